@@ -0,0 +1,60 @@
+"""add photo_register_jobs
+
+Revision ID: 9d41b7e2c6a8
+Revises: 7c3e91a4d2b5
+Create Date: 2026-10-18 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9d41b7e2c6a8'
+down_revision: Union[str, Sequence[str], None] = '7c3e91a4d2b5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('photo_register_jobs',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('input_channel_id', sa.Integer(), nullable=False),
+    sa.Column('status', sa.String(length=20), nullable=False),
+    sa.Column('attempts', sa.Integer(), nullable=False),
+    sa.Column('error', sa.Text(), nullable=True),
+    sa.Column('filename', sa.String(length=255), nullable=False),
+    sa.Column('content_type', sa.String(length=100), nullable=False),
+    sa.Column('spool_path', sa.String(length=500), nullable=False),
+    sa.Column('rating', sa.Integer(), nullable=False),
+    sa.Column('visibility', sa.String(length=20), nullable=False),
+    sa.Column('author_id', sa.Integer(), nullable=True),
+    sa.Column('coldpreview_size', sa.Integer(), nullable=True),
+    sa.Column('photo_id', sa.Integer(), nullable=True),
+    sa.Column('hothash', sa.String(length=64), nullable=True),
+    sa.Column('is_duplicate', sa.Boolean(), nullable=False),
+    sa.Column('started_at', sa.DateTime(), nullable=True),
+    sa.Column('finished_at', sa.DateTime(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['input_channel_id'], ['input_channels.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['author_id'], ['authors.id'], ondelete='SET NULL'),
+    sa.ForeignKeyConstraint(['photo_id'], ['photos.id'], ondelete='SET NULL'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_photo_register_jobs_user_id'), 'photo_register_jobs', ['user_id'], unique=False)
+    op.create_index(op.f('ix_photo_register_jobs_input_channel_id'), 'photo_register_jobs', ['input_channel_id'], unique=False)
+    op.create_index('ix_photo_register_jobs_status_id', 'photo_register_jobs', ['status', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_photo_register_jobs_status_id', table_name='photo_register_jobs')
+    op.drop_index(op.f('ix_photo_register_jobs_input_channel_id'), table_name='photo_register_jobs')
+    op.drop_index(op.f('ix_photo_register_jobs_user_id'), table_name='photo_register_jobs')
+    op.drop_table('photo_register_jobs')
@@ -0,0 +1,30 @@
+"""add photos.deleted_at
+
+Revision ID: c8a2d6f41e93
+Revises: b5f0e8c3a172
+Create Date: 2026-10-18 15:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c8a2d6f41e93'
+down_revision: Union[str, Sequence[str], None] = 'b5f0e8c3a172'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('photos', sa.Column('deleted_at', sa.DateTime(), nullable=True))
+    op.create_index(op.f('ix_photos_deleted_at'), 'photos', ['deleted_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_photos_deleted_at'), table_name='photos')
+    op.drop_column('photos', 'deleted_at')
@@ -0,0 +1,97 @@
+"""add timeline_buckets
+
+Revision ID: d3f7a1c9e254
+Revises: c8a2d6f41e93
+Create Date: 2026-10-18 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd3f7a1c9e254'
+down_revision: Union[str, Sequence[str], None] = 'c8a2d6f41e93'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('timeline_buckets',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('visibility', sa.String(length=20), nullable=False),
+    sa.Column('year', sa.Integer(), nullable=False),
+    sa.Column('month', sa.Integer(), nullable=False),
+    sa.Column('day', sa.Integer(), nullable=False),
+    sa.Column('hour', sa.Integer(), nullable=False),
+    sa.Column('count', sa.Integer(), nullable=False),
+    sa.Column('first_taken_at', sa.DateTime(), nullable=False),
+    sa.Column('last_taken_at', sa.DateTime(), nullable=False),
+    sa.Column('preview_hothash', sa.String(length=64), nullable=False),
+    sa.Column('preview_rating', sa.Integer(), nullable=True),
+    sa.Column('preview_taken_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('user_id', 'visibility', 'year', 'month', 'day', 'hour')
+    )
+    op.create_index('ix_timeline_buckets_visibility_year', 'timeline_buckets', ['visibility', 'year'], unique=False)
+
+    # Fill the rollup from existing photos (same result as scripts/maintenance/rebuild_timeline_buckets.py).
+    # Written against lightweight tables so the revision does not depend on the current models.
+    photos = sa.table(
+        'photos',
+        sa.column('user_id', sa.Integer()),
+        sa.column('visibility', sa.String()),
+        sa.column('taken_at', sa.DateTime()),
+        sa.column('hothash', sa.String()),
+        sa.column('rating', sa.Integer()),
+        sa.column('deleted_at', sa.DateTime()),
+    )
+    buckets = sa.table(
+        'timeline_buckets',
+        *[sa.column(name) for name in (
+            'user_id', 'visibility', 'year', 'month', 'day', 'hour', 'count', 'first_taken_at',
+            'last_taken_at', 'preview_hothash', 'preview_rating', 'preview_taken_at'
+        )]
+    )
+    parts = [sa.cast(sa.extract(part, photos.c.taken_at), sa.Integer()) for part in ('year', 'month', 'day', 'hour')]
+    partition = [photos.c.user_id, photos.c.visibility, *parts]
+    ranked = (
+        sa.select(
+            photos.c.user_id,
+            photos.c.visibility,
+            *[part.label(name) for part, name in zip(parts, ('year', 'month', 'day', 'hour'))],
+            sa.func.count().over(partition_by=partition).label('count'),
+            sa.func.min(photos.c.taken_at).over(partition_by=partition).label('first_taken_at'),
+            sa.func.max(photos.c.taken_at).over(partition_by=partition).label('last_taken_at'),
+            photos.c.hothash.label('preview_hothash'),
+            photos.c.rating.label('preview_rating'),
+            photos.c.taken_at.label('preview_taken_at'),
+            sa.func.row_number().over(
+                partition_by=partition,
+                # Rated 4-5 first, then highest rating, then earliest
+                order_by=[
+                    sa.case((photos.c.rating >= 4, 0), else_=1),
+                    photos.c.rating.desc().nullslast(),
+                    photos.c.taken_at
+                ]
+            ).label('rn')
+        )
+        .where(photos.c.deleted_at.is_(None), photos.c.taken_at.isnot(None))
+        .subquery()
+    )
+    columns = [column.name for column in buckets.columns]
+    op.execute(
+        buckets.insert().from_select(
+            columns,
+            sa.select(*[ranked.c[name] for name in columns]).where(ranked.c.rn == 1)
+        )
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_timeline_buckets_visibility_year', table_name='timeline_buckets')
+    op.drop_table('timeline_buckets')
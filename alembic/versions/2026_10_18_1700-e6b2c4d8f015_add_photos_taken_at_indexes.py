@@ -0,0 +1,30 @@
+"""add photos taken_at composite indexes
+
+Revision ID: e6b2c4d8f015
+Revises: d3f7a1c9e254
+Create Date: 2026-10-18 17:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e6b2c4d8f015'
+down_revision: Union[str, Sequence[str], None] = 'd3f7a1c9e254'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_photos_user_id_taken_at', 'photos', ['user_id', 'taken_at'], unique=False)
+    op.create_index('ix_photos_visibility_taken_at', 'photos', ['visibility', 'taken_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_photos_visibility_taken_at', table_name='photos')
+    op.drop_index('ix_photos_user_id_taken_at', table_name='photos')
@@ -0,0 +1,66 @@
+"""add event_closure
+
+Revision ID: f4a9c2e7b381
+Revises: e6b2c4d8f015
+Create Date: 2026-10-18 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f4a9c2e7b381'
+down_revision: Union[str, Sequence[str], None] = 'e6b2c4d8f015'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('event_closure',
+    sa.Column('ancestor_id', sa.Integer(), nullable=False),
+    sa.Column('descendant_id', sa.Integer(), nullable=False),
+    sa.Column('depth', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['ancestor_id'], ['events.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['descendant_id'], ['events.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('ancestor_id', 'descendant_id')
+    )
+    op.create_index('ix_event_closure_descendant_depth', 'event_closure', ['descendant_id', 'depth'], unique=False)
+
+    # Fill the closure from existing parent_event_id links, one INSERT ... SELECT per tree level
+    # (same result as rebuild_event_closure, written against lightweight tables)
+    events = sa.table('events', sa.column('id', sa.Integer()), sa.column('parent_event_id', sa.Integer()))
+    closure = sa.table(
+        'event_closure',
+        sa.column('ancestor_id', sa.Integer()),
+        sa.column('descendant_id', sa.Integer()),
+        sa.column('depth', sa.Integer()),
+    )
+    columns = ['ancestor_id', 'descendant_id', 'depth']
+    op.execute(
+        closure.insert().from_select(
+            columns,
+            sa.select(events.c.id.label('ancestor_id'), events.c.id.label('descendant_id'), sa.literal(0))
+        )
+    )
+    # The row count decides when the deepest level is done, so execute on the bind
+    bind = op.get_bind()
+    depth = 0
+    while bind.execute(
+        closure.insert().from_select(
+            columns,
+            sa.select(closure.c.ancestor_id, events.c.id, sa.literal(depth + 1))
+            .join(events, events.c.parent_event_id == closure.c.descendant_id)
+            .where(closure.c.depth == depth)
+        )
+    ).rowcount:
+        depth += 1
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_event_closure_descendant_depth', table_name='event_closure')
+    op.drop_table('event_closure')
@@ -0,0 +1,28 @@
+"""add photos event_id taken_at index
+
+Revision ID: a7d3e9b2c460
+Revises: f4a9c2e7b381
+Create Date: 2026-10-18 19:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7d3e9b2c460'
+down_revision: Union[str, Sequence[str], None] = 'f4a9c2e7b381'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_photos_event_id_taken_at', 'photos', ['event_id', 'taken_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_photos_event_id_taken_at', table_name='photos')
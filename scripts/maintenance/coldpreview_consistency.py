@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Coldpreview Consistency Scanner
+
+Cross-checks coldpreview storage against photos.coldpreview_path and reports:
+- Orphans: coldpreviews whose photo no longer exists
+- Unlinked: photo exists but does not reference its coldpreview
+- Dangling: photo references a coldpreview that is missing
+
+The scan is resumable. Progress is checkpointed after every shard directory, so an
+interrupted run (or a run limited with --max-shards) continues where it stopped.
+
+Usage:
+    python scripts/maintenance/coldpreview_consistency.py                  # Report only
+    python scripts/maintenance/coldpreview_consistency.py --delete-orphans --fix
+    python scripts/maintenance/coldpreview_consistency.py --max-shards 32  # Incremental
+    python scripts/maintenance/coldpreview_consistency.py --reset          # Start over
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+# Add project root to Python path for imports
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Coldpreview storage/database consistency scanner")
+    parser.add_argument("--delete-orphans", action="store_true", help="Delete coldpreviews without a photo")
+    parser.add_argument("--fix", action="store_true",
+                        help="Relink unlinked coldpreviews and clear dangling coldpreview_path values")
+    parser.add_argument("--workers", type=int, default=8, help="Parallel worker threads (default: 8)")
+    parser.add_argument("--max-shards", type=int, default=None,
+                        help="Scan at most this many of the 256 shard directories, then stop")
+    parser.add_argument("--min-age", type=int, default=3600,
+                        help="Never delete orphans younger than this many seconds (default: 3600)")
+    parser.add_argument("--reset", action="store_true", help="Discard checkpoint and start a new scan")
+    args = parser.parse_args()
+
+    from src.database.connection import SessionLocal
+    from src.services.coldpreview_consistency_service import ColdpreviewConsistencyService
+
+    db = SessionLocal()
+    try:
+        service = ColdpreviewConsistencyService(db)
+        print(f"🔍 Scanning coldpreviews in {service.repository.base_path}")
+
+        report = service.scan(
+            delete_orphans=args.delete_orphans,
+            fix=args.fix,
+            workers=args.workers,
+            max_shards=args.max_shards,
+            resume=not args.reset,
+            min_age_seconds=args.min_age
+        )
+    finally:
+        db.close()
+
+    totals = report["totals"]
+    print(f"📊 Shards: {report['shards_completed']}/{report['shards_total']}")
+    print(f"   Files scanned:   {totals['files_scanned']}")
+    print(f"   Photos checked:  {totals['photos_checked']}")
+    print(f"   Orphans:         {totals['orphans']} (deleted: {totals['orphans_deleted']})")
+    print(f"   Unlinked:        {totals['unlinked']} (fixed: {totals['unlinked_fixed']})")
+    print(f"   Dangling:        {totals['dangling']} (fixed: {totals['dangling_fixed']})")
+
+    if report["complete"]:
+        print("✅ Scan complete")
+    else:
+        print("⏸️  Scan incomplete - run again to continue from checkpoint")
+
+    for category, hothashes in report["samples"].items():
+        if hothashes:
+            print(f"\n{category} (first {len(hothashes)}):")
+            print(json.dumps(hothashes, indent=2))
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
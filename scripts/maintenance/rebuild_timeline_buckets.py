@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""
+Timeline Bucket Rebuild
+
+Recomputes the timeline_buckets rollup from photos. The rollup is maintained
+incrementally on every photo change; rebuild after the table was created
+(migration) or whenever photos were changed outside the application.
+
+Usage:
+    python scripts/maintenance/rebuild_timeline_buckets.py              # All users
+    python scripts/maintenance/rebuild_timeline_buckets.py --user-id 3  # One user
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+# Add project root to Python path for imports
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rebuild the timeline_buckets rollup from photos")
+    parser.add_argument("--user-id", type=int, default=None, help="Only rebuild this user's buckets")
+    args = parser.parse_args()
+
+    from src.database.connection import SessionLocal
+    from src.repositories.timeline_bucket_repository import TimelineBucketRepository
+
+    scope = f"user {args.user_id}" if args.user_id is not None else "all users"
+    print(f"🔄 Rebuilding timeline buckets for {scope}")
+
+    db = SessionLocal()
+    try:
+        written = TimelineBucketRepository(db).rebuild(user_id=args.user_id)
+    finally:
+        db.close()
+
+    print(f"✅ Wrote {written} bucket(s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
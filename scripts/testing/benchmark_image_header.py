@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Benchmark header-only dimension probing against Pillow
+
+Runs utils.image_header.probe_image_header and PIL.Image.open(...).size over
+every preview image in tests/fixtures/photo_create_schemas (hotpreview and
+coldpreview base64 fields), checks that both agree, and prints timings.
+
+Usage:
+    python scripts/testing/benchmark_image_header.py
+    python scripts/testing/benchmark_image_header.py --rounds 5000
+"""
+
+import argparse
+import base64
+import io
+import json
+import sys
+import time
+from pathlib import Path
+
+from PIL import Image
+
+# Add project root to Python path for imports
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.utils.image_header import probe_image_header
+
+FIXTURES_DIR = project_root / "tests" / "fixtures" / "photo_create_schemas"
+
+
+def load_fixture_images():
+    images = []
+    for path in sorted(FIXTURES_DIR.glob("*.json")):
+        schema = json.loads(path.read_text())
+        for field in ("hotpreview_base64", "coldpreview_base64"):
+            if schema.get(field):
+                images.append((f"{path.stem}.{field.split('_')[0]}", base64.b64decode(schema[field])))
+    return images
+
+
+def pil_probe(data: bytes):
+    img = Image.open(io.BytesIO(data))
+    return img.format, img.size[0], img.size[1]
+
+
+def bench(fn, images, rounds: int) -> float:
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for _, data in images:
+            fn(data)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Header probe vs Pillow benchmark")
+    parser.add_argument("--rounds", type=int, default=1000, help="Passes over all fixture images (default: 1000)")
+    args = parser.parse_args()
+
+    images = load_fixture_images()
+    if not images:
+        print(f"❌ No fixture images found in {FIXTURES_DIR}")
+        return 1
+
+    mismatches = 0
+    for name, data in images:
+        header = tuple(probe_image_header(data))
+        pil = pil_probe(data)
+        if header != pil:
+            mismatches += 1
+            print(f"❌ {name}: header={header} pil={pil}")
+
+    calls = args.rounds * len(images)
+    header_seconds = bench(probe_image_header, images, args.rounds)
+    pil_seconds = bench(pil_probe, images, args.rounds)
+
+    print(f"📊 {len(images)} fixture images x {args.rounds} rounds = {calls} probes")
+    print(f"   image_header: {header_seconds:.3f}s ({header_seconds / calls * 1e6:.1f} µs/probe)")
+    print(f"   Pillow:       {pil_seconds:.3f}s ({pil_seconds / calls * 1e6:.1f} µs/probe)")
+    print(f"   Speedup:      {pil_seconds / header_seconds:.1f}x")
+    print("✅ All dimensions match Pillow" if not mismatches else f"❌ {mismatches} mismatches")
+    return 0 if not mismatches else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,7 +3,7 @@ Development/Debug API endpoints - ONLY for development use
 """
 import os
 from pathlib import Path
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Query
 from sqlalchemy.orm import Session
 from sqlalchemy import text, inspect
 
@@ -292,4 +292,53 @@ def clear_database(db: Session = Depends(get_db)):
         raise HTTPException(
             status_code=500,
             detail=f"Database clear failed: {str(e)}"
-        )
\ No newline at end of file
+        )
+
+
+@router.post("/coldpreview-consistency")
+def coldpreview_consistency(
+    delete_orphans: bool = False,
+    fix: bool = False,
+    max_shards: int = Query(16, ge=1, le=256, description="Shard directories to scan in this call"),
+    workers: int = Query(8, ge=1, le=64, description="Parallel worker threads"),
+    reset: bool = False,
+    db: Session = Depends(get_db)
+):
+    """
+    Cross-check coldpreview storage against photos.coldpreview_path (development/admin only)
+    
+    Reports orphaned coldpreviews (no photo), unlinked coldpreviews (photo does not
+    reference them) and dangling references (photo points at missing coldpreview).
+    
+    The scan is incremental: each call processes up to max_shards of the 256 shard
+    directories and stores a checkpoint. Call repeatedly until "complete" is true.
+    For unattended runs use scripts/maintenance/coldpreview_consistency.py.
+    
+    Parameters:
+    - delete_orphans: Delete coldpreviews without a photo
+    - fix: Relink unlinked coldpreviews and clear dangling coldpreview_path values
+    - reset: Discard checkpoint and start a new scan
+    """
+    from src.services.coldpreview_consistency_service import ColdpreviewConsistencyService
+    
+    if not is_development_mode():
+        raise HTTPException(
+            status_code=403,
+            detail="Coldpreview consistency scan only available in development mode"
+        )
+    
+    try:
+        service = ColdpreviewConsistencyService(db)
+        return service.scan(
+            delete_orphans=delete_orphans,
+            fix=fix,
+            workers=workers,
+            max_shards=max_shards,
+            resume=not reset
+        )
+    except Exception as e:
+        db.rollback()
+        raise HTTPException(
+            status_code=500,
+            detail=f"Coldpreview consistency scan failed: {str(e)}"
+        )
@@ -11,9 +11,10 @@ from src.models.user import User
 from src.services.event_service import EventService
 from src.schemas.event import (
     EventCreate, EventUpdate, EventResponse, EventTreeResponse,
-    EventWithPhotos, EventMoveRequest
+    EventWithPhotos, EventMoveRequest, EventPhotoPage,
+    EventClusteringRequest, EventProposalResponse, EventProposalApplyResponse,
+    EventRangeAssignRequest, EventRangeAssignResponse
 )
-from src.schemas.photo_schemas import PhotoResponse
 
 router = APIRouter(prefix="/events", tags=["events"])
 
@@ -74,6 +75,58 @@ def get_event_tree(
     return service.get_event_tree(current_user.id, root_id)
 
 
+@router.post("/cluster/propose", response_model=EventProposalResponse)
+def propose_events(
+    request: EventClusteringRequest,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Propose events from photo times and locations (nothing is created)
+    
+    Photos are split into trips, days and locations wherever the time gap or the
+    distance between consecutive photos exceeds the level's threshold. Levels that
+    do not split their parent are skipped. Returns the proposed hierarchy with
+    photo counts.
+    """
+    service = EventService(db)
+    return service.propose_events(current_user.id, request)
+
+
+@router.post("/cluster/apply", response_model=EventProposalApplyResponse)
+def apply_event_proposal(
+    request: EventClusteringRequest,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Create the events proposed for these thresholds and assign their photos
+    
+    Send the same thresholds that were used for POST /events/cluster/propose.
+    """
+    service = EventService(db)
+    return service.apply_event_proposal(current_user.id, request)
+
+
+@router.post("/assign-by-range", response_model=EventRangeAssignResponse)
+def assign_photos_by_range(
+    request: EventRangeAssignRequest,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Assign photos to every event that has start_date and end_date
+    
+    Photos taken within an event's range (and, with radius_km, within that
+    distance of its GPS position) are put into the event; a photo matching
+    several events goes to the deepest one. An end_date at midnight includes
+    that whole day. By default only photos without an
+    event are assigned (overwrite=true moves them too). dry_run=true only counts.
+    """
+    service = EventService(db)
+    return service.assign_photos_by_range(current_user.id, request)
+
+
 @router.get("/{event_id}", response_model=EventResponse)
 def get_event(
     event_id: int,
@@ -137,21 +190,45 @@ def delete_event(
 
 # Photo-Event associations
 
-@router.get("/{event_id}/photos", response_model=List[PhotoResponse])
+@router.get("/{event_id}/photos", response_model=EventPhotoPage)
 def get_event_photos(
     event_id: int,
     include_descendants: bool = Query(False, description="Include photos from child events"),
+    limit: int = Query(100, ge=1, le=1000, description="Number of photos per page"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    order: str = Query("asc", pattern="^(asc|desc)$", description="taken_at order (undated photos last)"),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """
-    Get photos in event
+    Get photos in event, one page at a time
     
     - **include_descendants=false**: Only direct photos in this event
     - **include_descendants=true**: Photos in this event + all child events (recursive)
     
+    Photos are returned as lightweight summaries (no hotpreview/EXIF), ordered by
+    taken_at. Pass `next_cursor` back as `cursor` to get the following page; it
+    is null on the last page.
+    
     Note: To set/change a photo's event, use PUT /photos/{hothash}/event
     """
     service = EventService(db)
-    photos = service.get_event_photos(event_id, current_user.id, include_descendants)
-    return [PhotoResponse.model_validate(photo) for photo in photos]
+    return service.get_event_photos(
+        event_id, current_user.id, include_descendants, limit, cursor, descending=order == "desc"
+    )
+
+
+@router.post("/{event_id}/assign-by-range", response_model=EventRangeAssignResponse)
+def assign_event_photos_by_range(
+    event_id: int,
+    request: EventRangeAssignRequest,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Assign photos taken between this event's start_date and end_date to it
+    
+    Same options as POST /events/assign-by-range, for a single event.
+    """
+    service = EventService(db)
+    return service.assign_photos_by_range(current_user.id, request, event_id)
@@ -0,0 +1,53 @@
+"""
+Runtime metrics API endpoints
+Exposes queue, latency and memory metrics for in-process workers and caches
+"""
+from fastapi import APIRouter
+
+from src.services.hothash_filter_service import hothash_filters
+from src.utils.image_worker_pool import get_image_worker_pool
+from src.utils.imalink_core_client import get_imalink_core_client
+
+router = APIRouter(prefix="/metrics", tags=["System"])
+
+
+@router.get("/image-workers")
+def get_image_worker_metrics():
+    """
+    Get image worker pool metrics
+
+    Returns pool configuration plus counters (submitted, completed, rejected,
+    timeouts, in_flight) and queue wait / run time percentiles over recent tasks.
+
+    No authentication required - intended for system monitoring.
+    """
+    pool = get_image_worker_pool()
+    return {
+        "processes": pool.max_workers,
+        "max_queue": pool.max_queue,
+        "timeout_seconds": pool.timeout,
+        **pool.metrics.snapshot()
+    }
+
+
+@router.get("/hothash-filters")
+def get_hothash_filter_metrics():
+    """
+    Get memory use of the per-user hothash filters behind POST /photos/exists
+
+    No authentication required - intended for system monitoring.
+    """
+    return hothash_filters.stats()
+
+
+@router.get("/imalink-core")
+def get_imalink_core_metrics():
+    """
+    Get imalink-core client metrics (POST /photos/register-image)
+
+    Returns concurrency/pool configuration plus counters (rejected = no slot
+    within the queue timeout) and queue wait / processing time percentiles.
+
+    No authentication required - intended for system monitoring.
+    """
+    return get_imalink_core_client().stats()
@@ -17,36 +17,65 @@ This API provides:
 - DELETE: Remove photo and all associated image files (cascade)
 """
 from typing import Optional, List
-from fastapi import APIRouter, Depends, HTTPException, Response, Query, File, UploadFile, Body
-from fastapi.responses import StreamingResponse
+from fastapi import APIRouter, Depends, HTTPException, Response, Query, File, UploadFile, Body, Request, Form, Header
+from fastapi.responses import StreamingResponse, JSONResponse
+from fastapi.encoders import jsonable_encoder
+from starlette.concurrency import run_in_threadpool
+from starlette.requests import ClientDisconnect
+import base64
+import hashlib
 import io
+import json
 import logging
 import httpx
 
-from src.core.dependencies import get_photo_service, get_photo_stack_service
+from src.core.dependencies import (
+    get_photo_service, get_photo_stack_service, get_photo_import_service, get_photo_register_job_service,
+    get_photo_upload_session_service
+)
 from src.services.photo_service import PhotoService
 from src.services.photo_stack_service import PhotoStackService
+from src.services.photo_import_service import PhotoImportService
+from src.services.photo_register_job_service import PhotoRegisterJobService, register_job_workers
+from src.services.photo_upload_session_service import PhotoUploadSessionService
 from src.schemas.photo_schemas import (
     PhotoResponse, PhotoCreateRequest, PhotoUpdateRequest, 
-    PhotoSearchRequest, TimeLocCorrectionRequest, ViewCorrectionRequest
+    PhotoSearchRequest, TimeLocCorrectionRequest, ViewCorrectionRequest,
+    PhotoBulkUpdateRequest, PhotoBulkUpdateResponse, PhotoBulkDeleteRequest, PhotoBulkDeleteResponse
 )
 from imalink_schemas import PhotoCreateSchema, ImageFileCreateSchema
-from src.schemas.photo_create_schemas import PhotoCreateRequest as PhotoCreateReq, PhotoCreateResponse
+from src.schemas.photo_create_schemas import (
+    PhotoCreateRequest as PhotoCreateReq, PhotoCreateResponse,
+    PhotoCreateBatchRequest, PhotoCreateBatchResponse, PhotoCreateBatchItemResult,
+    PhotoImportProgressResponse, HothashExistsRequest, HothashExistsResponse,
+    PhotoRegisterJobResponse, PhotoUploadSessionCreateRequest, PhotoUploadSessionResponse
+)
 from src.schemas.image_file_upload_schemas import (
     ImageFileNewPhotoRequest, ImageFileAddToPhotoRequest, ImageFileUploadResponse
 )
 from src.schemas.image_file_schemas import ImageFileResponse
 from src.schemas.tag_schemas import AddTagsRequest, AddTagsResponse, RemoveTagResponse
-from src.schemas.common import PaginatedResponse, create_success_response
+from src.schemas.common import PaginatedResponse, create_success_response, create_paginated_response
 from src.schemas.responses.photo_stack_responses import PhotoStackSummary
-from src.core.exceptions import NotFoundError, ValidationError, DuplicateImageError
+from src.core.exceptions import (
+    NotFoundError, ValidationError, ConflictError, DuplicateImageError, ServiceBusyError, ProcessingTimeoutError
+)
+from src.core.config import Config
 from src.api.dependencies import get_current_active_user, get_optional_current_user
 from src.models.user import User
+from src.utils.ndjson import RequestStreamingResponse, iter_ndjson_lines
+from src.utils.imalink_core_client import get_imalink_core_client
 from pydantic import ValidationError as PydanticValidationError
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
+# Streaming import: longest accepted NDJSON line (base64 hot+coldpreview)
+MAX_IMPORT_LINE_BYTES = 16 * 1024 * 1024
+
+# Multipart create: largest accepted raw hotpreview part (150px JPEG is ~5-15KB)
+MAX_HOTPREVIEW_BYTES = 1024 * 1024
+
 
 @router.get("/", response_model=PaginatedResponse[PhotoResponse])
 def list_photos(
@@ -98,6 +127,109 @@ def search_photos(
 # PhotoCreateSchema endpoint is the single unified way to create photos
 
 
+# Register-image jobs - registered before /{hothash} so "jobs" is not taken as a hothash
+
+@router.get("/jobs", response_model=PaginatedResponse[PhotoRegisterJobResponse])
+def list_register_jobs(
+    input_channel_id: Optional[int] = Query(None, description="Only jobs for this input channel"),
+    status: Optional[str] = Query(None, pattern="^(pending|processing|done|failed)$", description="Only jobs with this status"),
+    offset: int = Query(0, ge=0, description="Number of jobs to skip"),
+    limit: int = Query(100, ge=1, le=1000, description="Number of jobs to return"),
+    current_user: User = Depends(get_current_active_user),
+    job_service: PhotoRegisterJobService = Depends(get_photo_register_job_service)
+):
+    """
+    List queued register-image jobs (newest first)
+    
+    Use input_channel_id to follow one upload session; jobs without an explicit
+    channel belong to the protected Quick Channel.
+    """
+    jobs, total = job_service.list_jobs(
+        user_id=getattr(current_user, 'id'),
+        input_channel_id=input_channel_id,
+        status=status,
+        offset=offset,
+        limit=limit
+    )
+    return create_paginated_response(
+        data=[PhotoRegisterJobResponse.model_validate(job) for job in jobs],
+        total=total,
+        offset=offset,
+        limit=limit
+    )
+
+
+@router.get("/jobs/{job_id}", response_model=PhotoRegisterJobResponse)
+def get_register_job(
+    job_id: int,
+    current_user: User = Depends(get_current_active_user),
+    job_service: PhotoRegisterJobService = Depends(get_photo_register_job_service)
+):
+    """
+    Get status of a register-image job (poll until status is done or failed)
+    
+    done: photo_id/hothash of the created photo (or the existing one if is_duplicate)
+    failed: error explains why
+    """
+    try:
+        job = job_service.get_job(job_id, getattr(current_user, 'id'))
+    except NotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    return PhotoRegisterJobResponse.model_validate(job)
+
+
+@router.patch("/bulk", response_model=PhotoBulkUpdateResponse)
+def bulk_update_photos(
+    request: PhotoBulkUpdateRequest,
+    current_user: User = Depends(get_current_active_user),
+    photo_service: PhotoService = Depends(get_photo_service)
+):
+    """
+    Update rating, visibility, category, author or event on many photos
+    
+    Select photos by `hothashes` or by `search` (all of your photos matching
+    a PhotoSearchRequest). Only fields present in `patch` are changed;
+    `category`, `author_id` and `event_id` can be cleared with null.
+    
+    **Example:**
+    ```json
+    {
+        "hothashes": ["abc123...", "def456..."],
+        "patch": {"rating": 4, "event_id": null}
+    }
+    ```
+    """
+    try:
+        return photo_service.bulk_update_photos(request, getattr(current_user, 'id'))
+    except NotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except ValidationError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to update photos: {str(e)}")
+
+
+@router.post("/bulk-delete", response_model=PhotoBulkDeleteResponse, status_code=202)
+def bulk_delete_photos(
+    request: PhotoBulkDeleteRequest,
+    current_user: User = Depends(get_current_active_user),
+    photo_service: PhotoService = Depends(get_photo_service)
+):
+    """
+    Delete many photos (selected by `hothashes` or `search`)
+    
+    Photos disappear from all listings immediately. Their image files, tags,
+    coldpreviews and references in collections and PhotoText documents are
+    removed in the background.
+    """
+    try:
+        return photo_service.bulk_delete_photos(request, getattr(current_user, 'id'))
+    except ValidationError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to delete photos: {str(e)}")
+
+
 @router.get("/{hothash}/files", response_model=List[ImageFileResponse])
 def get_photo_files(
     hothash: str,
@@ -215,15 +347,7 @@ def upload_coldpreview(
         if not file_content:
             raise HTTPException(status_code=400, detail="File is empty")
         
-        # Validate that it's a valid image by trying to open it
-        from PIL import Image as PILImage
-        import io
-        try:
-            test_img = PILImage.open(io.BytesIO(file_content))
-            test_img.verify()  # Check if it's a valid image
-        except Exception as e:
-            raise HTTPException(status_code=400, detail=f"Invalid image file: {str(e)}")
-        
+        # Image is verified by the service (in the image worker pool)
         result = photo_service.upload_coldpreview(hothash, file_content, current_user.id)
         return create_success_response(
             message="Coldpreview uploaded successfully",
@@ -233,6 +357,8 @@ def upload_coldpreview(
         raise HTTPException(status_code=404, detail=str(e))
     except ValidationError as e:
         raise HTTPException(status_code=400, detail=str(e))
+    except (ServiceBusyError, ProcessingTimeoutError) as e:
+        raise HTTPException(status_code=e.status_code, detail=e.message)
     except HTTPException:
         raise  # Re-raise HTTP exceptions as-is
     except Exception as e:
@@ -265,6 +391,8 @@ def get_coldpreview(
             raise HTTPException(status_code=404, detail="Coldpreview not available")
     except NotFoundError as e:
         raise HTTPException(status_code=404, detail=str(e))
+    except (ServiceBusyError, ProcessingTimeoutError) as e:
+        raise HTTPException(status_code=e.status_code, detail=e.message)
     except HTTPException:
         # Re-raise HTTP exceptions as-is (including our 404 above)
         raise
@@ -479,6 +607,22 @@ def get_photo_stack(
         raise HTTPException(status_code=500, detail=f"Failed to fetch stack for photo: {str(e)}")
 
 
+def _photo_create_response(photo, is_duplicate: bool) -> PhotoCreateResponse:
+    """PhotoCreateResponse for a created (or already existing) photo"""
+    return PhotoCreateResponse(
+        id=photo.id,
+        user_id=photo.user_id,
+        hothash=photo.hothash,
+        rating=photo.rating,
+        visibility=photo.visibility,
+        width=photo.width,
+        height=photo.height,
+        taken_at=photo.taken_at,
+        created_at=photo.created_at,
+        is_duplicate=is_duplicate
+    )
+
+
 @router.post("/create", response_model=PhotoCreateResponse, status_code=201)
 def create_photo(
     request: PhotoCreateReq,
@@ -509,18 +653,7 @@ def create_photo(
             user_id=getattr(current_user, 'id')
         )
         
-        return PhotoCreateResponse(
-            id=photo.id,
-            user_id=photo.user_id,
-            hothash=photo.hothash,
-            rating=photo.rating,
-            visibility=photo.visibility,
-            width=photo.width,
-            height=photo.height,
-            taken_at=photo.taken_at,
-            created_at=photo.created_at,
-            is_duplicate=False  # Will be set by service if hothash existed
-        )
+        return _photo_create_response(photo, is_duplicate=False)
         
     except DuplicateImageError as e:
         # Photo with this hothash already exists - return existing
@@ -528,77 +661,270 @@ def create_photo(
             hothash=request.photo_create_schema.hothash,
             user_id=getattr(current_user, 'id')
         )
-        return PhotoCreateResponse(
-            id=existing_photo.id,
-            user_id=existing_photo.user_id,
-            hothash=existing_photo.hothash,
-            rating=existing_photo.rating,
-            visibility=existing_photo.visibility,
-            width=existing_photo.width,
-            height=existing_photo.height,
-            taken_at=existing_photo.taken_at,
-            created_at=existing_photo.created_at,
-            is_duplicate=True
-        )
+        return _photo_create_response(existing_photo, is_duplicate=True)
     except ValidationError as e:
         raise HTTPException(status_code=400, detail=str(e))
+    except (ServiceBusyError, ProcessingTimeoutError) as e:
+        raise HTTPException(status_code=e.status_code, detail=e.message)
     except Exception as e:
         logger.error(f"Failed to create photo from PhotoCreateSchema: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Failed to create photo: {str(e)}")
 
 
-@router.post("/register-image", response_model=PhotoCreateResponse, status_code=201)
-def register_image(
-    file: UploadFile = File(..., description="Image file to register"),
-    input_channel_id: Optional[int] = Query(None, description="Input channel ID (uses protected 'Quick Channel' if not provided)"),
-    rating: int = Query(0, ge=0, le=5, description="Star rating 0-5"),
-    visibility: str = Query("private", pattern="^(private|space|authenticated|public)$", description="Visibility level"),
-    author_id: Optional[int] = Query(None, description="Author ID"),
-    coldpreview_size: Optional[int] = Query(None, ge=150, description="Size for coldpreview (e.g., 2560)"),
+@router.post("/exists", response_model=HothashExistsResponse)
+def check_photos_exist(
+    request: HothashExistsRequest,
     current_user: User = Depends(get_current_active_user),
     photo_service: PhotoService = Depends(get_photo_service)
 ):
     """
-    Register image by sending to imalink-core for processing (Convenience endpoint)
+    Check which hothashes already exist (import pre-check)
     
-    **Use case**: Quick web upload when user doesn't have desktop app available.
-    **Not recommended for**: Batch imports (use desktop app with local imalink-core instead).
+    Lets the desktop client skip files that are already imported before sending
+    them through imalink-core. Accepts up to 10000 hothashes per request.
+    """
+    hothashes = list(dict.fromkeys(request.hothashes))
+    existing = photo_service.find_existing_hothashes(hothashes, getattr(current_user, 'id'))
+    return HothashExistsResponse(
+        checked=len(hothashes),
+        existing=existing,
+        missing_count=len(hothashes) - len(existing)
+    )
+
+
+@router.post("/create-multipart", response_model=PhotoCreateResponse, status_code=201)
+def create_photo_multipart(
+    metadata: str = Form(..., description="PhotoCreateRequest (or bare PhotoCreateSchema) JSON without preview base64 fields"),
+    hotpreview: UploadFile = File(..., description="Raw hotpreview JPEG"),
+    coldpreview: Optional[UploadFile] = File(None, description="Raw coldpreview JPEG (optional)"),
+    current_user: User = Depends(get_current_active_user),
+    photo_service: PhotoService = Depends(get_photo_service)
+):
+    """
+    Create Photo from metadata JSON plus raw binary previews (multipart/form-data)
     
-    Flow:
-    1. Frontend uploads raw image file (multipart/form-data)
-    2. Backend sends to imalink-core server (localhost:8001) for processing
-    3. imalink-core returns PhotoCreateSchema (metadata + previews)
-    4. Backend stores PhotoCreateSchema (same as POST /create endpoint)
+    Same result as POST /photos/create, without base64: the request is ~25% smaller,
+    the JSON parser never sees the preview bytes, and the coldpreview part is
+    copied from the upload spool file to storage in chunks instead of being
+    decoded in memory.
     
-    Note: Original image is NOT stored on server, only metadata and previews.
+    Parts:
+    - metadata: PhotoCreateRequest JSON ({"photo_create_schema": {...}, "tags": [...]})
+      or a bare PhotoCreateSchema; hotpreview_base64/coldpreview_base64 are ignored
+    - hotpreview: raw hotpreview bytes
+    - coldpreview: raw coldpreview bytes (optional)
+    """
+    hotpreview_bytes = hotpreview.file.read(MAX_HOTPREVIEW_BYTES + 1)
+    if not hotpreview_bytes:
+        raise HTTPException(status_code=400, detail="Hotpreview part is empty")
+    if len(hotpreview_bytes) > MAX_HOTPREVIEW_BYTES:
+        raise HTTPException(status_code=400, detail=f"Hotpreview part exceeds {MAX_HOTPREVIEW_BYTES} bytes")
     
-    Args:
-        file: Image file (JPEG, PNG, etc.)
-        input_channel_id: Optional input channel (defaults to protected 'Quick Channel')
-        rating: Star rating 0-5
-        visibility: Visibility level (private, space, authenticated, public)
-        author_id: Optional photographer/author
-        coldpreview_size: Optional size for larger preview (e.g., 2560px)
-        
-    Returns:
-        PhotoCreateResponse: Created photo metadata
-        
-    Raises:
-        400: If image processing fails or invalid image
-        500: If imalink-core service unavailable
+    try:
+        data = json.loads(metadata)
+        if not isinstance(data, dict):
+            raise ValueError("metadata must be a JSON object")
+        if "photo_create_schema" not in data:
+            data = {"photo_create_schema": data}
+        schema_data = data["photo_create_schema"]
+        # Previews travel as binary parts; the schema still validates a hotpreview
+        # (small), the coldpreview is left out so it is never decoded
+        schema_data["hotpreview_base64"] = base64.b64encode(hotpreview_bytes).decode("ascii")
+        schema_data["coldpreview_base64"] = None
+        request = PhotoCreateReq.model_validate(data)
+    except PydanticValidationError as e:
+        raise HTTPException(status_code=422, detail=e.errors(include_url=False, include_context=False))
+    except (ValueError, TypeError) as e:
+        raise HTTPException(status_code=400, detail=f"Invalid metadata: {str(e)}")
+    
+    try:
+        photo = photo_service.create_photo_from_photo_create_schema(
+            photo_create_request=request,
+            user_id=getattr(current_user, 'id'),
+            hotpreview_bytes=hotpreview_bytes,
+            coldpreview_stream=coldpreview.file if coldpreview is not None else None
+        )
+        return _photo_create_response(photo, is_duplicate=False)
+    except DuplicateImageError:
+        existing_photo = photo_service.get_photo_by_hothash(
+            hothash=request.photo_create_schema.hothash,
+            user_id=getattr(current_user, 'id')
+        )
+        return _photo_create_response(existing_photo, is_duplicate=True)
+    except (ValueError, ValidationError) as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except (ServiceBusyError, ProcessingTimeoutError) as e:
+        raise HTTPException(status_code=e.status_code, detail=e.message)
+    except Exception as e:
+        logger.error(f"Failed to create photo from multipart upload: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=500, detail=f"Failed to create photo: {str(e)}")
+
+
+@router.post("/create-batch", response_model=PhotoCreateBatchResponse)
+def create_photos_batch(
+    request: PhotoCreateBatchRequest,
+    current_user: User = Depends(get_current_active_user),
+    photo_service: PhotoService = Depends(get_photo_service)
+):
     """
-    from src.utils.imalink_core_client import ImalinkCoreClient
+    Create many Photos from PhotoCreateSchemas in one request (bulk import)
+    
+    Batch version of POST /photos/create for desktop imports. Input channel and
+    author defaults are resolved once, duplicates are checked with one query and
+    all new photos are committed in a single transaction.
     
+    Each item gets its own result (same order as the request):
+    - created: new photo_id
+    - duplicate: hothash already exists for this user (existing photo_id)
+    - error: item skipped (error explains why); other items are still created
+    """
     try:
-        # Read uploaded file (sync)
-        image_bytes = file.file.read()
+        results = photo_service.create_photos_batch(request.items, getattr(current_user, 'id'))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except (ServiceBusyError, ProcessingTimeoutError) as e:
+        raise HTTPException(status_code=e.status_code, detail=e.message)
+    except Exception as e:
+        logger.error(f"Failed to create photo batch: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=500, detail=f"Failed to create photo batch: {str(e)}")
+    
+    return PhotoCreateBatchResponse(
+        total=len(results),
+        created=sum(1 for result in results if result["status"] == "created"),
+        duplicates=sum(1 for result in results if result["status"] == "duplicate"),
+        errors=sum(1 for result in results if result["status"] == "error"),
+        results=[PhotoCreateBatchItemResult(**result) for result in results]
+    )
+
+
+@router.post("/import")
+async def import_photos_ndjson(
+    request: Request,
+    import_id: Optional[str] = Query(None, min_length=1, max_length=100, description="Client-chosen import name; enables resume"),
+    start_line: int = Query(1, ge=1, description="Input line number of the first line in this body"),
+    batch_size: int = Query(100, ge=1, le=500, description="Lines per transaction"),
+    current_user: User = Depends(get_current_active_user),
+    import_service: PhotoImportService = Depends(get_photo_import_service)
+):
+    """
+    Streaming bulk import from newline-delimited JSON (NDJSON)
+    
+    Request body: one PhotoCreateSchema (or PhotoCreateRequest) JSON object per line,
+    Content-Type application/x-ndjson. The body is parsed as it arrives and created
+    in batches of batch_size lines, one commit per batch - memory use does not
+    grow with import size.
+    
+    Response (application/x-ndjson, streamed while the body is still uploading):
+    - {"line": n, "hothash": ..., "status": "created|duplicate|error", "photo_id": ..., "error": ...}
+    - {"progress": {...}} after every committed batch
+    - {"done": true, "progress": {...}} at the end, or {"error": ...} if the import stopped
+    
+    Resume: with import_id, the last committed line is stored with each batch.
+    After an interruption, either send the whole input again (committed lines are
+    skipped) or only the remainder with start_line=committed_line+1.
+    GET /photos/import/{import_id} returns the checkpoint.
+    """
+    user_id = getattr(current_user, 'id')
+    progress = None
+    if import_id is not None:
+        progress = await run_in_threadpool(import_service.get_or_create_progress, user_id, import_id)
+    skip_through = progress.committed_line if progress is not None else 0
+    
+    async def results():
+        totals = {"lines_read": 0, "skipped": 0, "created": 0, "duplicates": 0, "errors": 0,
+                  "committed_line": skip_through}
+        status_keys = {"created": "created", "duplicate": "duplicates", "error": "errors"}
+        batch = []
+        line_number = start_line - 1
         
-        # Send to imalink-core for processing (sync)
-        core_client = ImalinkCoreClient()
-        photo_create_schema = core_client.process_image(
-            image_bytes=image_bytes,
-            filename=file.filename or "uploaded_image.jpg",
-            coldpreview_size=coldpreview_size
+        async def commit_batch():
+            batch_results = await run_in_threadpool(import_service.import_batch, user_id, batch, progress)
+            for result in batch_results:
+                totals[status_keys[result["status"]]] += 1
+            totals["committed_line"] = batch[-1][0]
+            return "".join(json.dumps(result) + "\n" for result in batch_results) + \
+                json.dumps({"progress": totals}) + "\n"
+        
+        try:
+            async for line in iter_ndjson_lines(request.stream(), MAX_IMPORT_LINE_BYTES):
+                line_number += 1
+                totals["lines_read"] += 1
+                if line_number <= skip_through:
+                    totals["skipped"] += 1
+                    continue
+                if isinstance(line, bytes) and not line.strip():
+                    continue  # Blank lines are allowed (counted for line numbers only)
+                batch.append((line_number, line))
+                if len(batch) >= batch_size:
+                    yield await commit_batch()
+                    batch = []
+            if batch:
+                yield await commit_batch()
+            yield json.dumps({"done": True, "progress": totals}) + "\n"
+        except ClientDisconnect:
+            # Committed batches stay committed; client resumes from the checkpoint
+            logger.info(f"Photo import {import_id or '(unnamed)'} disconnected after line {totals['committed_line']}")
+        except ValueError as e:
+            yield json.dumps({"error": str(e), "progress": totals}) + "\n"
+        except (ServiceBusyError, ProcessingTimeoutError) as e:
+            yield json.dumps({"error": e.message, "progress": totals}) + "\n"
+        except Exception as e:
+            logger.error(f"Photo import failed: {str(e)}", exc_info=True)
+            yield json.dumps({"error": f"Import failed: {str(e)}", "progress": totals}) + "\n"
+    
+    return RequestStreamingResponse(results(), media_type="application/x-ndjson")
+
+
+@router.get("/import/{import_id}", response_model=PhotoImportProgressResponse)
+def get_import_progress(
+    import_id: str,
+    current_user: User = Depends(get_current_active_user),
+    import_service: PhotoImportService = Depends(get_photo_import_service)
+):
+    """Get checkpoint of a streaming import (resume from committed_line + 1)"""
+    progress = import_service.get_progress(getattr(current_user, 'id'), import_id)
+    if progress is None:
+        raise HTTPException(status_code=404, detail=f"Import '{import_id}' not found")
+    return PhotoImportProgressResponse.model_validate(progress)
+
+
+async def _accept_register_job(queue, **kwargs) -> JSONResponse:
+    """Queue a register-image job via queue(**kwargs) and answer 202 with the job"""
+    try:
+        job = await run_in_threadpool(queue, **kwargs)
+    except ValidationError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Failed to queue register job: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=500, detail=f"Failed to queue image: {str(e)}")
+    register_job_workers.notify()
+    return JSONResponse(
+        status_code=202,
+        content=jsonable_encoder(PhotoRegisterJobResponse.model_validate(job)),
+        headers={"Location": f"/api/v1/photos/jobs/{job.id}"}
+    )
+
+
+async def _register_image_file(
+    image_file,
+    filename: str,
+    content_type: str,
+    user_id: int,
+    photo_service: PhotoService,
+    input_channel_id: Optional[int] = None,
+    rating: int = 0,
+    visibility: str = "private",
+    author_id: Optional[int] = None,
+    coldpreview_size: Optional[int] = None
+) -> PhotoCreateResponse:
+    """Send an image file to imalink-core and create the photo (synchronous register-image)"""
+    try:
+        # Stream file to imalink-core (async, pooled connection)
+        photo_create_schema = await get_imalink_core_client().process_image(
+            image_file=image_file,
+            filename=filename,
+            coldpreview_size=coldpreview_size,
+            content_type=content_type
         )
         
         # Set user organization fields (user_id will be set by service from authenticated user)
@@ -616,42 +942,21 @@ def register_image(
         )
         
         # Create photo using existing PhotoCreateSchema logic
-        photo = photo_service.create_photo_from_photo_create_schema(
+        photo = await run_in_threadpool(
+            photo_service.create_photo_from_photo_create_schema,
             photo_create_request=photo_create_request,
-            user_id=getattr(current_user, 'id')
-        )
-        
-        return PhotoCreateResponse(
-            id=photo.id,
-            hothash=photo.hothash,
-            rating=photo.rating,
-            visibility=photo.visibility,
-            width=photo.width,
-            height=photo.height,
-            taken_at=photo.taken_at,
-            created_at=photo.created_at,
-            user_id=photo.user_id,
-            is_duplicate=False
+            user_id=user_id
         )
+        return _photo_create_response(photo, is_duplicate=False)
         
     except DuplicateImageError:
         # Photo already exists
-        existing_photo = photo_service.get_photo_by_hothash(
+        existing_photo = await run_in_threadpool(
+            photo_service.get_photo_by_hothash,
             hothash=photo_create_schema.hothash,
-            user_id=getattr(current_user, 'id')
-        )
-        return PhotoCreateResponse(
-            id=existing_photo.id,
-            hothash=existing_photo.hothash,
-            rating=existing_photo.rating,
-            visibility=existing_photo.visibility,
-            width=existing_photo.width,
-            height=existing_photo.height,
-            taken_at=existing_photo.taken_at,
-            created_at=existing_photo.created_at,
-            user_id=existing_photo.user_id,
-            is_duplicate=True
+            user_id=user_id
         )
+        return _photo_create_response(existing_photo, is_duplicate=True)
     except httpx.HTTPStatusError as e:
         # imalink-core returned error (400, 500, etc.)
         logger.error(f"imalink-core error: {e.response.status_code} - {e.response.text}")
@@ -666,7 +971,291 @@ def register_image(
             status_code=503,
             detail="Image processing service unavailable. Please try again later."
         )
+    except (ServiceBusyError, ProcessingTimeoutError) as e:
+        raise HTTPException(status_code=e.status_code, detail=e.message)
     except Exception as e:
         logger.error(f"Failed to register image: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Failed to register image: {str(e)}")
 
+
+@router.post(
+    "/register-image",
+    response_model=PhotoCreateResponse,
+    status_code=201,
+    responses={202: {"model": PhotoRegisterJobResponse, "description": "Queued as a job (mode=job)"}}
+)
+async def register_image(
+    file: UploadFile = File(..., description="Image file to register"),
+    input_channel_id: Optional[int] = Query(None, description="Input channel ID (uses protected 'Quick Channel' if not provided)"),
+    rating: int = Query(0, ge=0, le=5, description="Star rating 0-5"),
+    visibility: str = Query("private", pattern="^(private|space|authenticated|public)$", description="Visibility level"),
+    author_id: Optional[int] = Query(None, description="Author ID"),
+    coldpreview_size: Optional[int] = Query(None, ge=150, description="Size for coldpreview (e.g., 2560)"),
+    mode: str = Query("sync", pattern="^(sync|job)$", description="sync: wait for the photo; job: queue and return 202"),
+    current_user: User = Depends(get_current_active_user),
+    photo_service: PhotoService = Depends(get_photo_service),
+    job_service: PhotoRegisterJobService = Depends(get_photo_register_job_service)
+):
+    """
+    Register image by sending to imalink-core for processing (Convenience endpoint)
+    
+    **Use case**: Quick web upload when user doesn't have desktop app available.
+    **Not recommended for**: Batch imports (use desktop app with local imalink-core instead).
+    
+    Flow:
+    1. Frontend uploads raw image file (multipart/form-data)
+    2. Backend sends to imalink-core server (localhost:8001) for processing
+    3. imalink-core returns PhotoCreateSchema (metadata + previews)
+    4. Backend stores PhotoCreateSchema (same as POST /create endpoint)
+    
+    Note: Original image is NOT stored on server, only metadata and previews.
+    
+    Job mode (mode=job): the upload is spooled to disk and 202 is returned with a
+    job right away; local workers do steps 2-4. Poll GET /photos/jobs/{id} (or
+    GET /photos/jobs?input_channel_id=...) for the result. Queued jobs survive
+    a server restart.
+    
+    The upload is streamed to imalink-core over a pooled connection and the
+    endpoint waits on the event loop, not in a threadpool thread. At most
+    IMALINK_CORE_MAX_CONCURRENCY images are processed at once; others queue
+    (see GET /metrics/imalink-core).
+    
+    Args:
+        file: Image file (JPEG, PNG, etc.)
+        input_channel_id: Optional input channel (defaults to protected 'Quick Channel')
+        rating: Star rating 0-5
+        visibility: Visibility level (private, space, authenticated, public)
+        author_id: Optional photographer/author
+        coldpreview_size: Optional size for larger preview (e.g., 2560px)
+        
+    Returns:
+        PhotoCreateResponse: Created photo metadata
+        
+    Raises:
+        400: If image processing fails or invalid image
+        503: If imalink-core service unavailable or too many uploads queued
+        504: If imalink-core does not answer in time
+    """
+    filename = file.filename or "uploaded_image.jpg"
+    content_type = file.content_type or "image/jpeg"
+    settings = dict(
+        input_channel_id=input_channel_id,
+        rating=rating,
+        visibility=visibility,
+        author_id=author_id,
+        coldpreview_size=coldpreview_size
+    )
+    if mode == "job":
+        return await _accept_register_job(
+            job_service.create_job,
+            user_id=getattr(current_user, 'id'),
+            upload=file.file,
+            filename=filename,
+            content_type=content_type,
+            **settings
+        )
+    return await _register_image_file(
+        file.file, filename, content_type, getattr(current_user, 'id'), photo_service, **settings
+    )
+
+
+# Resumable chunked uploads (large RAW files) - finalized like register-image
+
+def _upload_session_response(upload) -> PhotoUploadSessionResponse:
+    return PhotoUploadSessionResponse(
+        id=upload.id,
+        filename=upload.filename,
+        size=upload.size,
+        received_bytes=upload.received_bytes,
+        complete=upload.received_bytes == upload.size,
+        max_chunk_size=Config.UPLOAD_CHUNK_MAX_BYTES,
+        updated_at=upload.updated_at
+    )
+
+
+@router.post("/uploads", response_model=PhotoUploadSessionResponse, status_code=201)
+def create_upload_session(
+    request: PhotoUploadSessionCreateRequest,
+    current_user: User = Depends(get_current_active_user),
+    upload_service: PhotoUploadSessionService = Depends(get_photo_upload_session_service)
+):
+    """
+    Start a resumable upload for register-image
+    
+    Protocol:
+    1. POST /photos/uploads {filename, size, sha256?} -> id, offset 0
+    2. PUT /photos/uploads/{id}?offset=N with the next bytes as request body
+       (application/octet-stream, at most max_chunk_size; optional
+       X-Chunk-SHA256 header with the chunk's hex SHA256)
+    3. After an interruption: GET /photos/uploads/{id} and continue at offset
+    4. POST /photos/uploads/{id}/finalize (same query parameters as register-image)
+    
+    Sessions idle for more than UPLOAD_SESSION_TTL_HOURS are deleted.
+    """
+    try:
+        upload = upload_service.create_session(
+            user_id=getattr(current_user, 'id'),
+            filename=request.filename,
+            size=request.size,
+            content_type=request.content_type,
+            sha256=request.sha256
+        )
+    except ValidationError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    return _upload_session_response(upload)
+
+
+@router.get("/uploads/{upload_id}", response_model=PhotoUploadSessionResponse)
+def get_upload_session(
+    upload_id: str,
+    current_user: User = Depends(get_current_active_user),
+    upload_service: PhotoUploadSessionService = Depends(get_photo_upload_session_service)
+):
+    """Get upload state - offset is where the next chunk must start"""
+    try:
+        upload = upload_service.get_session(upload_id, getattr(current_user, 'id'))
+    except NotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    return _upload_session_response(upload)
+
+
+@router.put("/uploads/{upload_id}", response_model=PhotoUploadSessionResponse)
+async def upload_chunk(
+    upload_id: str,
+    request: Request,
+    offset: int = Query(..., ge=0, description="Position of this chunk in the file (must equal the session offset)"),
+    chunk_sha256: Optional[str] = Header(None, alias="X-Chunk-SHA256", description="Hex SHA256 of the chunk"),
+    current_user: User = Depends(get_current_active_user),
+    upload_service: PhotoUploadSessionService = Depends(get_photo_upload_session_service)
+):
+    """
+    Append one chunk (request body) at offset
+    
+    The body is written to a chunk file as it arrives. The chunk only counts
+    once it is complete and matches X-Chunk-SHA256 (if sent); otherwise the
+    offset stays where it was and the chunk can simply be sent again.
+    
+    409: offset is not the current session offset (GET the session to resume)
+    """
+    try:
+        upload = await run_in_threadpool(upload_service.get_session, upload_id, getattr(current_user, 'id'))
+        chunk_file = await run_in_threadpool(upload_service.open_chunk, upload, offset)
+    except NotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except ConflictError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    
+    max_length = min(Config.UPLOAD_CHUNK_MAX_BYTES, upload.size - offset)
+    digest = hashlib.sha256()
+    length = 0
+    try:
+        async for data in request.stream():
+            length += len(data)
+            if length > max_length:
+                raise HTTPException(
+                    status_code=413,
+                    detail=f"Chunk too large: at most {max_length} bytes accepted at offset {offset}"
+                )
+            digest.update(data)
+            await run_in_threadpool(chunk_file.write, data)
+        if length == 0:
+            raise HTTPException(status_code=400, detail="Empty chunk")
+        if chunk_sha256 is not None and digest.hexdigest() != chunk_sha256.lower():
+            raise HTTPException(status_code=400, detail="Chunk checksum mismatch: resend the chunk")
+    except BaseException as e:
+        await run_in_threadpool(upload_service.discard_chunk, chunk_file)
+        if isinstance(e, ClientDisconnect):
+            raise HTTPException(status_code=400, detail="Client disconnected during chunk upload")
+        raise
+    await run_in_threadpool(chunk_file.close)
+    
+    try:
+        upload = await run_in_threadpool(upload_service.commit_chunk, upload, offset, chunk_file.name, length)
+    except NotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except ConflictError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    return _upload_session_response(upload)
+
+
+@router.delete("/uploads/{upload_id}", status_code=204)
+def abort_upload_session(
+    upload_id: str,
+    current_user: User = Depends(get_current_active_user),
+    upload_service: PhotoUploadSessionService = Depends(get_photo_upload_session_service)
+):
+    """Abort upload and delete received data"""
+    try:
+        upload = upload_service.get_session(upload_id, getattr(current_user, 'id'))
+    except NotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    upload_service.delete_session(upload)
+    return Response(status_code=204)
+
+
+@router.post(
+    "/uploads/{upload_id}/finalize",
+    response_model=PhotoCreateResponse,
+    status_code=201,
+    responses={202: {"model": PhotoRegisterJobResponse, "description": "Queued as a job (mode=job)"}}
+)
+async def finalize_upload_session(
+    upload_id: str,
+    input_channel_id: Optional[int] = Query(None, description="Input channel ID (uses protected 'Quick Channel' if not provided)"),
+    rating: int = Query(0, ge=0, le=5, description="Star rating 0-5"),
+    visibility: str = Query("private", pattern="^(private|space|authenticated|public)$", description="Visibility level"),
+    author_id: Optional[int] = Query(None, description="Author ID"),
+    coldpreview_size: Optional[int] = Query(None, ge=150, description="Size for coldpreview (e.g., 2560)"),
+    mode: str = Query("sync", pattern="^(sync|job)$", description="sync: wait for the photo; job: queue and return 202"),
+    current_user: User = Depends(get_current_active_user),
+    photo_service: PhotoService = Depends(get_photo_service),
+    job_service: PhotoRegisterJobService = Depends(get_photo_register_job_service),
+    upload_service: PhotoUploadSessionService = Depends(get_photo_upload_session_service)
+):
+    """
+    Verify a complete upload (size, sha256) and register it like POST /photos/register-image
+    
+    The spooled file is streamed to imalink-core from disk. In sync mode the
+    session is kept when imalink-core is busy or unavailable (503/504), so
+    finalize can be retried without uploading again.
+    """
+    user_id = getattr(current_user, 'id')
+    try:
+        upload = await run_in_threadpool(upload_service.get_session, upload_id, user_id)
+        spool_path = await run_in_threadpool(upload_service.verify_complete, upload)
+    except NotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except ValidationError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    settings = dict(
+        input_channel_id=input_channel_id,
+        rating=rating,
+        visibility=visibility,
+        author_id=author_id,
+        coldpreview_size=coldpreview_size
+    )
+    if mode == "job":
+        response = await _accept_register_job(
+            job_service.queue_spooled_file,
+            user_id=user_id,
+            spool_path=spool_path,
+            filename=upload.filename,
+            content_type=upload.content_type,
+            **settings
+        )
+        # The job owns the spool file now
+        await run_in_threadpool(upload_service.delete_session, upload, False)
+        return response
+    
+    try:
+        with open(spool_path, "rb") as image_file:
+            response = await _register_image_file(
+                image_file, upload.filename, upload.content_type, user_id, photo_service, **settings
+            )
+    except HTTPException as e:
+        if e.status_code not in (503, 504):
+            await run_in_threadpool(upload_service.delete_session, upload)
+        raise
+    await run_in_threadpool(upload_service.delete_session, upload)
+    return response
@@ -10,7 +10,8 @@ from src.database.connection import get_db
 from src.services.tag_service import TagService
 from src.schemas.tag_schemas import (
     TagListResponse, TagAutocompleteResponse, TagUpdate,
-    DeleteTagResponse, RenameTagResponse
+    DeleteTagResponse, RenameTagResponse,
+    BulkTagRequest, BulkTagApplyResponse, BulkTagRemoveResponse
 )
 from src.models.user import User
 from src.api.dependencies import get_current_user
@@ -67,6 +68,54 @@ def autocomplete_tags(
         raise HTTPException(status_code=500, detail=f"Failed to autocomplete tags: {str(e)}")
 
 
+@router.post("/bulk-apply", response_model=BulkTagApplyResponse)
+def bulk_apply_tags(
+    request: BulkTagRequest,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Apply tags to many photos at once
+    
+    Missing tags are created. Associations that already exist are skipped.
+    Hothashes that are not your photos are returned in `not_found`.
+    
+    **Example:**
+    ```json
+    {
+        "hothashes": ["abc123...", "def456..."],
+        "tags": ["landscape", "norway"]
+    }
+    ```
+    """
+    try:
+        tag_service = TagService(db)
+        return tag_service.bulk_apply_tags(request.hothashes, request.tags, getattr(current_user, 'id'))
+    except Exception as e:
+        logger.error(f"Failed to bulk apply tags: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Failed to bulk apply tags: {str(e)}")
+
+
+@router.post("/bulk-remove", response_model=BulkTagRemoveResponse)
+def bulk_remove_tags(
+    request: BulkTagRequest,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Remove tags from many photos at once
+    
+    Tag names you don't have are returned in `unknown_tags`, hothashes that
+    are not your photos in `not_found`. Tags themselves are not deleted.
+    """
+    try:
+        tag_service = TagService(db)
+        return tag_service.bulk_remove_tags(request.hothashes, request.tags, getattr(current_user, 'id'))
+    except Exception as e:
+        logger.error(f"Failed to bulk remove tags: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Failed to bulk remove tags: {str(e)}")
+
+
 @router.put("/{tag_id}", response_model=RenameTagResponse)
 def rename_tag(
     tag_id: int,
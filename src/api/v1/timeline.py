@@ -5,12 +5,14 @@ Provides year/month/day/hour aggregation with visibility-aware filtering
 and representative preview selection.
 """
 from typing import Optional, Literal
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Query, Request, Response
 import logging
 
 from src.services.timeline_service import TimelineService
 from src.repositories.timeline_repository import TimelineRepository
-from src.schemas.timeline_schemas import TimelineResponse
+from src.repositories.timeline_bucket_repository import TimelineBucketRepository
+from src.schemas.timeline_schemas import TimelineResponse, TimelineHistogramResponse, TimelineSearchRequest
+from src.utils.histogram import pack_varints
 from src.database.connection import get_db
 from src.api.dependencies import get_optional_current_user
 from src.models.user import User
@@ -24,7 +26,7 @@ logger = logging.getLogger(__name__)
 def get_timeline_service(db: Session = Depends(get_db)) -> TimelineService:
     """Dependency to get timeline service."""
     timeline_repo = TimelineRepository(db)
-    return TimelineService(timeline_repo)
+    return TimelineService(timeline_repo, TimelineBucketRepository(db))
 
 
 @router.get("/", response_model=TimelineResponse)
@@ -51,6 +53,12 @@ def get_timeline(
         le=31,
         description="Filter to specific day (required for hour, requires year and month)"
     ),
+    previews: int = Query(
+        1,
+        ge=1,
+        le=9,
+        description="Representative photos per bucket (for mosaic cards)"
+    ),
     current_user: Optional[User] = Depends(get_optional_current_user),
     timeline_service: TimelineService = Depends(get_timeline_service)
 ) -> TimelineResponse:
@@ -71,6 +79,9 @@ def get_timeline(
     2. Temporally centered photo (middle of period)
     3. First photo in period
     
+    With `previews=N` each bucket also lists its top N photos by the same
+    rule in `previews` (selected in the same query).
+    
     **Visibility Filtering:**
     - Anonymous users: Only `public` photos
     - Authenticated users: Own photos + `authenticated` + `public` photos
@@ -89,7 +100,7 @@ def get_timeline(
     
     logger.info(
         f"Timeline request: granularity={granularity}, year={year}, month={month}, "
-        f"day={day}, user_id={user_id}"
+        f"day={day}, previews={previews}, user_id={user_id}"
     )
     
     timeline = timeline_service.get_timeline(
@@ -97,7 +108,8 @@ def get_timeline(
         year=year,
         month=month,
         day=day,
-        user_id=user_id
+        user_id=user_id,
+        previews=previews
     )
     
     logger.info(
@@ -106,3 +118,74 @@ def get_timeline(
     )
     
     return timeline
+
+
+@router.post("/search", response_model=TimelineResponse)
+def search_timeline(
+    request: TimelineSearchRequest,
+    current_user: Optional[User] = Depends(get_optional_current_user),
+    timeline_service: TimelineService = Depends(get_timeline_service)
+) -> TimelineResponse:
+    """
+    Get the timeline of photos matching a photo search.
+    
+    Takes the same criteria as `POST /photos/search` (author, tags, rating,
+    category, dates, GPS, RAW) in `search`, plus the `GET /timeline`
+    parameters. Buckets, counts, previews and `meta.total_photos` cover only
+    matching photos; visibility filtering is the same as for `GET /timeline`.
+    
+    **Example:** 5-star photos tagged 'hiking' by one author, per month of 2024:
+    `{"granularity": "month", "year": 2024, "search": {"rating_min": 5, "tag_ids": [7], "author_id": 3}}`
+    """
+    user_id = current_user.id if current_user else None
+    
+    return timeline_service.get_timeline(
+        granularity=request.granularity,
+        year=request.year,
+        month=request.month,
+        day=request.day,
+        user_id=user_id,
+        previews=request.previews,
+        search_params=request.search
+    )
+
+
+@router.get("/histogram", response_model=TimelineHistogramResponse)
+def get_timeline_histogram(
+    request: Request,
+    granularity: Literal["year", "month", "day", "hour"] = Query(
+        "day",
+        description="Bin size (year/month/day/hour)"
+    ),
+    current_user: Optional[User] = Depends(get_optional_current_user),
+    timeline_service: TimelineService = Depends(get_timeline_service)
+):
+    """
+    Get photo counts for every bin of the library at once (scrubber bars).
+    
+    Bins run consecutively from `start` (first bin with photos) to the last
+    bin with photos. Counts are run-length encoded as a flat list
+    `[count, run_length, count, run_length, ...]`; empty stretches are single
+    `0, length` pairs, so a 20-year day histogram stays small.
+    
+    **Binary form:** with `Accept: application/octet-stream` the run list is
+    returned as unsigned LEB128 varints, with `X-Histogram-Granularity`,
+    `X-Histogram-Start`, `X-Histogram-Bins` and `X-Total-Photos` headers.
+    
+    Visibility filtering is the same as for `GET /timeline`.
+    """
+    user_id = current_user.id if current_user else None
+    histogram = timeline_service.get_histogram(granularity=granularity, user_id=user_id)
+    
+    if "application/octet-stream" in request.headers.get("accept", ""):
+        return Response(
+            content=pack_varints(histogram.runs),
+            media_type="application/octet-stream",
+            headers={
+                "X-Histogram-Granularity": histogram.granularity,
+                "X-Histogram-Start": histogram.start.isoformat() if histogram.start else "",
+                "X-Histogram-Bins": str(histogram.bins),
+                "X-Total-Photos": str(histogram.total_photos)
+            }
+        )
+    return histogram
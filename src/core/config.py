@@ -29,6 +29,18 @@ class Config:
     
     COLDPREVIEW_MAX_SIZE: int = 1200  # Max width/height in pixels
     COLDPREVIEW_QUALITY: int = 85  # JPEG quality (1-100)
+
+    # Coldpreview storage backend: "files" (one file per photo, default) or
+    # "segments" (packed append-only segment files with compact index)
+    COLDPREVIEW_STORAGE_BACKEND: str = os.getenv("COLDPREVIEW_STORAGE_BACKEND", "files")
+    COLDPREVIEW_SEGMENT_MAX_BYTES: int = int(os.getenv("COLDPREVIEW_SEGMENT_MAX_BYTES", str(256 * 1024 * 1024)))
+    COLDPREVIEW_COMPACTION_INTERVAL: int = int(os.getenv("COLDPREVIEW_COMPACTION_INTERVAL", "3600"))  # Seconds, 0 = off
+    COLDPREVIEW_COMPACTION_THRESHOLD: float = float(os.getenv("COLDPREVIEW_COMPACTION_THRESHOLD", "0.5"))  # Dead ratio
+    
+    # Image worker processes for Pillow work in the request path (0 = run inline in API thread)
+    IMAGE_WORKER_PROCESSES: int = int(os.getenv("IMAGE_WORKER_PROCESSES", str(min(4, os.cpu_count() or 1))))
+    IMAGE_WORKER_MAX_QUEUE: int = int(os.getenv("IMAGE_WORKER_MAX_QUEUE", "32"))  # Waiting tasks before 503
+    IMAGE_WORKER_TIMEOUT: float = float(os.getenv("IMAGE_WORKER_TIMEOUT", "30"))  # Seconds before 504
     
     # Note: IMAGE_POOL and frontend-related paths removed - handled by frontend
     # Image processing quality settings handled by services as needed
@@ -48,9 +60,38 @@ class Config:
     GOOGLE_MAPS_API_KEY: Optional[str] = os.getenv("GOOGLE_MAPS_API_KEY")
     OPENAI_API_KEY: Optional[str] = os.getenv("OPENAI_API_KEY")
     
+    # /database-stats snapshot refresh interval in seconds (0 = collect on first request only)
+    DATABASE_STATS_REFRESH_INTERVAL: int = int(os.getenv("DATABASE_STATS_REFRESH_INTERVAL", "300"))
+    # Recount coldpreview storage totals every N refreshes to correct counter drift (0 = never)
+    DATABASE_STATS_STORAGE_RECOUNT_EVERY: int = int(os.getenv("DATABASE_STATS_STORAGE_RECOUNT_EVERY", "12"))
+    
+    # POST /photos/exists membership filters (per-user Bloom filters over photos.hothash)
+    HOTHASH_FILTER_ERROR_RATE: float = float(os.getenv("HOTHASH_FILTER_ERROR_RATE", "0.01"))  # False positive rate
+    HOTHASH_FILTER_MAX_USERS: int = int(os.getenv("HOTHASH_FILTER_MAX_USERS", "100"))  # Filters kept in memory (LRU)
+    # Catch-up re-scans photos created this long ago; must exceed the longest photo-creating transaction
+    HOTHASH_FILTER_SYNC_OVERLAP_SECONDS: float = float(os.getenv("HOTHASH_FILTER_SYNC_OVERLAP_SECONDS", "300"))
+    
     # imalink-core service URL (image processing service)
     # Runs on same machine as backend for convenience uploads from web
     IMALINK_CORE_URL: str = os.getenv("IMALINK_CORE_URL", "http://localhost:8001")
+    IMALINK_CORE_MAX_CONCURRENCY: int = int(os.getenv("IMALINK_CORE_MAX_CONCURRENCY", "4"))  # Requests processed at once
+    IMALINK_CORE_MAX_CONNECTIONS: int = int(os.getenv("IMALINK_CORE_MAX_CONNECTIONS", "10"))  # Pooled keep-alive connections
+    IMALINK_CORE_QUEUE_TIMEOUT: float = float(os.getenv("IMALINK_CORE_QUEUE_TIMEOUT", "30"))  # Seconds waiting for a slot before 503
+    IMALINK_CORE_TIMEOUT: float = float(os.getenv("IMALINK_CORE_TIMEOUT", "30"))  # Seconds per processing request
+    
+    # register-image job mode: queued uploads processed by local workers
+    REGISTER_JOB_WORKERS: int = int(os.getenv("REGISTER_JOB_WORKERS", "4"))  # Concurrent jobs per process (0 = disabled)
+    REGISTER_JOB_MAX_ATTEMPTS: int = int(os.getenv("REGISTER_JOB_MAX_ATTEMPTS", "3"))  # Tries when imalink-core is busy/unreachable
+    REGISTER_JOB_SPOOL_DIRECTORY: str = os.getenv("REGISTER_JOB_SPOOL_DIRECTORY", os.path.join(DATA_DIRECTORY, "register_jobs"))
+    
+    # Resumable chunked uploads for register-image (spooled next to job uploads)
+    UPLOAD_MAX_FILE_BYTES: int = int(os.getenv("UPLOAD_MAX_FILE_BYTES", str(200 * 1024 * 1024)))
+    UPLOAD_CHUNK_MAX_BYTES: int = int(os.getenv("UPLOAD_CHUNK_MAX_BYTES", str(16 * 1024 * 1024)))
+    UPLOAD_SESSION_TTL_HOURS: int = int(os.getenv("UPLOAD_SESSION_TTL_HOURS", "24"))  # Idle sessions are deleted
+    
+    # Deleted photos: rows, tags, image files and coldpreviews are purged in the background
+    PHOTO_PURGE_BATCH_SIZE: int = int(os.getenv("PHOTO_PURGE_BATCH_SIZE", "500"))  # Photos per purge transaction
+    PHOTO_PURGE_INTERVAL: int = int(os.getenv("PHOTO_PURGE_INTERVAL", "60"))  # Seconds between idle checks (0 = disabled)
     
     # Development
     DEBUG: bool = os.getenv("DEBUG", "False").lower() in ("true", "1", "yes")
@@ -74,7 +115,8 @@ class Config:
         directories = [
             self.DATA_DIRECTORY,
             self.STORAGE_ROOT,
-            self.COLDPREVIEW_ROOT
+            self.COLDPREVIEW_ROOT,
+            self.REGISTER_JOB_SPOOL_DIRECTORY
         ]
         
         for directory in directories:
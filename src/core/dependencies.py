@@ -49,6 +49,27 @@ def get_photo_service(db: Session = Depends(get_db)) -> PhotoService:
     return PhotoService(db)
 
 
+# Photo Import Service Dependencies
+def get_photo_import_service(db: Session = Depends(get_db)) -> "PhotoImportService":
+    """Get PhotoImportService instance with database dependency"""
+    from src.services.photo_import_service import PhotoImportService
+    return PhotoImportService(db)
+
+
+# Photo Register Job Service Dependencies
+def get_photo_register_job_service(db: Session = Depends(get_db)) -> "PhotoRegisterJobService":
+    """Get PhotoRegisterJobService instance with database dependency"""
+    from src.services.photo_register_job_service import PhotoRegisterJobService
+    return PhotoRegisterJobService(db)
+
+
+# Photo Upload Session Service Dependencies
+def get_photo_upload_session_service(db: Session = Depends(get_db)) -> "PhotoUploadSessionService":
+    """Get PhotoUploadSessionService instance with database dependency"""
+    from src.services.photo_upload_session_service import PhotoUploadSessionService
+    return PhotoUploadSessionService(db)
+
+
 # PhotoStack Service Dependencies
 def get_photo_stack_service(db: Session = Depends(get_db)) -> PhotoStackService:
     """Get PhotoStackService instance with database dependency"""
@@ -113,4 +113,25 @@ class ExternalServiceError(APIException):
             message=f"{service}: {message}",
             code="EXTERNAL_SERVICE_ERROR",
             status_code=503
-        )
\ No newline at end of file
+        )
+
+class ServiceBusyError(APIException):
+    """Raised when a bounded worker queue is full and the request is rejected"""
+    
+    def __init__(self, service: str, message: str = "Too many requests in progress, try again shortly"):
+        super().__init__(
+            message=f"{service}: {message}",
+            code="SERVICE_BUSY",
+            status_code=503
+        )
+
+
+class ProcessingTimeoutError(APIException):
+    """Raised when offloaded work does not finish within its timeout"""
+    
+    def __init__(self, service: str, timeout: float):
+        super().__init__(
+            message=f"{service}: processing did not finish within {timeout:g} seconds",
+            code="PROCESSING_TIMEOUT",
+            status_code=504
+        )
@@ -1,6 +1,7 @@
 """
 Main FastAPI application for ImaLink Fase 1 - Pure API Backend
 """
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request
 from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
@@ -21,6 +22,7 @@ from src.api.v1.debug import router as debug_router
 from src.api.v1.photos import router as photos_router
 from src.api.v1.tags import router as tags_router
 from src.api.v1.database_stats import router as database_stats_router
+from src.api.v1.metrics import router as metrics_router
 from src.api.v1.photo_searches import router as photo_searches_router
 from src.api.v1.photo_collections import router as photo_collections_router
 from src.api.v1.timeline import router as timeline_router
@@ -30,6 +32,11 @@ from src.api.phototext_documents import router as phototext_router
 from src.api.auth import router as auth_router
 from src.api.users import router as users_router
 from src.core.exceptions import APIException
+from src.services.database_stats_service import database_stats_collector
+from src.services.photo_register_job_service import register_job_workers
+from src.services.photo_purge_service import photo_purger
+from src.utils.image_worker_pool import shutdown_image_worker_pool
+from src.utils.imalink_core_client import close_imalink_core_client
 
 # Ensure directories exist
 config.ensure_directories()
@@ -40,11 +47,30 @@ init_database()
 # Initialize rate limiter
 limiter = Limiter(key_func=get_remote_address)
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Start and stop background workers"""
+    # Database/storage statistics snapshot for GET /database-stats
+    database_stats_collector.start(config.DATABASE_STATS_REFRESH_INTERVAL)
+    # Queued register-image jobs (resumes jobs left pending by a restart)
+    await register_job_workers.start()
+    # Soft-deleted photos: rows, files and references removed in batches
+    photo_purger.start(config.PHOTO_PURGE_INTERVAL)
+    yield
+    photo_purger.stop()
+    await register_job_workers.stop()
+    database_stats_collector.stop()
+    shutdown_image_worker_pool()
+    await close_imalink_core_client()
+
+
 # Create FastAPI app
 app = FastAPI(
     title="ImaLink API",
     description="Pure API backend for image gallery and management system",
-    version="0.1.0"
+    version="0.1.0",
+    lifespan=lifespan
 )
 
 # Add rate limiter to app state
@@ -76,6 +102,7 @@ app.include_router(events_router, prefix="/api/v1")  # Event endpoints (hierarch
 app.include_router(photo_stacks_router, prefix="/api/v1")  # PhotoStack endpoints
 app.include_router(phototext_router, prefix="/api/v1")  # PhotoText document endpoints
 app.include_router(database_stats_router, prefix="/api/v1")  # Database statistics (no auth required)
+app.include_router(metrics_router, prefix="/api/v1")  # Worker pool metrics (no auth required)
 
 # Debug endpoint to list all routes
 @app.get("/debug/routes")
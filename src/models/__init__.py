@@ -14,6 +14,11 @@ from .photo_collection import PhotoCollection
 from .tag import Tag, PhotoTag
 from .phototext_document import PhotoTextDocument
 from .event import Event
+from .event_closure import EventClosure
+from .photo_import_progress import PhotoImportProgress
+from .photo_register_job import PhotoRegisterJob
+from .photo_upload_session import PhotoUploadSession
+from .timeline_bucket import TimelineBucket
 
 __all__ = [
     "Base",
@@ -29,5 +34,10 @@ __all__ = [
     "Tag",
     "PhotoTag",
     "PhotoTextDocument",
-    "Event"
+    "Event",
+    "EventClosure",
+    "PhotoImportProgress",
+    "PhotoRegisterJob",
+    "PhotoUploadSession",
+    "TimelineBucket"
 ]
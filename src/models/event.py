@@ -7,10 +7,11 @@ Each photo belongs to at most ONE event.
 """
 from datetime import datetime
 from typing import List, Optional
-from sqlalchemy import Column, Integer, String, Text, DateTime, Numeric, ForeignKey, CheckConstraint
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, Text, DateTime, Numeric, ForeignKey, CheckConstraint, func, select
+from sqlalchemy.orm import object_session, relationship
 
 from .base import Base
+from .event_closure import EventClosure
 from .mixins import TimestampMixin
 
 
@@ -65,31 +66,49 @@ class Event(Base, TimestampMixin):
     def __repr__(self):
         return f"<Event(id={self.id}, name='{self.name}', user_id={self.user_id}, parent_id={self.parent_event_id})>"
     
-    @property
-    def depth(self) -> int:
-        """Calculate depth in tree (0 = root)"""
-        depth = 0
+    def _ancestors(self) -> List['Event']:
+        """Ancestors nearest first, walking parent (for events outside a session)"""
+        ancestors = []
         current = self.parent
         while current:
-            depth += 1
+            ancestors.append(current)
             current = current.parent
-        return depth
+        return ancestors
+    
+    @property
+    def depth(self) -> int:
+        """Depth in tree (0 = root), one event_closure lookup"""
+        session = object_session(self)
+        if session is None or self.id is None:
+            return len(self._ancestors())
+        depth = session.execute(
+            select(func.max(EventClosure.depth)).where(EventClosure.descendant_id == self.id)
+        ).scalar()
+        return depth or 0
     
     @property
     def path(self) -> List[str]:
-        """Get full path from root to this event"""
-        path = [self.name]
-        current = self.parent
-        while current:
-            path.insert(0, current.name)
-            current = current.parent
-        return path
+        """Names from root to this event (breadcrumbs), one event_closure lookup"""
+        session = object_session(self)
+        if session is None or self.id is None:
+            return [ancestor.name for ancestor in reversed(self._ancestors())] + [self.name]
+        names = session.execute(
+            select(Event.name)
+            .join(EventClosure, EventClosure.ancestor_id == Event.id)
+            .where(EventClosure.descendant_id == self.id)
+            .order_by(EventClosure.depth.desc())
+        ).scalars().all()
+        return list(names) or [self.name]
     
     def is_ancestor_of(self, other: 'Event') -> bool:
         """Check if this event is an ancestor of another"""
-        current = other.parent
-        while current:
-            if current.id == self.id:
-                return True
-            current = current.parent
-        return False
+        session = object_session(self)
+        if session is None or self.id is None or other.id is None:
+            return any(ancestor.id == self.id for ancestor in other._ancestors())
+        return session.execute(
+            select(EventClosure.depth).where(
+                EventClosure.ancestor_id == self.id,
+                EventClosure.descendant_id == other.id,
+                EventClosure.depth > 0
+            )
+        ).first() is not None
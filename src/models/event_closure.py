@@ -0,0 +1,31 @@
+"""
+EventClosure model - Ancestor/descendant pairs of the event hierarchy
+"""
+from sqlalchemy import Column, Integer, ForeignKey, Index
+
+from .base import Base
+
+
+class EventClosure(Base):
+    """
+    One row per (ancestor, descendant) pair in the event tree
+
+    Every event has a row for itself (depth 0) and one per ancestor, depth
+    being the number of levels between them. Subtrees, ancestor chains and
+    "is X below Y" checks are single indexed lookups instead of recursive
+    queries. Rows are kept in step with event inserts, parent changes and
+    deletes in the same flush (see src.repositories.event_repository).
+    """
+    __tablename__ = "event_closure"
+
+    ancestor_id = Column(Integer, ForeignKey("events.id", ondelete="CASCADE"), primary_key=True)
+    descendant_id = Column(Integer, ForeignKey("events.id", ondelete="CASCADE"), primary_key=True)
+    depth = Column(Integer, nullable=False)
+
+    __table_args__ = (
+        # Ancestor chains (breadcrumbs, depth) of an event
+        Index("ix_event_closure_descendant_depth", "descendant_id", "depth"),
+    )
+
+    def __repr__(self):
+        return f"<EventClosure(ancestor_id={self.ancestor_id}, descendant_id={self.descendant_id}, depth={self.depth})>"
@@ -4,8 +4,8 @@ Photo model - Primary display model for photo galleries and browsing
 from datetime import datetime
 from typing import TYPE_CHECKING, List, Optional
 
-from sqlalchemy import Column, Integer, String, DateTime, LargeBinary, Float, Text, ForeignKey, JSON, CheckConstraint
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, DateTime, LargeBinary, Float, Text, ForeignKey, JSON, CheckConstraint, Index, event
+from sqlalchemy.orm import relationship, Session, with_loader_criteria
 
 from .base import Base
 from .mixins import TimestampMixin
@@ -110,6 +110,9 @@ class Photo(Base, TimestampMixin):
     # Values: 'private' (only owner), 'space' (space members - Phase 2), 
     #         'authenticated' (all logged-in users), 'public' (everyone including anonymous)
     
+    # Soft delete: set by (bulk) delete, row and files removed later by the photo purger
+    deleted_at = Column(DateTime, nullable=True, index=True)
+    
     # Relationships
     user = relationship("User", back_populates="photos")
     image_files = relationship("ImageFile", back_populates="photo", cascade="all, delete-orphan", 
@@ -126,6 +129,11 @@ class Photo(Base, TimestampMixin):
             "visibility IN ('private', 'space', 'authenticated', 'public')",
             name='valid_photo_visibility'
         ),
+        # Timeline: taken_at range scans of own photos / shared photos
+        Index('ix_photos_user_id_taken_at', 'user_id', 'taken_at'),
+        Index('ix_photos_visibility_taken_at', 'visibility', 'taken_at'),
+        # Event galleries: keyset pages by taken_at within an event
+        Index('ix_photos_event_id_taken_at', 'event_id', 'taken_at', 'id'),
     )
     
     def __repr__(self):
@@ -181,4 +189,23 @@ class Photo(Base, TimestampMixin):
     def last_imported(self) -> Optional[datetime]:
         """Get latest import time across all files"""
         times = [f.imported_time for f in self.image_files if f.imported_time]
-        return max(times) if times else None
\ No newline at end of file
+        return max(times) if times else None
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _exclude_deleted_photos(execute_state):
+    """
+    Hide soft-deleted photos from every ORM SELECT (including relationship
+    loads of objects loaded by that SELECT)
+    
+    Opt out per statement with .execution_options(include_deleted=True).
+    """
+    if (
+        execute_state.is_select
+        and not execute_state.is_column_load
+        and not execute_state.is_relationship_load
+        and not execute_state.execution_options.get("include_deleted", False)
+    ):
+        execute_state.statement = execute_state.statement.options(
+            with_loader_criteria(Photo, lambda cls: cls.deleted_at.is_(None), include_aliases=True)
+        )
@@ -0,0 +1,38 @@
+"""
+PhotoImportProgress model - Checkpoint for resumable streaming photo imports
+"""
+from sqlalchemy import Column, Integer, String, ForeignKey, UniqueConstraint
+
+from .base import Base
+from .mixins import TimestampMixin
+
+
+class PhotoImportProgress(Base, TimestampMixin):
+    """
+    Progress of a streaming NDJSON import (POST /photos/import)
+    
+    The client names an import with import_id (e.g. a hash of the source file).
+    committed_line is the last input line whose result is committed; it is
+    updated in the same transaction as the photos of each batch, so after an
+    interruption the client can continue from committed_line + 1.
+    """
+    __tablename__ = "photo_import_progress"
+    
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    import_id = Column(String(100), nullable=False)
+    
+    # Last committed input line (1-based, 0 = nothing committed yet)
+    committed_line = Column(Integer, nullable=False, default=0)
+    
+    # Running totals over all requests for this import
+    created_count = Column(Integer, nullable=False, default=0)
+    duplicate_count = Column(Integer, nullable=False, default=0)
+    error_count = Column(Integer, nullable=False, default=0)
+    
+    __table_args__ = (
+        UniqueConstraint("user_id", "import_id", name="uq_photo_import_progress_user_import"),
+    )
+    
+    def __repr__(self):
+        return f"<PhotoImportProgress(user_id={self.user_id}, import_id='{self.import_id}', committed_line={self.committed_line})>"
@@ -0,0 +1,55 @@
+"""
+PhotoRegisterJob model - Queued register-image work (POST /photos/register-image?mode=job)
+"""
+from sqlalchemy import Column, Integer, String, Boolean, Text, DateTime, ForeignKey, Index
+
+from .base import Base
+from .mixins import TimestampMixin
+
+
+class PhotoRegisterJob(Base, TimestampMixin):
+    """
+    One uploaded image waiting for (or done with) imalink-core processing
+    
+    The upload is spooled to spool_path before the job row is committed; local
+    workers claim pending jobs, send the file to imalink-core and create the
+    photo. Because the state lives here, pending jobs survive a restart.
+    
+    Status flow: pending -> processing -> done | failed
+    (processing jobs whose worker died are returned to pending)
+    """
+    __tablename__ = "photo_register_jobs"
+    
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    input_channel_id = Column(Integer, ForeignKey("input_channels.id", ondelete="CASCADE"), nullable=False, index=True)
+    
+    status = Column(String(20), nullable=False, default="pending")
+    attempts = Column(Integer, nullable=False, default=0)
+    error = Column(Text, nullable=True)
+    
+    # Upload
+    filename = Column(String(255), nullable=False)
+    content_type = Column(String(100), nullable=False)
+    spool_path = Column(String(500), nullable=False)
+    
+    # Photo settings (same as the synchronous endpoint's query parameters)
+    rating = Column(Integer, nullable=False, default=0)
+    visibility = Column(String(20), nullable=False, default="private")
+    author_id = Column(Integer, ForeignKey("authors.id", ondelete="SET NULL"), nullable=True)
+    coldpreview_size = Column(Integer, nullable=True)
+    
+    # Result
+    photo_id = Column(Integer, ForeignKey("photos.id", ondelete="SET NULL"), nullable=True)
+    hothash = Column(String(64), nullable=True)
+    is_duplicate = Column(Boolean, nullable=False, default=False)
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+    
+    __table_args__ = (
+        # Workers pick the oldest pending job
+        Index("ix_photo_register_jobs_status_id", "status", "id"),
+    )
+    
+    def __repr__(self):
+        return f"<PhotoRegisterJob(id={self.id}, user_id={self.user_id}, status='{self.status}')>"
@@ -0,0 +1,33 @@
+"""
+PhotoUploadSession model - Resumable chunked upload of one image file
+"""
+from sqlalchemy import Column, Integer, BigInteger, String, ForeignKey
+
+from .base import Base
+from .mixins import TimestampMixin
+
+
+class PhotoUploadSession(Base, TimestampMixin):
+    """
+    Upload in progress (POST /photos/uploads, PUT /photos/uploads/{id}?offset=...)
+    
+    Chunks are appended to spool_path; received_bytes is the committed length
+    and the only offset a client may continue from. Bytes past it (an
+    interrupted or rejected chunk) are truncated by the next chunk.
+    Sessions idle for UPLOAD_SESSION_TTL_HOURS are deleted with their spool file.
+    """
+    __tablename__ = "photo_upload_sessions"
+    
+    id = Column(String(32), primary_key=True)  # uuid4 hex
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    
+    filename = Column(String(255), nullable=False)
+    content_type = Column(String(100), nullable=False)
+    size = Column(BigInteger, nullable=False)  # Announced total size
+    sha256 = Column(String(64), nullable=True)  # Announced checksum (verified on finalize)
+    
+    received_bytes = Column(BigInteger, nullable=False, default=0)
+    spool_path = Column(String(500), nullable=False)
+    
+    def __repr__(self):
+        return f"<PhotoUploadSession(id='{self.id}', user_id={self.user_id}, received={self.received_bytes}/{self.size})>"
@@ -0,0 +1,50 @@
+"""
+TimelineBucket model - Per-hour photo rollup behind GET /timeline
+"""
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Index
+
+from .base import Base
+
+
+class TimelineBucket(Base):
+    """
+    Photo count, time range and best preview candidate for one hour
+
+    One row per (owner, visibility, year, month, day, hour) that has photos
+    (soft-deleted photos and photos without taken_at are not counted). Rows
+    are recomputed in the same transaction as every photo insert, delete,
+    rating/visibility change and taken_at edit (see
+    src.repositories.timeline_bucket_repository), so timeline reads only
+    aggregate buckets instead of scanning photos.
+
+    Rebuild from scratch with scripts/maintenance/rebuild_timeline_buckets.py.
+    """
+    __tablename__ = "timeline_buckets"
+
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    visibility = Column(String(20), primary_key=True)
+    year = Column(Integer, primary_key=True)
+    month = Column(Integer, primary_key=True)
+    day = Column(Integer, primary_key=True)
+    hour = Column(Integer, primary_key=True)
+
+    count = Column(Integer, nullable=False)
+    first_taken_at = Column(DateTime, nullable=False)
+    last_taken_at = Column(DateTime, nullable=False)
+
+    # Best photo of the hour by the timeline preview order; coarser buckets
+    # pick the best of their hours' candidates
+    preview_hothash = Column(String(64), nullable=False)
+    preview_rating = Column(Integer, nullable=True)
+    preview_taken_at = Column(DateTime, nullable=False)
+
+    __table_args__ = (
+        # Other users' authenticated/public buckets
+        Index("ix_timeline_buckets_visibility_year", "visibility", "year"),
+    )
+
+    def __repr__(self):
+        return (
+            f"<TimelineBucket(user_id={self.user_id}, visibility='{self.visibility}', "
+            f"{self.year}-{self.month:02d}-{self.day:02d} {self.hour:02d}h, count={self.count})>"
+        )
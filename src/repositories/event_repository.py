@@ -1,12 +1,152 @@
 """
 Repository for Event database operations
 """
-from typing import List, Optional
-from sqlalchemy import text
-from sqlalchemy.orm import Session, joinedload
+import operator
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import and_, delete, func, insert, inspect, literal, or_, select
+from sqlalchemy.event import listens_for
+from sqlalchemy.engine import Connection, Row
+from sqlalchemy.orm import Session, aliased, joinedload
 
 from src.models.event import Event
+from src.models.event_closure import EventClosure
 from src.models.photo import Photo
+from src.utils.db_utils import chunked
+
+# Closure rows per multi-row INSERT
+EVENT_CHUNK_SIZE = 500
+
+# Columns of event photo listings (EventPhotoSummary)
+EVENT_PHOTO_COLUMNS = (
+    Photo.id, Photo.hothash, Photo.taken_at, Photo.rating, Photo.width, Photo.height,
+    Photo.gps_latitude, Photo.gps_longitude, Photo.visibility, Photo.event_id
+)
+
+
+def add_event_closure(connection: Connection, event_id: int, parent_id: Optional[int]) -> None:
+    """Closure rows for a new (leaf) event: itself, then its parent's ancestors"""
+    connection.execute(insert(EventClosure).values(ancestor_id=event_id, descendant_id=event_id, depth=0))
+    attach_event_subtree(connection, event_id, parent_id)
+
+
+def attach_event_subtree(connection: Connection, event_id: int, parent_id: Optional[int]) -> None:
+    """Link every ancestor of parent_id (and parent_id) to every event in event_id's subtree"""
+    if parent_id is None:
+        return
+    above = aliased(EventClosure)
+    below = aliased(EventClosure)
+    connection.execute(
+        insert(EventClosure).from_select(
+            ["ancestor_id", "descendant_id", "depth"],
+            select(above.ancestor_id, below.descendant_id, above.depth + below.depth + 1)
+            .select_from(above)
+            .join(below, below.ancestor_id == event_id)
+            .where(above.descendant_id == parent_id)
+        )
+    )
+
+
+def detach_event_subtree(connection: Connection, event_id: int) -> None:
+    """Unlink event_id's subtree from the event's ancestors (the subtree stays intact)"""
+    subtree = aliased(EventClosure)
+    ancestors = aliased(EventClosure)
+    connection.execute(
+        delete(EventClosure).where(
+            EventClosure.descendant_id.in_(
+                select(subtree.descendant_id).where(subtree.ancestor_id == event_id)
+            ),
+            EventClosure.ancestor_id.in_(
+                select(ancestors.ancestor_id).where(ancestors.descendant_id == event_id, ancestors.depth > 0)
+            )
+        )
+    )
+
+
+def remove_event_closure(connection: Connection, event_id: int) -> None:
+    """Drop a deleted event's rows; its children become roots of their subtrees"""
+    detach_event_subtree(connection, event_id)
+    connection.execute(delete(EventClosure).where(EventClosure.ancestor_id == event_id))
+
+
+def rebuild_event_closure(connection: Connection, user_id: Optional[int] = None) -> int:
+    """
+    Recompute event_closure (of one user's events) from parent_event_id
+    
+    One INSERT ... SELECT per tree level: self rows first, then each event
+    inherits its parent's rows one level further.
+    
+    Returns:
+        Number of rows written
+    """
+    owned = select(Event.id)
+    if user_id is not None:
+        owned = owned.where(Event.user_id == user_id)
+    connection.execute(delete(EventClosure).where(EventClosure.descendant_id.in_(owned)))
+    
+    events = select(Event.id, Event.parent_event_id)
+    if user_id is not None:
+        events = events.where(Event.user_id == user_id)
+    events = events.subquery()
+    
+    written = connection.execute(
+        insert(EventClosure).from_select(
+            ["ancestor_id", "descendant_id", "depth"],
+            select(events.c.id.label("ancestor_id"), events.c.id.label("descendant_id"), literal(0))
+        )
+    ).rowcount
+    depth = 0
+    while True:
+        level = connection.execute(
+            insert(EventClosure).from_select(
+                ["ancestor_id", "descendant_id", "depth"],
+                select(EventClosure.ancestor_id, events.c.id, literal(depth + 1))
+                .join(events, events.c.parent_event_id == EventClosure.descendant_id)
+                .where(EventClosure.depth == depth)
+            )
+        ).rowcount
+        if not level:
+            return written
+        written += level
+        depth += 1
+
+
+
+def _parents_first(events: List[Event]) -> List[Event]:
+    """Order new events so that parents created in the same flush come first"""
+    by_id = {event.id: event for event in events}
+    
+    def level(event: Event) -> int:
+        depth, seen = 0, {event.id}
+        while event.parent_event_id in by_id and event.parent_event_id not in seen:
+            event = by_id[event.parent_event_id]
+            seen.add(event.id)
+            depth += 1
+        return depth
+    
+    return sorted(events, key=level)
+
+
+@listens_for(Session, "before_flush")
+def _remove_deleted_event_closure(session, flush_context, instances):
+    """Unlink deleted events while their closure rows still describe the tree"""
+    for obj in session.deleted:
+        if isinstance(obj, Event) and obj.id is not None:
+            remove_event_closure(session.connection(), obj.id)
+
+
+@listens_for(Session, "after_flush")
+def _update_event_closure(session, flush_context):
+    """Closure rows for flushed event inserts and parent changes"""
+    connection = None
+    for event in _parents_first([obj for obj in session.new if isinstance(obj, Event)]):
+        connection = connection or session.connection()
+        add_event_closure(connection, event.id, event.parent_event_id)
+    for obj in session.dirty:
+        if isinstance(obj, Event) and inspect(obj).attrs.parent_event_id.history.has_changes():
+            connection = connection or session.connection()
+            detach_event_subtree(connection, obj.id)
+            attach_event_subtree(connection, obj.id, obj.parent_event_id)
 
 
 class EventRepository:
@@ -62,7 +202,7 @@ class EventRepository:
     
     def get_event_tree(self, user_id: int, root_event_id: Optional[int] = None) -> List[Event]:
         """
-        Get hierarchical event tree using recursive SQL
+        Get hierarchical event tree from event_closure
         
         Args:
             user_id: User ID
@@ -71,86 +211,32 @@ class EventRepository:
         Returns:
             List of Event objects with children populated
         """
-        # Build recursive CTE query
+        columns = [
+            Event.id, Event.user_id, Event.parent_event_id, Event.name, Event.description,
+            Event.start_date, Event.end_date, Event.location_name,
+            Event.gps_latitude, Event.gps_longitude, Event.sort_order,
+            Event.created_at, Event.updated_at
+        ]
+        query = (
+            select(*columns)
+            .join(EventClosure, EventClosure.descendant_id == Event.id)
+            .where(Event.user_id == user_id)
+        )
         if root_event_id is None:
-            # Get all root events and their descendants
-            cte_query = text("""
-                WITH RECURSIVE event_tree AS (
-                    -- Base case: root events
-                    SELECT id, user_id, parent_event_id, name, description,
-                           start_date, end_date, location_name, 
-                           gps_latitude, gps_longitude, sort_order,
-                           created_at, updated_at,
-                           0 as depth
-                    FROM events
-                    WHERE user_id = :user_id AND parent_event_id IS NULL
-                    
-                    UNION ALL
-                    
-                    -- Recursive case: children
-                    SELECT e.id, e.user_id, e.parent_event_id, e.name, e.description,
-                           e.start_date, e.end_date, e.location_name,
-                           e.gps_latitude, e.gps_longitude, e.sort_order,
-                           e.created_at, e.updated_at,
-                           et.depth + 1
-                    FROM events e
-                    INNER JOIN event_tree et ON e.parent_event_id = et.id
-                )
-                SELECT * FROM event_tree ORDER BY depth, sort_order, name
-            """)
-            params = {"user_id": user_id}
+            # Every event below (or being) one of the user's roots
+            root = aliased(Event)
+            query = query.join(root, root.id == EventClosure.ancestor_id).where(root.parent_event_id.is_(None))
         else:
-            # Get specific event and its descendants
-            cte_query = text("""
-                WITH RECURSIVE event_tree AS (
-                    -- Base case: specified event
-                    SELECT id, user_id, parent_event_id, name, description,
-                           start_date, end_date, location_name,
-                           gps_latitude, gps_longitude, sort_order,
-                           created_at, updated_at,
-                           0 as depth
-                    FROM events
-                    WHERE id = :root_id AND user_id = :user_id
-                    
-                    UNION ALL
-                    
-                    -- Recursive case: children
-                    SELECT e.id, e.user_id, e.parent_event_id, e.name, e.description,
-                           e.start_date, e.end_date, e.location_name,
-                           e.gps_latitude, e.gps_longitude, e.sort_order,
-                           e.created_at, e.updated_at,
-                           et.depth + 1
-                    FROM events e
-                    INNER JOIN event_tree et ON e.parent_event_id = et.id
-                )
-                SELECT * FROM event_tree ORDER BY depth, sort_order, name
-            """)
-            params = {"user_id": user_id, "root_id": root_event_id}
-        
-        # Execute query and convert to Event objects
-        result = self.db.execute(cte_query, params)
-        rows = result.fetchall()
-        
-        # Convert rows to Event objects and build tree structure
+            # Specific event and its descendants
+            query = query.where(EventClosure.ancestor_id == root_event_id)
+        rows = self.db.execute(query.order_by(EventClosure.depth, Event.sort_order, Event.name)).mappings()
+        
+        # Convert rows to transient Event objects and build tree structure
         events_by_id = {}
         root_events = []
         
         for row in rows:
-            event = Event(
-                id=row.id,
-                user_id=row.user_id,
-                parent_event_id=row.parent_event_id,
-                name=row.name,
-                description=row.description,
-                start_date=row.start_date,
-                end_date=row.end_date,
-                location_name=row.location_name,
-                gps_latitude=row.gps_latitude,
-                gps_longitude=row.gps_longitude,
-                sort_order=row.sort_order,
-                created_at=row.created_at,
-                updated_at=row.updated_at
-            )
+            event = Event(**row)
             # Initialize children list
             event.children = []
             events_by_id[event.id] = event
@@ -166,9 +252,17 @@ class EventRepository:
         
         return root_events if root_event_id is None else [events_by_id.get(root_event_id)] if root_event_id in events_by_id else []
     
+    def _descendant_ids_query(self, event_id: int, user_id: int):
+        """SELECT of the event's own ID and all its descendants' IDs (empty if not user's)"""
+        return (
+            select(EventClosure.descendant_id)
+            .join(Event, Event.id == EventClosure.ancestor_id)
+            .where(EventClosure.ancestor_id == event_id, Event.user_id == user_id)
+        )
+    
     def get_descendant_ids(self, event_id: int, user_id: int) -> List[int]:
         """
-        Get all descendant event IDs (recursive)
+        Get all descendant event IDs (one event_closure lookup)
         
         Args:
             event_id: Root event ID
@@ -177,25 +271,35 @@ class EventRepository:
         Returns:
             List of event IDs including root
         """
-        cte_query = text("""
-            WITH RECURSIVE event_descendants AS (
-                -- Base case: specified event
-                SELECT id, parent_event_id
-                FROM events
-                WHERE id = :event_id AND user_id = :user_id
-                
-                UNION ALL
-                
-                -- Recursive case: children
-                SELECT e.id, e.parent_event_id
-                FROM events e
-                INNER JOIN event_descendants ed ON e.parent_event_id = ed.id
-            )
-            SELECT id FROM event_descendants
-        """)
+        return list(self.db.execute(self._descendant_ids_query(event_id, user_id)).scalars())
+    
+    def get_ancestors(self, event_id: int, user_id: int) -> List[Event]:
+        """
+        Get the event's ancestors, root first (breadcrumbs, one event_closure lookup)
         
-        result = self.db.execute(cte_query, {"event_id": event_id, "user_id": user_id})
-        return [row.id for row in result.fetchall()]
+        Returns:
+            List of ancestor events, excluding the event itself
+        """
+        return (
+            self.db.query(Event)
+            .join(EventClosure, EventClosure.ancestor_id == Event.id)
+            .filter(
+                EventClosure.descendant_id == event_id,
+                EventClosure.depth > 0,
+                Event.user_id == user_id
+            )
+            .order_by(EventClosure.depth.desc())
+            .all()
+        )
+    
+    def is_descendant(self, event_id: int, ancestor_id: int) -> bool:
+        """Whether event_id is ancestor_id itself or lies below it"""
+        return self.db.execute(
+            select(EventClosure.depth).where(
+                EventClosure.ancestor_id == ancestor_id,
+                EventClosure.descendant_id == event_id
+            )
+        ).first() is not None
     
     def move_event(self, event_id: int, new_parent_id: Optional[int], user_id: int) -> Event:
         """
@@ -224,11 +328,10 @@ class EventRepository:
                 raise ValueError(f"Parent event {new_parent_id} not found")
             
             # Prevent creating cycle (new parent can't be descendant)
-            descendant_ids = self.get_descendant_ids(event_id, user_id)
-            if new_parent_id in descendant_ids:
+            if self.is_descendant(new_parent_id, event_id):
                 raise ValueError("Cannot move event to its own descendant (would create cycle)")
         
-        # Update parent
+        # Update parent (the flush re-hangs the subtree in event_closure)
         event.parent_event_id = new_parent_id
         self.db.commit()
         self.db.refresh(event)
@@ -258,6 +361,7 @@ class EventRepository:
         Delete event
         
         Child events will have parent_event_id set to NULL (via CASCADE SET NULL)
+        and become roots of their own subtrees in event_closure.
         Photos remain but lose event association (via CASCADE DELETE on photo_events)
         """
         event = self.get_by_id(event_id, user_id)
@@ -270,51 +374,191 @@ class EventRepository:
     
     # Photo-Event associations (one-to-many: photo.event_id)
     
-    def get_photos_in_event(self, event_id: int, user_id: int, include_descendants: bool = False) -> List[Photo]:
+    def get_photo_page(
+        self,
+        event_id: int,
+        user_id: int,
+        include_descendants: bool = False,
+        limit: int = 100,
+        after: Optional[Tuple[Optional[datetime], int]] = None,
+        descending: bool = False
+    ) -> List[Row]:
         """
-        Get photos in event
+        One page of photo summaries in event, by taken_at (undated last), then id
         
         Args:
             event_id: Event ID
             user_id: User ID for security
-            include_descendants: Include photos from child events
+            include_descendants: Include photos from child events (joined via event_closure)
+            limit: Maximum number of rows
+            after: (taken_at, id) of the previous page's last photo (keyset pagination)
+            descending: Newest first
+        
+        Returns:
+            Rows of EVENT_PHOTO_COLUMNS only (no hotpreview/exif blobs)
         """
         event = self.get_by_id(event_id, user_id)
         if not event:
             raise ValueError(f"Event {event_id} not found")
         
+        query = select(*EVENT_PHOTO_COLUMNS).where(Photo.user_id == user_id)
         if include_descendants:
-            # Get all descendant event IDs
-            event_ids = self.get_descendant_ids(event_id, user_id)
+            query = query.join(EventClosure, EventClosure.descendant_id == Photo.event_id).where(
+                EventClosure.ancestor_id == event_id
+            )
         else:
-            event_ids = [event_id]
+            query = query.where(Photo.event_id == event_id)
         
-        # Query photos directly via event_id column
-        photos = self.db.query(Photo).filter(
-            Photo.event_id.in_(event_ids),
-            Photo.user_id == user_id
-        ).all()
+        beyond = operator.lt if descending else operator.gt
+        if after is not None:
+            taken_at, photo_id = after
+            if taken_at is None:
+                query = query.where(Photo.taken_at.is_(None), beyond(Photo.id, photo_id))
+            else:
+                query = query.where(or_(
+                    beyond(Photo.taken_at, taken_at),
+                    and_(Photo.taken_at == taken_at, beyond(Photo.id, photo_id)),
+                    Photo.taken_at.is_(None)
+                ))
         
-        return photos
+        order = (lambda column: column.desc()) if descending else (lambda column: column.asc())
+        query = query.order_by(order(Photo.taken_at).nulls_last(), order(Photo.id)).limit(limit)
+        return list(self.db.execute(query).all())
     
     def get_photo_count(self, event_id: int, include_descendants: bool = False) -> int:
         """Get number of photos in event (optionally recursive)"""
+        query = self.db.query(func.count(Photo.id))
         if include_descendants:
-            # Recursive count using CTE
-            cte_query = text("""
-                WITH RECURSIVE event_tree AS (
-                    SELECT id FROM events WHERE id = :event_id
-                    UNION ALL
-                    SELECT e.id FROM events e
-                    INNER JOIN event_tree et ON e.parent_event_id = et.id
-                )
-                SELECT COUNT(p.id)
-                FROM photos p
-                INNER JOIN event_tree et ON p.event_id = et.id
-            """)
-            result = self.db.execute(cte_query, {"event_id": event_id})
-            return result.scalar() or 0
+            # Photos of every event below (or being) event_id
+            query = query.join(EventClosure, EventClosure.descendant_id == Photo.event_id).filter(
+                EventClosure.ancestor_id == event_id
+            )
         else:
             # Direct count
-            count = self.db.query(Photo).filter(Photo.event_id == event_id).count()
-            return count
+            query = query.filter(Photo.event_id == event_id)
+        return query.scalar()
+    
+    def get_photo_counts(self, user_id: int) -> Dict[int, int]:
+        """
+        Number of photos directly in each of user's events (one GROUP BY query)
+        
+        Events without photos are absent from the result.
+        """
+        rows = (
+            self.db.query(Photo.event_id, func.count(Photo.id))
+            .join(Event, Event.id == Photo.event_id)
+            .filter(Event.user_id == user_id)
+            .group_by(Photo.event_id)
+            .all()
+        )
+        return {event_id: count for event_id, count in rows}
+    
+    def get_parent_ids(self, user_id: int) -> Dict[int, Optional[int]]:
+        """Map of all of user's event IDs to their parent event ID"""
+        rows = self.db.query(Event.id, Event.parent_event_id).filter(Event.user_id == user_id).all()
+        return {event_id: parent_id for event_id, parent_id in rows}
+    
+    def get_photo_points(self, user_id: int, only_unassigned: bool = False) -> List[Row]:
+        """
+        (id, taken_at, gps_latitude, gps_longitude) of user's dated photos, by taken_at
+        
+        Only these columns are read, so whole libraries fit in memory for clustering.
+        """
+        query = (
+            select(Photo.id, Photo.taken_at, Photo.gps_latitude, Photo.gps_longitude)
+            .where(Photo.user_id == user_id, Photo.taken_at.isnot(None))
+            .order_by(Photo.taken_at, Photo.id)
+        )
+        if only_unassigned:
+            query = query.where(Photo.event_id.is_(None))
+        return list(self.db.execute(query).all())
+    
+    def bulk_create_events(self, user_id: int, events: List[Dict], parents: List[Optional[int]]) -> List[int]:
+        """
+        Insert many events with their closure rows, one multi-row INSERT per tree level
+        
+        Args:
+            user_id: Owner of all events
+            events: Column values per event
+            parents: Per event, index (into events) of its parent, or None for a root;
+                parents must come before their children
+        
+        Returns:
+            New event IDs in the order of events
+        """
+        depths: List[int] = []
+        for parent in parents:
+            depths.append(0 if parent is None else depths[parent] + 1)
+        
+        ids: List[Optional[int]] = [None] * len(events)
+        for depth in range(max(depths, default=-1) + 1):
+            level = [i for i, event_depth in enumerate(depths) if event_depth == depth]
+            rows = [
+                {
+                    **events[i],
+                    "user_id": user_id,
+                    "parent_event_id": None if parents[i] is None else ids[parents[i]]
+                }
+                for i in level
+            ]
+            inserted = self.db.execute(
+                insert(Event).returning(Event.id, sort_by_parameter_order=True), rows
+            ).scalars().all()
+            for i, event_id in zip(level, inserted):
+                ids[i] = event_id
+        
+        closure_rows = []
+        for i, event_id in enumerate(ids):
+            ancestor, depth = i, 0
+            while ancestor is not None:
+                closure_rows.append({"ancestor_id": ids[ancestor], "descendant_id": event_id, "depth": depth})
+                ancestor, depth = parents[ancestor], depth + 1
+        for chunk in chunked(closure_rows, EVENT_CHUNK_SIZE):
+            self.db.execute(insert(EventClosure), chunk)
+        return ids
+    
+    def get_dated_events(self, user_id: int) -> List[Event]:
+        """User's events that have both start_date and end_date"""
+        return (
+            self.db.query(Event)
+            .filter(Event.user_id == user_id, Event.start_date.isnot(None), Event.end_date.isnot(None))
+            .order_by(Event.start_date, Event.id)
+            .all()
+        )
+    
+    def get_event_depths(self, user_id: int) -> Dict[int, int]:
+        """Depth (0 = root) of each of user's events, one grouped event_closure query"""
+        rows = self.db.execute(
+            select(EventClosure.descendant_id, func.max(EventClosure.depth))
+            .join(Event, Event.id == EventClosure.descendant_id)
+            .where(Event.user_id == user_id)
+            .group_by(EventClosure.descendant_id)
+        ).all()
+        return {event_id: depth for event_id, depth in rows}
+    
+    def get_photos_in_range(
+        self,
+        user_id: int,
+        start: datetime,
+        end: datetime,
+        only_unassigned: bool = False,
+        bbox: Optional[Tuple[float, float, Optional[float], Optional[float]]] = None
+    ) -> List[Row]:
+        """
+        (id, event_id, gps_latitude, gps_longitude) of user's photos taken within [start, end)
+        
+        A (user_id, taken_at) index range scan; bbox (min_lat, max_lat, min_lon,
+        max_lon) additionally requires GPS inside the box (None longitude bounds
+        = any longitude).
+        """
+        query = select(Photo.id, Photo.event_id, Photo.gps_latitude, Photo.gps_longitude).where(
+            Photo.user_id == user_id, Photo.taken_at >= start, Photo.taken_at < end
+        )
+        if only_unassigned:
+            query = query.where(Photo.event_id.is_(None))
+        if bbox is not None:
+            min_lat, max_lat, min_lon, max_lon = bbox
+            query = query.where(Photo.gps_latitude.between(min_lat, max_lat))
+            if min_lon is not None:
+                query = query.where(Photo.gps_longitude.between(min_lon, max_lon))
+        return list(self.db.execute(query).all())
@@ -1,7 +1,7 @@
 """
 Input Channel Repository - Data Access Layer for InputChannel simple CRUD
 """
-from typing import List, Optional
+from typing import List, Optional, Set
 from datetime import datetime
 from sqlalchemy.orm import Session
 from sqlalchemy import desc
@@ -27,6 +27,18 @@ class InputChannelRepository:
         
         return query.first()
     
+    def get_existing_channel_ids(self, channel_ids: Set[int], user_id: int) -> Set[int]:
+        """Return the subset of channel_ids that exist and belong to user (one query)"""
+        if not channel_ids:
+            return set()
+        rows = (
+            self.db.query(InputChannel.id)
+            .filter(InputChannel.id.in_(channel_ids))
+            .filter(InputChannel.user_id == user_id)
+            .all()
+        )
+        return {row.id for row in rows}
+    
     def get_protected_channel(self, user_id: int) -> Optional[InputChannel]:
         """
         Get user's protected InputChannel (default channel for quick uploads)
@@ -4,11 +4,21 @@ Handles all database interactions for Photo model
 """
 from typing import List, Optional, Dict, Any
 from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import and_, or_, desc, asc, func, text, String
+from sqlalchemy import and_, or_, desc, asc, case, func, text, String, update, select
 from datetime import datetime
 
 from src.models import Photo, Author, ImageFile
 from src.schemas.photo_schemas import PhotoCreateRequest, PhotoUpdateRequest, PhotoSearchRequest
+from src.utils.db_utils import chunked
+from src.repositories.timeline_bucket_repository import (
+    TRACKED_PHOTO_ATTRS, photo_bucket_keys, refresh_buckets_for_photos
+)
+
+# Max hothashes per IN (...) list; keeps bound parameters well under backend limits
+HASH_LOOKUP_CHUNK_SIZE = 1000
+
+# Photo IDs per bulk UPDATE ... WHERE id IN (...) statement
+BULK_UPDATE_CHUNK_SIZE = 1000
 
 
 class PhotoRepository:
@@ -31,6 +41,44 @@ class PhotoRepository:
         
         return query.first()
     
+    def get_owners_by_hashes(self, hothashes: List[str]) -> Dict[str, tuple]:
+        """
+        Look up existing photos for many hothashes in one IN query
+        
+        hothash is unique across all users, so this is not user-scoped.
+        
+        Returns:
+            Dict mapping hothash -> (photo_id, user_id) for hashes that exist
+        """
+        if not hothashes:
+            return {}
+        rows = (
+            self.db.query(Photo.hothash, Photo.id, Photo.user_id)
+            .filter(Photo.hothash.in_(hothashes))
+            .all()
+        )
+        return {row.hothash: (row.id, row.user_id) for row in rows}
+    
+    def get_ids_by_hashes(self, hothashes: List[str], user_id: int) -> Dict[str, int]:
+        """
+        Resolve many hothashes to photo IDs (user-scoped)
+        
+        Queries in chunks of HASH_LOOKUP_CHUNK_SIZE, selecting only (hothash, id).
+        
+        Returns:
+            Dict mapping hothash -> photo_id for the user's own photos
+        """
+        ids: Dict[str, int] = {}
+        for chunk in chunked(list(dict.fromkeys(hothashes)), HASH_LOOKUP_CHUNK_SIZE):
+            rows = (
+                self.db.query(Photo.hothash, Photo.id)
+                .filter(Photo.user_id == user_id)
+                .filter(Photo.hothash.in_(chunk))
+                .all()
+            )
+            ids.update({row.hothash: row.id for row in rows})
+        return ids
+    
     def get_by_hash(self, hothash: str, user_id: Optional[int] = None) -> Optional[Photo]:
         """
         Get photo by hothash with relationships loaded
@@ -200,20 +248,87 @@ class PhotoRepository:
         self.db.flush()
         return photo
     
+    def get_own_ids_for_search(self, user_id: int, search_params: PhotoSearchRequest) -> List[int]:
+        """
+        IDs of the user's own photos matching a search (no pagination)
+        
+        Used as the selection for bulk operations; only owned photos qualify,
+        even though search results also include other users' public photos.
+        """
+        query = self.db.query(Photo.id).filter(Photo.user_id == user_id)
+        query = self._apply_filters(query, search_params=search_params, user_id=user_id)
+        return [row.id for row in query.order_by(Photo.id).all()]
+    
+    def bulk_update(self, photo_ids: List[int], user_id: int, values: Dict[str, Any]) -> int:
+        """
+        Set the same column values on many photos (user-scoped)
+        
+        One UPDATE ... WHERE user_id = ? AND id IN (...) per
+        BULK_UPDATE_CHUNK_SIZE IDs; objects are not loaded into the session.
+        Timeline buckets are refreshed when values touch bucketed columns.
+        
+        Returns:
+            Number of rows updated
+        """
+        affects_timeline = any(attr in values for attr in TRACKED_PHOTO_ATTRS)
+        previous_keys = photo_bucket_keys(self.db.connection(), photo_ids) if affects_timeline else set()
+        
+        updated = 0
+        for chunk in chunked(photo_ids, BULK_UPDATE_CHUNK_SIZE):
+            updated += self.db.execute(
+                update(Photo)
+                .where(Photo.user_id == user_id)
+                .where(Photo.id.in_(chunk))
+                .values(**values)
+                .execution_options(synchronize_session=False)
+            ).rowcount
+        
+        if affects_timeline:
+            refresh_buckets_for_photos(self.db.connection(), photo_ids, previous_keys)
+        return updated
+    
+    def bulk_set_event(self, event_ids: Dict[int, int], user_id: int) -> int:
+        """
+        Move many photos to (possibly different) events (user-scoped)
+        
+        One UPDATE ... SET event_id = CASE id ... END WHERE user_id = ? AND
+        id IN (...) per BULK_UPDATE_CHUNK_SIZE photos, however many events
+        they go to.
+        
+        Args:
+            event_ids: Photo ID -> event ID
+            user_id: Owner user ID
+        
+        Returns:
+            Number of rows updated
+        """
+        updated = 0
+        for chunk in chunked(list(event_ids), BULK_UPDATE_CHUNK_SIZE):
+            updated += self.db.execute(
+                update(Photo)
+                .where(Photo.user_id == user_id)
+                .where(Photo.id.in_(chunk))
+                .values(event_id=case({photo_id: event_ids[photo_id] for photo_id in chunk}, value=Photo.id))
+                .execution_options(synchronize_session=False)
+            ).rowcount
+        return updated
+    
     def delete(self, hothash: str, user_id: int) -> bool:
-        """Delete photo and associated files (user-scoped - only owner can delete)"""
-        # For deletes, we MUST be the owner (no public access)
-        photo = self.db.query(Photo).filter(
-            Photo.hothash == hothash,
-            Photo.user_id == user_id
-        ).first()
+        """
+        Soft-delete photo (user-scoped - only owner can delete)
         
-        if not photo:
+        The photo disappears from all queries at once; its row, image files,
+        tags and coldpreview are removed by the photo purger.
+        """
+        # For deletes, we MUST be the owner (no public access)
+        photo_id = self.db.execute(
+            select(Photo.id)
+            .where(Photo.hothash == hothash)
+            .where(Photo.user_id == user_id)
+        ).scalar_one_or_none()
+        if photo_id is None:
             return False
-        
-        self.db.delete(photo)
-        self.db.flush()
-        return True
+        return self.bulk_update([photo_id], user_id, {"deleted_at": datetime.utcnow()}) > 0
     
     def get_hotpreview(self, hothash: str) -> Optional[bytes]:
         """
@@ -276,7 +391,7 @@ class PhotoRepository:
         
         # Filter by tags (OR logic: photos with ANY of the specified tags)
         if search_params.tag_ids:
-            from models.tag import Tag
+            from src.models.tag import Tag
             # Join with photo_tags association table
             query = query.join(Photo.tags).filter(Tag.id.in_(search_params.tag_ids)).distinct()
         
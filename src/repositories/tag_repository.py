@@ -1,12 +1,20 @@
 """
 Tag Repository - Data access layer for tag operations
 """
-from typing import List, Optional
+from datetime import datetime
+from typing import List, Optional, Tuple
 from sqlalchemy.orm import Session
-from sqlalchemy import func, and_
+from sqlalchemy import func, and_, delete
 
 from src.models.tag import Tag, PhotoTag
 from src.models.photo import Photo
+from src.utils.db_utils import insert_ignore, chunked
+
+# Rows per INSERT ... VALUES statement for bulk photo_tags inserts
+BULK_INSERT_BATCH_SIZE = 1000
+
+# Photo IDs per DELETE ... IN (...) statement for bulk removal
+BULK_DELETE_BATCH_SIZE = 1000
 
 
 class TagRepository:
@@ -105,6 +113,41 @@ class TagRepository:
         self.db.flush()  # Get ID without committing
         return tag
     
+    def get_by_names(self, names: List[str], user_id: int) -> List[Tag]:
+        """Get many tags by (normalized) name in one query (user-scoped)"""
+        if not names:
+            return []
+        return self.db.query(Tag).filter(
+            and_(Tag.user_id == user_id, Tag.name.in_([name.lower() for name in names]))
+        ).all()
+    
+    def get_or_create_many(self, names: List[str], user_id: int) -> Tuple[List[Tag], int]:
+        """
+        Resolve tag names to tags, creating the missing ones
+        
+        One SELECT for all names; missing names are inserted with
+        ON CONFLICT DO NOTHING (a concurrent request may create the same tag)
+        and selected again.
+        
+        Returns:
+            (tags, number of tags created)
+        """
+        names = list(dict.fromkeys(name.lower() for name in names))
+        tags = self.get_by_names(names, user_id)
+        existing = {tag.name for tag in tags}
+        missing = [name for name in names if name not in existing]
+        if not missing:
+            return tags, 0
+        
+        now = datetime.utcnow()
+        created = self.db.execute(
+            insert_ignore(self.db, Tag).values([
+                {"user_id": user_id, "name": name, "created_at": now, "updated_at": now}
+                for name in missing
+            ])
+        ).rowcount
+        return tags + self.get_by_names(missing, user_id), created
+    
     def get_or_create(self, name: str, user_id: int) -> Tag:
         """Get existing tag or create new one"""
         tag = self.get_by_name(name, user_id)
@@ -140,20 +183,7 @@ class TagRepository:
             photo_id: Photo's integer ID (not hothash)
             tag_id: Tag ID
         """
-        existing = self.db.query(PhotoTag).filter(
-            and_(
-                PhotoTag.photo_id == photo_id,
-                PhotoTag.tag_id == tag_id
-            )
-        ).first()
-        
-        if existing:
-            return False  # Already tagged
-        
-        photo_tag = PhotoTag(photo_id=photo_id, tag_id=tag_id)
-        self.db.add(photo_tag)
-        self.db.flush()
-        return True
+        return self.add_tags_to_photos([photo_id], [tag_id]) > 0
     
     def remove_tag_from_photo(self, photo_id: int, tag_id: int) -> bool:
         """
@@ -173,6 +203,46 @@ class TagRepository:
         
         return deleted > 0
     
+    def add_tags_to_photos(self, photo_ids: List[int], tag_ids: List[int]) -> int:
+        """
+        Tag many photos with many tags
+        
+        Inserts every (photo, tag) pair with INSERT ... ON CONFLICT DO NOTHING
+        in batches of BULK_INSERT_BATCH_SIZE rows; existing associations are
+        skipped by the database instead of being looked up first.
+        
+        Returns:
+            Number of associations actually created
+        """
+        now = datetime.utcnow()
+        rows = [
+            {"photo_id": photo_id, "tag_id": tag_id, "tagged_at": now}
+            for photo_id in photo_ids
+            for tag_id in tag_ids
+        ]
+        added = 0
+        for batch in chunked(rows, BULK_INSERT_BATCH_SIZE):
+            added += self.db.execute(insert_ignore(self.db, PhotoTag).values(batch)).rowcount
+        return added
+    
+    def remove_tags_from_photos(self, photo_ids: List[int], tag_ids: List[int]) -> int:
+        """
+        Remove many tags from many photos
+        
+        Returns:
+            Number of associations deleted
+        """
+        if not tag_ids:
+            return 0
+        removed = 0
+        for batch in chunked(photo_ids, BULK_DELETE_BATCH_SIZE):
+            removed += self.db.execute(
+                delete(PhotoTag)
+                .where(PhotoTag.tag_id.in_(tag_ids))
+                .where(PhotoTag.photo_id.in_(batch))
+            ).rowcount
+        return removed
+    
     def get_photo_tags(self, photo_id: int) -> List[Tag]:
         """
         Get all tags for a photo
@@ -0,0 +1,323 @@
+"""
+Timeline Bucket Repository - Maintenance and reads of the timeline rollup
+Keeps timeline_buckets (one row per owner/visibility/hour) in step with photos
+"""
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import Integer, case, cast, delete, event, extract, func, insert, inspect, or_, select, tuple_
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+from src.models import Photo, TimelineBucket
+from src.utils.db_utils import chunked, upsert
+
+# (user_id, visibility, year, month, day, hour)
+BucketKey = Tuple[int, str, int, int, int, int]
+
+# Photo IDs / bucket keys per IN (...) list
+BUCKET_CHUNK_SIZE = 500
+
+# Photo columns that move a photo between buckets or change a bucket's preview
+TRACKED_PHOTO_ATTRS = ("user_id", "visibility", "taken_at", "rating", "deleted_at", "hothash")
+
+GRANULARITY_LEVELS = {
+    "year": ("year",),
+    "month": ("year", "month"),
+    "day": ("year", "month", "day"),
+    "hour": ("year", "month", "day", "hour"),
+}
+
+# Non-key columns, overwritten when a recomputed bucket already exists
+BUCKET_VALUE_COLUMNS = (
+    "count", "first_taken_at", "last_taken_at", "preview_hothash", "preview_rating", "preview_taken_at"
+)
+
+# First key of the per-owner PostgreSQL advisory lock taken by refreshes
+TIMELINE_LOCK_NAMESPACE = 41
+
+_SESSION_KEYS = "timeline_bucket_keys"
+
+
+def preview_order(rating, taken_at) -> list:
+    """Timeline preview order: rated 4-5 first, then highest rating, then earliest"""
+    return [case((rating >= 4, 0), else_=1), rating.desc().nullslast(), taken_at]
+
+
+def _bucket_select(*criteria):
+    """
+    One row per (user_id, visibility, hour) of live photos matching criteria
+
+    Columns are named after TimelineBucket's, so the result can be inserted
+    as is. Count, time range and preview come from one windowed pass.
+    """
+    parts = [cast(extract(part, Photo.taken_at), Integer) for part in ("year", "month", "day", "hour")]
+    partition = [Photo.user_id, Photo.visibility, *parts]
+    ranked = (
+        select(
+            Photo.user_id,
+            Photo.visibility,
+            *[part.label(name) for part, name in zip(parts, ("year", "month", "day", "hour"))],
+            func.count().over(partition_by=partition).label("count"),
+            func.min(Photo.taken_at).over(partition_by=partition).label("first_taken_at"),
+            func.max(Photo.taken_at).over(partition_by=partition).label("last_taken_at"),
+            Photo.hothash.label("preview_hothash"),
+            Photo.rating.label("preview_rating"),
+            Photo.taken_at.label("preview_taken_at"),
+            func.row_number().over(
+                partition_by=partition,
+                order_by=preview_order(Photo.rating, Photo.taken_at)
+            ).label("rn")
+        )
+        .where(Photo.deleted_at.is_(None), Photo.taken_at.isnot(None), *criteria)
+        .subquery()
+    )
+    return select(*[ranked.c[column.name] for column in TimelineBucket.__table__.columns]).where(ranked.c.rn == 1)
+
+
+def bucket_key(user_id: int, visibility: str, taken_at: datetime) -> BucketKey:
+    return (user_id, visibility, taken_at.year, taken_at.month, taken_at.day, taken_at.hour)
+
+
+def photo_bucket_keys(connection: Connection, photo_ids: Iterable[int]) -> Set[BucketKey]:
+    """Buckets the given photos currently count in (deleted/undated photos count nowhere)"""
+    keys = set()
+    for chunk in chunked(list(photo_ids), BUCKET_CHUNK_SIZE):
+        rows = connection.execute(
+            select(Photo.user_id, Photo.visibility, Photo.taken_at)
+            .where(Photo.id.in_(chunk), Photo.deleted_at.is_(None), Photo.taken_at.isnot(None))
+        )
+        keys.update(bucket_key(row.user_id, row.visibility, row.taken_at) for row in rows)
+    return keys
+
+
+def _lock_owner_buckets(connection: Connection, user_id: int) -> None:
+    """
+    Serialize bucket refreshes of one owner until the transaction ends (PostgreSQL)
+
+    A refresh recomputes buckets from the photos it can see; without the lock
+    two transactions adding photos to the same hour would each count only
+    their own. Waiting for the other's commit makes the later recompute see
+    both. SQLite serializes writers anyway.
+    """
+    if connection.dialect.name == "postgresql":
+        connection.execute(select(func.pg_advisory_xact_lock(TIMELINE_LOCK_NAMESPACE, user_id)))
+
+
+def refresh_timeline_buckets(connection: Connection, keys: Iterable[BucketKey]) -> None:
+    """
+    Recompute the given buckets from photos (within the caller's transaction)
+
+    Per owner and visibility, one windowed query over the time range spanned
+    by the keys. Recomputed buckets are upserted; buckets left without photos
+    are removed.
+    """
+    by_owner: Dict[Tuple[int, str], Set[BucketKey]] = defaultdict(set)
+    for key in keys:
+        by_owner[key[:2]].add(key)
+
+    # Fixed lock order across transactions
+    for user_id in sorted({user_id for user_id, _ in by_owner}):
+        _lock_owner_buckets(connection, user_id)
+
+    for (user_id, visibility), owner_keys in sorted(by_owner.items()):
+        hours = sorted(datetime(*key[2:]) for key in owner_keys)
+        rows = connection.execute(
+            _bucket_select(
+                Photo.user_id == user_id,
+                Photo.visibility == visibility,
+                Photo.taken_at >= hours[0],
+                Photo.taken_at < hours[-1] + timedelta(hours=1)
+            )
+        ).mappings().all()
+
+        buckets = [
+            dict(row) for row in rows
+            if (user_id, visibility, row["year"], row["month"], row["day"], row["hour"]) in owner_keys
+        ]
+        if buckets:
+            connection.execute(upsert(connection, TimelineBucket, BUCKET_VALUE_COLUMNS), buckets)
+
+        emptied = owner_keys - {
+            (user_id, visibility, bucket["year"], bucket["month"], bucket["day"], bucket["hour"])
+            for bucket in buckets
+        }
+        for chunk in chunked(sorted(emptied), BUCKET_CHUNK_SIZE):
+            connection.execute(
+                delete(TimelineBucket)
+                .where(TimelineBucket.user_id == user_id, TimelineBucket.visibility == visibility)
+                .where(
+                    tuple_(TimelineBucket.year, TimelineBucket.month, TimelineBucket.day, TimelineBucket.hour)
+                    .in_([key[2:] for key in chunk])
+                )
+            )
+
+
+def refresh_buckets_for_photos(
+    connection: Connection,
+    photo_ids: Iterable[int],
+    previous_keys: Iterable[BucketKey] = ()
+) -> None:
+    """
+    Refresh the buckets photos count in now, plus the ones they counted in before
+
+    For Core inserts/updates that bypass the session hooks: collect
+    previous_keys with photo_bucket_keys before the statement, call this after.
+    """
+    keys = set(previous_keys) | photo_bucket_keys(connection, photo_ids)
+    if keys:
+        refresh_timeline_buckets(connection, keys)
+
+
+def rebuild_timeline_buckets(connection: Connection, user_id: Optional[int] = None) -> int:
+    """
+    Recompute all buckets (of one user) with a single INSERT ... SELECT
+
+    Returns:
+        Number of buckets written
+    """
+    criteria = [] if user_id is None else [Photo.user_id == user_id]
+    clear = delete(TimelineBucket)
+    if user_id is not None:
+        clear = clear.where(TimelineBucket.user_id == user_id)
+    connection.execute(clear)
+
+    query = _bucket_select(*criteria)
+    return connection.execute(
+        insert(TimelineBucket).from_select([column.name for column in query.selected_columns], query)
+    ).rowcount
+
+
+def _photo_id(state) -> Optional[int]:
+    return state.identity[0] if state.identity else state.dict.get("id")
+
+
+def _changed_photos(objects) -> List[int]:
+    ids = []
+    for obj in objects:
+        if not isinstance(obj, Photo):
+            continue
+        state = inspect(obj)
+        if any(state.attrs[attr].history.has_changes() for attr in TRACKED_PHOTO_ATTRS):
+            photo_id = _photo_id(state)
+            if photo_id is not None:
+                ids.append(photo_id)
+    return ids
+
+
+@event.listens_for(Session, "before_flush")
+def _collect_previous_bucket_keys(session, flush_context, instances):
+    """Remember the buckets of photos about to be changed or deleted"""
+    ids = _changed_photos(session.dirty)
+    ids += [_photo_id(inspect(obj)) for obj in session.deleted if isinstance(obj, Photo)]
+    ids = [photo_id for photo_id in ids if photo_id is not None]
+    if ids:
+        session.info.setdefault(_SESSION_KEYS, set()).update(photo_bucket_keys(session.connection(), ids))
+
+
+@event.listens_for(Session, "after_flush")
+def _refresh_flushed_buckets(session, flush_context):
+    """Refresh buckets touched by flushed photo inserts, updates and deletes"""
+    previous_keys = session.info.pop(_SESSION_KEYS, set())
+    ids = [_photo_id(inspect(obj)) for obj in session.new if isinstance(obj, Photo)]
+    ids += _changed_photos(session.dirty)
+    ids = [photo_id for photo_id in ids if photo_id is not None]
+    if ids or previous_keys:
+        refresh_buckets_for_photos(session.connection(), ids, previous_keys)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_bucket_keys(session):
+    session.info.pop(_SESSION_KEYS, None)
+
+
+class TimelineBucketRepository:
+    """Timeline aggregations read from timeline_buckets (O(buckets), not O(photos))"""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def _build_visibility_filter(self, user_id: Optional[int]):
+        """Same access rules as TimelineRepository: public, or own + authenticated + public"""
+        if user_id is None:
+            return TimelineBucket.visibility == 'public'
+        return or_(
+            TimelineBucket.user_id == user_id,
+            TimelineBucket.visibility.in_(('authenticated', 'public'))
+        )
+
+    def get_aggregation(
+        self,
+        granularity: str,
+        year: Optional[int] = None,
+        month: Optional[int] = None,
+        day: Optional[int] = None,
+        user_id: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Aggregate buckets at granularity within the enclosing year/month/day
+
+        Sums, time range and best preview candidate are computed in one
+        windowed statement. Returns the same dicts as TimelineRepository
+        (year[, month, day, hour], count, preview_hothash, first_date,
+        last_date), newest first. Buckets hold one candidate per hour, so
+        preview_hothashes always has a single entry.
+        """
+        levels = GRANULARITY_LEVELS[granularity]
+        group = [getattr(TimelineBucket, level) for level in levels]
+        criteria = [self._build_visibility_filter(user_id)]
+        for column, value in zip(group[:-1], (year, month, day)):
+            criteria.append(column == value)
+
+        ranked = (
+            select(
+                *group,
+                func.sum(TimelineBucket.count).over(partition_by=group).label("count"),
+                func.min(TimelineBucket.first_taken_at).over(partition_by=group).label("first_date"),
+                func.max(TimelineBucket.last_taken_at).over(partition_by=group).label("last_date"),
+                TimelineBucket.preview_hothash,
+                func.row_number().over(
+                    partition_by=group,
+                    order_by=preview_order(TimelineBucket.preview_rating, TimelineBucket.preview_taken_at)
+                ).label("rn")
+            )
+            .where(*criteria)
+            .subquery()
+        )
+        rows = self.db.execute(
+            select(
+                *[ranked.c[level] for level in levels],
+                ranked.c["count"],
+                ranked.c["preview_hothash"],
+                ranked.c["first_date"],
+                ranked.c["last_date"]
+            )
+            .where(ranked.c.rn == 1)
+            .order_by(*[ranked.c[level].desc() for level in levels])
+        ).mappings()
+        return [dict(row, preview_hothashes=[row["preview_hothash"]]) for row in rows]
+
+    def get_histogram(self, granularity: str, user_id: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Photo count per bucket over the whole library (year[, month, day, hour], count), oldest first"""
+        group = [getattr(TimelineBucket, level) for level in GRANULARITY_LEVELS[granularity]]
+        rows = self.db.execute(
+            select(*group, func.sum(TimelineBucket.count).label("count"))
+            .where(self._build_visibility_filter(user_id))
+            .group_by(*group)
+            .order_by(*group)
+        ).mappings()
+        return [dict(row) for row in rows]
+
+    def count_total_photos(self, user_id: Optional[int] = None) -> int:
+        """Count dated photos visible to user"""
+        return self.db.execute(
+            select(func.coalesce(func.sum(TimelineBucket.count), 0))
+            .where(self._build_visibility_filter(user_id))
+        ).scalar_one()
+
+    def rebuild(self, user_id: Optional[int] = None) -> int:
+        """Rebuild buckets (of one user) from photos and commit"""
+        written = rebuild_timeline_buckets(self.db.connection(), user_id)
+        self.db.commit()
+        return written
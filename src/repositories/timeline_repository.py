@@ -2,12 +2,16 @@
 Timeline Repository - Data Access Layer for Timeline aggregations
 Handles hierarchical time-based photo aggregation queries
 """
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 from sqlalchemy.orm import Session
-from sqlalchemy import func, and_, or_, case, extract
-from datetime import datetime
+from sqlalchemy import func, or_, case, extract, select
+from datetime import datetime, timedelta
 
 from src.models import Photo
+from src.repositories.photo_repository import PhotoRepository
+from src.schemas.photo_schemas import PhotoSearchRequest
+
+TIME_PARTS = ('year', 'month', 'day', 'hour')
 
 
 class TimelineRepository:
@@ -35,7 +39,7 @@ class TimelineRepository:
                 Photo.visibility == 'public'
             )
     
-    def _get_preview_selection_case(self):
+    def _get_preview_selection_case(self, rating=Photo.rating):
         """
         Build SQL CASE statement for preview photo selection.
         
@@ -48,100 +52,185 @@ class TimelineRepository:
         """
         return case(
             # Priority 1: Rating 4-5 (sort by rating DESC, then by temporal position)
-            (Photo.rating >= 4, 0),
+            (rating >= 4, 0),
             # Priority 2: No rating or rating < 4 (sort by temporal position)
             else_=1
         )
     
-    def get_year_aggregation(
+    def _time_range(
         self,
-        user_id: Optional[int] = None
-    ) -> List[Dict[str, Any]]:
+        year: Optional[int] = None,
+        month: Optional[int] = None,
+        day: Optional[int] = None
+    ) -> Optional[Tuple[datetime, datetime]]:
         """
-        Aggregate photos by year.
+        Translate year[/month[/day]] into a half-open [start, end) taken_at range.
         
-        Returns list of dicts with:
-        - year: int
-        - count: int
-        - preview_hothash: str
-        - first_date: datetime
-        - last_date: datetime
+        Range predicates on taken_at can use the (user_id, taken_at) and
+        (visibility, taken_at) indexes; extract() predicates cannot.
+        
+        Raises:
+            ValueError: If the date does not exist (e.g. February 30)
         """
-        visibility_filter = self._build_visibility_filter(user_id)
+        if year is None:
+            return None
+        if month is None:
+            return datetime(year, 1, 1), datetime(year + 1, 1, 1)
+        if day is None:
+            start = datetime(year, month, 1)
+            end = datetime(year + 1, 1, 1) if month == 12 else datetime(year, month + 1, 1)
+            return start, end
+        start = datetime(year, month, day)
+        return start, start + timedelta(days=1)
+    
+    def _search_cte(
+        self,
+        user_id: Optional[int],
+        search_params: PhotoSearchRequest,
+        time_range: Optional[Tuple[datetime, datetime]] = None
+    ):
+        """
+        Dated photos visible to user that match search_params (and time_range).
         
-        # Subquery to find preview photo for each year
-        preview_subquery = (
-            self.db.query(
-                extract('year', Photo.taken_at).label('year'),
-                Photo.hothash,
-                Photo.rating,
-                Photo.taken_at,
+        Visibility and search criteria are applied by PhotoRepository._apply_filters;
+        the CTE carries only the columns the aggregation needs.
+        """
+        query = self.db.query(Photo.id, Photo.hothash, Photo.rating, Photo.taken_at).filter(
+            Photo.taken_at.isnot(None)
+        )
+        if time_range is not None:
+            query = query.filter(Photo.taken_at >= time_range[0], Photo.taken_at < time_range[1])
+        query = PhotoRepository(self.db)._apply_filters(query, search_params=search_params, user_id=user_id)
+        return query.cte('search_photos')
+    
+    def _aggregation_statement(
+        self,
+        granularity: str,
+        user_id: Optional[int] = None,
+        year: Optional[int] = None,
+        month: Optional[int] = None,
+        day: Optional[int] = None,
+        previews: int = 1,
+        search_params: Optional[PhotoSearchRequest] = None
+    ):
+        """
+        Build the aggregation SELECT for a granularity within year/month/day.
+        
+        Count, first/last date and preview are window functions over the same
+        partition, so one statement (one range scan) yields complete buckets:
+        the rows with rn <= previews per bucket are its preview photos, best
+        first.
+        
+        With search_params, the photos come from a CTE built by
+        PhotoRepository._apply_filters (same criteria as photo search), which
+        carries the taken_at range so it is range-scanned the same way.
+        """
+        levels = TIME_PARTS[:TIME_PARTS.index(granularity) + 1]
+        time_range = self._time_range(year, month, day)
+        
+        if search_params is None:
+            source = Photo
+            filters = [Photo.taken_at.isnot(None), self._build_visibility_filter(user_id)]
+            if time_range is not None:
+                filters += [Photo.taken_at >= time_range[0], Photo.taken_at < time_range[1]]
+        else:
+            source = self._search_cte(user_id, search_params, time_range).c
+            filters = []
+        parts = [extract(level, source.taken_at) for level in levels]
+        
+        ranked = (
+            select(
+                *[part.label(level) for part, level in zip(parts, levels)],
+                func.count().over(partition_by=parts).label('count'),
+                func.min(source.taken_at).over(partition_by=parts).label('first_date'),
+                func.max(source.taken_at).over(partition_by=parts).label('last_date'),
+                source.hothash.label('preview_hothash'),
                 func.row_number().over(
-                    partition_by=extract('year', Photo.taken_at),
+                    partition_by=parts,
                     order_by=[
-                        self._get_preview_selection_case(),
-                        Photo.rating.desc().nullslast(),
-                        Photo.taken_at
+                        self._get_preview_selection_case(source.rating),
+                        source.rating.desc().nullslast(),
+                        source.taken_at
                     ]
                 ).label('rn')
             )
-            .filter(
-                Photo.taken_at.isnot(None),
-                visibility_filter
-            )
+            .where(*filters)
             .subquery()
         )
         
-        # Main aggregation query
-        query = (
-            self.db.query(
-                extract('year', Photo.taken_at).label('year'),
-                func.count(Photo.id).label('count'),
-                func.min(Photo.taken_at).label('first_date'),
-                func.max(Photo.taken_at).label('last_date')
-            )
-            .filter(
-                Photo.taken_at.isnot(None),
-                visibility_filter
+        return (
+            select(
+                *[ranked.c[level] for level in levels],
+                ranked.c['count'],
+                ranked.c['preview_hothash'],
+                ranked.c['first_date'],
+                ranked.c['last_date']
             )
-            .group_by(extract('year', Photo.taken_at))
-            .order_by(extract('year', Photo.taken_at).desc())
+            .where(ranked.c.rn <= previews)
+            .order_by(*[ranked.c[level].desc() for level in levels], ranked.c.rn)
         )
-        
-        results = query.all()
-        
-        # Get preview hashes
-        year_previews = {}
-        preview_results = (
-            self.db.query(
-                preview_subquery.c.year,
-                preview_subquery.c.hothash
+    
+    def _aggregate(
+        self,
+        granularity: str,
+        user_id: Optional[int] = None,
+        year: Optional[int] = None,
+        month: Optional[int] = None,
+        day: Optional[int] = None,
+        previews: int = 1,
+        search_params: Optional[PhotoSearchRequest] = None
+    ) -> List[Dict[str, Any]]:
+        """Run the aggregation statement and convert rows to bucket dicts."""
+        try:
+            statement = self._aggregation_statement(
+                granularity, user_id, year, month, day, previews, search_params
             )
-            .filter(preview_subquery.c.rn == 1)
-            .all()
-        )
-        
-        for year, hothash in preview_results:
-            year_previews[int(year)] = hothash
+        except ValueError:
+            # Date that does not exist: no photos can match
+            return []
         
-        # Combine results
         timeline = []
-        for year, count, first_date, last_date in results:
-            year_int = int(year)
+        for row in self.db.execute(statement).mappings():
+            key = {level: int(row[level]) for level in TIME_PARTS if level in row}
+            if timeline and all(timeline[-1][level] == value for level, value in key.items()):
+                # Further preview of the same bucket (rows arrive in rn order)
+                timeline[-1]['preview_hothashes'].append(row['preview_hothash'])
+                continue
             timeline.append({
-                'year': year_int,
-                'count': count,
-                'preview_hothash': year_previews.get(year_int, ''),
-                'first_date': first_date,
-                'last_date': last_date
+                **key,
+                'count': row['count'],
+                'preview_hothash': row['preview_hothash'],
+                'preview_hothashes': [row['preview_hothash']],
+                'first_date': row['first_date'],
+                'last_date': row['last_date']
             })
-        
         return timeline
     
+    def get_year_aggregation(
+        self,
+        user_id: Optional[int] = None,
+        previews: int = 1,
+        search_params: Optional[PhotoSearchRequest] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Aggregate photos by year.
+        
+        Returns list of dicts with:
+        - year: int
+        - count: int
+        - preview_hothash: str
+        - preview_hothashes: list[str] (up to previews, best first)
+        - first_date: datetime
+        - last_date: datetime
+        """
+        return self._aggregate('year', user_id, previews=previews, search_params=search_params)
+    
     def get_month_aggregation(
         self,
         year: int,
-        user_id: Optional[int] = None
+        user_id: Optional[int] = None,
+        previews: int = 1,
+        search_params: Optional[PhotoSearchRequest] = None
     ) -> List[Dict[str, Any]]:
         """
         Aggregate photos by month for a specific year.
@@ -151,96 +240,19 @@ class TimelineRepository:
         - month: int
         - count: int
         - preview_hothash: str
+        - preview_hothashes: list[str] (up to previews, best first)
         - first_date: datetime
         - last_date: datetime
         """
-        visibility_filter = self._build_visibility_filter(user_id)
-        
-        # Subquery for preview selection
-        preview_subquery = (
-            self.db.query(
-                extract('year', Photo.taken_at).label('year'),
-                extract('month', Photo.taken_at).label('month'),
-                Photo.hothash,
-                Photo.rating,
-                Photo.taken_at,
-                func.row_number().over(
-                    partition_by=[
-                        extract('year', Photo.taken_at),
-                        extract('month', Photo.taken_at)
-                    ],
-                    order_by=[
-                        self._get_preview_selection_case(),
-                        Photo.rating.desc().nullslast(),
-                        Photo.taken_at
-                    ]
-                ).label('rn')
-            )
-            .filter(
-                Photo.taken_at.isnot(None),
-                extract('year', Photo.taken_at) == year,
-                visibility_filter
-            )
-            .subquery()
-        )
-        
-        # Main aggregation
-        query = (
-            self.db.query(
-                extract('year', Photo.taken_at).label('year'),
-                extract('month', Photo.taken_at).label('month'),
-                func.count(Photo.id).label('count'),
-                func.min(Photo.taken_at).label('first_date'),
-                func.max(Photo.taken_at).label('last_date')
-            )
-            .filter(
-                Photo.taken_at.isnot(None),
-                extract('year', Photo.taken_at) == year,
-                visibility_filter
-            )
-            .group_by(
-                extract('year', Photo.taken_at),
-                extract('month', Photo.taken_at)
-            )
-            .order_by(extract('month', Photo.taken_at).desc())
-        )
-        
-        results = query.all()
-        
-        # Get preview hashes
-        month_previews = {}
-        preview_results = (
-            self.db.query(
-                preview_subquery.c.month,
-                preview_subquery.c.hothash
-            )
-            .filter(preview_subquery.c.rn == 1)
-            .all()
-        )
-        
-        for month, hothash in preview_results:
-            month_previews[int(month)] = hothash
-        
-        # Combine results
-        timeline = []
-        for year_val, month, count, first_date, last_date in results:
-            month_int = int(month)
-            timeline.append({
-                'year': int(year_val),
-                'month': month_int,
-                'count': count,
-                'preview_hothash': month_previews.get(month_int, ''),
-                'first_date': first_date,
-                'last_date': last_date
-            })
-        
-        return timeline
+        return self._aggregate('month', user_id, year, previews=previews, search_params=search_params)
     
     def get_day_aggregation(
         self,
         year: int,
         month: int,
-        user_id: Optional[int] = None
+        user_id: Optional[int] = None,
+        previews: int = 1,
+        search_params: Optional[PhotoSearchRequest] = None
     ) -> List[Dict[str, Any]]:
         """
         Aggregate photos by day for a specific month.
@@ -251,104 +263,20 @@ class TimelineRepository:
         - day: int
         - count: int
         - preview_hothash: str
+        - preview_hothashes: list[str] (up to previews, best first)
         - first_date: datetime
         - last_date: datetime
         """
-        visibility_filter = self._build_visibility_filter(user_id)
-        
-        # Subquery for preview selection
-        preview_subquery = (
-            self.db.query(
-                extract('year', Photo.taken_at).label('year'),
-                extract('month', Photo.taken_at).label('month'),
-                extract('day', Photo.taken_at).label('day'),
-                Photo.hothash,
-                Photo.rating,
-                Photo.taken_at,
-                func.row_number().over(
-                    partition_by=[
-                        extract('year', Photo.taken_at),
-                        extract('month', Photo.taken_at),
-                        extract('day', Photo.taken_at)
-                    ],
-                    order_by=[
-                        self._get_preview_selection_case(),
-                        Photo.rating.desc().nullslast(),
-                        Photo.taken_at
-                    ]
-                ).label('rn')
-            )
-            .filter(
-                Photo.taken_at.isnot(None),
-                extract('year', Photo.taken_at) == year,
-                extract('month', Photo.taken_at) == month,
-                visibility_filter
-            )
-            .subquery()
-        )
-        
-        # Main aggregation
-        query = (
-            self.db.query(
-                extract('year', Photo.taken_at).label('year'),
-                extract('month', Photo.taken_at).label('month'),
-                extract('day', Photo.taken_at).label('day'),
-                func.count(Photo.id).label('count'),
-                func.min(Photo.taken_at).label('first_date'),
-                func.max(Photo.taken_at).label('last_date')
-            )
-            .filter(
-                Photo.taken_at.isnot(None),
-                extract('year', Photo.taken_at) == year,
-                extract('month', Photo.taken_at) == month,
-                visibility_filter
-            )
-            .group_by(
-                extract('year', Photo.taken_at),
-                extract('month', Photo.taken_at),
-                extract('day', Photo.taken_at)
-            )
-            .order_by(extract('day', Photo.taken_at).desc())
-        )
-        
-        results = query.all()
-        
-        # Get preview hashes
-        day_previews = {}
-        preview_results = (
-            self.db.query(
-                preview_subquery.c.day,
-                preview_subquery.c.hothash
-            )
-            .filter(preview_subquery.c.rn == 1)
-            .all()
-        )
-        
-        for day, hothash in preview_results:
-            day_previews[int(day)] = hothash
-        
-        # Combine results
-        timeline = []
-        for year_val, month_val, day, count, first_date, last_date in results:
-            day_int = int(day)
-            timeline.append({
-                'year': int(year_val),
-                'month': int(month_val),
-                'day': day_int,
-                'count': count,
-                'preview_hothash': day_previews.get(day_int, ''),
-                'first_date': first_date,
-                'last_date': last_date
-            })
-        
-        return timeline
+        return self._aggregate('day', user_id, year, month, previews=previews, search_params=search_params)
     
     def get_hour_aggregation(
         self,
         year: int,
         month: int,
         day: int,
-        user_id: Optional[int] = None
+        user_id: Optional[int] = None,
+        previews: int = 1,
+        search_params: Optional[PhotoSearchRequest] = None
     ) -> List[Dict[str, Any]]:
         """
         Aggregate photos by hour for a specific day.
@@ -360,107 +288,43 @@ class TimelineRepository:
         - hour: int
         - count: int
         - preview_hothash: str
+        - preview_hothashes: list[str] (up to previews, best first)
         - first_date: datetime
         - last_date: datetime
         """
-        visibility_filter = self._build_visibility_filter(user_id)
-        
-        # Subquery for preview selection
-        preview_subquery = (
-            self.db.query(
-                extract('year', Photo.taken_at).label('year'),
-                extract('month', Photo.taken_at).label('month'),
-                extract('day', Photo.taken_at).label('day'),
-                extract('hour', Photo.taken_at).label('hour'),
-                Photo.hothash,
-                Photo.rating,
-                Photo.taken_at,
-                func.row_number().over(
-                    partition_by=[
-                        extract('year', Photo.taken_at),
-                        extract('month', Photo.taken_at),
-                        extract('day', Photo.taken_at),
-                        extract('hour', Photo.taken_at)
-                    ],
-                    order_by=[
-                        self._get_preview_selection_case(),
-                        Photo.rating.desc().nullslast(),
-                        Photo.taken_at
-                    ]
-                ).label('rn')
-            )
-            .filter(
-                Photo.taken_at.isnot(None),
-                extract('year', Photo.taken_at) == year,
-                extract('month', Photo.taken_at) == month,
-                extract('day', Photo.taken_at) == day,
-                visibility_filter
-            )
-            .subquery()
-        )
-        
-        # Main aggregation
-        query = (
-            self.db.query(
-                extract('year', Photo.taken_at).label('year'),
-                extract('month', Photo.taken_at).label('month'),
-                extract('day', Photo.taken_at).label('day'),
-                extract('hour', Photo.taken_at).label('hour'),
-                func.count(Photo.id).label('count'),
-                func.min(Photo.taken_at).label('first_date'),
-                func.max(Photo.taken_at).label('last_date')
-            )
-            .filter(
-                Photo.taken_at.isnot(None),
-                extract('year', Photo.taken_at) == year,
-                extract('month', Photo.taken_at) == month,
-                extract('day', Photo.taken_at) == day,
-                visibility_filter
-            )
-            .group_by(
-                extract('year', Photo.taken_at),
-                extract('month', Photo.taken_at),
-                extract('day', Photo.taken_at),
-                extract('hour', Photo.taken_at)
-            )
-            .order_by(extract('hour', Photo.taken_at).desc())
-        )
-        
-        results = query.all()
-        
-        # Get preview hashes
-        hour_previews = {}
-        preview_results = (
-            self.db.query(
-                preview_subquery.c.hour,
-                preview_subquery.c.hothash
-            )
-            .filter(preview_subquery.c.rn == 1)
-            .all()
-        )
-        
-        for hour, hothash in preview_results:
-            hour_previews[int(hour)] = hothash
-        
-        # Combine results
-        timeline = []
-        for year_val, month_val, day_val, hour, count, first_date, last_date in results:
-            hour_int = int(hour)
-            timeline.append({
-                'year': int(year_val),
-                'month': int(month_val),
-                'day': int(day_val),
-                'hour': hour_int,
-                'count': count,
-                'preview_hothash': hour_previews.get(hour_int, ''),
-                'first_date': first_date,
-                'last_date': last_date
-            })
+        return self._aggregate('hour', user_id, year, month, day, previews=previews, search_params=search_params)
+    
+    def get_histogram(
+        self,
+        granularity: str,
+        user_id: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Count photos per bucket over the whole library in one grouped pass.
         
-        return timeline
+        Returns list of dicts with year[, month, day, hour] and count, oldest first.
+        """
+        levels = TIME_PARTS[:TIME_PARTS.index(granularity) + 1]
+        parts = [extract(level, Photo.taken_at) for level in levels]
+        
+        rows = self.db.execute(
+            select(*[part.label(level) for part, level in zip(parts, levels)], func.count().label('count'))
+            .where(Photo.taken_at.isnot(None), self._build_visibility_filter(user_id))
+            .group_by(*parts)
+            .order_by(*parts)
+        ).mappings()
+        return [{**{level: int(row[level]) for level in levels}, 'count': row['count']} for row in rows]
     
-    def count_total_photos(self, user_id: Optional[int] = None) -> int:
-        """Count total accessible photos."""
+    def count_total_photos(
+        self,
+        user_id: Optional[int] = None,
+        search_params: Optional[PhotoSearchRequest] = None
+    ) -> int:
+        """Count total accessible photos (matching search_params, if given)."""
+        if search_params is not None:
+            search_photos = self._search_cte(user_id, search_params)
+            return self.db.execute(select(func.count()).select_from(search_photos)).scalar_one()
+        
         visibility_filter = self._build_visibility_filter(user_id)
         
         return (
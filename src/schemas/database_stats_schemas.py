@@ -1,6 +1,7 @@
 """
 Database statistics schemas
 """
+from datetime import datetime
 from pydantic import BaseModel, Field
 from typing import Dict
 
@@ -29,3 +30,5 @@ class DatabaseStatsResponse(BaseModel):
     database_file: str = Field(..., description="Database file path")
     database_size_bytes: int = Field(..., ge=0, description="Total database file size in bytes")
     database_size_mb: float = Field(..., ge=0, description="Total database file size in MB")
+    generated_at: datetime = Field(..., description="When this snapshot was collected (UTC)")
+    age_seconds: float = Field(..., ge=0, description="Snapshot age in seconds at response time")
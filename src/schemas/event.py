@@ -56,12 +56,14 @@ class EventResponse(EventBase):
 class EventWithPhotos(EventResponse):
     """Event with photo count"""
     photo_count: int = Field(..., description="Number of photos directly in this event")
+    total_photo_count: int = Field(..., description="Number of photos in this event and all its descendants")
 
 
 class EventTreeNode(EventResponse):
     """Event node in hierarchy tree with children"""
     children: List['EventTreeNode'] = Field(default_factory=list, description="Child events")
     photo_count: int = Field(0, description="Number of photos directly in this event (not recursive)")
+    total_photo_count: int = Field(0, description="Number of photos in this event and all its descendants")
     
     model_config = ConfigDict(from_attributes=True)
 
@@ -77,5 +79,91 @@ class EventMoveRequest(BaseModel):
     new_parent_id: Optional[int] = Field(None, description="New parent event ID (null for root level)")
 
 
-# Allow forward references for recursive EventTreeNode
+class EventPhotoSummary(BaseModel):
+    """Lightweight photo row for event galleries (no hotpreview/EXIF blobs)"""
+    hothash: str
+    taken_at: Optional[datetime] = None
+    rating: Optional[int] = None
+    width: Optional[int] = None
+    height: Optional[int] = None
+    gps_latitude: Optional[float] = None
+    gps_longitude: Optional[float] = None
+    visibility: str
+    event_id: Optional[int] = None
+    
+    model_config = ConfigDict(from_attributes=True)
+
+
+class EventPhotoPage(BaseModel):
+    """One page of event photos ordered by taken_at (undated photos last)"""
+    photos: List[EventPhotoSummary] = Field(..., description="Photos on this page")
+    next_cursor: Optional[str] = Field(None, description="Pass as cursor to get the next page (null = last page)")
+    limit: int = Field(..., description="Maximum number of photos per page")
+
+
+class EventClusteringRequest(BaseModel):
+    """Thresholds for proposing a trip > day > location hierarchy from photo times and GPS"""
+    model_config = ConfigDict(extra='forbid')
+    
+    trip_gap_hours: float = Field(36, gt=0, description="Start a new trip after this many hours without photos")
+    trip_jump_km: float = Field(300, gt=0, description="Start a new trip when consecutive photos are this far apart")
+    day_gap_hours: float = Field(8, gt=0, description="Start a new day after this many hours without photos (also at midnight)")
+    day_jump_km: float = Field(100, gt=0, description="Start a new day when consecutive photos are this far apart")
+    location_gap_hours: float = Field(2, gt=0, description="Start a new location after this many hours without photos")
+    location_jump_km: float = Field(2, gt=0, description="Start a new location when consecutive photos are this far apart")
+    min_trip_photos: int = Field(10, ge=1, description="Smaller trips are not proposed (their photos stay unassigned)")
+    min_photos: int = Field(3, ge=1, description="Smaller days/locations are not proposed (their photos stay in the parent)")
+    only_unassigned: bool = Field(True, description="Only cluster photos that are not in an event yet")
+
+
+class ProposedEvent(BaseModel):
+    """Event the clustering would create"""
+    name: str
+    level: str = Field(..., description="trip, day or location")
+    start_date: datetime
+    end_date: datetime
+    gps_latitude: Optional[float] = Field(None, description="Mean latitude of the geotagged photos")
+    gps_longitude: Optional[float] = Field(None, description="Mean longitude of the geotagged photos")
+    photo_count: int = Field(..., description="Photos in this event and its children")
+    children: List['ProposedEvent'] = Field(default_factory=list)
+
+
+class EventProposalResponse(BaseModel):
+    """Proposed event hierarchy"""
+    events: List[ProposedEvent] = Field(..., description="Proposed trips with nested days/locations")
+    total_photos: int = Field(..., description="Dated photos considered")
+    clustered_photos: int = Field(..., description="Photos that would be assigned to an event")
+
+
+class EventProposalApplyResponse(BaseModel):
+    """Result of creating the proposed events"""
+    events_created: int
+    photos_assigned: int
+
+class EventRangeAssignRequest(BaseModel):
+    """Options for assigning photos to events by the events' date range"""
+    model_config = ConfigDict(extra='forbid')
+    
+    radius_km: Optional[float] = Field(None, gt=0, description="Only photos within this distance of the event's GPS position")
+    overwrite: bool = Field(False, description="Also move photos that are already in another event (default: fill empty only)")
+    dry_run: bool = Field(False, description="Only count the photos that would be assigned")
+
+
+class EventRangeAssignment(BaseModel):
+    """Photos assigned to one event"""
+    event_id: int
+    name: str
+    photo_count: int = Field(..., description="Photos (that would be) moved into this event")
+
+
+class EventRangeAssignResponse(BaseModel):
+    """Result of assigning photos by date range"""
+    events: List[EventRangeAssignment] = Field(..., description="Per considered event")
+    photos_assigned: int = Field(..., description="Photos (that would be) moved in total")
+    dry_run: bool
+
+
+# Allow forward references for recursive EventTreeNode and ProposedEvent
 EventTreeNode.model_rebuild()
+ProposedEvent.model_rebuild()
+
@@ -4,7 +4,7 @@ Backend-specific schemas for Photo API.
 PhotoCreateSchema and ImageFileCreateSchema are now imported from imalink-schemas package.
 This file contains backend-specific wrappers and response schemas.
 """
-from typing import Optional, Any
+from typing import Optional, Any, List, Literal
 from datetime import datetime
 from pydantic import BaseModel, Field
 
@@ -62,6 +62,104 @@ class PhotoCreateResponse(PhotoResponse):
         from_attributes = True
 
 
+class PhotoCreateBatchRequest(BaseModel):
+    """
+    Request for creating many Photos in one call (desktop bulk import).
+    
+    Each item is processed like POST /photos/create, but defaults, duplicate
+    checks and the commit are done once for the whole batch.
+    """
+    items: List[PhotoCreateRequest] = Field(
+        ..., min_length=1, max_length=500, description="Photos to create (max 500 per request)"
+    )
+
+
+class PhotoCreateBatchItemResult(BaseModel):
+    """Result for one item in a batch create (same order as the request)"""
+    index: int = Field(..., description="Position of the item in the request")
+    hothash: str
+    status: Literal["created", "duplicate", "error"]
+    photo_id: Optional[int] = Field(None, description="New photo ID, or existing ID for duplicates")
+    error: Optional[str] = Field(None, description="Why the item was not created (status=error)")
+
+
+class PhotoCreateBatchResponse(BaseModel):
+    """Response after batch Photo creation"""
+    total: int
+    created: int
+    duplicates: int
+    errors: int
+    results: List[PhotoCreateBatchItemResult]
+
+
+class HothashExistsRequest(BaseModel):
+    """Hothashes to check before processing files (import pre-check)"""
+    hothashes: List[str] = Field(..., max_length=10000, description="Hothashes to check (max 10000)")
+
+
+class HothashExistsResponse(BaseModel):
+    """Which of the requested hothashes already exist for the user"""
+    checked: int = Field(..., description="Number of distinct hothashes checked")
+    existing: List[str] = Field(..., description="Hothashes that already exist (skip these)")
+    missing_count: int = Field(..., description="Number of hothashes that do not exist yet")
+
+
+class PhotoImportProgressResponse(BaseModel):
+    """Checkpoint of a streaming NDJSON import (resume from committed_line + 1)"""
+    import_id: str
+    committed_line: int = Field(..., description="Last input line whose result is committed (0 = none)")
+    created: int = Field(..., validation_alias="created_count")
+    duplicates: int = Field(..., validation_alias="duplicate_count")
+    errors: int = Field(..., validation_alias="error_count")
+    updated_at: datetime
+    
+    class Config:
+        from_attributes = True
+
+
+class PhotoRegisterJobResponse(BaseModel):
+    """Queued register-image upload (POST /photos/register-image?mode=job)"""
+    id: int
+    status: str = Field(..., description="pending, processing, done or failed")
+    input_channel_id: int
+    filename: str
+    attempts: int = Field(..., description="Processing attempts so far")
+    error: Optional[str] = Field(None, description="Why the job failed (or the last retried error)")
+    photo_id: Optional[int] = Field(None, description="Created (or existing, if duplicate) photo")
+    hothash: Optional[str] = None
+    is_duplicate: bool = False
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    
+    class Config:
+        from_attributes = True
+
+
+class PhotoUploadSessionCreateRequest(BaseModel):
+    """Start a resumable chunked upload (POST /photos/uploads)"""
+    filename: str = Field(..., min_length=1, max_length=255)
+    size: int = Field(..., gt=0, description="Total file size in bytes")
+    content_type: str = Field("image/jpeg", max_length=100)
+    sha256: Optional[str] = Field(
+        None, pattern="^[0-9a-fA-F]{64}$", description="Whole-file SHA256 (hex), verified on finalize"
+    )
+
+
+class PhotoUploadSessionResponse(BaseModel):
+    """State of a resumable upload; continue with PUT ...?offset={offset}"""
+    id: str
+    filename: str
+    size: int
+    offset: int = Field(..., validation_alias="received_bytes", description="Bytes received so far")
+    complete: bool = Field(False, description="All bytes received - ready to finalize")
+    max_chunk_size: int = Field(0, description="Largest accepted chunk in bytes")
+    updated_at: datetime
+    
+    class Config:
+        from_attributes = True
+
+
 # Re-export for convenience
 __all__ = [
     "PhotoCreateSchema",
@@ -70,4 +168,13 @@ __all__ = [
     "PhotoResponse",
     "PhotoCreateRequest",
     "PhotoCreateResponse",
+    "PhotoCreateBatchRequest",
+    "PhotoCreateBatchItemResult",
+    "PhotoCreateBatchResponse",
+    "PhotoImportProgressResponse",
+    "PhotoRegisterJobResponse",
+    "PhotoUploadSessionCreateRequest",
+    "PhotoUploadSessionResponse",
+    "HothashExistsRequest",
+    "HothashExistsResponse",
 ]
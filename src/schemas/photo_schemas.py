@@ -4,7 +4,7 @@ Provides type-safe data models for photo operations
 """
 from typing import Optional, List, TYPE_CHECKING, ForwardRef
 from datetime import datetime
-from pydantic import BaseModel, Field, field_validator, ConfigDict
+from pydantic import BaseModel, Field, field_validator, model_validator, ConfigDict
 
 
 class RelativeCrop(BaseModel):
@@ -267,6 +267,81 @@ class PhotoSearchRequest(BaseModel):
         return v
 
 
+class PhotoBulkPatch(BaseModel):
+    """
+    Field patch for bulk photo updates
+    
+    Only fields present in the request are changed. category, author_id and
+    event_id may be set to null to clear them; rating and visibility may not.
+    """
+    model_config = ConfigDict(extra='forbid')
+    
+    rating: Optional[int] = Field(None, ge=0, le=5, description="User rating")
+    category: Optional[str] = Field(None, max_length=100, description="User-defined category")
+    author_id: Optional[int] = Field(None, description="Author/photographer ID")
+    event_id: Optional[int] = Field(None, description="Event ID")
+    visibility: Optional[str] = Field(None, pattern=r'^(private|space|authenticated|public)$', description="Photo visibility")
+    
+    @model_validator(mode='after')
+    def validate_patch(self):
+        """Require at least one field; rating and visibility cannot be cleared"""
+        if not self.model_fields_set:
+            raise ValueError('patch must contain at least one field')
+        for field in ('rating', 'visibility'):
+            if field in self.model_fields_set and getattr(self, field) is None:
+                raise ValueError(f'{field} cannot be null')
+        return self
+    
+    def values(self) -> dict:
+        """Column values to set (fields present in the request)"""
+        return self.model_dump(include=self.model_fields_set)
+
+
+class PhotoBulkSelection(BaseModel):
+    """
+    Photo selection for bulk operations
+    
+    Either an explicit hothash list or a search (all matching own photos;
+    offset, limit and sorting are ignored).
+    """
+    model_config = ConfigDict(extra='forbid')
+    
+    hothashes: Optional[List[str]] = Field(None, min_length=1, max_length=50000, description="Selected photos")
+    search: Optional[PhotoSearchRequest] = Field(None, description="Select all own photos matching this search")
+    
+    @model_validator(mode='after')
+    def validate_selection(self):
+        """Exactly one of hothashes and search"""
+        if (self.hothashes is None) == (self.search is None):
+            raise ValueError('Provide exactly one of hothashes or search')
+        return self
+
+
+class PhotoBulkUpdateRequest(PhotoBulkSelection):
+    """Request model for PATCH /photos/bulk"""
+    patch: PhotoBulkPatch
+
+
+class PhotoBulkUpdateResponse(BaseModel):
+    """Result of a bulk photo update"""
+    matched: int = Field(description="Number of own photos selected")
+    updated: int = Field(description="Number of rows updated")
+    fields: List[str] = Field(description="Fields that were set")
+    not_found: List[str] = Field(default_factory=list, description="Hothashes that are not the user's photos")
+
+
+class PhotoBulkDeleteRequest(PhotoBulkSelection):
+    """Request model for POST /photos/bulk-delete"""
+    pass
+
+
+class PhotoBulkDeleteResponse(BaseModel):
+    """Result of a bulk delete (files and dependent rows are purged in the background)"""
+    matched: int = Field(description="Number of own photos selected")
+    deleted: int = Field(description="Number of photos marked as deleted")
+    not_found: List[str] = Field(default_factory=list, description="Hothashes that are not the user's photos")
+
+
 # Import TagSummary after PhotoResponse is defined to avoid circular imports
 # Then rebuild PhotoResponse to include TagSummary in validation
 def _rebuild_models():
@@ -140,3 +140,28 @@ class RenameTagResponse(BaseModel):
     new_name: str
     photo_count: int
     updated_at: datetime
+
+
+class BulkTagRequest(AddTagsRequest):
+    """Request body for applying/removing tags across many photos"""
+    hothashes: List[str] = Field(..., min_length=1, max_length=10000, description="Photos to update (own photos only)")
+    tags: List[str] = Field(..., min_length=1, max_length=100, description="Tag names (normalized like AddTagsRequest)")
+
+
+class BulkTagApplyResponse(BaseModel):
+    """Response after applying tags to many photos"""
+    photos_matched: int = Field(description="Number of hothashes resolved to own photos")
+    not_found: List[str] = Field(default_factory=list, description="Hothashes that are not the user's photos")
+    tags: List[TagSummary]
+    tags_created: int = Field(description="Number of tags that did not exist before")
+    added: int = Field(description="Number of photo-tag associations created")
+    skipped: int = Field(default=0, description="Number of associations that already existed")
+
+
+class BulkTagRemoveResponse(BaseModel):
+    """Response after removing tags from many photos"""
+    photos_matched: int = Field(description="Number of hothashes resolved to own photos")
+    not_found: List[str] = Field(default_factory=list, description="Hothashes that are not the user's photos")
+    tags: List[TagSummary] = Field(description="Existing tags that were matched by name")
+    unknown_tags: List[str] = Field(default_factory=list, description="Tag names the user does not have")
+    removed: int = Field(description="Number of photo-tag associations deleted")
@@ -2,9 +2,11 @@
 Timeline API schemas for hierarchical time-based photo navigation.
 """
 from typing import Optional, Literal
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from datetime import datetime
 
+from src.schemas.photo_schemas import PhotoSearchRequest
+
 
 class DateRange(BaseModel):
     """Date range for a timeline bucket."""
@@ -12,6 +14,12 @@ class DateRange(BaseModel):
     last: datetime = Field(..., description="Timestamp of latest photo in bucket")
 
 
+class TimelinePreview(BaseModel):
+    """A representative photo of a timeline bucket."""
+    hothash: str = Field(..., description="HotHash of the photo")
+    url: str = Field(..., description="URL to hotpreview of the photo")
+
+
 class TimelineBucket(BaseModel):
     """A time bucket with aggregated photo data."""
     year: int = Field(..., description="Year (1900-2100)")
@@ -21,6 +29,10 @@ class TimelineBucket(BaseModel):
     count: int = Field(..., description="Number of photos in this bucket")
     preview_hothash: str = Field(..., description="HotHash of representative photo")
     preview_url: str = Field(..., description="URL to hotpreview of representative photo")
+    previews: list[TimelinePreview] = Field(
+        default_factory=list,
+        description="Representative photos, best first (up to the requested number of previews)"
+    )
     date_range: DateRange = Field(..., description="Date range of photos in bucket")
     
     class Config:
@@ -79,3 +91,41 @@ class TimelineResponse(BaseModel):
                 }
             }
         }
+
+
+class TimelineSearchRequest(BaseModel):
+    """Timeline of the photos matching a photo search."""
+    model_config = ConfigDict(extra='forbid')
+    
+    granularity: Literal["year", "month", "day", "hour"] = Field("year", description="Time bucket granularity")
+    year: Optional[int] = Field(None, ge=1900, le=2100, description="Filter to specific year (required for month/day/hour)")
+    month: Optional[int] = Field(None, ge=1, le=12, description="Filter to specific month (required for day/hour)")
+    day: Optional[int] = Field(None, ge=1, le=31, description="Filter to specific day (required for hour)")
+    previews: int = Field(1, ge=1, le=9, description="Representative photos per bucket")
+    search: PhotoSearchRequest = Field(
+        default_factory=PhotoSearchRequest,
+        description="Photo search criteria (pagination and sorting fields are ignored)"
+    )
+
+
+class TimelineHistogramResponse(BaseModel):
+    """Photo counts for every bucket of the library, run-length encoded."""
+    granularity: Literal["year", "month", "day", "hour"] = Field(..., description="Bin size")
+    start: Optional[datetime] = Field(None, description="Start of the first bin (None when there are no photos)")
+    bins: int = Field(..., description="Number of consecutive bins from start to the last bin with photos")
+    total_photos: int = Field(..., description="Total photos in the histogram")
+    runs: list[int] = Field(
+        ...,
+        description="Flat run list [count, run_length, count, run_length, ...] covering all bins"
+    )
+    
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "granularity": "day",
+                "start": "2024-06-01T00:00:00",
+                "bins": 10,
+                "total_photos": 23,
+                "runs": [5, 1, 0, 6, 3, 2, 12, 1]
+            }
+        }
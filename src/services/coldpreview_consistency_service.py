@@ -0,0 +1,292 @@
+"""
+Coldpreview Consistency Service - Cross-checks coldpreview storage against photos
+
+Coldpreview bytes and Photo.coldpreview_path can drift apart:
+- Orphans: stored coldpreviews whose photo no longer exists
+  (photo rows are deleted by cascade, the coldpreview is not)
+- Unlinked: photo exists but its coldpreview_path is empty or points elsewhere
+- Dangling: Photo.coldpreview_path set but the coldpreview is missing from storage
+
+The scan walks the 256 top-level shard directories ("00".."ff") in parallel worker
+threads and checks each shard against the database with batched IN queries. Progress
+is written to a checkpoint file after every shard, so a scan over a very large store
+can run in several smaller passes (max_shards) and resume where it stopped.
+
+Orphan deletion skips coldpreviews written less than min_age_seconds ago, because
+photo creation stores the coldpreview before the photo row is committed. The segment
+backend ages records by their segment's mtime, so orphans in the active segment are
+only deleted once it has been idle for min_age_seconds. Orphans of unknown age are
+reported but never deleted.
+"""
+import json
+import os
+import time
+import logging
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from src.models import Photo
+from src.utils.coldpreview_repository import ColdpreviewRepository
+from src.utils.coldpreview_storage import ShardedFileStorage
+
+logger = logging.getLogger(__name__)
+
+SHARD_PREFIXES = [f"{i:02x}" for i in range(256)]
+CHECKPOINT_FILENAME = ".consistency_checkpoint.json"
+SAMPLE_LIMIT = 100  # Max hothashes listed per category in a report
+
+
+class ColdpreviewConsistencyService:
+    """Scans coldpreview storage for orphans and dangling references"""
+
+    def __init__(self, db: Session, repository: Optional[ColdpreviewRepository] = None):
+        self.db = db
+        self.repository = repository or ColdpreviewRepository()
+        self.storage = self.repository.storage
+        self.checkpoint_path = self.repository.base_path / CHECKPOINT_FILENAME
+
+    # ----- Checkpoint -----
+
+    def _new_checkpoint(self) -> Dict[str, Any]:
+        return {
+            "started_at": datetime.utcnow().isoformat(),
+            "completed_shards": [],
+            "last_photo_id": 0,
+            "dangling_complete": False,
+            "totals": {
+                "files_scanned": 0,
+                "photos_checked": 0,
+                "orphans": 0,
+                "orphans_deleted": 0,
+                "unlinked": 0,
+                "unlinked_fixed": 0,
+                "dangling": 0,
+                "dangling_fixed": 0,
+            },
+            "samples": {"orphans": [], "unlinked": [], "dangling": []},
+        }
+
+    def load_checkpoint(self) -> Dict[str, Any]:
+        """Load checkpoint from previous (incomplete) scan, or start a new one"""
+        if self.checkpoint_path.exists():
+            try:
+                return json.loads(self.checkpoint_path.read_text())
+            except (OSError, ValueError) as e:
+                logger.warning(f"Ignoring unreadable consistency checkpoint: {e}")
+        return self._new_checkpoint()
+
+    def _save_checkpoint(self, checkpoint: Dict[str, Any]) -> None:
+        tmp_path = self.checkpoint_path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(checkpoint))
+        os.replace(tmp_path, self.checkpoint_path)
+
+    def reset_checkpoint(self) -> None:
+        """Discard scan progress so the next scan starts from scratch"""
+        self.checkpoint_path.unlink(missing_ok=True)
+
+    # ----- Storage listing (runs in worker threads) -----
+
+    def _list_file_shard(self, prefix: str) -> List[Tuple[str, str, float]]:
+        """List (hothash, relative_path, mtime) for one top-level shard directory"""
+        shard_dir = self.repository.base_path / prefix
+        entries = []
+        if not shard_dir.is_dir():
+            return entries
+
+        with os.scandir(shard_dir) as subdirs:
+            for subdir in subdirs:
+                if not subdir.is_dir():
+                    continue
+                with os.scandir(subdir.path) as files:
+                    for entry in files:
+                        if not entry.name.endswith(".jpg"):
+                            continue
+                        try:
+                            mtime = entry.stat().st_mtime
+                        except OSError:
+                            continue  # Deleted during scan
+                        entries.append((
+                            entry.name[:-4],
+                            f"{prefix}/{subdir.name}/{entry.name}",
+                            mtime
+                        ))
+        return entries
+
+    def _iter_shards(self, prefixes: List[str], workers: int):
+        """Yield (prefix, entries) as shards finish listing"""
+        if isinstance(self.storage, ShardedFileStorage):
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="coldpreview-scan") as pool:
+                futures = {pool.submit(self._list_file_shard, prefix): prefix for prefix in prefixes}
+                for future in as_completed(futures):
+                    yield futures[future], future.result()
+        else:
+            # Index-based backends list everything from memory in one pass
+            grouped: Dict[str, List[Tuple[str, str, Optional[float]]]] = defaultdict(list)
+            wanted = set(prefixes)
+            for hothash in self.storage.iter_hothashes():
+                if hothash[:2] in wanted:
+                    grouped[hothash[:2]].append((
+                        hothash,
+                        self.storage.relative_path_for(hothash),
+                        self.storage.modified_at(hothash)
+                    ))
+            for prefix in prefixes:
+                yield prefix, grouped.get(prefix, [])
+
+    # ----- Cross-checks (main thread, owns the Session) -----
+
+    def _check_shard(
+        self,
+        entries: List[Tuple[str, str, Optional[float]]],
+        checkpoint: Dict[str, Any],
+        delete_orphans: bool,
+        fix: bool,
+        min_age_seconds: int,
+        batch_size: int
+    ) -> None:
+        totals = checkpoint["totals"]
+        samples = checkpoint["samples"]
+        now = time.time()
+
+        for start in range(0, len(entries), batch_size):
+            batch = entries[start:start + batch_size]
+            rows = (
+                self.db.query(Photo.id, Photo.hothash, Photo.coldpreview_path)
+                .filter(Photo.hothash.in_([hothash for hothash, _, _ in batch]))
+                .all()
+            )
+            photos = {row.hothash: row for row in rows}
+            relink: Dict[int, str] = {}
+
+            for hothash, relative_path, mtime in batch:
+                totals["files_scanned"] += 1
+                row = photos.get(hothash)
+
+                if row is None:
+                    totals["orphans"] += 1
+                    if len(samples["orphans"]) < SAMPLE_LIMIT:
+                        samples["orphans"].append(hothash)
+                    # Grace period for in-flight imports (files backend only, see module docstring)
+                    if delete_orphans and mtime is not None and now - mtime >= min_age_seconds:
+                        if self.storage.delete_by_hash(hothash):
+                            totals["orphans_deleted"] += 1
+                elif row.coldpreview_path != relative_path:
+                    totals["unlinked"] += 1
+                    if len(samples["unlinked"]) < SAMPLE_LIMIT:
+                        samples["unlinked"].append(hothash)
+                    if fix:
+                        relink[row.id] = relative_path
+
+            if relink:
+                self.db.bulk_update_mappings(
+                    Photo, [{"id": photo_id, "coldpreview_path": path} for photo_id, path in relink.items()]
+                )
+                self.db.commit()
+                totals["unlinked_fixed"] += len(relink)
+
+    def _check_dangling(self, checkpoint: Dict[str, Any], fix: bool, workers: int, batch_size: int) -> None:
+        """Find photos whose coldpreview_path points at missing storage (keyset-paginated by id)"""
+        totals = checkpoint["totals"]
+        samples = checkpoint["samples"]
+
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="coldpreview-scan") as pool:
+            while True:
+                rows = (
+                    self.db.query(Photo.id, Photo.hothash, Photo.coldpreview_path)
+                    .filter(Photo.id > checkpoint["last_photo_id"])
+                    .filter(Photo.coldpreview_path.isnot(None))
+                    .order_by(Photo.id)
+                    .limit(batch_size)
+                    .all()
+                )
+                if not rows:
+                    break
+
+                exists = list(pool.map(lambda row: self.storage.exists(row.coldpreview_path), rows))
+                missing = [row for row, found in zip(rows, exists) if not found]
+
+                totals["photos_checked"] += len(rows)
+                totals["dangling"] += len(missing)
+                for row in missing:
+                    if len(samples["dangling"]) < SAMPLE_LIMIT:
+                        samples["dangling"].append(row.hothash)
+
+                if fix and missing:
+                    self.db.query(Photo).filter(Photo.id.in_([row.id for row in missing])).update(
+                        {Photo.coldpreview_path: None}, synchronize_session=False
+                    )
+                    self.db.commit()
+                    totals["dangling_fixed"] += len(missing)
+
+                checkpoint["last_photo_id"] = rows[-1].id
+                self._save_checkpoint(checkpoint)
+
+        checkpoint["dangling_complete"] = True
+
+    # ----- Public API -----
+
+    def scan(
+        self,
+        delete_orphans: bool = False,
+        fix: bool = False,
+        workers: int = 8,
+        max_shards: Optional[int] = None,
+        resume: bool = True,
+        min_age_seconds: int = 3600,
+        batch_size: int = 500
+    ) -> Dict[str, Any]:
+        """
+        Run (or continue) a consistency scan
+
+        Args:
+            delete_orphans: Delete coldpreviews that have no photo
+            fix: Relink unlinked coldpreviews and clear dangling coldpreview_path values
+            workers: Worker threads for directory walking and existence checks
+            max_shards: Stop after this many shards (None = all); rerun to continue
+            resume: Continue from checkpoint (False = start over)
+            min_age_seconds: Never delete orphans younger than this (in-flight imports)
+            batch_size: Hothashes per IN query / photos per dangling batch
+
+        Returns:
+            Report with totals, samples and progress (complete=False if more to do)
+        """
+        if not resume:
+            self.reset_checkpoint()
+        checkpoint = self.load_checkpoint()
+
+        completed = set(checkpoint["completed_shards"])
+        pending = [prefix for prefix in SHARD_PREFIXES if prefix not in completed]
+        if max_shards is not None:
+            pending = pending[:max_shards]
+
+        for prefix, entries in self._iter_shards(pending, workers):
+            self._check_shard(entries, checkpoint, delete_orphans, fix, min_age_seconds, batch_size)
+            checkpoint["completed_shards"].append(prefix)
+            self._save_checkpoint(checkpoint)
+
+        shards_complete = len(checkpoint["completed_shards"]) == len(SHARD_PREFIXES)
+        if shards_complete and not checkpoint["dangling_complete"]:
+            self._check_dangling(checkpoint, fix, workers, batch_size)
+
+        complete = shards_complete and checkpoint["dangling_complete"]
+        checkpoint["finished_at"] = datetime.utcnow().isoformat() if complete else None
+
+        if complete:
+            # Next scan starts fresh
+            self.reset_checkpoint()
+        else:
+            self._save_checkpoint(checkpoint)
+
+        return {
+            "complete": complete,
+            "started_at": checkpoint["started_at"],
+            "finished_at": checkpoint["finished_at"],
+            "shards_completed": len(checkpoint["completed_shards"]),
+            "shards_total": len(SHARD_PREFIXES),
+            "totals": checkpoint["totals"],
+            "samples": checkpoint["samples"],
+        }
@@ -0,0 +1,181 @@
+"""
+Database Stats Service - Background-refreshed database and storage statistics
+
+GET /database-stats is unauthenticated and polled by monitoring. Counting every
+table and sizing it is far too expensive to run per request, so statistics are
+collected by a background thread on an interval and served from a snapshot.
+Coldpreview storage totals are kept incrementally by the storage backend; every
+DATABASE_STATS_STORAGE_RECOUNT_EVERY refreshes they are recounted from disk.
+"""
+import os
+import threading
+import logging
+from datetime import datetime
+from typing import Dict, Optional
+
+from sqlalchemy import text, inspect
+from sqlalchemy.orm import Session
+
+from src.core.config import Config
+from src.schemas.database_stats_schemas import DatabaseStatsResponse, TableStats, StorageStats
+
+logger = logging.getLogger(__name__)
+
+
+class DatabaseStatsCollector:
+    """Collects database/storage statistics and keeps the latest snapshot"""
+
+    def __init__(self):
+        self._snapshot: Optional[DatabaseStatsResponse] = None
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+        self._refresh_count = 0
+
+    def collect_table_stats(self, db: Session) -> Dict[str, TableStats]:
+        """Count records and estimate disk size for every table"""
+        db_url = Config.DATABASE_URL
+        inspector = inspect(db.bind)
+        tables_stats: Dict[str, TableStats] = {}
+
+        for table_name in inspector.get_table_names():
+            try:
+                result = db.execute(text(f"SELECT COUNT(*) FROM {table_name}"))
+                record_count = result.scalar() or 0
+
+                # Get table size - database specific
+                size_bytes = 0
+                if db_url.startswith("sqlite"):
+                    # For SQLite, get approximate size using DBSTAT (if available)
+                    try:
+                        result = db.execute(text(
+                            f"SELECT SUM(pgsize) FROM dbstat WHERE name='{table_name}'"
+                        ))
+                        size_bytes = result.scalar() or 0
+                    except Exception:
+                        # Fallback for SQLite
+                        db.rollback()
+                        size_bytes = record_count * 1024
+                else:
+                    # For PostgreSQL, use pg_total_relation_size
+                    try:
+                        result = db.execute(text(
+                            f"SELECT pg_total_relation_size('{table_name}')"
+                        ))
+                        size_bytes = result.scalar() or 0
+                    except Exception:
+                        # Fallback: rough estimate
+                        db.rollback()
+                        size_bytes = record_count * 1024
+
+                tables_stats[table_name] = TableStats(
+                    name=table_name,
+                    record_count=record_count,
+                    size_bytes=size_bytes,
+                    size_mb=round(size_bytes / (1024 * 1024), 2)
+                )
+            except Exception as e:
+                logger.error(f"Failed to query table {table_name}: {e}")
+                db.rollback()
+                continue
+
+        return tables_stats
+
+    def collect_coldstorage_stats(self, recount: bool = False) -> StorageStats:
+        """
+        Coldpreview storage totals (maintained incrementally by the storage backend)
+
+        recount=True walks the stored data first to correct drifted counters.
+        """
+        from src.utils.coldpreview_repository import ColdpreviewRepository
+        repository = ColdpreviewRepository()
+        if recount:
+            repository.storage.recount()
+        repo_stats = repository.get_repository_stats()
+        size_bytes = repo_stats["total_size_bytes"]
+
+        return StorageStats(
+            path=repo_stats["base_path"],
+            total_files=repo_stats["total_files"],
+            total_size_bytes=size_bytes,
+            total_size_mb=round(size_bytes / (1024 * 1024), 2),
+            total_size_gb=round(size_bytes / (1024 * 1024 * 1024), 2)
+        )
+
+    def refresh(self) -> DatabaseStatsResponse:
+        """Collect fresh statistics and replace the snapshot"""
+        from src.database.connection import SessionLocal
+
+        # Only one collection at a time
+        with self._refresh_lock:
+            self._refresh_count += 1
+            recount_every = Config.DATABASE_STATS_STORAGE_RECOUNT_EVERY
+            recount = recount_every > 0 and self._refresh_count % recount_every == 0
+
+            db_url = Config.DATABASE_URL
+            db_file_path = db_url.replace("sqlite:///", "") if db_url.startswith("sqlite:///") else "unknown"
+            db_file_size_bytes = os.path.getsize(db_file_path) if os.path.exists(db_file_path) else 0
+
+            db = SessionLocal()
+            try:
+                tables_stats = self.collect_table_stats(db)
+            finally:
+                db.close()
+
+            snapshot = DatabaseStatsResponse(
+                tables=tables_stats,
+                coldstorage=self.collect_coldstorage_stats(recount=recount),
+                database_file=db_file_path,
+                database_size_bytes=db_file_size_bytes,
+                database_size_mb=round(db_file_size_bytes / (1024 * 1024), 2),
+                generated_at=datetime.utcnow(),
+                age_seconds=0.0
+            )
+
+            with self._lock:
+                self._snapshot = snapshot
+            return snapshot
+
+    def get_snapshot(self) -> DatabaseStatsResponse:
+        """
+        Get latest snapshot with its current age
+
+        Collects synchronously only if no snapshot exists yet (e.g. refresher not started).
+        """
+        with self._lock:
+            snapshot = self._snapshot
+        if snapshot is None:
+            snapshot = self.refresh()
+
+        age = (datetime.utcnow() - snapshot.generated_at).total_seconds()
+        return snapshot.model_copy(update={"age_seconds": round(age, 1)})
+
+    def start(self, interval_seconds: int) -> None:
+        """Start background refresh thread (first refresh runs immediately)"""
+        if self._thread is not None or interval_seconds <= 0:
+            return
+        self._stop_event.clear()
+
+        def run():
+            while True:
+                try:
+                    self.refresh()
+                except Exception as e:
+                    logger.error(f"Failed to refresh database stats: {e}", exc_info=True)
+                if self._stop_event.wait(interval_seconds):
+                    break
+
+        self._thread = threading.Thread(target=run, name="database-stats-refresher", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop background refresh thread"""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+
+# Global collector instance
+database_stats_collector = DatabaseStatsCollector()
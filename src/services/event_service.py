@@ -1,16 +1,23 @@
 """
 Service layer for Event business logic
 """
-from typing import List, Optional
+from collections import defaultdict
+from datetime import datetime, time, timedelta
+from typing import Dict, List, Optional
 from sqlalchemy.orm import Session
 
 from src.repositories.event_repository import EventRepository
+from src.repositories.photo_repository import PhotoRepository
 from src.models.event import Event
 from src.schemas.event import (
     EventCreate, EventUpdate, EventResponse, EventTreeNode, 
-    EventTreeResponse, EventWithPhotos
+    EventTreeResponse, EventWithPhotos, EventPhotoPage, EventPhotoSummary,
+    EventClusteringRequest, EventProposalResponse, EventProposalApplyResponse, ProposedEvent,
+    EventRangeAssignRequest, EventRangeAssignment, EventRangeAssignResponse
 )
 from src.core.exceptions import NotFoundError, ValidationError, AuthorizationError
+from src.utils.cursor import decode_cursor, encode_cursor
+from src.utils.event_clustering import Cluster, ClusterLevel, bounding_box, cluster_points, haversine_km
 
 
 class EventService:
@@ -56,16 +63,30 @@ class EventService:
         """
         events = self.repo.list_by_user(user_id, parent_id)
         
-        # Add photo counts
+        # Add photo counts (one grouped query, descendants rolled up in memory)
+        photo_counts = self.repo.get_photo_counts(user_id)
+        total_counts = self._roll_up_photo_counts(photo_counts, self.repo.get_parent_ids(user_id))
+        
         result = []
         for event in events:
-            photo_count = self.repo.get_photo_count(event.id, include_descendants=False)
             event_dict = EventResponse.model_validate(event).model_dump()
-            event_dict['photo_count'] = photo_count
+            event_dict['photo_count'] = photo_counts.get(event.id, 0)
+            event_dict['total_photo_count'] = total_counts.get(event.id, 0)
             result.append(EventWithPhotos(**event_dict))
         
         return result
     
+    def _roll_up_photo_counts(self, photo_counts: Dict[int, int], parent_ids: Dict[int, Optional[int]]) -> Dict[int, int]:
+        """Add each event's direct photo count to itself and all its ancestors"""
+        totals = dict.fromkeys(parent_ids, 0)
+        for event_id, count in photo_counts.items():
+            current, seen = event_id, set()
+            while current in totals and current not in seen:
+                totals[current] += count
+                seen.add(current)
+                current = parent_ids[current]
+        return totals
+    
     def get_event_tree(self, user_id: int, root_event_id: Optional[int] = None) -> EventTreeResponse:
         """
         Get hierarchical event tree
@@ -75,14 +96,18 @@ class EventService:
             root_event_id: Start from specific event (None = all roots)
         """
         events = self.repo.get_event_tree(user_id, root_event_id)
+        photo_counts = self.repo.get_photo_counts(user_id)
         
         def build_tree_node(event: Event) -> EventTreeNode:
-            """Recursively build EventTreeNode with photo counts"""
-            photo_count = self.repo.get_photo_count(event.id, include_descendants=False)
+            """Recursively build EventTreeNode with direct and subtree photo counts"""
+            children = [build_tree_node(child) for child in event.children]
             
             node_dict = EventResponse.model_validate(event).model_dump()
-            node_dict['photo_count'] = photo_count
-            node_dict['children'] = [build_tree_node(child) for child in event.children]
+            node_dict['photo_count'] = photo_counts.get(event.id, 0)
+            node_dict['total_photo_count'] = node_dict['photo_count'] + sum(
+                child.total_photo_count for child in children
+            )
+            node_dict['children'] = children
             
             return EventTreeNode(**node_dict)
         
@@ -139,9 +164,213 @@ class EventService:
     
     # Photo operations (simplified for one-to-many)
     
-    def get_event_photos(self, event_id: int, user_id: int, include_descendants: bool = False):
-        """Get photos in event (optionally recursive)"""
+    def get_event_photos(
+        self,
+        event_id: int,
+        user_id: int,
+        include_descendants: bool = False,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        descending: bool = False
+    ) -> EventPhotoPage:
+        """Get one page of photo summaries in event (optionally recursive)"""
         try:
-            return self.repo.get_photos_in_event(event_id, user_id, include_descendants)
+            after = decode_cursor(cursor) if cursor else None
+        except ValueError as e:
+            raise ValidationError(str(e))
+        
+        try:
+            # One extra row tells whether there is a next page
+            rows = self.repo.get_photo_page(
+                event_id, user_id, include_descendants, limit + 1, after, descending
+            )
         except ValueError as e:
             raise NotFoundError("Event", event_id)
+        
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor(rows[-1].taken_at, rows[-1].id)
+        return EventPhotoPage(
+            photos=[EventPhotoSummary.model_validate(row) for row in rows],
+            next_cursor=next_cursor,
+            limit=limit
+        )
+    
+    # Automatic event proposals (spatio-temporal clustering)
+    
+    def _cluster(self, user_id: int, request: EventClusteringRequest):
+        """Load user's photo points and cluster them with the request's thresholds"""
+        levels = (
+            ClusterLevel("trip", request.trip_gap_hours * 3600, request.trip_jump_km, request.min_trip_photos),
+            ClusterLevel(
+                "day", request.day_gap_hours * 3600, request.day_jump_km, request.min_photos, split_on_date=True
+            ),
+            ClusterLevel("location", request.location_gap_hours * 3600, request.location_jump_km, request.min_photos),
+        )
+        points = self.repo.get_photo_points(user_id, only_unassigned=request.only_unassigned)
+        return points, cluster_points(points, levels)
+    
+    def _cluster_values(self, points, cluster: Cluster) -> Dict:
+        """Event column values for a cluster: generated name, time span and GPS centroid"""
+        first = points[cluster.start].taken_at
+        last = points[cluster.end - 1].taken_at
+        if cluster.level == "trip":
+            name = f"Trip {first:%Y-%m-%d}" if first.date() == last.date() else f"Trip {first:%Y-%m-%d} – {last:%Y-%m-%d}"
+        elif cluster.level == "day":
+            name = f"{first:%Y-%m-%d}"
+        else:
+            name = f"{first:%Y-%m-%d %H:%M}"
+        
+        located = [
+            point for point in points[cluster.start:cluster.end]
+            if point.gps_latitude is not None and point.gps_longitude is not None
+        ]
+        return {
+            "name": name,
+            "start_date": first,
+            "end_date": last,
+            "gps_latitude": sum(point.gps_latitude for point in located) / len(located) if located else None,
+            "gps_longitude": sum(point.gps_longitude for point in located) / len(located) if located else None,
+        }
+    
+    def propose_events(self, user_id: int, request: EventClusteringRequest) -> EventProposalResponse:
+        """Propose a trip > day > location hierarchy for user's photos (nothing is written)"""
+        points, clusters = self._cluster(user_id, request)
+        
+        def proposed(cluster: Cluster) -> ProposedEvent:
+            return ProposedEvent(
+                level=cluster.level,
+                photo_count=cluster.photo_count,
+                children=[proposed(child) for child in cluster.children],
+                **self._cluster_values(points, cluster)
+            )
+        
+        return EventProposalResponse(
+            events=[proposed(cluster) for cluster in clusters],
+            total_photos=len(points),
+            clustered_photos=sum(cluster.photo_count for cluster in clusters)
+        )
+    
+    def apply_event_proposal(self, user_id: int, request: EventClusteringRequest) -> EventProposalApplyResponse:
+        """
+        Create the proposed events and move their photos into them
+        
+        Clusters again with the same thresholds, so the result matches
+        propose_events for an unchanged library. Events are bulk-inserted one
+        tree level at a time; photos are assigned with one chunked
+        UPDATE ... SET event_id = CASE id ... END for all events. Nothing is
+        kept if any step fails.
+        """
+        points, clusters = self._cluster(user_id, request)
+        
+        nodes: List[Cluster] = []
+        parents: List[Optional[int]] = []
+        positions: Dict[int, int] = {}
+        for root in clusters:
+            for cluster, parent in root.walk():
+                positions[id(cluster)] = len(nodes)
+                nodes.append(cluster)
+                parents.append(None if parent is None else positions[id(parent)])
+        
+        try:
+            event_ids = self.repo.bulk_create_events(
+                user_id, [self._cluster_values(points, cluster) for cluster in nodes], parents
+            )
+            targets = {
+                points[i].id: event_id
+                for cluster, event_id in zip(nodes, event_ids)
+                for i in cluster.direct_indices()
+            }
+            assigned = PhotoRepository(self.db).bulk_set_event(targets, user_id)
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+        
+        return EventProposalApplyResponse(events_created=len(event_ids), photos_assigned=assigned)
+    
+    # Rule-based assignment by date range
+    
+    @staticmethod
+    def _range_end(end_date: datetime) -> datetime:
+        """Exclusive upper taken_at bound for an event's end_date"""
+        end = end_date.replace(tzinfo=None)
+        if end.time() == time.min:
+            return end + timedelta(days=1)
+        return end + timedelta(microseconds=1)
+    
+    def assign_photos_by_range(
+        self,
+        user_id: int,
+        request: EventRangeAssignRequest,
+        event_id: Optional[int] = None
+    ) -> EventRangeAssignResponse:
+        """
+        Put user's photos taken between an event's start_date and end_date into it
+        
+        Args:
+            user_id: User ID
+            request: GPS radius, overwrite/fill-empty mode and dry run
+            event_id: Single event (None = every event with both dates; with
+                radius_km, only those that have a GPS position)
+        
+        Photos matching several events go to the most specific one (deepest in
+        the hierarchy, then shortest range). Event dates are compared with
+        taken_at as wall-clock times (any timezone is dropped), like EXIF times.
+        An end_date at midnight means the whole of that day (a date-only end);
+        any other end_date is inclusive.
+        Assignment runs as chunked UPDATE ... WHERE id IN (...) per event.
+        """
+        if event_id is not None:
+            event = self.repo.get_by_id(event_id, user_id)
+            if not event:
+                raise NotFoundError("Event", event_id)
+            if event.start_date is None or event.end_date is None:
+                raise ValidationError("Event needs start_date and end_date to assign photos by range")
+            if request.radius_km is not None and (event.gps_latitude is None or event.gps_longitude is None):
+                raise ValidationError("Event needs a GPS position to assign photos by radius")
+            events = [event]
+        else:
+            events = self.repo.get_dated_events(user_id)
+            if request.radius_km is not None:
+                events = [e for e in events if e.gps_latitude is not None and e.gps_longitude is not None]
+        
+        depths = self.repo.get_event_depths(user_id) if len(events) > 1 else {}
+        
+        # photo ID -> (specificity key, event ID, current event ID)
+        chosen: Dict[int, tuple] = {}
+        for event in events:
+            start = event.start_date.replace(tzinfo=None)
+            end = self._range_end(event.end_date)
+            bbox = None
+            if request.radius_km is not None:
+                center = (float(event.gps_latitude), float(event.gps_longitude))
+                bbox = bounding_box(*center, request.radius_km)
+            
+            key = (-depths.get(event.id, 0), end - start, event.id)
+            for row in self.repo.get_photos_in_range(user_id, start, end, not request.overwrite, bbox):
+                if bbox is not None and haversine_km(*center, row.gps_latitude, row.gps_longitude) > request.radius_km:
+                    continue
+                if row.id not in chosen or key < chosen[row.id][0]:
+                    chosen[row.id] = (key, event.id, row.event_id)
+        
+        moves: Dict[int, List[int]] = defaultdict(list)
+        for photo_id, (_, target_id, current_id) in chosen.items():
+            if current_id != target_id:
+                moves[target_id].append(photo_id)
+        
+        if not request.dry_run and moves:
+            photo_repo = PhotoRepository(self.db)
+            for target_id, photo_ids in moves.items():
+                photo_repo.bulk_update(photo_ids, user_id, {"event_id": target_id})
+            self.db.commit()
+        
+        return EventRangeAssignResponse(
+            events=[
+                EventRangeAssignment(event_id=event.id, name=event.name, photo_count=len(moves.get(event.id, ())))
+                for event in events
+            ],
+            photos_assigned=sum(len(photo_ids) for photo_ids in moves.values()),
+            dry_run=request.dry_run
+        )
@@ -0,0 +1,195 @@
+"""
+Hothash Filter Service - Per-user membership filters for POST /photos/exists
+
+Desktop re-scans ask whether thousands of hothashes already exist before sending
+files through imalink-core. Each user's photos.hothash values are kept in an
+in-memory Bloom filter, so most "new" hashes are answered without touching the
+database; only filter positives are confirmed with a batched IN query.
+
+Keeping filters correct:
+- Create: hashes are added right away (add)
+- Delete: Bloom filters cannot remove items, so deletes are only counted
+  (discard); stale entries cause extra positives, never wrong answers, and
+  the filter is rebuilt once too many have piled up
+- Other processes: before each check, photos with id > a sync watermark are
+  added (one indexed query). Ids are assigned at INSERT but become visible at
+  COMMIT, so a lower id can appear after a higher one has been seen. The
+  watermark therefore trails the highest id seen: it only moves up to the
+  highest id seen HOTHASH_FILTER_SYNC_OVERLAP_SECONDS ago, and only after a
+  scan from the old watermark ran once that window had passed. Photos from
+  transactions shorter than the window are never missed.
+
+Filters are built lazily on first use and kept for the HOTHASH_FILTER_MAX_USERS
+most recently used users.
+"""
+import threading
+import time
+import logging
+from collections import OrderedDict, deque
+from typing import Dict, List, Optional
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from src.core.config import Config
+from src.models import Photo
+from src.utils.bloom_filter import BloomFilter
+
+logger = logging.getLogger(__name__)
+
+CONFIRM_CHUNK_SIZE = 1000  # Hothashes per confirming IN query
+REBUILD_STALE_FRACTION = 0.25  # Rebuild when this share of filter entries was deleted
+
+
+class _UserFilter:
+    """Bloom filter for one user plus sync state"""
+
+    def __init__(self, capacity: int, error_rate: float):
+        self.bloom = BloomFilter(capacity, error_rate)
+        self.last_photo_id = 0  # Highest id seen
+        self.sync_from_id = 0  # Catch-up scans start after this id
+        self.checkpoints: "deque[tuple]" = deque()  # (monotonic time, last_photo_id) not yet safe
+        self.removed = 0
+        self.lock = threading.Lock()
+
+    def needs_rebuild(self) -> bool:
+        return (
+            self.bloom.count > self.bloom.capacity
+            or self.removed > self.bloom.count * REBUILD_STALE_FRACTION
+        )
+
+
+class HothashFilterRegistry:
+    """Process-wide registry of per-user hothash filters"""
+
+    def __init__(self, max_users: int, error_rate: float, sync_overlap_seconds: float):
+        self.max_users = max_users
+        self.error_rate = error_rate
+        self.sync_overlap_seconds = sync_overlap_seconds
+        self._filters: "OrderedDict[int, _UserFilter]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    # ----- Maintenance hooks (called by PhotoService) -----
+
+    def add(self, user_id: int, hothashes: List[str]) -> None:
+        """Record newly created photos (no-op if the user's filter is not loaded)"""
+        with self._lock:
+            user_filter = self._filters.get(user_id)
+        if user_filter is not None:
+            with user_filter.lock:
+                user_filter.bloom.update(hothashes)
+
+    def discard(self, user_id: int, count: int = 1) -> None:
+        """Record deleted photos (counted towards rebuild)"""
+        with self._lock:
+            user_filter = self._filters.get(user_id)
+        if user_filter is not None:
+            with user_filter.lock:
+                user_filter.removed += count
+
+    def invalidate(self, user_id: Optional[int] = None) -> None:
+        """Drop filter(s); rebuilt on next use"""
+        with self._lock:
+            if user_id is None:
+                self._filters.clear()
+            else:
+                self._filters.pop(user_id, None)
+
+    # ----- Build / sync -----
+
+    def _load_new_photos(self, db: Session, user_id: int, user_filter: _UserFilter) -> None:
+        """Add photos with id > sync_from_id (initial build or catch-up)"""
+        started = time.monotonic()
+        query = (
+            db.query(Photo.id, Photo.hothash)
+            .filter(Photo.user_id == user_id)
+            .filter(Photo.id > user_filter.sync_from_id)
+            .order_by(Photo.id)
+            .yield_per(10000)
+        )
+        for row in query:
+            # Rows inside the overlap window are seen again; do not count them twice
+            if row.hothash not in user_filter.bloom:
+                user_filter.bloom.add(row.hothash)
+            user_filter.last_photo_id = max(user_filter.last_photo_id, row.id)
+
+        checkpoints = user_filter.checkpoints
+        if user_filter.last_photo_id > (checkpoints[-1][1] if checkpoints else user_filter.sync_from_id):
+            checkpoints.append((started, user_filter.last_photo_id))
+        # Every id up to a checkpoint's was assigned before it; once the window has
+        # passed those rows are committed, and this scan (from the old watermark) saw them
+        while checkpoints and checkpoints[0][0] <= started - self.sync_overlap_seconds:
+            user_filter.sync_from_id = checkpoints.popleft()[1]
+
+    def _build(self, db: Session, user_id: int) -> _UserFilter:
+        count = db.query(func.count(Photo.id)).filter(Photo.user_id == user_id).scalar() or 0
+        # Headroom so imports do not trigger an immediate rebuild
+        user_filter = _UserFilter(capacity=count * 2, error_rate=self.error_rate)
+        self._load_new_photos(db, user_id, user_filter)
+        logger.debug(
+            f"Built hothash filter for user {user_id}: {user_filter.bloom.count} photos, "
+            f"{user_filter.bloom.size_bytes} bytes"
+        )
+        return user_filter
+
+    def _get_synced(self, db: Session, user_id: int) -> _UserFilter:
+        with self._lock:
+            user_filter = self._filters.get(user_id)
+            if user_filter is not None:
+                self._filters.move_to_end(user_id)
+
+        if user_filter is not None:
+            with user_filter.lock:
+                if not user_filter.needs_rebuild():
+                    self._load_new_photos(db, user_id, user_filter)
+                    return user_filter
+
+        user_filter = self._build(db, user_id)
+        with self._lock:
+            self._filters[user_id] = user_filter
+            self._filters.move_to_end(user_id)
+            while len(self._filters) > self.max_users:
+                self._filters.popitem(last=False)
+        return user_filter
+
+    # ----- Query -----
+
+    def find_existing(self, db: Session, user_id: int, hothashes: List[str]) -> List[str]:
+        """
+        Return the hothashes that exist as photos of user (input order, no duplicates)
+
+        Filter negatives are final; positives are confirmed in chunked IN queries.
+        """
+        user_filter = self._get_synced(db, user_id)
+        with user_filter.lock:
+            candidates = list(dict.fromkeys(h for h in hothashes if h in user_filter.bloom))
+
+        confirmed = set()
+        for start in range(0, len(candidates), CONFIRM_CHUNK_SIZE):
+            chunk = candidates[start:start + CONFIRM_CHUNK_SIZE]
+            rows = (
+                db.query(Photo.hothash)
+                .filter(Photo.user_id == user_id)
+                .filter(Photo.hothash.in_(chunk))
+                .all()
+            )
+            confirmed.update(row.hothash for row in rows)
+
+        return [hothash for hothash in candidates if hothash in confirmed]
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            filters = list(self._filters.values())
+        return {
+            "users": len(filters),
+            "photos": sum(f.bloom.count for f in filters),
+            "bytes": sum(f.bloom.size_bytes for f in filters),
+        }
+
+
+# Global registry instance
+hothash_filters = HothashFilterRegistry(
+    max_users=Config.HOTHASH_FILTER_MAX_USERS,
+    error_rate=Config.HOTHASH_FILTER_ERROR_RATE,
+    sync_overlap_seconds=Config.HOTHASH_FILTER_SYNC_OVERLAP_SECONDS,
+)
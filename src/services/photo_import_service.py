@@ -0,0 +1,139 @@
+"""
+Photo Import Service - Streaming NDJSON bulk import
+
+Large desktop imports send one PhotoCreateSchema JSON object per line. Lines are
+parsed and created in bounded batches (PhotoService.create_photos_batch), each
+batch committed together with the import checkpoint (PhotoImportProgress), so:
+- memory use depends on batch size, not import size
+- an interrupted import continues from committed_line + 1 (earlier lines are
+  skipped if the client sends them again)
+"""
+import json
+from typing import Any, Dict, List, Optional, Tuple
+
+from pydantic import ValidationError as PydanticValidationError
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from src.models import PhotoImportProgress
+from src.schemas.photo_create_schemas import PhotoCreateRequest
+from src.services.photo_service import PhotoService
+from src.utils.ndjson import LineTooLong
+
+
+class PhotoImportService:
+    """Service for resumable streaming photo imports"""
+
+    def __init__(self, db: Session):
+        self.db = db
+        self.photo_service = PhotoService(db)
+
+    def get_progress(self, user_id: int, import_id: str) -> Optional[PhotoImportProgress]:
+        """Get checkpoint for an import (None if never started)"""
+        return (
+            self.db.query(PhotoImportProgress)
+            .filter(PhotoImportProgress.user_id == user_id)
+            .filter(PhotoImportProgress.import_id == import_id)
+            .first()
+        )
+
+    def get_or_create_progress(self, user_id: int, import_id: str) -> PhotoImportProgress:
+        """Get checkpoint for an import, creating it on first use"""
+        progress = self.get_progress(user_id, import_id)
+        if progress is not None:
+            return progress
+
+        progress = PhotoImportProgress(
+            user_id=user_id, import_id=import_id,
+            committed_line=0, created_count=0, duplicate_count=0, error_count=0
+        )
+        self.db.add(progress)
+        try:
+            self.db.commit()
+        except IntegrityError:
+            # Concurrent request for the same import created it first
+            self.db.rollback()
+            return self.get_progress(user_id, import_id)
+        return progress
+
+    @staticmethod
+    def _parse_line(raw: Any) -> PhotoCreateRequest:
+        """
+        Parse one input line
+
+        A line is a PhotoCreateSchema object, or a PhotoCreateRequest
+        ({"photo_create_schema": {...}, "tags": [...]}).
+
+        Raises:
+            ValueError: Line is not valid JSON or not a valid PhotoCreateSchema
+        """
+        if isinstance(raw, LineTooLong):
+            raise ValueError(f"Line too long ({raw.size} bytes)")
+        try:
+            data = json.loads(raw)
+        except ValueError as e:
+            raise ValueError(f"Invalid JSON: {e}")
+        if not isinstance(data, dict):
+            raise ValueError("Line must be a JSON object")
+        if "photo_create_schema" not in data:
+            data = {"photo_create_schema": data}
+        try:
+            return PhotoCreateRequest.model_validate(data)
+        except PydanticValidationError as e:
+            raise ValueError(f"Invalid PhotoCreateSchema: {e.errors()[0].get('msg', str(e))}")
+
+    def import_batch(
+        self,
+        user_id: int,
+        lines: List[Tuple[int, Any]],
+        progress: Optional[PhotoImportProgress] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Parse and create one batch of lines, committing photos and checkpoint together
+
+        Args:
+            user_id: Owner user ID
+            lines: (line_number, raw bytes or LineTooLong) in input order
+            progress: Checkpoint to advance (None for imports without import_id)
+
+        Returns:
+            Per-line results: dicts with line, hothash, status, photo_id, error
+        """
+        results: List[Dict[str, Any]] = []
+        requests: List[PhotoCreateRequest] = []
+        request_results: List[Dict[str, Any]] = []
+
+        for line_number, raw in lines:
+            result = {"line": line_number, "hothash": None, "status": "error", "photo_id": None, "error": None}
+            results.append(result)
+            try:
+                request = self._parse_line(raw)
+            except ValueError as e:
+                result["error"] = str(e)
+                continue
+            result["hothash"] = request.photo_create_schema.hothash
+            requests.append(request)
+            request_results.append(result)
+
+        try:
+            created = self.photo_service.create_photos_batch(requests, user_id, commit=False) if requests else []
+        except Exception:
+            self.db.rollback()
+            raise
+
+        for result, batch_result in zip(request_results, created):
+            result.update(
+                status=batch_result["status"],
+                photo_id=batch_result["photo_id"],
+                error=batch_result["error"]
+            )
+
+        if progress is not None:
+            # Checkpoint is committed in the same transaction as the photos
+            progress.committed_line = lines[-1][0]
+            progress.created_count += sum(1 for result in results if result["status"] == "created")
+            progress.duplicate_count += sum(1 for result in results if result["status"] == "duplicate")
+            progress.error_count += sum(1 for result in results if result["status"] == "error")
+        self.db.commit()
+
+        return results
@@ -0,0 +1,274 @@
+"""
+Photo Purge Service - Deferred removal of soft-deleted photos
+
+Deleting photos only sets Photo.deleted_at (one UPDATE, see
+PhotoRepository.delete / PhotoService.bulk_delete_photos); the photos vanish
+from all ORM queries at once. The purger then removes them for real, in
+batches of PHOTO_PURGE_BATCH_SIZE so no transaction holds locks for long:
+
+- photo_tags and image_files rows, then the photos rows
+- hothashes in the owners' PhotoCollection lists
+- PhotoText references (cover image, image blocks)
+- coldpreview files (after the commit, so a rollback never loses files)
+
+purge_hashes(commit=False) runs inside the caller's transaction (photo
+creation); its coldpreview files are deleted by an after_commit hook once the
+caller commits, and forgotten if it rolls back.
+"""
+import copy
+import logging
+import threading
+from typing import Any, Dict, Iterable, Optional, Set
+
+from sqlalchemy import event, select, delete
+from sqlalchemy.orm import Session
+
+from src.core.config import Config
+from src.models import Photo, ImageFile, PhotoTag, PhotoCollection, PhotoTextDocument
+from src.utils.coldpreview_repository import ColdpreviewRepository
+
+logger = logging.getLogger(__name__)
+
+# Session.info key: hothash -> PhotoPurgeService, coldpreviews to delete when the session commits
+_PENDING_COLDPREVIEWS = "purged_coldpreviews"
+
+
+def scrub_phototext_content(content: Dict[str, Any], hothashes: Set[str]) -> Optional[Dict[str, Any]]:
+    """
+    Remove references to hothashes from a PhotoText document
+
+    Clears coverImage and drops matching images from image blocks (blocks left
+    without images are dropped).
+
+    Returns:
+        Scrubbed copy, or None if the document references none of the hothashes
+    """
+    if not isinstance(content, dict):
+        return None
+    scrubbed = copy.deepcopy(content)
+    changed = False
+
+    cover = scrubbed.get("coverImage")
+    if isinstance(cover, dict) and cover.get("hash") in hothashes:
+        scrubbed["coverImage"] = None
+        changed = True
+
+    blocks = []
+    for block in scrubbed.get("blocks") or []:
+        images = block.get("images") if isinstance(block, dict) else None
+        if isinstance(images, list):
+            kept = [image for image in images if not (isinstance(image, dict) and image.get("hash") in hothashes)]
+            if len(kept) != len(images):
+                changed = True
+                if not kept:
+                    continue
+                block["images"] = kept
+        blocks.append(block)
+    if changed and "blocks" in scrubbed:
+        scrubbed["blocks"] = blocks
+
+    return scrubbed if changed else None
+
+
+class PhotoPurgeService:
+    """Removes soft-deleted photos and everything that references them"""
+
+    def __init__(self, db: Session, repository: Optional[ColdpreviewRepository] = None):
+        self.db = db
+        self._repository = repository  # Created on first purge
+
+    def purge_batch(self, batch_size: Optional[int] = None) -> int:
+        """
+        Purge up to batch_size soft-deleted photos (oldest IDs first)
+
+        Returns:
+            Number of photos purged (0 when nothing is pending)
+        """
+        rows = self.db.execute(
+            select(Photo.id, Photo.hothash, Photo.user_id)
+            .where(Photo.deleted_at.isnot(None))
+            .order_by(Photo.id)
+            .limit(batch_size or Config.PHOTO_PURGE_BATCH_SIZE)
+            .execution_options(include_deleted=True)
+        ).all()
+        return self._purge(rows)
+
+    def purge_pending(self) -> int:
+        """Purge batches until no soft-deleted photos are left"""
+        total = 0
+        while True:
+            purged = self.purge_batch()
+            if not purged:
+                return total
+            total += purged
+
+    def purge_hashes(self, hothashes: Iterable[str], commit: bool = True) -> int:
+        """
+        Purge soft-deleted photos with these hothashes right away
+
+        Called before creating photos: a deleted photo still holds its (unique)
+        hothash until purged, so re-importing it must not wait for the purger.
+
+        Args:
+            hothashes: Hothashes about to be created
+            commit: Commit the purge (False: only delete and scrub rows in the
+                caller's transaction; coldpreview files go when it commits)
+        """
+        hothashes = list(dict.fromkeys(hothashes))
+        if not hothashes:
+            return 0
+        rows = self.db.execute(
+            select(Photo.id, Photo.hothash, Photo.user_id)
+            .where(Photo.deleted_at.isnot(None))
+            .where(Photo.hothash.in_(hothashes))
+            .execution_options(include_deleted=True)
+        ).all()
+        return self._purge(rows, commit=commit)
+
+    def _purge(self, rows, commit: bool = True) -> int:
+        if not rows:
+            return 0
+        photo_ids = [row.id for row in rows]
+        hothashes = {row.hothash for row in rows}
+        user_ids = {row.user_id for row in rows}
+
+        if not commit:
+            self._delete_rows(photo_ids, user_ids, hothashes)
+            self.db.info.setdefault(_PENDING_COLDPREVIEWS, {}).update(dict.fromkeys(hothashes, self))
+            return len(photo_ids)
+
+        try:
+            self._delete_rows(photo_ids, user_ids, hothashes)
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+
+        self._delete_coldpreviews(hothashes)
+        logger.info(f"Purged {len(photo_ids)} deleted photo(s)")
+        return len(photo_ids)
+
+    def _delete_rows(self, photo_ids, user_ids: Set[int], hothashes: Set[str]) -> None:
+        self.db.execute(delete(PhotoTag).where(PhotoTag.photo_id.in_(photo_ids)))
+        self.db.execute(delete(ImageFile).where(ImageFile.photo_id.in_(photo_ids)))
+        self.db.execute(
+            delete(Photo)
+            .where(Photo.id.in_(photo_ids))
+            .where(Photo.deleted_at.isnot(None))
+            .execution_options(synchronize_session=False)
+        )
+        self._scrub_collections(user_ids, hothashes)
+        self._scrub_phototexts(user_ids, hothashes)
+
+    def _scrub_collections(self, user_ids: Set[int], hothashes: Set[str]) -> None:
+        collections = self.db.query(PhotoCollection).filter(PhotoCollection.user_id.in_(user_ids)).all()
+        for collection in collections:
+            if collection.hothashes and hothashes.intersection(collection.hothashes):
+                collection.hothashes = [h for h in collection.hothashes if h not in hothashes]
+
+    def _scrub_phototexts(self, user_ids: Set[int], hothashes: Set[str]) -> None:
+        documents = self.db.query(PhotoTextDocument).filter(PhotoTextDocument.user_id.in_(user_ids)).all()
+        for document in documents:
+            if document.cover_image_hash in hothashes:
+                document.cover_image_hash = None
+                document.cover_image_alt = None
+            content = scrub_phototext_content(document.content, hothashes)
+            if content is not None:
+                document.content = content
+
+    def _delete_coldpreviews(self, hothashes: Set[str]) -> None:
+        if self._repository is None:
+            self._repository = ColdpreviewRepository()
+        for hothash in hothashes:
+            try:
+                self._repository.delete_coldpreview_by_hash(hothash)
+            except Exception as e:
+                # Orphaned file: reported by the coldpreview consistency check
+                logger.warning(f"Failed to delete coldpreview {hothash}: {e}")
+
+
+def keep_coldpreviews(db: Session, hothashes: Iterable[str]) -> None:
+    """
+    Cancel the pending deletion of purged coldpreviews
+
+    For hashes re-created in the same transaction with a new coldpreview,
+    which is stored under the same hothash.
+    """
+    pending = db.info.get(_PENDING_COLDPREVIEWS)
+    if pending:
+        for hothash in hothashes:
+            pending.pop(hothash, None)
+
+
+@event.listens_for(Session, "after_commit")
+def _delete_committed_coldpreviews(session: Session) -> None:
+    if session.in_nested_transaction():
+        return
+    pending = session.info.pop(_PENDING_COLDPREVIEWS, None)
+    if not pending:
+        return
+    by_service: Dict[PhotoPurgeService, Set[str]] = {}
+    for hothash, service in pending.items():
+        by_service.setdefault(service, set()).add(hothash)
+    for service, hothashes in by_service.items():
+        service._delete_coldpreviews(hothashes)
+    logger.info(f"Deleted coldpreviews of {len(pending)} purged photo(s)")
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _forget_pending_coldpreviews(session: Session, transaction) -> None:
+    # Rolled back (a commit has already taken them): the purged rows are back
+    if transaction.parent is None:
+        session.info.pop(_PENDING_COLDPREVIEWS, None)
+
+
+class PhotoPurger:
+    """Background thread running PhotoPurgeService.purge_pending"""
+
+    def __init__(self):
+        self._thread: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+        self._wake = threading.Event()
+
+    def purge_now(self) -> int:
+        """Purge everything pending in a new session"""
+        from src.database.connection import SessionLocal
+        db = SessionLocal()
+        try:
+            return PhotoPurgeService(db).purge_pending()
+        finally:
+            db.close()
+
+    def notify(self) -> None:
+        """Wake the purger after photos were soft-deleted (thread-safe)"""
+        self._wake.set()
+
+    def start(self, interval_seconds: int) -> None:
+        """Start purger thread (first pass runs immediately, then on notify or every interval)"""
+        if self._thread is not None or interval_seconds <= 0:
+            return
+        self._stop_event.clear()
+
+        def run():
+            while not self._stop_event.is_set():
+                self._wake.clear()
+                try:
+                    self.purge_now()
+                except Exception as e:
+                    logger.error(f"Failed to purge deleted photos: {e}", exc_info=True)
+                self._wake.wait(interval_seconds)
+
+        self._thread = threading.Thread(target=run, name="photo-purger", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop purger thread (an interrupted batch is rolled back and redone on next start)"""
+        self._stop_event.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+
+# Global purger instance (started/stopped by the application lifespan)
+photo_purger = PhotoPurger()
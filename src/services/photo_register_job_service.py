@@ -0,0 +1,401 @@
+"""
+Photo Register Job Service - Queued register-image uploads
+
+POST /photos/register-image?mode=job answers 202 as soon as the upload is
+spooled to disk and a PhotoRegisterJob row is committed. RegisterJobWorkers
+(started in the application lifespan) then process jobs in the background:
+
+1. Claim the oldest pending job (conditional UPDATE, safe with several API processes)
+2. Stream the spooled file to imalink-core (shared AsyncImalinkCoreClient)
+3. Create the photo (same as the synchronous endpoint) and record the result
+
+Workers are asyncio tasks on the server's event loop: waiting for imalink-core
+holds no thread, database work runs in the threadpool. Throughput grows with
+REGISTER_JOB_WORKERS up to IMALINK_CORE_MAX_CONCURRENCY.
+
+Job state lives in the database, so pending jobs are picked up again after a
+restart, and jobs left in "processing" by a dead worker are returned to pending
+once they are older than any processing attempt can take.
+"""
+import asyncio
+import os
+import shutil
+import tempfile
+import logging
+from datetime import datetime, timedelta
+from typing import BinaryIO, List, Optional, Tuple
+
+import httpx
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from src.core.config import Config
+from src.core.exceptions import (
+    NotFoundError, ValidationError, DuplicateImageError, ServiceBusyError, ProcessingTimeoutError
+)
+from src.models import PhotoRegisterJob
+from src.repositories.input_channel_repository import InputChannelRepository
+from src.schemas.photo_create_schemas import PhotoCreateRequest
+from src.services.photo_service import PhotoService
+from src.utils.imalink_core_client import get_imalink_core_client
+
+logger = logging.getLogger(__name__)
+
+POLL_INTERVAL_SECONDS = 5.0  # Idle workers re-check the table (jobs from other processes, stale recovery)
+SPOOL_CHUNK_SIZE = 1024 * 1024
+RETRY_DELAY_SECONDS = 5.0  # Per attempt; the job stays claimed while its worker waits
+# A processing job older than this has lost its worker (queue wait + request + margin)
+STALE_JOB_SECONDS = Config.IMALINK_CORE_QUEUE_TIMEOUT + Config.IMALINK_CORE_TIMEOUT + 60
+
+
+class PhotoRegisterJobService:
+    """Database side of register-image jobs"""
+
+    def __init__(self, db: Session):
+        self.db = db
+        self.photo_service = PhotoService(db)
+
+    # ----- API -----
+
+    def create_job(
+        self,
+        user_id: int,
+        upload: BinaryIO,
+        filename: str,
+        content_type: str,
+        **settings
+    ) -> PhotoRegisterJob:
+        """
+        Spool an upload to disk and queue it (settings: see queue_spooled_file)
+
+        Raises:
+            ValidationError: User has no protected channel to fall back to
+        """
+        spool_path = spool_upload(upload)
+        try:
+            return self.queue_spooled_file(user_id, spool_path, filename, content_type, **settings)
+        except Exception:
+            remove_spool_file(spool_path)
+            raise
+
+    def queue_spooled_file(
+        self,
+        user_id: int,
+        spool_path: str,
+        filename: str,
+        content_type: str,
+        input_channel_id: Optional[int] = None,
+        rating: int = 0,
+        visibility: str = "private",
+        author_id: Optional[int] = None,
+        coldpreview_size: Optional[int] = None
+    ) -> PhotoRegisterJob:
+        """
+        Queue a file that is already on disk (the job takes ownership of it)
+
+        The input channel is resolved now (protected Quick Channel if not given
+        or not the user's), so jobs can be listed per channel right away.
+
+        Raises:
+            ValidationError: User has no protected channel to fall back to
+        """
+        channel_repo = InputChannelRepository(self.db)
+        channel = channel_repo.get_channel_by_id(input_channel_id, user_id) if input_channel_id is not None else None
+        if channel is None:
+            channel = channel_repo.get_protected_channel(user_id)
+            if channel is None:
+                raise ValidationError("No valid input_channel_id provided and no protected default channel found")
+
+        job = PhotoRegisterJob(
+            user_id=user_id,
+            input_channel_id=channel.id,
+            status="pending",
+            attempts=0,
+            filename=filename,
+            content_type=content_type,
+            spool_path=spool_path,
+            rating=rating,
+            visibility=visibility,
+            author_id=author_id,
+            coldpreview_size=coldpreview_size,
+            is_duplicate=False
+        )
+        self.db.add(job)
+        try:
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+        self.db.refresh(job)
+        return job
+
+    def get_job(self, job_id: int, user_id: int) -> PhotoRegisterJob:
+        """
+        Get job (user-scoped)
+
+        Raises:
+            NotFoundError: Job does not exist or belongs to another user
+        """
+        job = (
+            self.db.query(PhotoRegisterJob)
+            .filter(PhotoRegisterJob.id == job_id)
+            .filter(PhotoRegisterJob.user_id == user_id)
+            .first()
+        )
+        if job is None:
+            raise NotFoundError("Register job", job_id)
+        return job
+
+    def list_jobs(
+        self,
+        user_id: int,
+        input_channel_id: Optional[int] = None,
+        status: Optional[str] = None,
+        offset: int = 0,
+        limit: int = 100
+    ) -> Tuple[List[PhotoRegisterJob], int]:
+        """List jobs newest first, optionally for one input channel / status; returns (jobs, total)"""
+        query = self.db.query(PhotoRegisterJob).filter(PhotoRegisterJob.user_id == user_id)
+        if input_channel_id is not None:
+            query = query.filter(PhotoRegisterJob.input_channel_id == input_channel_id)
+        if status is not None:
+            query = query.filter(PhotoRegisterJob.status == status)
+        total = query.count()
+        jobs = query.order_by(PhotoRegisterJob.id.desc()).offset(offset).limit(limit).all()
+        return jobs, total
+
+    # ----- Workers -----
+
+    def claim_next_job(self) -> Optional[PhotoRegisterJob]:
+        """Mark the oldest pending job as processing and return it (None if there is none)"""
+        while True:
+            job_id = (
+                self.db.query(PhotoRegisterJob.id)
+                .filter(PhotoRegisterJob.status == "pending")
+                .order_by(PhotoRegisterJob.id)
+                .limit(1)
+                .scalar()
+            )
+            if job_id is None:
+                return None
+
+            # Conditional update: only one worker (in any process) wins the job
+            claimed = self.db.execute(
+                update(PhotoRegisterJob)
+                .where(PhotoRegisterJob.id == job_id)
+                .where(PhotoRegisterJob.status == "pending")
+                .values(
+                    status="processing",
+                    attempts=PhotoRegisterJob.attempts + 1,
+                    started_at=datetime.utcnow()
+                )
+            ).rowcount
+            self.db.commit()
+            if claimed:
+                return self.db.get(PhotoRegisterJob, job_id)
+
+    def recover_stale_jobs(self) -> int:
+        """Return processing jobs whose worker died (restart, crash) to pending"""
+        cutoff = datetime.utcnow() - timedelta(seconds=STALE_JOB_SECONDS)
+        recovered = self.db.execute(
+            update(PhotoRegisterJob)
+            .where(PhotoRegisterJob.status == "processing")
+            .where(PhotoRegisterJob.started_at < cutoff)
+            .values(status="pending")
+        ).rowcount
+        self.db.commit()
+        if recovered:
+            logger.warning(f"Returned {recovered} stale register job(s) to pending")
+        return recovered
+
+    def complete_job(self, job_id: int, photo_create_schema) -> PhotoRegisterJob:
+        """Create the photo from imalink-core's PhotoCreateSchema and mark the job done"""
+        job = self.db.get(PhotoRegisterJob, job_id)
+
+        # Same settings as the synchronous endpoint's query parameters
+        photo_create_schema = photo_create_schema.model_copy(update={
+            "rating": job.rating,
+            "visibility": job.visibility,
+            "input_channel_id": job.input_channel_id,
+            "author_id": job.author_id,
+        })
+        request = PhotoCreateRequest(photo_create_schema=photo_create_schema, tags=[])
+
+        try:
+            photo = self.photo_service.create_photo_from_photo_create_schema(
+                photo_create_request=request,
+                user_id=job.user_id
+            )
+            is_duplicate = False
+        except DuplicateImageError:
+            self.db.rollback()
+            photo = self.photo_service.get_photo_by_hothash(photo_create_schema.hothash, job.user_id)
+            is_duplicate = True
+
+        job.status = "done"
+        job.error = None
+        job.photo_id = photo.id
+        job.hothash = photo.hothash
+        job.is_duplicate = is_duplicate
+        job.finished_at = datetime.utcnow()
+        self.db.commit()
+        return job
+
+    def fail_job(self, job_id: int, error: str, retry: bool = False) -> PhotoRegisterJob:
+        """
+        Record a failed attempt
+
+        retry=True returns the job to pending unless REGISTER_JOB_MAX_ATTEMPTS is reached.
+        """
+        self.db.rollback()
+        job = self.db.get(PhotoRegisterJob, job_id)
+        job.error = error
+        if retry and job.attempts < Config.REGISTER_JOB_MAX_ATTEMPTS:
+            job.status = "pending"
+        else:
+            job.status = "failed"
+            job.finished_at = datetime.utcnow()
+        self.db.commit()
+        return job
+
+
+def spool_upload(upload: BinaryIO) -> str:
+    """Copy an upload to a new file in REGISTER_JOB_SPOOL_DIRECTORY; returns its path"""
+    os.makedirs(Config.REGISTER_JOB_SPOOL_DIRECTORY, exist_ok=True)
+    fd, path = tempfile.mkstemp(dir=Config.REGISTER_JOB_SPOOL_DIRECTORY, suffix=".upload")
+    try:
+        with os.fdopen(fd, "wb") as spool_file:
+            upload.seek(0)
+            shutil.copyfileobj(upload, spool_file, SPOOL_CHUNK_SIZE)
+    except Exception:
+        remove_spool_file(path)
+        raise
+    return path
+
+
+def remove_spool_file(path: str) -> None:
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        pass
+    except OSError as e:
+        logger.warning(f"Failed to remove register job spool file {path}: {e}")
+
+
+class RegisterJobWorkers:
+    """Bounded set of asyncio worker tasks processing PhotoRegisterJobs"""
+
+    def __init__(self, workers: int):
+        self.workers = workers
+        self._tasks: List[asyncio.Task] = []
+        self._wake: Optional[asyncio.Event] = None
+
+    @staticmethod
+    def _with_service(method: str, *args):
+        """Run a PhotoRegisterJobService method in its own session (threadpool side)"""
+        from src.database.connection import SessionLocal
+        db = SessionLocal()
+        try:
+            service = PhotoRegisterJobService(db)
+            job = getattr(service, method)(*args)
+            if isinstance(job, PhotoRegisterJob):
+                # Used after the session is closed: load attributes expired by commit, then detach
+                db.refresh(job)
+                db.expunge(job)
+            return job
+        finally:
+            db.close()
+
+    async def start(self) -> None:
+        """Start worker tasks on the running event loop"""
+        if self._tasks or self.workers <= 0:
+            return
+        self._wake = asyncio.Event()
+        try:
+            await run_in_threadpool(self._with_service, "recover_stale_jobs")
+        except Exception as e:
+            logger.error(f"Failed to recover stale register jobs: {e}", exc_info=True)
+        self._tasks = [
+            asyncio.create_task(self._run(), name=f"register-job-worker-{n}")
+            for n in range(self.workers)
+        ]
+
+    async def stop(self) -> None:
+        """Cancel worker tasks (interrupted jobs are recovered on next start)"""
+        tasks, self._tasks = self._tasks, []
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def notify(self) -> None:
+        """Wake idle workers (call from the event loop after committing a job)"""
+        if self._wake is not None:
+            self._wake.set()
+
+    async def _run(self) -> None:
+        while True:
+            # Clear before claiming so a notify() during the claim is not lost
+            self._wake.clear()
+            try:
+                job = await run_in_threadpool(self._with_service, "claim_next_job")
+            except Exception as e:
+                logger.error(f"Failed to claim register job: {e}", exc_info=True)
+                job = None
+
+            if job is None:
+                try:
+                    await asyncio.wait_for(self._wake.wait(), timeout=POLL_INTERVAL_SECONDS)
+                except asyncio.TimeoutError:
+                    try:
+                        await run_in_threadpool(self._with_service, "recover_stale_jobs")
+                    except Exception as e:
+                        logger.error(f"Failed to recover stale register jobs: {e}", exc_info=True)
+                continue
+
+            await self.process(job)
+
+    async def process(self, job: PhotoRegisterJob) -> None:
+        """Send one claimed job to imalink-core and store the result"""
+        retry = False
+        try:
+            with open(job.spool_path, "rb") as image_file:
+                photo_create_schema = await get_imalink_core_client().process_image(
+                    image_file=image_file,
+                    filename=job.filename,
+                    coldpreview_size=job.coldpreview_size,
+                    content_type=job.content_type
+                )
+            await run_in_threadpool(self._with_service, "complete_job", job.id, photo_create_schema)
+            remove_spool_file(job.spool_path)
+            return
+        except FileNotFoundError:
+            error = "Uploaded file is no longer available"
+        except httpx.HTTPStatusError as e:
+            # imalink-core rejected the image - retrying will not help
+            try:
+                detail = e.response.json().get("detail", "Unknown error")
+            except ValueError:
+                detail = e.response.text or "Unknown error"
+            error = f"Image processing failed: {detail}"
+        except (ServiceBusyError, ProcessingTimeoutError) as e:
+            error, retry = e.message, True
+        except httpx.RequestError as e:
+            error, retry = f"Image processing service unavailable: {e}", True
+        except Exception as e:
+            logger.error(f"Register job {job.id} failed: {e}", exc_info=True)
+            error = f"Failed to register image: {e}"
+
+        if retry and job.attempts < Config.REGISTER_JOB_MAX_ATTEMPTS:
+            await asyncio.sleep(RETRY_DELAY_SECONDS * job.attempts)
+        try:
+            job = await run_in_threadpool(self._with_service, "fail_job", job.id, error, retry)
+        except Exception as e:
+            logger.error(f"Failed to record register job {job.id} failure: {e}", exc_info=True)
+            return
+        if job.status == "failed":
+            remove_spool_file(job.spool_path)
+
+
+# Global worker set (started/stopped by the application lifespan)
+register_job_workers = RegisterJobWorkers(workers=Config.REGISTER_JOB_WORKERS)
@@ -6,7 +6,7 @@ Photos are created via POST /photos/new-photo which creates both Photo + ImageFi
 - Hotpreview and exif_dict stored in Photo (visual data)
 - ImageFile stores only file metadata
 """
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, BinaryIO
 from datetime import datetime
 from sqlalchemy.orm import Session
 from pathlib import Path
@@ -15,9 +15,11 @@ import hashlib
 
 from src.repositories.photo_repository import PhotoRepository
 from src.repositories.image_file_repository import ImageFileRepository
+from src.repositories.timeline_bucket_repository import refresh_buckets_for_photos
 from src.schemas.photo_schemas import (
     PhotoResponse, PhotoCreateRequest, PhotoUpdateRequest, PhotoSearchRequest,
-    AuthorSummary, ImageFileSummary, TimeLocCorrectionRequest, ViewCorrectionRequest
+    AuthorSummary, ImageFileSummary, TimeLocCorrectionRequest, ViewCorrectionRequest,
+    PhotoBulkSelection, PhotoBulkUpdateRequest, PhotoBulkUpdateResponse, PhotoBulkDeleteResponse
 )
 from src.schemas.tag_schemas import TagSummary
 from src.schemas.image_file_upload_schemas import (
@@ -26,6 +28,8 @@ from src.schemas.image_file_upload_schemas import (
 from src.schemas.common import PaginatedResponse, create_paginated_response
 from src.core.exceptions import NotFoundError, DuplicatePhotoError, DuplicateImageError, ValidationError
 from src.models import Photo, ImageFile
+from src.services.hothash_filter_service import hothash_filters
+from src.services.photo_purge_service import PhotoPurgeService, keep_coldpreviews, photo_purger
 
 import logging
 logger = logging.getLogger(__name__)
@@ -185,13 +189,86 @@ class PhotoService:
         self.db.commit()
         return self._convert_to_response(photo)
     
+    def bulk_update_photos(self, request: PhotoBulkUpdateRequest, user_id: int) -> PhotoBulkUpdateResponse:
+        """
+        Apply one field patch to many photos (user-scoped)
+        
+        The selection is resolved to own photo IDs once, referenced author and
+        event are validated once, then the patch runs as set-based UPDATEs in a
+        single transaction.
+        
+        Raises:
+            NotFoundError: author_id or event_id does not exist (or event is not the user's)
+        """
+        values = request.patch.values()
+        
+        if values.get('author_id') is not None:
+            from src.models import Author
+            if not self.db.query(Author.id).filter(Author.id == values['author_id']).first():
+                raise NotFoundError("Author", values['author_id'])
+        if values.get('event_id') is not None:
+            from src.models.event import Event
+            event = self.db.query(Event.id).filter(
+                Event.id == values['event_id'],
+                Event.user_id == user_id
+            ).first()
+            if not event:
+                raise NotFoundError("Event", values['event_id'])
+        
+        photo_ids, not_found = self._resolve_selection(request, user_id)
+        
+        try:
+            updated = self.photo_repo.bulk_update(photo_ids, user_id, values)
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+        
+        return PhotoBulkUpdateResponse(
+            matched=len(photo_ids),
+            updated=updated,
+            fields=sorted(values),
+            not_found=not_found
+        )
+    
+    def bulk_delete_photos(self, selection: PhotoBulkSelection, user_id: int) -> PhotoBulkDeleteResponse:
+        """
+        Delete many photos (user-scoped)
+        
+        Photos are soft-deleted with set-based UPDATEs and vanish from all
+        queries right away; rows, files and references are removed by the
+        background photo purger.
+        """
+        photo_ids, not_found = self._resolve_selection(selection, user_id)
+        
+        try:
+            deleted = self.photo_repo.bulk_update(photo_ids, user_id, {"deleted_at": datetime.utcnow()})
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+        
+        hothash_filters.discard(user_id, count=deleted)
+        photo_purger.notify()
+        return PhotoBulkDeleteResponse(matched=len(photo_ids), deleted=deleted, not_found=not_found)
+    
+    def _resolve_selection(self, selection: PhotoBulkSelection, user_id: int):
+        """Own photo IDs for a bulk selection, plus requested hothashes that were not found"""
+        if selection.hothashes is None:
+            return self.photo_repo.get_own_ids_for_search(user_id, selection.search), []
+        ids_by_hash = self.photo_repo.get_ids_by_hashes(selection.hothashes, user_id)
+        not_found = [h for h in dict.fromkeys(selection.hothashes) if h not in ids_by_hash]
+        return sorted(ids_by_hash.values()), not_found
+    
     def delete_photo(self, hothash: str, user_id: int) -> bool:
-        """Delete photo (user-scoped)"""
+        """Delete photo (user-scoped, soft delete - purged in the background)"""
         success = self.photo_repo.delete(hothash, user_id)
         if not success:
             raise NotFoundError("Photo", hothash)
         
         self.db.commit()
+        hothash_filters.discard(user_id, count=1)
+        photo_purger.notify()
         return True
     
     def get_hotpreview(self, hothash: str) -> Optional[bytes]:
@@ -213,8 +290,13 @@ class PhotoService:
         from src.utils.coldpreview_repository import ColdpreviewRepository
         repository = ColdpreviewRepository()
         
-        # Save coldpreview and get metadata (returns tuple)
-        relative_path, width, height, file_size = repository.save_coldpreview(hothash, file_content)
+        # Save coldpreview and get metadata (returns tuple) - verify untrusted upload
+        try:
+            relative_path, width, height, file_size = repository.save_coldpreview(
+                hothash, file_content, verify=True
+            )
+        except ValueError as e:
+            raise ValidationError(str(e))
         
         # SIMPLIFIED: Only store path, dimensions/size will be read dynamically
         setattr(photo, 'coldpreview_path', relative_path)
@@ -611,7 +693,9 @@ class PhotoService:
         """Generate SHA256 hash from hotpreview bytes"""
         return hashlib.sha256(hotpreview_bytes).hexdigest()
 
-    def create_photo_from_photo_create_schema(self, photo_create_request, user_id: int) -> Photo:
+    def create_photo_from_photo_create_schema(self, photo_create_request, user_id: int,
+                                              hotpreview_bytes: Optional[bytes] = None,
+                                              coldpreview_stream: Optional[BinaryIO] = None) -> Photo:
         """
         Create Photo from PhotoCreateSchema (matches MY_OVERVIEW.md)
         
@@ -625,6 +709,10 @@ class PhotoService:
         Args:
             photo_create_request: PhotoCreateRequest with photo_create_schema and tags
             user_id: Owner user ID (overrides photo_create_schema.user_id for security)
+            hotpreview_bytes: Raw hotpreview (multipart upload) - used instead of
+                decoding hotpreview_base64
+            coldpreview_stream: Raw coldpreview file object (multipart upload) -
+                streamed to storage instead of decoding coldpreview_base64
             
         Returns:
             Created Photo with associated ImageFile records
@@ -694,44 +782,30 @@ class PhotoService:
         if existing:
             raise DuplicateImageError(f"Photo with hothash {schema.hothash} already exists")
         
-        # Decode base64 hotpreview
-        hotpreview_bytes = base64.b64decode(schema.hotpreview_base64)
+        # A deleted photo keeps its hothash until purged - purge it now to re-create
+        # (in this transaction: rolled back together with the create)
+        PhotoPurgeService(self.db).purge_hashes([schema.hothash], commit=False)
         
-        # exif_dict already contains ALL EXIF metadata from imalink-core
-        # (camera_make, iso, aperture, etc. are IN exif_dict, not at root)
-        exif_dict = schema.exif_dict or {}
+        # Decode base64 hotpreview (unless sent as raw bytes)
+        if hotpreview_bytes is None:
+            hotpreview_bytes = base64.b64decode(schema.hotpreview_base64)
         
         # Create Photo matching MY_OVERVIEW.md structure
-        photo = Photo(
-            user_id=user_id,
-            hothash=schema.hothash,
-            hotpreview=hotpreview_bytes,
-            width=schema.width,
-            height=schema.height,
-            
-            # Time & location (indexed copies from exif_dict for fast queries)
-            taken_at=schema.taken_at,
-            gps_latitude=schema.gps_latitude,
-            gps_longitude=schema.gps_longitude,
-            
-            # Complete EXIF metadata (all camera/lens data stored here)
-            exif_dict=exif_dict,
-            
-            # User organization fields
-            rating=schema.rating,
-            category=schema.category,
-            visibility=schema.visibility,
-            input_channel_id=input_channel_id,
-            author_id=author_id,
-            stack_id=schema.stack_id,
-            
-            # Corrections (usually null initially)
-            timeloc_correction=schema.timeloc_correction,
-            view_correction=schema.view_correction,
-        )
+        photo = Photo(**self._photo_values_from_schema(
+            schema, user_id, input_channel_id, author_id, hotpreview_bytes
+        ))
         
         # Handle coldpreview (optional larger preview)
-        if schema.coldpreview_base64:
+        if coldpreview_stream is not None:
+            from src.utils.coldpreview_repository import ColdpreviewRepository
+            repository = ColdpreviewRepository()
+            
+            # Raw upload - copy to storage without holding it in memory
+            relative_path, _, _, _ = repository.save_coldpreview_stream(
+                schema.hothash, coldpreview_stream, verify=True
+            )
+            photo.coldpreview_path = relative_path
+        elif schema.coldpreview_base64:
             from src.utils.coldpreview_repository import ColdpreviewRepository
             repository = ColdpreviewRepository()
             
@@ -740,6 +814,10 @@ class PhotoService:
             relative_path, _, _, _ = repository.save_coldpreview(schema.hothash, coldpreview_bytes)
             photo.coldpreview_path = relative_path
         
+        if photo.coldpreview_path:
+            # Replaces the purged photo's coldpreview (same hothash)
+            keep_coldpreviews(self.db, [schema.hothash])
+        
         # Save Photo first
         self.db.add(photo)
         self.db.flush()  # Get photo.id without committing yet
@@ -760,6 +838,7 @@ class PhotoService:
         # Commit everything (Photo + ImageFiles)
         self.db.commit()
         self.db.refresh(photo)
+        hothash_filters.add(user_id, [photo.hothash])
         
         # TODO: Add tags if provided
         # if photo_create_request.tags:
@@ -769,6 +848,245 @@ class PhotoService:
         
         return photo
     
+    @staticmethod
+    def _photo_values_from_schema(schema, user_id: int, input_channel_id: int, author_id: int,
+                                  hotpreview_bytes: bytes) -> Dict[str, Any]:
+        """Photo column values from PhotoCreateSchema (shared by single and batch create)"""
+        return dict(
+            user_id=user_id,
+            hothash=schema.hothash,
+            hotpreview=hotpreview_bytes,
+            width=schema.width,
+            height=schema.height,
+            
+            # Time & location (indexed copies from exif_dict for fast queries)
+            taken_at=schema.taken_at,
+            gps_latitude=schema.gps_latitude,
+            gps_longitude=schema.gps_longitude,
+            
+            # Complete EXIF metadata (all camera/lens data stored here)
+            # exif_dict already contains ALL EXIF metadata from imalink-core
+            # (camera_make, iso, aperture, etc. are IN exif_dict, not at root)
+            exif_dict=schema.exif_dict or {},
+            
+            # User organization fields
+            rating=schema.rating,
+            category=schema.category,
+            visibility=schema.visibility,
+            input_channel_id=input_channel_id,
+            author_id=author_id,
+            stack_id=schema.stack_id,
+            
+            # Corrections (usually null initially)
+            timeloc_correction=schema.timeloc_correction,
+            view_correction=schema.view_correction,
+        )
+    
+    def create_photos_batch(self, photo_create_requests: List, user_id: int,
+                            commit: bool = True) -> List[Dict[str, Any]]:
+        """
+        Create many Photos from PhotoCreateSchemas in one transaction
+        
+        Same rules as create_photo_from_photo_create_schema, but per batch instead of per photo:
+        - input channels validated with one query, protected channel / default author looked up once
+        - duplicates found with one IN query on hothash
+        - photos and image files inserted with bulk INSERTs, committed once
+        
+        Items that cannot be created (duplicate hothash, bad base64, unreadable coldpreview)
+        are reported per item and do not affect the rest of the batch. Photos created
+        concurrently by another request are reported as duplicates too. On a database
+        error the transaction is rolled back and coldpreviews saved by this call are removed.
+        
+        Args:
+            photo_create_requests: List of PhotoCreateRequest
+            user_id: Owner user ID
+            commit: Commit the transaction (False: only flush, caller commits)
+            
+        Returns:
+            Per-item results in request order: dicts with index, hothash, status
+            ("created", "duplicate" or "error"), photo_id and error
+            
+        Raises:
+            ValueError: If a default channel/author is needed but missing
+        """
+        import base64
+        import binascii
+        from sqlalchemy import insert
+        from src.repositories.input_channel_repository import InputChannelRepository
+        from src.repositories.user_repository import UserRepository
+        from src.utils.coldpreview_repository import ColdpreviewRepository
+        from src.utils.db_utils import insert_ignore
+        
+        schemas = [request.photo_create_schema for request in photo_create_requests]
+        results: List[Dict[str, Any]] = [
+            {"index": index, "hothash": schema.hothash, "status": "error", "photo_id": None, "error": None}
+            for index, schema in enumerate(schemas)
+        ]
+        
+        # Resolve defaults once for the whole batch
+        channel_repo = InputChannelRepository(self.db)
+        valid_channel_ids = channel_repo.get_existing_channel_ids(
+            {schema.input_channel_id for schema in schemas if schema.input_channel_id is not None}, user_id
+        )
+        default_channel_id = None
+        if any(schema.input_channel_id not in valid_channel_ids for schema in schemas):
+            default_channel = channel_repo.get_protected_channel(user_id)
+            if not default_channel:
+                raise ValueError(
+                    "No valid input_channel_id provided and no protected default channel found. "
+                    "This should not happen - contact administrator."
+                )
+            default_channel_id = default_channel.id
+        
+        default_author_id = None
+        if any(schema.author_id is None for schema in schemas):
+            user = UserRepository(self.db).get_by_id(user_id)
+            if not user or not user.default_author_id:
+                raise ValueError(
+                    "No author_id provided and user has no default author. "
+                    "This should not happen - contact administrator."
+                )
+            default_author_id = user.default_author_id
+        
+        # Duplicate check for the whole batch (hothash is unique across users)
+        existing = self.photo_repo.get_owners_by_hashes([schema.hothash for schema in schemas])
+        PhotoPurgeService(self.db).purge_hashes(
+            (schema.hothash for schema in schemas if schema.hothash not in existing), commit=False
+        )
+        
+        coldpreview_repository = None
+        photo_rows = []
+        image_file_rows = []  # (hothash, values) - photo_id known after insert
+        pending = {}  # hothash -> result
+        created_coldpreviews = []  # hothashes that had no stored coldpreview before this call
+        
+        for schema, result in zip(schemas, results):
+            if schema.hothash in existing:
+                photo_id, owner_id = existing[schema.hothash]
+                if owner_id == user_id:
+                    result.update(status="duplicate", photo_id=photo_id)
+                else:
+                    result["error"] = f"Photo with hothash {schema.hothash} already exists"
+                continue
+            if schema.hothash in pending:
+                result["error"] = "Duplicate hothash within batch"
+                continue
+            
+            try:
+                hotpreview_bytes = base64.b64decode(schema.hotpreview_base64, validate=True)
+            except (binascii.Error, ValueError) as e:
+                result["error"] = f"Invalid hotpreview_base64: {e}"
+                continue
+            
+            values = self._photo_values_from_schema(
+                schema,
+                user_id,
+                schema.input_channel_id if schema.input_channel_id in valid_channel_ids else default_channel_id,
+                schema.author_id if schema.author_id is not None else default_author_id,
+                hotpreview_bytes
+            )
+            values["coldpreview_path"] = None
+            
+            if schema.coldpreview_base64:
+                if coldpreview_repository is None:
+                    coldpreview_repository = ColdpreviewRepository()
+                stored_before = coldpreview_repository.storage.size_by_hash(schema.hothash) is not None
+                try:
+                    coldpreview_bytes = base64.b64decode(schema.coldpreview_base64)
+                    values["coldpreview_path"], _, _, _ = coldpreview_repository.save_coldpreview(
+                        schema.hothash, coldpreview_bytes
+                    )
+                except (binascii.Error, ValueError) as e:
+                    result["error"] = str(e)
+                    continue
+                if not stored_before:
+                    created_coldpreviews.append(schema.hothash)
+            
+            photo_rows.append(values)
+            for image_file_schema in schema.image_file_list:
+                image_file_rows.append((schema.hothash, dict(
+                    filename=image_file_schema.filename,
+                    file_size=image_file_schema.file_size,
+                    imported_time=image_file_schema.imported_time,
+                    imported_info=image_file_schema.imported_info,
+                    local_storage_info=image_file_schema.local_storage_info,
+                    cloud_storage_info=image_file_schema.cloud_storage_info,
+                )))
+            pending[schema.hothash] = result
+        
+        if not photo_rows:
+            if commit:
+                self.db.commit()  # Purged rows
+            return results
+        
+        keep_coldpreviews(self.db, [values["hothash"] for values in photo_rows if values["coldpreview_path"]])
+        try:
+            # ON CONFLICT DO NOTHING: a concurrent request may have created some of the
+            # hashes since the duplicate check; only rows actually inserted are returned
+            inserted = self.db.execute(
+                insert_ignore(self.db, Photo).returning(Photo.id, Photo.hothash), photo_rows
+            ).all()
+            photo_ids = {row.hothash: row.id for row in inserted}
+            if photo_ids:
+                refresh_buckets_for_photos(self.db.connection(), photo_ids.values())
+            
+            image_file_rows = [
+                {**values, "photo_id": photo_ids[hothash]}
+                for hothash, values in image_file_rows if hothash in photo_ids
+            ]
+            if image_file_rows:
+                self.db.execute(insert(ImageFile), image_file_rows)
+            
+            if commit:
+                self.db.commit()
+            else:
+                self.db.flush()
+        except Exception:
+            self.db.rollback()
+            self._remove_unclaimed_coldpreviews(coldpreview_repository, created_coldpreviews)
+            raise
+        
+        lost = self.photo_repo.get_owners_by_hashes([hothash for hothash in pending if hothash not in photo_ids])
+        for hothash, result in pending.items():
+            if hothash in photo_ids:
+                result.update(status="created", photo_id=photo_ids[hothash])
+            elif hothash in lost and lost[hothash][1] == user_id:
+                result.update(status="duplicate", photo_id=lost[hothash][0])
+            else:
+                result["error"] = f"Photo with hothash {hothash} already exists"
+        hothash_filters.add(user_id, list(photo_ids))
+        
+        return results
+    
+    def _remove_unclaimed_coldpreviews(self, repository, hothashes: List[str]) -> None:
+        """
+        Delete coldpreviews stored by a failed create for hashes that still have no photo
+        
+        Coldpreviews are stored by hothash: a photo committed meanwhile by a
+        concurrent request uses the same file, so claimed hashes are kept.
+        """
+        if not hothashes:
+            return
+        try:
+            claimed = self.photo_repo.get_owners_by_hashes(hothashes)
+        except Exception as e:
+            # Leftovers are reported by the coldpreview consistency check
+            self.db.rollback()
+            logger.warning(f"Keeping {len(hothashes)} coldpreview(s) of failed batch: {e}")
+            return
+        for hothash in hothashes:
+            if hothash not in claimed:
+                repository.delete_coldpreview_by_hash(hothash)
+    
+    def find_existing_hothashes(self, hothashes: List[str], user_id: int) -> List[str]:
+        """
+        Return which hothashes already exist as photos of user
+        
+        Pre-check for imports: answered from the per-user hothash filter, with
+        filter positives confirmed by batched IN queries (see hothash_filter_service).
+        """
+        return hothash_filters.find_existing(self.db, user_id, hothashes)
+    
     def get_photo_by_hothash(self, hothash: str, user_id: int) -> Photo:
         """
         Get photo by hothash for specific user
@@ -0,0 +1,232 @@
+"""
+Photo Upload Session Service - Resumable chunked uploads for register-image
+
+Large RAW files over flaky connections are sent in chunks instead of one
+multipart request:
+
+1. POST /photos/uploads                        -> session (size, optional sha256)
+2. PUT  /photos/uploads/{id}?offset=N          -> chunk appended at N (repeat)
+   GET  /photos/uploads/{id}                   -> current offset (to resume)
+3. POST /photos/uploads/{id}/finalize          -> processed like register-image
+   DELETE /photos/uploads/{id}                 -> abort
+
+Each chunk request is written straight to its own file on disk (memory use per
+upload is one network read, not the file size) and appended to the upload's
+spool file under a file lock once complete. The committed offset lives in the
+database; a chunk only counts once it is fully written and its checksum
+(optional X-Chunk-SHA256 header) matched. On finalize the whole file is checked
+against the announced size and SHA256, then handed on as a file stream.
+"""
+import fcntl
+import hashlib
+import os
+import shutil
+import uuid
+import logging
+from datetime import datetime, timedelta
+from typing import BinaryIO, Optional
+
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+
+from src.core.config import Config
+from src.core.exceptions import NotFoundError, ValidationError, ConflictError
+from src.models import PhotoUploadSession
+from src.services.photo_register_job_service import remove_spool_file
+
+logger = logging.getLogger(__name__)
+
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+class PhotoUploadSessionService:
+    """Service for resumable chunked uploads"""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def create_session(
+        self,
+        user_id: int,
+        filename: str,
+        size: int,
+        content_type: str = "image/jpeg",
+        sha256: Optional[str] = None
+    ) -> PhotoUploadSession:
+        """
+        Start an upload (creates an empty spool file)
+
+        Raises:
+            ValidationError: size exceeds UPLOAD_MAX_FILE_BYTES
+        """
+        if size > Config.UPLOAD_MAX_FILE_BYTES:
+            raise ValidationError(f"File too large ({size} bytes, max {Config.UPLOAD_MAX_FILE_BYTES})")
+
+        self.purge_expired_sessions()
+
+        session_id = uuid.uuid4().hex
+        os.makedirs(Config.REGISTER_JOB_SPOOL_DIRECTORY, exist_ok=True)
+        spool_path = os.path.join(Config.REGISTER_JOB_SPOOL_DIRECTORY, f"{session_id}.part")
+        open(spool_path, "wb").close()
+
+        upload = PhotoUploadSession(
+            id=session_id,
+            user_id=user_id,
+            filename=filename,
+            content_type=content_type,
+            size=size,
+            sha256=sha256.lower() if sha256 else None,
+            received_bytes=0,
+            spool_path=spool_path
+        )
+        self.db.add(upload)
+        try:
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            remove_spool_file(spool_path)
+            raise
+        self.db.refresh(upload)
+        return upload
+
+    def get_session(self, session_id: str, user_id: int) -> PhotoUploadSession:
+        """
+        Get upload session (user-scoped)
+
+        Raises:
+            NotFoundError: Session does not exist, belongs to another user or expired
+        """
+        upload = (
+            self.db.query(PhotoUploadSession)
+            .filter(PhotoUploadSession.id == session_id)
+            .filter(PhotoUploadSession.user_id == user_id)
+            .first()
+        )
+        if upload is None:
+            raise NotFoundError("Upload session", session_id)
+        return upload
+
+    @staticmethod
+    def _check_offset(upload: PhotoUploadSession, offset: int) -> None:
+        if offset != upload.received_bytes:
+            raise ConflictError(f"Chunk offset {offset} does not match upload offset {upload.received_bytes}")
+
+    def open_chunk(self, upload: PhotoUploadSession, offset: int) -> BinaryIO:
+        """
+        Open a temporary file for one chunk request at offset
+
+        Each request writes its own file next to the spool file; commit_chunk
+        appends it once complete, so concurrent requests for the same offset
+        never write into the spool file at the same time.
+
+        Raises:
+            ConflictError: offset is not the committed offset
+            NotFoundError: Spool file is gone
+        """
+        self._check_offset(upload, offset)
+        if not os.path.exists(upload.spool_path):
+            raise NotFoundError("Upload session", upload.id)
+        return open(f"{upload.spool_path}.{uuid.uuid4().hex}.chunk", "wb")
+
+    @staticmethod
+    def discard_chunk(chunk_file: BinaryIO) -> None:
+        """Close and remove a chunk file that will not be committed"""
+        chunk_file.close()
+        remove_spool_file(chunk_file.name)
+
+    def commit_chunk(self, upload: PhotoUploadSession, offset: int, chunk_path: str,
+                     length: int) -> PhotoUploadSession:
+        """
+        Append a fully received chunk to the spool file and record it
+
+        Runs under an exclusive lock on the spool file. The UPDATE is
+        conditional on the offset still being current, so of two requests for
+        the same offset only one wins; only the winner writes, and its bytes
+        are in the spool file before the new offset is committed. Anything
+        after the committed offset (left by an interrupted append) is truncated
+        first. The chunk file is removed in any case.
+
+        Raises:
+            ConflictError: Another chunk was committed at this offset meanwhile
+            NotFoundError: Spool file is gone
+        """
+        try:
+            with open(upload.spool_path, "r+b") as spool_file:
+                fcntl.flock(spool_file, fcntl.LOCK_EX)  # Released when the file is closed
+                committed = self.db.execute(
+                    update(PhotoUploadSession)
+                    .where(PhotoUploadSession.id == upload.id)
+                    .where(PhotoUploadSession.received_bytes == offset)
+                    .values(received_bytes=offset + length)
+                ).rowcount
+                if committed:
+                    spool_file.truncate(offset)
+                    spool_file.seek(offset)
+                    with open(chunk_path, "rb") as chunk_file:
+                        shutil.copyfileobj(chunk_file, spool_file, HASH_CHUNK_SIZE)
+                    spool_file.flush()
+                self.db.commit()
+        except FileNotFoundError:
+            self.db.rollback()
+            raise NotFoundError("Upload session", upload.id)
+        except Exception:
+            self.db.rollback()
+            raise
+        finally:
+            remove_spool_file(chunk_path)
+
+        self.db.refresh(upload)
+        if not committed:
+            raise ConflictError(f"Chunk offset {offset} does not match upload offset {upload.received_bytes}")
+        return upload
+
+    def verify_complete(self, upload: PhotoUploadSession) -> str:
+        """
+        Check that all bytes arrived and match the announced SHA256
+
+        Returns:
+            Spool file path (still owned by the session until delete_session)
+
+        Raises:
+            ValidationError: Bytes missing or SHA256 mismatch
+        """
+        if upload.received_bytes != upload.size:
+            raise ValidationError(f"Upload incomplete: {upload.received_bytes} of {upload.size} bytes received")
+
+        with open(upload.spool_path, "r+b") as spool_file:
+            spool_file.truncate(upload.size)  # Drop bytes of an uncommitted trailing chunk
+            if upload.sha256:
+                digest = hashlib.sha256()
+                for block in iter(lambda: spool_file.read(HASH_CHUNK_SIZE), b""):
+                    digest.update(block)
+                if digest.hexdigest() != upload.sha256:
+                    raise ValidationError("Upload checksum mismatch: SHA256 of received file differs from announced sha256")
+
+        return upload.spool_path
+
+    def delete_session(self, upload: PhotoUploadSession, remove_file: bool = True) -> None:
+        """
+        End a session (abort, or after processing)
+
+        remove_file=False when the spool file was handed to a register job.
+        """
+        if remove_file:
+            remove_spool_file(upload.spool_path)
+        self.db.delete(upload)
+        self.db.commit()
+
+    def purge_expired_sessions(self) -> int:
+        """Delete sessions idle for longer than UPLOAD_SESSION_TTL_HOURS (all users)"""
+        cutoff = datetime.utcnow() - timedelta(hours=Config.UPLOAD_SESSION_TTL_HOURS)
+        expired = (
+            self.db.query(PhotoUploadSession)
+            .filter(PhotoUploadSession.updated_at < cutoff)
+            .all()
+        )
+        for upload in expired:
+            remove_spool_file(upload.spool_path)
+            self.db.delete(upload)
+        if expired:
+            self.db.commit()
+            logger.info(f"Deleted {len(expired)} expired upload session(s)")
+        return len(expired)
@@ -10,7 +10,7 @@ from src.repositories.photo_repository import PhotoRepository
 from src.schemas.tag_schemas import (
     TagResponse, TagListResponse, TagAutocompleteResponse, TagAutocompleteItem,
     AddTagsResponse, RemoveTagResponse, DeleteTagResponse, RenameTagResponse,
-    TagSummary
+    TagSummary, BulkTagApplyResponse, BulkTagRemoveResponse
 )
 from src.core.exceptions import NotFoundError, ValidationError, ConflictError
 
@@ -129,6 +129,74 @@ class TagService:
             message=message
         )
     
+    def bulk_apply_tags(self, hothashes: List[str], tag_names: List[str], user_id: int) -> BulkTagApplyResponse:
+        """
+        Apply tags to many photos in one transaction
+        
+        Set-based: one lookup for the photos, one for the tags (missing tags
+        are created), and batched INSERT ... ON CONFLICT DO NOTHING for the
+        associations. Hothashes that are not the user's photos are reported,
+        not treated as errors.
+        
+        Args:
+            hothashes: Photo hashes
+            tag_names: Tag names (already normalized)
+            user_id: User ID
+        """
+        photo_ids = self.photo_repo.get_ids_by_hashes(hothashes, user_id)
+        not_found = [h for h in dict.fromkeys(hothashes) if h not in photo_ids]
+        
+        try:
+            tags, tags_created = self.tag_repo.get_or_create_many(tag_names, user_id)
+            added = self.tag_repo.add_tags_to_photos(list(photo_ids.values()), [tag.id for tag in tags])
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+        
+        return BulkTagApplyResponse(
+            photos_matched=len(photo_ids),
+            not_found=not_found,
+            tags=[TagSummary(id=tag.id, name=tag.name) for tag in sorted(tags, key=lambda t: t.name)],
+            tags_created=tags_created,
+            added=added,
+            skipped=len(photo_ids) * len(tags) - added
+        )
+    
+    def bulk_remove_tags(self, hothashes: List[str], tag_names: List[str], user_id: int) -> BulkTagRemoveResponse:
+        """
+        Remove tags from many photos in one transaction
+        
+        Unknown tag names and hothashes are reported, not treated as errors.
+        Tags are kept even if no photo uses them any more.
+        
+        Args:
+            hothashes: Photo hashes
+            tag_names: Tag names (already normalized)
+            user_id: User ID
+        """
+        photo_ids = self.photo_repo.get_ids_by_hashes(hothashes, user_id)
+        not_found = [h for h in dict.fromkeys(hothashes) if h not in photo_ids]
+        
+        tags = self.tag_repo.get_by_names(tag_names, user_id)
+        known = {tag.name for tag in tags}
+        unknown_tags = [name for name in dict.fromkeys(tag_names) if name not in known]
+        
+        try:
+            removed = self.tag_repo.remove_tags_from_photos(list(photo_ids.values()), [tag.id for tag in tags])
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+        
+        return BulkTagRemoveResponse(
+            photos_matched=len(photo_ids),
+            not_found=not_found,
+            tags=[TagSummary(id=tag.id, name=tag.name) for tag in sorted(tags, key=lambda t: t.name)],
+            unknown_tags=unknown_tags,
+            removed=removed
+        )
+    
     def remove_tag_from_photo(self, hothash: str, tag_name: str, user_id: int) -> RemoveTagResponse:
         """
         Remove a tag from a photo
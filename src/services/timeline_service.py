@@ -6,21 +6,36 @@ from typing import Optional, Literal
 from fastapi import HTTPException, status
 
 from src.repositories.timeline_repository import TimelineRepository
-from src.schemas.timeline_schemas import TimelineResponse, TimelineBucket, TimelineMeta, DateRange
+from src.repositories.timeline_bucket_repository import TimelineBucketRepository
+from src.schemas.photo_schemas import PhotoSearchRequest
+from src.schemas.timeline_schemas import (
+    TimelineResponse, TimelineBucket, TimelineMeta, DateRange, TimelinePreview, TimelineHistogramResponse
+)
+from src.utils.histogram import bin_index, bin_start, encode_runs
+
+# Upper limit for previews per bucket (largest mosaic is 3x3)
+MAX_TIMELINE_PREVIEWS = 9
 
 
 class TimelineService:
     """Service for timeline operations"""
     
-    def __init__(self, timeline_repo: TimelineRepository):
+    def __init__(
+        self,
+        timeline_repo: TimelineRepository,
+        bucket_repo: Optional[TimelineBucketRepository] = None
+    ):
         self.timeline_repo = timeline_repo
+        # Rollup reads (O(buckets)); photo scans via timeline_repo when absent
+        self.bucket_repo = bucket_repo
     
     def _validate_parameters(
         self,
         granularity: str,
         year: Optional[int],
         month: Optional[int],
-        day: Optional[int]
+        day: Optional[int],
+        previews: int = 1
     ):
         """Validate timeline request parameters."""
         # Validate granularity
@@ -55,6 +70,13 @@ class TimelineService:
                     detail="Invalid day. Must be between 1 and 31"
                 )
         
+        # Validate previews
+        if previews < 1 or previews > MAX_TIMELINE_PREVIEWS:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Invalid previews. Must be between 1 and {MAX_TIMELINE_PREVIEWS}"
+            )
+        
         # Validate parameter requirements for each granularity
         if granularity == 'month' and year is None:
             raise HTTPException(
@@ -93,6 +115,10 @@ class TimelineService:
                 count=item['count'],
                 preview_hothash=item['preview_hothash'],
                 preview_url=self._build_preview_url(item['preview_hothash']),
+                previews=[
+                    TimelinePreview(hothash=hothash, url=self._build_preview_url(hothash))
+                    for hothash in item.get('preview_hothashes') or [item['preview_hothash']]
+                ],
                 date_range=DateRange(
                     first=item['first_date'],
                     last=item['last_date']
@@ -108,7 +134,9 @@ class TimelineService:
         year: Optional[int] = None,
         month: Optional[int] = None,
         day: Optional[int] = None,
-        user_id: Optional[int] = None
+        user_id: Optional[int] = None,
+        previews: int = 1,
+        search_params: Optional[PhotoSearchRequest] = None
     ) -> TimelineResponse:
         """
         Get timeline aggregation at specified granularity.
@@ -119,40 +147,65 @@ class TimelineService:
             month: Filter to specific month (requires year)
             day: Filter to specific day (requires year and month)
             user_id: User ID for visibility filtering (None for anonymous)
+            previews: Representative photos per bucket (the rollup keeps one
+                candidate per hour, so more than one is read from photos)
+            search_params: Only count photos matching this search (read from
+                photos, not the rollup)
         
         Returns:
             TimelineResponse with buckets and metadata
         """
         # Validate parameters
-        self._validate_parameters(granularity, year, month, day)
+        self._validate_parameters(granularity, year, month, day, previews)
         
         # Get aggregation data based on granularity
-        if granularity == 'year':
-            raw_data = self.timeline_repo.get_year_aggregation(user_id=user_id)
+        if self.bucket_repo is not None and previews == 1 and search_params is None:
+            raw_data = self.bucket_repo.get_aggregation(
+                granularity,
+                year=year,
+                month=month,
+                day=day,
+                user_id=user_id
+            )
+        elif granularity == 'year':
+            raw_data = self.timeline_repo.get_year_aggregation(
+                user_id=user_id,
+                previews=previews,
+                search_params=search_params
+            )
         elif granularity == 'month':
             raw_data = self.timeline_repo.get_month_aggregation(
                 year=year,
-                user_id=user_id
+                user_id=user_id,
+                previews=previews,
+                search_params=search_params
             )
         elif granularity == 'day':
             raw_data = self.timeline_repo.get_day_aggregation(
                 year=year,
                 month=month,
-                user_id=user_id
+                user_id=user_id,
+                previews=previews,
+                search_params=search_params
             )
         else:  # hour
             raw_data = self.timeline_repo.get_hour_aggregation(
                 year=year,
                 month=month,
                 day=day,
-                user_id=user_id
+                user_id=user_id,
+                previews=previews,
+                search_params=search_params
             )
         
         # Build timeline buckets
         buckets = self._build_timeline_buckets(raw_data)
         
         # Get total photo count
-        total_photos = self.timeline_repo.count_total_photos(user_id=user_id)
+        if search_params is not None or self.bucket_repo is None:
+            total_photos = self.timeline_repo.count_total_photos(user_id=user_id, search_params=search_params)
+        else:
+            total_photos = self.bucket_repo.count_total_photos(user_id=user_id)
         
         # Build metadata
         meta = TimelineMeta(
@@ -174,3 +227,38 @@ class TimelineService:
             meta.total_hours = len(buckets)
         
         return TimelineResponse(data=buckets, meta=meta)
+    
+    def get_histogram(
+        self,
+        granularity: Literal["year", "month", "day", "hour"] = "day",
+        user_id: Optional[int] = None
+    ) -> TimelineHistogramResponse:
+        """
+        Get photo counts for every bucket from the first to the last photo.
+        
+        Read from the rollup when available (one grouped pass over buckets),
+        otherwise from one grouped pass over photos.
+        
+        Args:
+            granularity: Bin size (year/month/day/hour)
+            user_id: User ID for visibility filtering (None for anonymous)
+        
+        Returns:
+            TimelineHistogramResponse with run-length encoded counts
+        """
+        repo = self.bucket_repo or self.timeline_repo
+        rows = repo.get_histogram(granularity, user_id=user_id)
+        
+        bins = (
+            (bin_index(granularity, **{key: value for key, value in row.items() if key != 'count'}), row['count'])
+            for row in rows
+        )
+        first, length, runs = encode_runs(bins)
+        
+        return TimelineHistogramResponse(
+            granularity=granularity,
+            start=bin_start(granularity, first) if first is not None else None,
+            bins=length,
+            total_photos=sum(row['count'] for row in rows),
+            runs=runs
+        )
@@ -0,0 +1,51 @@
+"""
+Bloom filter for hothash membership checks
+
+Answers "definitely not present" or "maybe present" using a few bits per item.
+Hothashes are SHA-256 hex digests, so bit positions are taken directly from the
+hash bytes (double hashing) instead of hashing again.
+"""
+import hashlib
+import math
+from typing import Iterable, List
+
+MIN_CAPACITY = 1024
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter sized for capacity items at error_rate false positives"""
+
+    def __init__(self, capacity: int, error_rate: float = 0.01):
+        self.capacity = max(capacity, MIN_CAPACITY)
+        self.error_rate = error_rate
+        self.num_bits = math.ceil(-self.capacity * math.log(error_rate) / (math.log(2) ** 2))
+        self.num_hashes = max(1, round(self.num_bits / self.capacity * math.log(2)))
+        self.bits = bytearray((self.num_bits + 7) // 8)
+        self.count = 0
+
+    def _positions(self, key: str) -> List[int]:
+        try:
+            digest = bytes.fromhex(key)
+        except ValueError:
+            digest = b""
+        if len(digest) < 16:
+            digest = hashlib.sha256(key.encode()).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:16], "little") | 1
+        return [(h1 + i * h2) % self.num_bits for i in range(self.num_hashes)]
+
+    def add(self, key: str) -> None:
+        for position in self._positions(key):
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def update(self, keys: Iterable[str]) -> None:
+        for key in keys:
+            self.add(key)
+
+    def __contains__(self, key: str) -> bool:
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(key))
+
+    @property
+    def size_bytes(self) -> int:
+        return len(self.bits)
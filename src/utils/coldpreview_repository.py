@@ -12,24 +12,31 @@ Backend receives pre-processed coldpreviews from:
 
 Key features:
 - Configurable repository location via core.config
-- Efficient 2-level directory structure for performance  
+- Pluggable storage backend (see utils.coldpreview_storage):
+  2-level directory structure (default) or packed segment files
 - No image processing - just stores pre-processed bytes
 - Relative path storage for database references
 """
 import os
 import hashlib
 from pathlib import Path
-from typing import Optional, Tuple
-from PIL import Image as PILImage
-import io
+from typing import BinaryIO, Optional, Tuple
 
 from src.core.config import Config
+from src.core.exceptions import APIException
+from src.utils import image_ops
+from src.utils.coldpreview_storage import ColdpreviewStorage, get_coldpreview_storage
+from src.utils.image_header import UnknownImageFormatError, probe_image_header
+from src.utils.image_worker_pool import get_image_worker_pool
+
+# Bytes sent to the worker pool for Pillow dimension probing (image header only)
+PROBE_PREFIX_BYTES = 64 * 1024
 
 
 class ColdpreviewRepository:
     """Handles coldpreview file storage and retrieval"""
     
-    def __init__(self, base_path: Optional[str] = None):
+    def __init__(self, base_path: Optional[str] = None, backend: Optional[str] = None):
         if base_path is None:
             # Use configured storage directory + coldpreviews subdirectory
             config = Config()
@@ -37,12 +44,13 @@ class ColdpreviewRepository:
             self.base_path = Path(config.DATA_DIRECTORY) / "coldpreviews"
         else:
             self.base_path = Path(base_path)
-            
-        self.base_path.mkdir(parents=True, exist_ok=True)
+        
+        # Backend instances are shared per process (segment index is loaded once)
+        self.storage: ColdpreviewStorage = get_coldpreview_storage(str(self.base_path), backend)
     
     def get_file_path(self, hothash: str) -> Path:
         """
-        Generate filesystem path for coldpreview from hothash
+        Generate filesystem path for coldpreview from hothash ("files" backend layout)
         
         Uses 2-level directory structure for performance:
         hothash "abcd1234567890ef..." → "ab/cd/abcd1234567890ef.jpg"
@@ -53,10 +61,43 @@ class ColdpreviewRepository:
         
         return self.base_path / dir1 / dir2 / filename
     
+    def probe_dimensions(self, image_data: bytes, verify: bool = False) -> Tuple[int, int]:
+        """
+        Read (width, height) from image bytes
+        
+        JPEG, PNG and WebP are read from the header in-process (utils.image_header).
+        Other formats fall back to Pillow in the image worker pool, with only the
+        header prefix sent to the worker.
+        
+        Args:
+            image_data: Image bytes
+            verify: Strict check for untrusted uploads - the header must parse as
+                    JPEG, PNG or WebP (no Pillow fallback)
+        
+        Raises:
+            ValueError: If data is not a readable image
+            ServiceBusyError / ProcessingTimeoutError: Worker pool overloaded
+        """
+        try:
+            header = probe_image_header(image_data)
+            return header.width, header.height
+        except UnknownImageFormatError:
+            if verify:
+                raise
+        
+        pool = get_image_worker_pool()
+        if len(image_data) <= PROBE_PREFIX_BYTES:
+            return pool.run(image_ops.probe_dimensions, image_data)
+        try:
+            return pool.run(image_ops.probe_dimensions, image_data[:PROBE_PREFIX_BYTES])
+        except ValueError:
+            return pool.run(image_ops.probe_dimensions, image_data)
+    
     def save_coldpreview(self, hothash: str, image_data: bytes, 
-                        max_size: int = 1200, quality: int = 85) -> Tuple[str, int, int, int]:
+                        max_size: int = 1200, quality: int = 85,
+                        verify: bool = False) -> Tuple[str, int, int, int]:
         """
-        Save pre-processed coldpreview to filesystem
+        Save pre-processed coldpreview to storage backend
         
         Backend receives coldpreview already processed by:
         - imalink-core server (via PhotoCreateSchema)
@@ -69,6 +110,7 @@ class ColdpreviewRepository:
             image_data: Pre-processed coldpreview bytes (JPEG)
             max_size: IGNORED (kept for backwards compatibility)
             quality: IGNORED (kept for backwards compatibility)
+            verify: Require a valid JPEG, PNG or WebP header (untrusted uploads)
             
         Returns:
             Tuple of (relative_path, width, height, file_size)
@@ -78,31 +120,66 @@ class ColdpreviewRepository:
             raise ValueError("Image data is empty")
         
         try:
-            # Read dimensions from image bytes (no processing)
-            img = PILImage.open(io.BytesIO(image_data))
-            width, height = img.size
+            # Read dimensions from image header (no decoding)
+            width, height = self.probe_dimensions(image_data, verify=verify)
             
-            # Generate file path
-            file_path = self.get_file_path(hothash)
-            file_path.parent.mkdir(parents=True, exist_ok=True)
+            # Save bytes directly to storage (no processing!)
+            relative_path = self.storage.write(hothash, image_data)
             
-            # Save bytes directly to disk (no processing!)
-            file_path.write_bytes(image_data)
+            # Return relative path for database storage
+            return relative_path, width, height, len(image_data)
             
-            # Get file size
-            file_size = file_path.stat().st_size
+        except APIException:
+            raise  # Worker pool busy/timeout - not a problem with the image
+        except Exception as e:
+            raise ValueError(f"Failed to save coldpreview: {str(e)}")
+    
+    def save_coldpreview_stream(self, hothash: str, stream: BinaryIO,
+                                verify: bool = False) -> Tuple[str, int, int, int]:
+        """
+        Save coldpreview from a file object without loading it into memory
+        
+        Used for multipart uploads (UploadFile spools large parts to disk).
+        Only the header prefix is read for dimensions; the rest is copied to
+        storage in chunks.
+        
+        Args:
+            hothash: Photo hash identifier
+            stream: Seekable binary file object positioned anywhere
+            verify: Require a valid JPEG, PNG or WebP header (untrusted uploads)
             
-            # Return relative path for database storage
-            relative_path = str(file_path.relative_to(self.base_path))
+        Returns:
+            Tuple of (relative_path, width, height, file_size)
+        """
+        stream.seek(0, os.SEEK_END)
+        size = stream.tell()
+        if size == 0:
+            raise ValueError("Image data is empty")
+        
+        try:
+            stream.seek(0)
+            header = stream.read(PROBE_PREFIX_BYTES)
+            try:
+                width, height = self.probe_dimensions(header, verify=verify)
+            except ValueError:
+                if len(header) >= size:
+                    raise
+                # Header larger than the prefix (e.g. big EXIF/ICC segments)
+                stream.seek(0)
+                width, height = self.probe_dimensions(stream.read(), verify=verify)
             
-            return relative_path, width, height, file_size
+            stream.seek(0)
+            relative_path = self.storage.write_stream(hothash, stream, size)
+            return relative_path, width, height, size
             
+        except APIException:
+            raise  # Worker pool busy/timeout - not a problem with the image
         except Exception as e:
             raise ValueError(f"Failed to save coldpreview: {str(e)}")
     
     def load_coldpreview(self, relative_path: str) -> Optional[bytes]:
         """
-        Load coldpreview from filesystem
+        Load coldpreview from storage
         
         Args:
             relative_path: Path relative to base_path
@@ -110,22 +187,13 @@ class ColdpreviewRepository:
         Returns:
             Image bytes or None if not found
         """
-        full_path = self.base_path / relative_path
-        
-        if not full_path.exists():
-            return None
-        
-        try:
-            with open(full_path, 'rb') as f:
-                return f.read()
-        except Exception:
-            return None
+        return self.storage.read(relative_path)
     
     def resize_coldpreview(self, image_data: bytes, target_width: Optional[int] = None,
                           target_height: Optional[int] = None, target_size: Optional[int] = None,
                           quality: int = 85) -> bytes:
         """
-        Resize coldpreview image on-the-fly
+        Resize coldpreview image on-the-fly (runs in image worker pool)
         
         Args:
             image_data: Original image bytes
@@ -137,40 +205,13 @@ class ColdpreviewRepository:
         Returns:
             Resized image bytes
         """
-        img = PILImage.open(io.BytesIO(image_data))
-        original_width, original_height = img.size
-        
-        # Calculate target dimensions
-        if target_size:
-            # Resize to fit within target_size (square)
-            if max(original_width, original_height) > target_size:
-                img.thumbnail((target_size, target_size), PILImage.Resampling.LANCZOS)
-        elif target_width and target_height:
-            # Resize to specific dimensions (may change aspect ratio)
-            img = img.resize((target_width, target_height), PILImage.Resampling.LANCZOS)
-        elif target_width:
-            # Resize to specific width, maintain aspect ratio
-            ratio = target_width / original_width
-            new_height = int(original_height * ratio)
-            img = img.resize((target_width, new_height), PILImage.Resampling.LANCZOS)
-        elif target_height:
-            # Resize to specific height, maintain aspect ratio
-            ratio = target_height / original_height
-            new_width = int(original_width * ratio)
-            img = img.resize((new_width, target_height), PILImage.Resampling.LANCZOS)
-        
-        # Don't upscale - return original if target is larger
-        if img.size[0] > original_width or img.size[1] > original_height:
-            img = PILImage.open(io.BytesIO(image_data))  # Reset to original
-        
-        # Convert to JPEG bytes
-        output = io.BytesIO()
-        img.save(output, format='JPEG', quality=quality, optimize=True)
-        return output.getvalue()
+        return get_image_worker_pool().run(
+            image_ops.resize_jpeg, image_data, target_width, target_height, target_size, quality
+        )
     
     def delete_coldpreview(self, relative_path: str) -> bool:
         """
-        Delete coldpreview file from filesystem
+        Delete coldpreview from storage
         
         Args:
             relative_path: Path relative to base_path
@@ -178,31 +219,11 @@ class ColdpreviewRepository:
         Returns:
             True if deleted successfully
         """
-        full_path = self.base_path / relative_path
-        
-        try:
-            if full_path.exists():
-                full_path.unlink()
-                
-                # Clean up empty directories
-                parent_dir = full_path.parent
-                if parent_dir != self.base_path and not any(parent_dir.iterdir()):
-                    parent_dir.rmdir()
-                    
-                    # Check grandparent too
-                    grandparent_dir = parent_dir.parent
-                    if grandparent_dir != self.base_path and not any(grandparent_dir.iterdir()):
-                        grandparent_dir.rmdir()
-                
-                return True
-        except Exception:
-            pass
-        
-        return False
+        return self.storage.delete(relative_path)
     
     def delete_coldpreview_by_hash(self, hothash: str) -> bool:
         """
-        Delete coldpreview file by hothash
+        Delete coldpreview by hothash
         
         Args:
             hothash: Photo hash identifier
@@ -210,27 +231,7 @@ class ColdpreviewRepository:
         Returns:
             True if deleted successfully
         """
-        file_path = self.get_file_path(hothash)
-        
-        try:
-            if file_path.exists():
-                file_path.unlink()
-                
-                # Clean up empty directories
-                parent_dir = file_path.parent
-                if parent_dir != self.base_path and not any(parent_dir.iterdir()):
-                    parent_dir.rmdir()
-                    
-                    # Check grandparent too
-                    grandparent_dir = parent_dir.parent
-                    if grandparent_dir != self.base_path and not any(grandparent_dir.iterdir()):
-                        grandparent_dir.rmdir()
-                
-                return True
-        except Exception:
-            pass
-        
-        return False
+        return self.storage.delete_by_hash(hothash)
     
     def load_coldpreview_by_hash(self, hothash: str) -> Optional[bytes]:
         """
@@ -242,25 +243,15 @@ class ColdpreviewRepository:
         Returns:
             Image bytes or None if not found
         """
-        file_path = self.get_file_path(hothash)
-        
-        if not file_path.exists():
-            return None
-        
-        try:
-            with open(file_path, 'rb') as f:
-                return f.read()
-        except Exception:
-            return None
+        return self.storage.read_by_hash(hothash)
     
     def exists(self, relative_path: str) -> bool:
-        """Check if coldpreview file exists"""
-        full_path = self.base_path / relative_path
-        return full_path.exists()
+        """Check if coldpreview exists in storage"""
+        return self.storage.exists(relative_path)
     
     def get_coldpreview_metadata(self, relative_path: str) -> Optional[dict]:
         """
-        Get coldpreview metadata dynamically from file
+        Get coldpreview metadata dynamically from stored bytes
         
         Args:
             relative_path: Path relative to base_path
@@ -271,18 +262,16 @@ class ColdpreviewRepository:
         if not relative_path:
             return None
             
-        full_path = self.base_path / relative_path
+        image_data = self.storage.read(relative_path)
         
-        if not full_path.exists():
+        if image_data is None:
             return None
         
         try:
-            # Get file size from filesystem
-            file_size = full_path.stat().st_size
+            file_size = len(image_data)
             
-            # Get image dimensions from PIL
-            img = PILImage.open(full_path)
-            width, height = img.size
+            # Get image dimensions (header only)
+            width, height = self.probe_dimensions(image_data)
             
             return {
                 "width": width,
@@ -296,16 +285,11 @@ class ColdpreviewRepository:
     
     def get_repository_stats(self) -> dict:
         """Get repository statistics"""
-        total_files = 0
-        total_size = 0
-        
-        for file_path in self.base_path.rglob("*.jpg"):
-            total_files += 1
-            total_size += file_path.stat().st_size
+        stats = self.storage.stats()
+        total_size = stats["total_size_bytes"]
         
         return {
-            "total_files": total_files,
-            "total_size_bytes": total_size,
+            **stats,
             "total_size_mb": round(total_size / 1024 / 1024, 2),
             "base_path": str(self.base_path)
         }
\ No newline at end of file
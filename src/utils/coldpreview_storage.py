@@ -0,0 +1,753 @@
+"""
+Coldpreview Storage Backends
+Byte-level storage for coldpreview images behind a common interface
+
+ColdpreviewRepository handles coldpreview semantics (dimensions, resizing, metadata)
+and delegates the actual byte storage to one of these backends:
+
+- ShardedFileStorage (default): one file per photo under "ab/cd/<hothash>.jpg".
+  Simple and transparent, but costs one inode per photo.
+- SegmentFileStorage: coldpreviews are appended to large segment files with a
+  compact index of hothash → (segment, offset, length). Reads are mmap slices,
+  deletes are tombstones and a background compactor reclaims dead space.
+
+Both backends return a relative path that is stored in Photo.coldpreview_path.
+The path always ends in "<hothash>.jpg", so either backend can resolve it.
+
+Backend is selected with COLDPREVIEW_STORAGE_BACKEND ("files" or "segments").
+"""
+import mmap
+import os
+import struct
+import threading
+import logging
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import BinaryIO, Dict, Iterator, Optional, Tuple
+
+from src.core.config import Config
+
+logger = logging.getLogger(__name__)
+
+STREAM_CHUNK_SIZE = 64 * 1024  # Copy size for write_stream
+
+
+class ColdpreviewStorage(ABC):
+    """Common interface for coldpreview byte storage"""
+
+    def __init__(self, base_path: Path):
+        self.base_path = Path(base_path)
+        self.base_path.mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def hothash_from_path(relative_path: str) -> str:
+        """Extract hothash from a stored relative path ("ab/cd/<hothash>.jpg")"""
+        return Path(relative_path).stem
+
+    @abstractmethod
+    def write(self, hothash: str, data: bytes) -> str:
+        """Store bytes for hothash, replacing any previous version. Returns relative path."""
+
+    def write_stream(self, hothash: str, stream: BinaryIO, size: int) -> str:
+        """
+        Store exactly size bytes read from a file object (e.g. a multipart upload)
+
+        Backends override this to copy in chunks; the default reads it into memory.
+        """
+        return self.write(hothash, stream.read(size))
+
+    @abstractmethod
+    def read_by_hash(self, hothash: str) -> Optional[bytes]:
+        """Load bytes for hothash, or None if not stored"""
+
+    @abstractmethod
+    def delete_by_hash(self, hothash: str) -> bool:
+        """Delete bytes for hothash. Returns True if something was deleted."""
+
+    @abstractmethod
+    def size_by_hash(self, hothash: str) -> Optional[int]:
+        """Stored size in bytes for hothash, or None if not stored"""
+
+    @abstractmethod
+    def modified_at(self, hothash: str) -> Optional[float]:
+        """
+        Time the bytes for hothash were last written (at the latest), or None if not stored
+
+        May be later than the actual write, never earlier, so age checks based on it are safe.
+        """
+
+    @abstractmethod
+    def iter_hothashes(self) -> Iterator[str]:
+        """Iterate over all stored hothashes"""
+
+    @abstractmethod
+    def stats(self) -> dict:
+        """
+        Storage statistics (total_files, total_size_bytes plus backend details)
+
+        Totals are maintained incrementally on write/delete, so this is cheap
+        once the backend has been counted (see recount()).
+        """
+
+    def recount(self) -> dict:
+        """Recompute totals from the stored data and reset the counters"""
+        return self.stats()
+
+    def read(self, relative_path: str) -> Optional[bytes]:
+        """Load bytes by relative path"""
+        return self.read_by_hash(self.hothash_from_path(relative_path))
+
+    def delete(self, relative_path: str) -> bool:
+        """Delete bytes by relative path"""
+        return self.delete_by_hash(self.hothash_from_path(relative_path))
+
+    def exists(self, relative_path: str) -> bool:
+        """Check if bytes exist for relative path"""
+        return self.size_by_hash(self.hothash_from_path(relative_path)) is not None
+
+    def close(self) -> None:
+        """Release resources held by the backend"""
+
+
+class ShardedFileStorage(ColdpreviewStorage):
+    """
+    One file per coldpreview in a 2-level directory structure
+
+    hothash "abcd1234567890ef..." → "ab/cd/abcd1234567890ef.jpg"
+    """
+
+    backend_name = "files"
+
+    def __init__(self, base_path: Path):
+        super().__init__(base_path)
+        self._counter_lock = threading.Lock()
+        # None until the first recount() - counting requires a full directory walk
+        self._total_files: Optional[int] = None
+        self._total_bytes: Optional[int] = None
+
+    def _adjust_counters(self, files: int, size: int) -> None:
+        with self._counter_lock:
+            if self._total_files is not None:
+                self._total_files += files
+                self._total_bytes += size
+
+    def get_file_path(self, hothash: str) -> Path:
+        """Generate filesystem path for coldpreview from hothash"""
+        return self.base_path / hothash[:2] / hothash[2:4] / f"{hothash}.jpg"
+
+    def write(self, hothash: str, data: bytes) -> str:
+        file_path = self.get_file_path(hothash)
+        old_size = self.size_by_hash(hothash)
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+        file_path.write_bytes(data)
+        if old_size is None:
+            self._adjust_counters(1, len(data))
+        else:
+            self._adjust_counters(0, len(data) - old_size)
+        return str(file_path.relative_to(self.base_path))
+
+    def write_stream(self, hothash: str, stream: BinaryIO, size: int) -> str:
+        file_path = self.get_file_path(hothash)
+        old_size = self.size_by_hash(hothash)
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+
+        # Copy to a temp file next to the target, then rename (readers never see partial files)
+        tmp_path = file_path.with_name(f".{file_path.name}.tmp")
+        try:
+            with open(tmp_path, 'wb') as f:
+                remaining = size
+                while remaining > 0:
+                    chunk = stream.read(min(STREAM_CHUNK_SIZE, remaining))
+                    if not chunk:
+                        raise ValueError(f"Coldpreview stream ended {remaining} bytes early")
+                    f.write(chunk)
+                    remaining -= len(chunk)
+            os.replace(tmp_path, file_path)
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
+
+        if old_size is None:
+            self._adjust_counters(1, size)
+        else:
+            self._adjust_counters(0, size - old_size)
+        return str(file_path.relative_to(self.base_path))
+
+    def read(self, relative_path: str) -> Optional[bytes]:
+        return self._read_file(self.base_path / relative_path)
+
+    def read_by_hash(self, hothash: str) -> Optional[bytes]:
+        return self._read_file(self.get_file_path(hothash))
+
+    def delete(self, relative_path: str) -> bool:
+        return self._delete_file(self.base_path / relative_path)
+
+    def delete_by_hash(self, hothash: str) -> bool:
+        return self._delete_file(self.get_file_path(hothash))
+
+    def exists(self, relative_path: str) -> bool:
+        return (self.base_path / relative_path).exists()
+
+    def size_by_hash(self, hothash: str) -> Optional[int]:
+        try:
+            return self.get_file_path(hothash).stat().st_size
+        except OSError:
+            return None
+
+    def modified_at(self, hothash: str) -> Optional[float]:
+        try:
+            return self.get_file_path(hothash).stat().st_mtime
+        except OSError:
+            return None
+
+    def iter_hothashes(self) -> Iterator[str]:
+        for file_path in self.base_path.rglob("*.jpg"):
+            yield file_path.stem
+
+    def stats(self) -> dict:
+        with self._counter_lock:
+            total_files, total_bytes = self._total_files, self._total_bytes
+        if total_files is None:
+            return self.recount()
+
+        return {
+            "backend": self.backend_name,
+            "total_files": total_files,
+            "total_size_bytes": total_bytes,
+        }
+
+    def recount(self) -> dict:
+        """
+        Walk the directory tree once to initialize the counters
+
+        Writes and deletes that happen while the walk is running may be counted
+        twice or not at all; a later recount() corrects such drift.
+        """
+        total_files = 0
+        total_size = 0
+
+        for file_path in self.base_path.rglob("*.jpg"):
+            try:
+                total_size += file_path.stat().st_size
+                total_files += 1
+            except OSError:
+                continue  # Deleted during the walk
+
+        with self._counter_lock:
+            self._total_files = total_files
+            self._total_bytes = total_size
+
+        return {
+            "backend": self.backend_name,
+            "total_files": total_files,
+            "total_size_bytes": total_size,
+        }
+
+    def _read_file(self, full_path: Path) -> Optional[bytes]:
+        if not full_path.exists():
+            return None
+
+        try:
+            with open(full_path, 'rb') as f:
+                return f.read()
+        except Exception:
+            return None
+
+    def _delete_file(self, full_path: Path) -> bool:
+        try:
+            if full_path.exists():
+                size = full_path.stat().st_size
+                full_path.unlink()
+                self._adjust_counters(-1, -size)
+
+                # Clean up empty directories
+                parent_dir = full_path.parent
+                if parent_dir != self.base_path and not any(parent_dir.iterdir()):
+                    parent_dir.rmdir()
+
+                    # Check grandparent too
+                    grandparent_dir = parent_dir.parent
+                    if grandparent_dir != self.base_path and not any(grandparent_dir.iterdir()):
+                        grandparent_dir.rmdir()
+
+                return True
+        except Exception:
+            pass
+
+        return False
+
+
+class SegmentFileStorage(ColdpreviewStorage):
+    """
+    Append-only segment files with a compact in-memory index
+
+    Layout under base_path/segments:
+        seg-000001.dat   Records: header (magic, hothash, length, flags) + payload
+        seg-000002.dat   New segment started when active one reaches max size
+        index.log        Journal of index records (hothash, segment, offset, length, flags)
+
+    The index is loaded by replaying index.log on startup. Each entry is packed into
+    a 32-byte key and a single int, which keeps memory use low with millions of photos.
+    Deletes append a tombstone; deletes and overwrites leave dead bytes in older
+    segments. compact() copies live records out of mostly-dead segments and removes them.
+
+    Assumes a single writer process (one API process per data directory).
+    """
+
+    backend_name = "segments"
+
+    MAGIC = b"ICP1"
+    RECORD_HEADER = struct.Struct("<4s32sIB")   # magic, hothash, length, flags
+    INDEX_RECORD = struct.Struct("<32sIQIB")    # hothash, segment, offset, length, flags
+    FLAG_DATA = 0
+    FLAG_TOMBSTONE = 1
+    FLAG_ABORTED = 2  # Incomplete streamed write, skipped by rebuild_index
+
+    def __init__(self, base_path: Path, max_segment_bytes: int = 256 * 1024 * 1024,
+                 compaction_threshold: float = 0.5):
+        super().__init__(base_path)
+        self.segment_dir = self.base_path / "segments"
+        self.segment_dir.mkdir(parents=True, exist_ok=True)
+        self.index_path = self.segment_dir / "index.log"
+        self.max_segment_bytes = max_segment_bytes
+        self.compaction_threshold = compaction_threshold
+
+        self._lock = threading.RLock()
+        # key (32 raw bytes) → packed (segment << 72 | offset << 32 | length)
+        self._index: Dict[bytes, int] = {}
+        # Live totals, maintained in _apply_index_record
+        self._live_files = 0
+        self._live_bytes = 0
+        self._maps: Dict[int, mmap.mmap] = {}
+        self._compactor: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+
+        self._load_index()
+        self._active_segment = max(self._segment_ids(), default=1)
+        self._active_file = open(self._segment_path(self._active_segment), 'ab')
+        self._index_file = open(self.index_path, 'ab')
+
+    # ----- Key and index encoding -----
+
+    @staticmethod
+    def _key(hothash: str) -> bytes:
+        try:
+            key = bytes.fromhex(hothash)
+        except ValueError:
+            raise ValueError(f"Invalid hothash for segment storage: {hothash!r}")
+        if len(key) != 32:
+            raise ValueError(f"Invalid hothash for segment storage: {hothash!r}")
+        return key
+
+    @staticmethod
+    def _pack(segment: int, offset: int, length: int) -> int:
+        return (segment << 72) | (offset << 32) | length
+
+    @staticmethod
+    def _unpack(value: int) -> Tuple[int, int, int]:
+        return value >> 72, (value >> 32) & 0xFFFFFFFFFF, value & 0xFFFFFFFF
+
+    def _segment_path(self, segment: int) -> Path:
+        return self.segment_dir / f"seg-{segment:06d}.dat"
+
+    def _segment_ids(self) -> list:
+        return sorted(int(p.stem[4:]) for p in self.segment_dir.glob("seg-*.dat"))
+
+    @staticmethod
+    def relative_path_for(hothash: str) -> str:
+        return f"segments/{hothash}.jpg"
+
+    # ----- Index loading -----
+
+    def _load_index(self) -> None:
+        if not self.index_path.exists() and self._segment_ids():
+            logger.warning("Coldpreview segment index missing - rebuilding from segments")
+            self.rebuild_index()
+            return
+
+        if self.index_path.exists():
+            record_size = self.INDEX_RECORD.size
+            with open(self.index_path, 'rb') as f:
+                while True:
+                    chunk = f.read(record_size * 4096)
+                    if not chunk:
+                        break
+                    usable = len(chunk) - len(chunk) % record_size
+                    for key, segment, offset, length, flags in self.INDEX_RECORD.iter_unpack(chunk[:usable]):
+                        self._apply_index_record(key, segment, offset, length, flags)
+                    if usable < len(chunk):
+                        # Torn write at the end of the journal - ignore the partial record
+                        break
+
+    def _apply_index_record(self, key: bytes, segment: int, offset: int, length: int, flags: int) -> None:
+        if flags == self.FLAG_DATA:
+            previous = self._index.get(key)
+            self._index[key] = self._pack(segment, offset, length)
+        else:
+            previous = self._index.pop(key, None)
+
+        if previous is not None:
+            self._live_files -= 1
+            self._live_bytes -= previous & 0xFFFFFFFF
+        if flags == self.FLAG_DATA:
+            self._live_files += 1
+            self._live_bytes += length
+
+    def _live_bytes_by_segment(self) -> Dict[int, int]:
+        """Bytes (header + payload) still referenced by the index, per segment"""
+        live: Dict[int, int] = {}
+        for value in self._index.values():
+            segment, _, length = self._unpack(value)
+            live[segment] = live.get(segment, 0) + length + self.RECORD_HEADER.size
+        return live
+
+    def rebuild_index(self) -> int:
+        """
+        Rebuild index.log by scanning record headers in all segments
+
+        Recovery tool for a lost or damaged index. Records are replayed in segment
+        order, so the newest write or tombstone for each hothash wins.
+
+        Returns:
+            Number of live entries after rebuild
+        """
+        with self._lock:
+            self._index.clear()
+            self._live_files = 0
+            self._live_bytes = 0
+
+            for segment in self._segment_ids():
+                for key, offset, length, flags in self._iter_records(segment):
+                    if flags != self.FLAG_ABORTED:
+                        self._apply_index_record(key, segment, offset, length, flags)
+
+            self._write_index_snapshot()
+            return len(self._index)
+
+    def _iter_records(self, segment: int) -> Iterator[Tuple[bytes, int, int, int]]:
+        """Yield (key, payload offset, length, flags) for each record header in segment"""
+        header_size = self.RECORD_HEADER.size
+        with open(self._segment_path(segment), 'rb') as f:
+            while True:
+                header = f.read(header_size)
+                if len(header) < header_size:
+                    break
+                magic, key, length, flags = self.RECORD_HEADER.unpack(header)
+                if magic != self.MAGIC:
+                    logger.error(f"Corrupt record in coldpreview segment {segment} - stopping scan")
+                    break
+                offset = f.tell()
+                f.seek(length, os.SEEK_CUR)
+                yield key, offset, length, flags
+
+    def _write_index_snapshot(self) -> None:
+        """Atomically replace index.log with one record per live entry"""
+        tmp_path = self.index_path.with_suffix(".tmp")
+        with open(tmp_path, 'wb') as f:
+            for key, value in self._index.items():
+                segment, offset, length = self._unpack(value)
+                f.write(self.INDEX_RECORD.pack(key, segment, offset, length, self.FLAG_DATA))
+            f.flush()
+            os.fsync(f.fileno())
+
+        index_file = getattr(self, '_index_file', None)
+        if index_file is not None:
+            index_file.close()
+        os.replace(tmp_path, self.index_path)
+        if index_file is not None:
+            self._index_file = open(self.index_path, 'ab')
+
+    # ----- Writes -----
+
+    def _append_record(self, key: bytes, data: bytes, flags: int, length: Optional[int] = None) -> Tuple[int, int]:
+        """
+        Append record to active segment (rolling over if full). Returns (segment, payload offset).
+
+        With length, only the header is written for a payload of that size; the
+        caller writes the payload (streamed writes).
+        """
+        streamed = length is not None
+        if length is None:
+            length = len(data)
+        record_size = self.RECORD_HEADER.size + length
+        if self._active_file.tell() > 0 and self._active_file.tell() + record_size > self.max_segment_bytes:
+            self._active_file.close()
+            self._active_segment += 1
+            self._active_file = open(self._segment_path(self._active_segment), 'ab')
+
+        offset = self._active_file.tell() + self.RECORD_HEADER.size
+        self._active_file.write(self.RECORD_HEADER.pack(self.MAGIC, key, length, flags))
+        if not streamed:
+            self._active_file.write(data)
+            self._active_file.flush()
+        return self._active_segment, offset
+
+    def _append_index(self, key: bytes, segment: int, offset: int, length: int, flags: int) -> None:
+        self._index_file.write(self.INDEX_RECORD.pack(key, segment, offset, length, flags))
+        self._index_file.flush()
+        self._apply_index_record(key, segment, offset, length, flags)
+
+    def write(self, hothash: str, data: bytes) -> str:
+        key = self._key(hothash)
+        with self._lock:
+            segment, offset = self._append_record(key, data, self.FLAG_DATA)
+            self._append_index(key, segment, offset, len(data), self.FLAG_DATA)
+        return self.relative_path_for(hothash)
+
+    def _mark_aborted(self, segment: int, offset: int) -> None:
+        """Flag a record whose payload was not fully written (flags is the last header byte)"""
+        with open(self._segment_path(segment), 'r+b') as f:
+            f.seek(offset - 1)
+            f.write(bytes([self.FLAG_ABORTED]))
+
+    def write_stream(self, hothash: str, stream: BinaryIO, size: int) -> str:
+        key = self._key(hothash)
+        with self._lock:
+            segment, offset = self._append_record(key, b"", self.FLAG_DATA, length=size)
+            remaining = size
+            try:
+                while remaining > 0:
+                    chunk = stream.read(min(STREAM_CHUNK_SIZE, remaining))
+                    if not chunk:
+                        raise ValueError(f"Coldpreview stream ended {remaining} bytes early")
+                    self._active_file.write(chunk)
+                    remaining -= len(chunk)
+            finally:
+                if remaining:
+                    # Pad to the announced length so the next record stays aligned
+                    self._active_file.write(b"\0" * remaining)
+                self._active_file.flush()
+                if remaining:
+                    # Not indexed, so any previous version stays readable
+                    self._mark_aborted(segment, offset)
+            self._append_index(key, segment, offset, size, self.FLAG_DATA)
+        return self.relative_path_for(hothash)
+
+    def delete_by_hash(self, hothash: str) -> bool:
+        key = self._key(hothash)
+        with self._lock:
+            if key not in self._index:
+                return False
+            segment, offset = self._append_record(key, b"", self.FLAG_TOMBSTONE)
+            self._append_index(key, segment, offset, 0, self.FLAG_TOMBSTONE)
+        return True
+
+    # ----- Reads -----
+
+    def _get_map(self, segment: int, end: int) -> mmap.mmap:
+        """Get read-only mmap of segment, remapping if the segment has grown past end"""
+        mapped = self._maps.get(segment)
+        if mapped is None or len(mapped) < end:
+            if mapped is not None:
+                mapped.close()
+            with open(self._segment_path(segment), 'rb') as f:
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            self._maps[segment] = mapped
+        return mapped
+
+    def read_by_hash(self, hothash: str) -> Optional[bytes]:
+        try:
+            key = self._key(hothash)
+        except ValueError:
+            return None
+
+        with self._lock:
+            value = self._index.get(key)
+            if value is None:
+                return None
+            segment, offset, length = self._unpack(value)
+            try:
+                return self._get_map(segment, offset + length)[offset:offset + length]
+            except (OSError, ValueError) as e:
+                logger.error(f"Failed to read coldpreview {hothash[:8]} from segment {segment}: {e}")
+                return None
+
+    def size_by_hash(self, hothash: str) -> Optional[int]:
+        try:
+            key = self._key(hothash)
+        except ValueError:
+            return None
+        value = self._index.get(key)
+        return None if value is None else self._unpack(value)[2]
+
+    def modified_at(self, hothash: str) -> Optional[float]:
+        # Records carry no timestamp; the segment's mtime is its last append,
+        # which is never earlier than the record's own write
+        try:
+            key = self._key(hothash)
+        except ValueError:
+            return None
+        value = self._index.get(key)
+        if value is None:
+            return None
+        try:
+            return self._segment_path(self._unpack(value)[0]).stat().st_mtime
+        except OSError:
+            return None
+
+    def iter_hothashes(self) -> Iterator[str]:
+        with self._lock:
+            keys = list(self._index.keys())
+        for key in keys:
+            yield key.hex()
+
+    def stats(self) -> dict:
+        with self._lock:
+            live_bytes = self._live_bytes + self._live_files * self.RECORD_HEADER.size
+            segment_ids = self._segment_ids()
+            segment_bytes = sum(self._segment_path(segment).stat().st_size for segment in segment_ids)
+            return {
+                "backend": self.backend_name,
+                "total_files": self._live_files,
+                "total_size_bytes": self._live_bytes,
+                "segment_count": len(segment_ids),
+                "segment_bytes": segment_bytes,
+                "dead_bytes": max(segment_bytes - live_bytes, 0),
+            }
+
+    # ----- Compaction -----
+
+    def compact(self, threshold: Optional[float] = None) -> dict:
+        """
+        Reclaim space from sealed segments whose dead ratio is at least threshold
+
+        Live records are copied to the active segment one at a time (the lock is
+        released between records), then the old segment file is removed and the
+        index journal is rewritten as a snapshot. Tombstones are copied too while
+        another segment still holds data for the deleted hothash, so rebuild_index
+        does not bring it back.
+
+        Returns:
+            Dict with compacted segment count and reclaimed bytes
+        """
+        threshold = self.compaction_threshold if threshold is None else threshold
+
+        with self._lock:
+            live = self._live_bytes_by_segment()
+            candidates = []
+            for segment in self._segment_ids():
+                if segment == self._active_segment:
+                    continue
+                size = self._segment_path(segment).stat().st_size
+                if size and (size - live.get(segment, 0)) / size >= threshold:
+                    candidates.append(segment)
+            if not candidates:
+                return {"segments_compacted": 0, "bytes_reclaimed": 0}
+
+            candidate_set = set(candidates)
+            moves = [
+                (key, value) for key, value in self._index.items()
+                if self._unpack(value)[0] in candidate_set
+            ]
+            sealed = [s for s in self._segment_ids() if s != self._active_segment]
+
+        # Sealed segments are not modified, so they are scanned without the lock.
+        # Data in the active segment for a deleted key is followed by a tombstone there.
+        deleted = set()
+        for segment in candidates:
+            for key, _, _, flags in self._iter_records(segment):
+                if flags == self.FLAG_TOMBSTONE and key not in self._index:
+                    deleted.add(key)
+        tombstones = set()
+        if deleted:
+            for segment in sealed:
+                if segment in candidate_set:
+                    continue
+                for key, _, _, flags in self._iter_records(segment):
+                    if flags == self.FLAG_DATA and key in deleted:
+                        tombstones.add(key)
+
+        for key in tombstones:
+            with self._lock:
+                # Written again since the scan: its newer record decides instead
+                if key not in self._index:
+                    self._append_record(key, b"", self.FLAG_TOMBSTONE)
+
+        for key, value in moves:
+            with self._lock:
+                # Skip entries deleted or overwritten since the scan
+                if self._index.get(key) != value:
+                    continue
+                segment, offset, length = self._unpack(value)
+                data = self._get_map(segment, offset + length)[offset:offset + length]
+                new_segment, new_offset = self._append_record(key, data, self.FLAG_DATA)
+                self._append_index(key, new_segment, new_offset, length, self.FLAG_DATA)
+
+        reclaimed = 0
+        with self._lock:
+            for segment in candidates:
+                mapped = self._maps.pop(segment, None)
+                if mapped is not None:
+                    mapped.close()
+                segment_path = self._segment_path(segment)
+                reclaimed += segment_path.stat().st_size - live.get(segment, 0)
+                segment_path.unlink()
+            self._write_index_snapshot()
+
+        logger.info(f"Compacted {len(candidates)} coldpreview segments, reclaimed {reclaimed} bytes")
+        return {"segments_compacted": len(candidates), "bytes_reclaimed": reclaimed}
+
+    def start_compactor(self, interval_seconds: float) -> None:
+        """Start background thread that runs compact() every interval_seconds"""
+        if self._compactor is not None:
+            return
+
+        def run():
+            while not self._stop_event.wait(interval_seconds):
+                try:
+                    self.compact()
+                except Exception as e:
+                    logger.error(f"Coldpreview segment compaction failed: {e}", exc_info=True)
+
+        self._compactor = threading.Thread(target=run, name="coldpreview-compactor", daemon=True)
+        self._compactor.start()
+
+    def close(self) -> None:
+        self._stop_event.set()
+        if self._compactor is not None:
+            self._compactor.join(timeout=5)
+            self._compactor = None
+        with self._lock:
+            for mapped in self._maps.values():
+                mapped.close()
+            self._maps.clear()
+            self._active_file.close()
+            self._index_file.close()
+
+
+# Process-wide backend instances (segment index must only be loaded once)
+_storages: Dict[Tuple[str, str], ColdpreviewStorage] = {}
+_storages_lock = threading.Lock()
+
+
+def get_coldpreview_storage(base_path: Optional[str] = None, backend: Optional[str] = None) -> ColdpreviewStorage:
+    """
+    Get shared storage backend for base_path
+
+    Args:
+        base_path: Storage root (default: DATA_DIRECTORY/coldpreviews)
+        backend: "files" or "segments" (default: COLDPREVIEW_STORAGE_BACKEND)
+    """
+    config = Config()
+    if base_path is None:
+        base_path = str(Path(config.DATA_DIRECTORY) / "coldpreviews")
+    backend = backend or config.COLDPREVIEW_STORAGE_BACKEND
+
+    cache_key = (backend, str(Path(base_path).resolve()))
+    with _storages_lock:
+        storage = _storages.get(cache_key)
+        if storage is None:
+            if backend == ShardedFileStorage.backend_name:
+                storage = ShardedFileStorage(Path(base_path))
+            elif backend == SegmentFileStorage.backend_name:
+                storage = SegmentFileStorage(
+                    Path(base_path),
+                    max_segment_bytes=config.COLDPREVIEW_SEGMENT_MAX_BYTES,
+                    compaction_threshold=config.COLDPREVIEW_COMPACTION_THRESHOLD,
+                )
+                if config.COLDPREVIEW_COMPACTION_INTERVAL > 0:
+                    storage.start_compactor(config.COLDPREVIEW_COMPACTION_INTERVAL)
+            else:
+                raise ValueError(f"Unknown coldpreview storage backend: {backend}")
+            _storages[cache_key] = storage
+        return storage
@@ -0,0 +1,36 @@
+"""
+Keyset cursor helpers - Opaque page cursors for taken_at-ordered listings
+
+A cursor is the sort key (taken_at, id) of the last row on a page, encoded as
+URL-safe base64 JSON. The next page continues strictly after that key, so
+pages stay stable while photos are added and cost the same at any depth
+(no OFFSET scan).
+"""
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Optional, Tuple
+
+
+def encode_cursor(taken_at: Optional[datetime], photo_id: int) -> str:
+    """Cursor pointing just past the row with this sort key"""
+    key = [taken_at.isoformat() if taken_at is not None else None, photo_id]
+    return base64.urlsafe_b64encode(json.dumps(key).encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[Optional[datetime], int]:
+    """
+    Inverse of encode_cursor
+
+    Raises:
+        ValueError: If the cursor was not produced by encode_cursor
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        taken_at, photo_id = json.loads(base64.urlsafe_b64decode(padded))
+        if not isinstance(photo_id, int):
+            raise ValueError
+        return (datetime.fromisoformat(taken_at) if taken_at is not None else None), photo_id
+    except (binascii.Error, UnicodeDecodeError, TypeError, ValueError):
+        raise ValueError(f"Invalid cursor: {cursor!r}")
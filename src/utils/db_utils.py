@@ -0,0 +1,49 @@
+"""
+Database helpers shared by repositories
+
+Dialect-specific statement builders for the two supported backends
+(PostgreSQL in production, SQLite in development and tests).
+"""
+from typing import Iterable, Iterator, List, Sequence, TypeVar
+
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+from sqlalchemy.dialects import postgresql, sqlite
+
+T = TypeVar("T")
+
+
+def insert_ignore(db: Session, model):
+    """
+    INSERT ... ON CONFLICT DO NOTHING for the session's dialect
+
+    Rows that would violate a unique or primary key constraint are skipped by
+    the database, so concurrent writers cannot fail on duplicates. With a
+    multi-row .values([...]) the result's rowcount is the number of rows
+    actually inserted.
+    """
+    if db.get_bind().dialect.name == "postgresql":
+        return postgresql.insert(model).on_conflict_do_nothing()
+    return sqlite.insert(model).on_conflict_do_nothing()
+
+
+def upsert(connection: Connection, model, update_columns: Iterable[str]):
+    """
+    INSERT ... ON CONFLICT (primary key) DO UPDATE for the connection's dialect
+
+    Rows whose primary key already exists get update_columns overwritten with
+    the inserted values instead of failing, so writers racing on the same key
+    cannot hit a duplicate key error.
+    """
+    dialect = postgresql if connection.dialect.name == "postgresql" else sqlite
+    statement = dialect.insert(model)
+    return statement.on_conflict_do_update(
+        index_elements=[column.name for column in model.__table__.primary_key.columns],
+        set_={name: statement.excluded[name] for name in update_columns}
+    )
+
+
+def chunked(items: Sequence[T], size: int) -> Iterator[List[T]]:
+    """Yield consecutive slices of at most size items"""
+    for start in range(0, len(items), size):
+        yield list(items[start:start + size])
@@ -0,0 +1,167 @@
+"""
+Event clustering - Segment a photo timeline into proposed trips, days and places
+
+Photos sorted by taken_at are split wherever the time gap to the previous
+photo, or the haversine distance from the previous geotagged photo, exceeds a
+level's threshold. Levels nest from coarse to fine (trip -> day -> location):
+each segment is split again with the next level's thresholds.
+
+Gaps and distances are computed once, in one pass over the photos; every
+level is then a linear scan over index ranges of that pass, so a library of
+500k photos clusters in about a second without array libraries.
+"""
+import math
+from datetime import datetime
+from typing import Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+EARTH_RADIUS_KM = 6371.0088
+
+
+class ClusterLevel(NamedTuple):
+    """Split thresholds of one hierarchy level"""
+    name: str
+    max_gap_seconds: float
+    max_jump_km: float
+    min_photos: int  # smaller segments are not proposed (their photos stay in the parent)
+    split_on_date: bool = False  # also split where the calendar date changes
+
+
+DEFAULT_LEVELS = (
+    ClusterLevel("trip", 36 * 3600, 300.0, 10),
+    ClusterLevel("day", 8 * 3600, 100.0, 3, split_on_date=True),
+    ClusterLevel("location", 2 * 3600, 2.0, 3),
+)
+
+
+class Cluster:
+    """
+    One proposed event: photos[start:end] of the sorted input
+
+    Children cover sub-ranges; photos outside them belong to this cluster
+    directly.
+    """
+
+    __slots__ = ("level", "start", "end", "children")
+
+    def __init__(self, level: str, start: int, end: int, children: List["Cluster"]):
+        self.level = level
+        self.start = start
+        self.end = end
+        self.children = children
+
+    @property
+    def photo_count(self) -> int:
+        """Photos in this cluster and its children"""
+        return self.end - self.start
+
+    def direct_indices(self) -> Iterator[int]:
+        """Indices of photos not covered by a child"""
+        position = self.start
+        for child in self.children:
+            yield from range(position, child.start)
+            position = child.end
+        yield from range(position, self.end)
+
+    def walk(self) -> Iterator[Tuple["Cluster", Optional["Cluster"]]]:
+        """(cluster, parent) pairs of this subtree, parents first"""
+        stack = [(self, None)]
+        while stack:
+            cluster, parent = stack.pop()
+            yield cluster, parent
+            stack.extend((child, cluster) for child in reversed(cluster.children))
+
+
+def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Great-circle distance between two WGS84 points"""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    a = (
+        math.sin((phi2 - phi1) / 2) ** 2
+        + math.cos(phi1) * math.cos(phi2) * math.sin(math.radians(lon2 - lon1) / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def bounding_box(lat: float, lon: float, radius_km: float) -> Tuple[float, float, Optional[float], Optional[float]]:
+    """
+    (min_lat, max_lat, min_lon, max_lon) enclosing a circle, for indexable prefilters
+
+    Longitude bounds are None when the box would reach a pole or cross the
+    antimeridian (no longitude restriction then).
+    """
+    lat_delta = math.degrees(radius_km / EARTH_RADIUS_KM)
+    min_lat, max_lat = lat - lat_delta, lat + lat_delta
+    if min_lat <= -90 or max_lat >= 90:
+        return max(min_lat, -90.0), min(max_lat, 90.0), None, None
+    lon_delta = math.degrees(radius_km / (EARTH_RADIUS_KM * math.cos(math.radians(lat))))
+    if lon - lon_delta < -180 or lon + lon_delta > 180:
+        return min_lat, max_lat, None, None
+    return min_lat, max_lat, lon - lon_delta, lon + lon_delta
+
+
+def _steps(points: Sequence) -> Tuple[List[float], List[float], List[int]]:
+    """
+    Per photo: seconds since the previous photo, km from the previous geotagged
+    photo (0 without GPS) and date ordinal
+    """
+    gaps, jumps, days = [], [], []
+    previous_time = None
+    previous_position = None
+    for point in points:
+        taken_at: datetime = point.taken_at
+        gaps.append((taken_at - previous_time).total_seconds() if previous_time is not None else 0.0)
+        previous_time = taken_at
+        days.append(taken_at.toordinal())
+
+        if point.gps_latitude is None or point.gps_longitude is None:
+            jumps.append(0.0)
+            continue
+        position = (point.gps_latitude, point.gps_longitude)
+        jumps.append(haversine_km(*previous_position, *position) if previous_position else 0.0)
+        previous_position = position
+    return gaps, jumps, days
+
+
+def _segments(level: ClusterLevel, start: int, end: int, steps) -> List[Tuple[int, int]]:
+    """Split [start, end) before every photo that crosses a threshold of level"""
+    gaps, jumps, days = steps
+    max_gap, max_jump, by_date = level.max_gap_seconds, level.max_jump_km, level.split_on_date
+    cuts = [start]
+    for i in range(start + 1, end):
+        if gaps[i] > max_gap or jumps[i] > max_jump or (by_date and days[i] != days[i - 1]):
+            cuts.append(i)
+    cuts.append(end)
+    return list(zip(cuts, cuts[1:]))
+
+
+def cluster_points(points: Sequence, levels: Sequence[ClusterLevel] = DEFAULT_LEVELS) -> List[Cluster]:
+    """
+    Propose an event hierarchy for photos sorted by taken_at
+
+    Args:
+        points: Objects with taken_at (datetime), gps_latitude and gps_longitude
+        levels: Coarse to fine split thresholds
+
+    Returns:
+        Top-level clusters in time order. A level that does not split its
+        parent (one segment, or none with enough photos) is skipped, so a
+        one-day trip directly holds its locations.
+    """
+    steps = _steps(points)
+
+    def children(level_index: int, start: int, end: int) -> List[Cluster]:
+        for index in range(level_index, len(levels)):
+            level = levels[index]
+            kept = [
+                (first, last) for first, last in _segments(level, start, end, steps)
+                if last - first >= level.min_photos
+            ]
+            if kept and kept != [(start, end)]:
+                return [Cluster(level.name, first, last, children(index + 1, first, last)) for first, last in kept]
+        return []
+
+    top = levels[0]
+    return [
+        Cluster(top.name, start, end, children(1, start, end))
+        for start, end in _segments(top, 0, len(points), steps)
+        if end - start >= top.min_photos
+    ]
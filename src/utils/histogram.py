@@ -0,0 +1,92 @@
+"""
+Histogram helpers - Dense time histograms in compact form
+
+Photo counts per year/month/day/hour are numbered as consecutive bins and
+run-length encoded as a flat list [count, run_length, count, run_length, ...]
+(empty stretches become one (0, length) pair). For binary transfer the list
+is packed as unsigned LEB128 varints, so typical day counts take one byte.
+"""
+from datetime import date, datetime, timedelta
+from typing import Iterable, List, Optional, Tuple
+
+GRANULARITIES = ("year", "month", "day", "hour")
+
+
+def bin_index(granularity: str, year: int, month: int = 1, day: int = 1, hour: int = 0) -> int:
+    """Consecutive bin number of a time bucket (adjacent buckets differ by 1)"""
+    if granularity == "year":
+        return year
+    if granularity == "month":
+        return year * 12 + month - 1
+    ordinal = date(year, month, day).toordinal()
+    if granularity == "day":
+        return ordinal
+    return ordinal * 24 + hour
+
+
+def bin_start(granularity: str, index: int) -> datetime:
+    """Start of the bucket with this bin number (inverse of bin_index)"""
+    if granularity == "year":
+        return datetime(index, 1, 1)
+    if granularity == "month":
+        return datetime(index // 12, index % 12 + 1, 1)
+    if granularity == "day":
+        return datetime.combine(date.fromordinal(index), datetime.min.time())
+    start = datetime.combine(date.fromordinal(index // 24), datetime.min.time())
+    return start + timedelta(hours=index % 24)
+
+
+def encode_runs(bins: Iterable[Tuple[int, int]]) -> Tuple[Optional[int], int, List[int]]:
+    """
+    Run-length encode sparse (bin, count) pairs sorted by bin
+
+    Returns:
+        (first bin or None, number of bins covered, flat run list)
+    """
+    runs: List[int] = []
+    first = previous = None
+    for index, count in bins:
+        if first is None:
+            first = index
+        elif index - previous > 1:
+            runs += [0, index - previous - 1]
+        if runs and runs[-2] == count:
+            runs[-1] += 1
+        else:
+            runs += [count, 1]
+        previous = index
+    length = 0 if first is None else previous - first + 1
+    return first, length, runs
+
+
+def decode_runs(runs: List[int]) -> List[int]:
+    """Expand a flat run list into one count per bin"""
+    counts: List[int] = []
+    for count, length in zip(runs[::2], runs[1::2]):
+        counts.extend([count] * length)
+    return counts
+
+
+def pack_varints(values: Iterable[int]) -> bytes:
+    """Pack non-negative integers as unsigned LEB128 varints"""
+    packed = bytearray()
+    for value in values:
+        while value >= 0x80:
+            packed.append((value & 0x7F) | 0x80)
+            value >>= 7
+        packed.append(value)
+    return bytes(packed)
+
+
+def unpack_varints(data: bytes) -> List[int]:
+    """Inverse of pack_varints"""
+    values: List[int] = []
+    value = shift = 0
+    for byte in data:
+        value |= (byte & 0x7F) << shift
+        if byte & 0x80:
+            shift += 7
+        else:
+            values.append(value)
+            value = shift = 0
+    return values
@@ -0,0 +1,139 @@
+"""
+Image Header - Pure-Python dimension probing for JPEG, PNG and WebP
+
+Reads width/height straight from the container header instead of opening the
+image with Pillow. Only the bytes up to the dimension field are examined:
+- JPEG: markers are skipped until the first SOFn segment
+- PNG:  IHDR chunk (always the first chunk, bytes 16-24)
+- WebP: VP8 (lossy), VP8L (lossless) or VP8X (extended) chunk header
+
+This is also a cheap format check: data that is not one of the three formats,
+or whose header is malformed or truncated, raises ValueError. Pixel data is not
+decoded, so corruption after the header is not detected.
+
+Dimensions are as stored in the file (EXIF orientation is not applied),
+matching PIL's Image.size.
+"""
+import struct
+from typing import NamedTuple
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+# SOFn markers carrying frame dimensions (C4 = DHT, C8 = JPG extension, CC = DAC are not frames)
+JPEG_SOF_MARKERS = frozenset(range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}
+# Markers without a length field
+JPEG_STANDALONE_MARKERS = frozenset(range(0xD0, 0xD8)) | {0x01}
+
+
+class ImageHeader(NamedTuple):
+    """Format and dimensions read from an image header"""
+    format: str  # "JPEG", "PNG" or "WEBP" (same names as PIL's Image.format)
+    width: int
+    height: int
+
+
+class UnknownImageFormatError(ValueError):
+    """Data does not start with a JPEG, PNG or WebP signature"""
+
+
+def _checked(header: ImageHeader) -> ImageHeader:
+    if header.width <= 0 or header.height <= 0:
+        raise ValueError(f"Invalid {header.format} header: zero image dimension")
+    return header
+
+
+def _probe_jpeg(data: bytes) -> ImageHeader:
+    pos = 2  # After SOI (FFD8)
+    size = len(data)
+    while True:
+        # Find next marker, skipping fill bytes (FF FF ...)
+        if pos >= size or data[pos] != 0xFF:
+            raise ValueError("Invalid JPEG header: expected marker")
+        while pos < size and data[pos] == 0xFF:
+            pos += 1
+        if pos >= size:
+            raise ValueError("Invalid JPEG header: truncated before frame header")
+        marker = data[pos]
+        pos += 1
+
+        if marker in JPEG_STANDALONE_MARKERS:
+            continue
+        if marker in (0xD9, 0xDA):
+            # EOI or start of scan before any frame header
+            raise ValueError("Invalid JPEG header: no frame header (SOF) before image data")
+
+        if pos + 2 > size:
+            raise ValueError("Invalid JPEG header: truncated before frame header")
+        (length,) = struct.unpack_from(">H", data, pos)
+        if length < 2:
+            raise ValueError("Invalid JPEG header: bad segment length")
+
+        if marker in JPEG_SOF_MARKERS:
+            if pos + 7 > size:
+                raise ValueError("Invalid JPEG header: truncated frame header")
+            # Segment: length(2) precision(1) height(2) width(2)
+            height, width = struct.unpack_from(">HH", data, pos + 3)
+            return _checked(ImageHeader("JPEG", width, height))
+
+        pos += length
+
+
+def _probe_png(data: bytes) -> ImageHeader:
+    if len(data) < 24:
+        raise ValueError("Invalid PNG header: truncated")
+    if data[12:16] != b"IHDR":
+        raise ValueError("Invalid PNG header: first chunk is not IHDR")
+    width, height = struct.unpack_from(">II", data, 16)
+    return _checked(ImageHeader("PNG", width, height))
+
+
+def _probe_webp(data: bytes) -> ImageHeader:
+    if len(data) < 30:
+        raise ValueError("Invalid WebP header: truncated")
+    chunk = data[12:16]
+
+    if chunk == b"VP8 ":
+        # Lossy: frame tag(3) + start code 9D 01 2A + 14-bit width/height
+        if data[23:26] != b"\x9d\x01\x2a":
+            raise ValueError("Invalid WebP header: bad VP8 start code")
+        width, height = struct.unpack_from("<HH", data, 26)
+        return _checked(ImageHeader("WEBP", width & 0x3FFF, height & 0x3FFF))
+
+    if chunk == b"VP8L":
+        # Lossless: signature 0x2F + 14-bit (width - 1) and (height - 1)
+        if data[20] != 0x2F:
+            raise ValueError("Invalid WebP header: bad VP8L signature")
+        (bits,) = struct.unpack_from("<I", data, 21)
+        return _checked(ImageHeader("WEBP", (bits & 0x3FFF) + 1, ((bits >> 14) & 0x3FFF) + 1))
+
+    if chunk == b"VP8X":
+        # Extended: flags(4) + 24-bit (canvas width - 1) and (canvas height - 1)
+        width = int.from_bytes(data[24:27], "little") + 1
+        height = int.from_bytes(data[27:30], "little") + 1
+        return _checked(ImageHeader("WEBP", width, height))
+
+    raise ValueError(f"Invalid WebP header: unknown chunk {chunk!r}")
+
+
+def probe_image_header(data: bytes) -> ImageHeader:
+    """
+    Read format and dimensions from image header bytes
+
+    Args:
+        data: Image bytes (a prefix is enough as long as it contains the header;
+              JPEGs with large EXIF/ICC segments may need more than a few KB)
+
+    Returns:
+        ImageHeader(format, width, height)
+
+    Raises:
+        UnknownImageFormatError: Not JPEG, PNG or WebP
+        ValueError: Header is malformed or truncated
+    """
+    if data[:2] == b"\xff\xd8":
+        return _probe_jpeg(data)
+    if data[:8] == PNG_SIGNATURE:
+        return _probe_png(data)
+    if data[:4] == b"RIFF" and data[8:12] == b"WEBP":
+        return _probe_webp(data)
+    raise UnknownImageFormatError("Invalid image file: unrecognized format (expected JPEG, PNG or WebP)")
@@ -0,0 +1,99 @@
+"""
+Image operations executed in image worker processes
+
+All Pillow decode/encode work in the request path lives here so it can run in
+the ImageWorkerPool (see utils.image_worker_pool) instead of the API threads.
+
+Functions must be module-level and take/return plain picklable values.
+Keep imports light - worker processes import this module on startup.
+"""
+import io
+import time
+from typing import Any, Callable, Optional, Tuple
+
+from PIL import Image as PILImage
+
+
+def timed_call(fn: Callable, args: tuple) -> Tuple[float, float, Optional[Exception], Any]:
+    """
+    Run fn(*args) and report timing for queue-wait metrics
+
+    Returns:
+        (started_at, finished_at, error, result) - wall-clock times; error is the
+        raised exception (returned instead of raised so timing is kept on failure)
+    """
+    started_at = time.time()
+    try:
+        result = fn(*args)
+    except Exception as e:
+        return started_at, time.time(), e, None
+    return started_at, time.time(), None, result
+
+
+def probe_dimensions(image_data: bytes, verify: bool = False) -> Tuple[int, int]:
+    """
+    Read (width, height) from image bytes
+
+    Args:
+        image_data: Encoded image (only the header is decoded)
+        verify: Also run Pillow's integrity check on the data
+
+    Raises:
+        ValueError: If data is not a readable image
+    """
+    try:
+        img = PILImage.open(io.BytesIO(image_data))
+        width, height = img.size
+        if verify:
+            img.verify()
+        return width, height
+    except Exception as e:
+        raise ValueError(f"Invalid image file: {str(e)}")
+
+
+def resize_jpeg(image_data: bytes, target_width: Optional[int] = None,
+                target_height: Optional[int] = None, target_size: Optional[int] = None,
+                quality: int = 85) -> bytes:
+    """
+    Resize image and encode as JPEG
+
+    Args:
+        image_data: Original image bytes
+        target_width: Target width (optional)
+        target_height: Target height (optional)
+        target_size: Target max dimension (optional)
+        quality: JPEG quality
+
+    Returns:
+        Resized JPEG bytes (never upscaled)
+    """
+    img = PILImage.open(io.BytesIO(image_data))
+    original_width, original_height = img.size
+
+    # Calculate target dimensions
+    if target_size:
+        # Resize to fit within target_size (square)
+        if max(original_width, original_height) > target_size:
+            img.thumbnail((target_size, target_size), PILImage.Resampling.LANCZOS)
+    elif target_width and target_height:
+        # Resize to specific dimensions (may change aspect ratio)
+        img = img.resize((target_width, target_height), PILImage.Resampling.LANCZOS)
+    elif target_width:
+        # Resize to specific width, maintain aspect ratio
+        ratio = target_width / original_width
+        new_height = int(original_height * ratio)
+        img = img.resize((target_width, new_height), PILImage.Resampling.LANCZOS)
+    elif target_height:
+        # Resize to specific height, maintain aspect ratio
+        ratio = target_height / original_height
+        new_width = int(original_width * ratio)
+        img = img.resize((new_width, target_height), PILImage.Resampling.LANCZOS)
+
+    # Don't upscale - return original if target is larger
+    if img.size[0] > original_width or img.size[1] > original_height:
+        img = PILImage.open(io.BytesIO(image_data))  # Reset to original
+
+    # Convert to JPEG bytes
+    output = io.BytesIO()
+    img.save(output, format='JPEG', quality=quality, optimize=True)
+    return output.getvalue()
@@ -0,0 +1,146 @@
+"""
+Image Worker Pool - Bounded process pool for CPU-bound image work
+
+Pillow decode/encode (dimension probing, verification, resizing) is CPU-bound and
+holds the GIL for most of its run time. Running it in FastAPI's threadpool lets a
+burst of resize requests starve light endpoints such as thumbnails and metadata.
+
+ImageWorkerPool runs that work in separate processes:
+- Bounded: at most max_workers running + max_queue waiting; more is rejected (503)
+- Timeout: callers stop waiting after timeout seconds (504)
+- Metrics: queue wait and run time per task (exposed via GET /metrics/image-workers)
+
+IMAGE_WORKER_PROCESSES=0 runs the work inline in the calling thread (tests, debugging).
+"""
+import multiprocessing
+import threading
+import time
+import logging
+from concurrent.futures import Future, ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Optional
+
+from src.core.config import Config
+from src.core.exceptions import ServiceBusyError, ProcessingTimeoutError
+from src.utils import image_ops
+from src.utils.queue_metrics import QueueMetrics
+
+logger = logging.getLogger(__name__)
+
+SERVICE_NAME = "Image processing"
+
+
+class ImageWorkerPool:
+    """Bounded ProcessPoolExecutor with queue-depth limit, timeout and metrics"""
+
+    def __init__(self, max_workers: int, max_queue: int, timeout: float):
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.timeout = timeout
+        self.metrics = QueueMetrics()
+        self._lock = threading.Lock()
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # spawn: forking a multi-threaded server process is unsafe
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return self._executor
+
+    def _record_done(self, submitted_at: float, future: Future) -> None:
+        if future.cancelled():
+            self.metrics.on_cancel()
+            return
+        if future.exception() is not None:
+            # Worker crashed (BrokenProcessPool) - timing unknown
+            self.metrics.on_done(None, None, failed=True)
+            return
+        started_at, finished_at, error, _ = future.result()
+        self.metrics.on_done(started_at - submitted_at, finished_at - started_at, failed=error is not None)
+
+    def run(self, fn: Callable, *args: Any) -> Any:
+        """
+        Run image_ops function in a worker process and wait for the result
+
+        Raises:
+            ServiceBusyError: Queue is full
+            ProcessingTimeoutError: Result not ready within timeout
+            Exception: Whatever fn raised (e.g. ValueError for invalid images)
+        """
+        if self.max_workers <= 0:
+            self.metrics.on_submit()
+            started_at, finished_at, error, result = image_ops.timed_call(fn, args)
+            self.metrics.on_done(0.0, finished_at - started_at, failed=error is not None)
+            if error is not None:
+                raise error
+            return result
+
+        with self._lock:
+            if self.metrics.in_flight >= self.max_workers + self.max_queue:
+                self.metrics.on_reject()
+                raise ServiceBusyError(SERVICE_NAME)
+            self.metrics.on_submit()
+            submitted_at = time.time()
+            try:
+                try:
+                    future = self._get_executor().submit(image_ops.timed_call, fn, args)
+                except BrokenProcessPool:
+                    # A worker died - start a fresh pool and retry once
+                    logger.error("Image worker pool broken - restarting")
+                    broken, self._executor = self._executor, None
+                    broken.shutdown(wait=False)
+                    future = self._get_executor().submit(image_ops.timed_call, fn, args)
+            except Exception:
+                # Never queued, so no done callback will settle on_submit
+                self.metrics.on_cancel()
+                raise
+        future.add_done_callback(lambda f: self._record_done(submitted_at, f))
+
+        try:
+            _, _, error, result = future.result(timeout=self.timeout)
+        except FutureTimeoutError:
+            # Queued work is dropped; work already running finishes in the background
+            future.cancel()
+            self.metrics.on_timeout()
+            raise ProcessingTimeoutError(SERVICE_NAME, self.timeout)
+        except BrokenProcessPool:
+            with self._lock:
+                self._executor = None
+            raise
+
+        if error is not None:
+            raise error
+        return result
+
+    def shutdown(self) -> None:
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+
+_pool: Optional[ImageWorkerPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_image_worker_pool() -> ImageWorkerPool:
+    """Get process-wide image worker pool (created on first use)"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ImageWorkerPool(
+                max_workers=Config.IMAGE_WORKER_PROCESSES,
+                max_queue=Config.IMAGE_WORKER_MAX_QUEUE,
+                timeout=Config.IMAGE_WORKER_TIMEOUT,
+            )
+        return _pool
+
+
+def shutdown_image_worker_pool() -> None:
+    """Stop worker processes (called on application shutdown)"""
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown()
@@ -3,13 +3,49 @@ Client for calling imalink-core image processing service
 
 imalink-core is a separate FastAPI server that processes images into PhotoCreateSchema format.
 This client handles communication between backend and core service.
+
+Two clients:
+- ImalinkCoreClient: simple synchronous client (scripts, one-off calls)
+- AsyncImalinkCoreClient: used by the API. One pooled httpx.AsyncClient with
+  keep-alive is shared by all requests, uploads are streamed from the upload
+  file in chunks, and a semaphore limits how many images imalink-core processes
+  at once. Waiting for imalink-core happens on the event loop, so slow image
+  processing does not hold API threadpool threads.
 """
+import asyncio
+import threading
+import time
+import logging
 import httpx
-from typing import Optional
+from typing import Any, BinaryIO, Dict, Optional
 
 from src.core.config import Config
+from src.core.exceptions import ServiceBusyError, ProcessingTimeoutError
+from src.utils.queue_metrics import QueueMetrics
 from imalink_schemas import PhotoCreateSchema
 
+logger = logging.getLogger(__name__)
+
+SERVICE_NAME = "Image processing service"
+
+
+def _form_data(coldpreview_size: Optional[int]) -> Dict[str, str]:
+    data = {}
+    if coldpreview_size is not None:
+        data["coldpreview_size"] = str(coldpreview_size)
+    return data
+
+
+def _parse_response(response: httpx.Response) -> PhotoCreateSchema:
+    """Raise on HTTP errors and validate PhotoCreateSchema JSON"""
+    # Raise on HTTP errors (400, 500, etc.)
+    response.raise_for_status()
+    
+    # imalink-core returns PhotoCreateSchema v2 format directly
+    # (hothash, hotpreview_base64, exif_dict, image_file_list, etc.)
+    # Note: user_id NOT included - backend sets it from JWT token
+    return PhotoCreateSchema(**response.json())
+
 
 class ImalinkCoreClient:
     """Client for imalink-core service"""
@@ -50,31 +86,161 @@ class ImalinkCoreClient:
             httpx.HTTPStatusError: If imalink-core returns error
             ValueError: If PhotoCreateSchema validation fails
         """
-        # Prepare multipart form-data
         files = {"file": (filename, image_bytes, "image/jpeg")}
-        data = {}
-        
-        if coldpreview_size is not None:
-            data["coldpreview_size"] = str(coldpreview_size)
         
         # Call imalink-core /v1/process endpoint (sync)
         with httpx.Client() as client:
             response = client.post(
                 f"{self.core_url}/v1/process",
                 files=files,
-                data=data,
-                timeout=30.0  # Image processing can take time
+                data=_form_data(coldpreview_size),
+                timeout=Config.IMALINK_CORE_TIMEOUT  # Image processing can take time
             )
+            return _parse_response(response)
+
+
+class AsyncImalinkCoreClient:
+    """
+    Pooled async client for imalink-core with a concurrency limit
+    
+    - At most max_concurrency requests are sent at once; others wait up to
+      queue_timeout seconds for a slot, then ServiceBusyError (503)
+    - Requests slower than timeout raise ProcessingTimeoutError (504)
+    - Queue wait and processing times are recorded in metrics
+    
+    The connection pool and semaphore belong to the event loop they were
+    created on; they are recreated if the client is used from another loop.
+    """
+    
+    def __init__(
+        self,
+        core_url: Optional[str] = None,
+        max_concurrency: Optional[int] = None,
+        max_connections: Optional[int] = None,
+        queue_timeout: Optional[float] = None,
+        timeout: Optional[float] = None
+    ):
+        self.core_url = core_url or Config.IMALINK_CORE_URL
+        self.max_concurrency = max_concurrency or Config.IMALINK_CORE_MAX_CONCURRENCY
+        self.max_connections = max_connections or Config.IMALINK_CORE_MAX_CONNECTIONS
+        self.queue_timeout = queue_timeout if queue_timeout is not None else Config.IMALINK_CORE_QUEUE_TIMEOUT
+        self.timeout = timeout if timeout is not None else Config.IMALINK_CORE_TIMEOUT
+        self.metrics = QueueMetrics()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._client: Optional[httpx.AsyncClient] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+    
+    def _ensure_started(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._loop is loop and self._client is not None:
+            return
+        if self._client is not None:
+            logger.warning("imalink-core client used from a new event loop - recreating connection pool")
+        self._loop = loop
+        self._client = httpx.AsyncClient(
+            base_url=self.core_url,
+            limits=httpx.Limits(
+                max_connections=self.max_connections,
+                max_keepalive_connections=self.max_connections
+            ),
+            timeout=httpx.Timeout(self.timeout, connect=5.0)
+        )
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+    
+    async def process_image(
+        self,
+        image_file: BinaryIO,
+        filename: str,
+        coldpreview_size: Optional[int] = None,
+        content_type: str = "image/jpeg"
+    ) -> PhotoCreateSchema:
+        """
+        Send image to imalink-core for processing
+        
+        Args:
+            image_file: Open binary file (e.g. UploadFile.file); sent in chunks
+                        from its current contents, never read into memory whole
+            filename: Original filename (for metadata)
+            coldpreview_size: Optional size for coldpreview (e.g., 2560)
+            content_type: MIME type of the upload
             
-            # Raise on HTTP errors (400, 500, etc.)
-            response.raise_for_status()
-            
-            # Parse and validate PhotoCreateSchema JSON
-            photo_create_dict = response.json()
-            
-            # imalink-core now returns PhotoCreateSchema v2 format directly
-            # (hothash, hotpreview_base64, exif_dict, image_file_list, etc.)
-            # Note: user_id NOT included - backend sets it from JWT token
+        Returns:
+            PhotoCreateSchema: Validated PhotoCreateSchema data
             
-            # Validate using Pydantic schema
-            return PhotoCreateSchema(**photo_create_dict)
+        Raises:
+            ServiceBusyError: No processing slot free within queue_timeout
+            ProcessingTimeoutError: imalink-core did not answer within timeout
+            httpx.HTTPStatusError: If imalink-core returns error
+            httpx.RequestError: If imalink-core is unreachable
+            ValueError: If PhotoCreateSchema validation fails
+        """
+        self._ensure_started()
+        
+        self.metrics.on_submit()
+        queued_at = time.monotonic()
+        try:
+            await asyncio.wait_for(self._semaphore.acquire(), timeout=self.queue_timeout)
+        except asyncio.TimeoutError:
+            self.metrics.on_cancel()
+            self.metrics.on_reject()
+            raise ServiceBusyError(SERVICE_NAME)
+        except BaseException:
+            self.metrics.on_cancel()
+            raise
+        
+        started_at = time.monotonic()
+        failed = True
+        try:
+            image_file.seek(0)
+            response = await self._client.post(
+                "/v1/process",
+                files={"file": (filename, image_file, content_type)},
+                data=_form_data(coldpreview_size)
+            )
+            result = _parse_response(response)
+            failed = False
+            return result
+        except httpx.TimeoutException as e:
+            if isinstance(e, (httpx.ConnectTimeout, httpx.PoolTimeout)):
+                raise
+            self.metrics.on_timeout()
+            raise ProcessingTimeoutError(SERVICE_NAME, self.timeout)
+        finally:
+            self._semaphore.release()
+            finished_at = time.monotonic()
+            self.metrics.on_done(started_at - queued_at, finished_at - started_at, failed=failed)
+    
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "core_url": self.core_url,
+            "max_concurrency": self.max_concurrency,
+            "max_connections": self.max_connections,
+            "queue_timeout_seconds": self.queue_timeout,
+            "timeout_seconds": self.timeout,
+            **self.metrics.snapshot()
+        }
+    
+    async def aclose(self) -> None:
+        """Close pooled connections"""
+        client, self._client, self._loop = self._client, None, None
+        if client is not None:
+            await client.aclose()
+
+
+_core_client: Optional[AsyncImalinkCoreClient] = None
+_core_client_lock = threading.Lock()
+
+
+def get_imalink_core_client() -> AsyncImalinkCoreClient:
+    """Get process-wide imalink-core client (created on first use)"""
+    global _core_client
+    with _core_client_lock:
+        if _core_client is None:
+            _core_client = AsyncImalinkCoreClient()
+        return _core_client
+
+
+async def close_imalink_core_client() -> None:
+    """Close pooled connections (called on application shutdown)"""
+    if _core_client is not None:
+        await _core_client.aclose()
@@ -0,0 +1,78 @@
+"""
+NDJSON helpers - Incremental line splitting for streamed request bodies
+
+Request bodies arrive in arbitrary chunks; lines are yielded as soon as their
+newline arrives, so memory use is bounded by the longest line (max_line_bytes)
+instead of the body size. RequestStreamingResponse lets a handler stream results
+back while it is still reading the request body.
+"""
+from typing import AsyncIterable, AsyncIterator, Optional
+
+from starlette.responses import StreamingResponse
+from starlette.types import Receive, Scope, Send
+
+
+class LineTooLong:
+    """Placeholder yielded instead of a line that exceeded max_line_bytes"""
+
+    def __init__(self, size: int):
+        self.size = size
+
+
+async def iter_ndjson_lines(chunks: AsyncIterable[bytes], max_line_bytes: int) -> AsyncIterator[object]:
+    """
+    Split a chunked byte stream into lines
+
+    Yields:
+        bytes for each line (without the newline; blank lines included so line
+        numbers match the input), or LineTooLong for lines over max_line_bytes
+        (their content is discarded as it arrives)
+    """
+    buffer = bytearray()
+    overflow: Optional[int] = None  # Size of an oversized line being discarded
+
+    async for chunk in chunks:
+        start = 0
+        while start <= len(chunk):
+            newline = chunk.find(b"\n", start)
+            end = len(chunk) if newline == -1 else newline
+
+            if overflow is not None:
+                overflow += end - start
+            else:
+                buffer += chunk[start:end]
+                if len(buffer) > max_line_bytes:
+                    overflow = len(buffer)
+                    buffer.clear()
+
+            if newline == -1:
+                break
+
+            if overflow is not None:
+                yield LineTooLong(overflow)
+                overflow = None
+            else:
+                yield bytes(buffer.rstrip(b"\r"))
+                buffer.clear()
+            start = newline + 1
+
+    if overflow is not None:
+        yield LineTooLong(overflow)
+    elif buffer:
+        yield bytes(buffer.rstrip(b"\r"))
+
+
+class RequestStreamingResponse(StreamingResponse):
+    """
+    StreamingResponse whose body generator reads the request body
+
+    StreamingResponse normally listens for client disconnect on receive() while
+    streaming, which would swallow request body chunks. Here the generator owns
+    receive() (via request.stream()), and a disconnect surfaces there as
+    ClientDisconnect instead.
+    """
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await self.stream_response(send)
+        if self.background is not None:
+            await self.background()
@@ -0,0 +1,83 @@
+"""
+Queue metrics for bounded worker pools
+
+Tracks how long work waits before it starts, how long it runs, and how often
+it is rejected or times out. Kept in memory per process and exposed via /metrics.
+"""
+import threading
+from collections import deque
+from typing import Deque, Dict, Optional
+
+
+class QueueMetrics:
+    """Thread-safe counters plus a window of recent wait/run samples"""
+
+    def __init__(self, window: int = 1000):
+        self._lock = threading.Lock()
+        self._wait_samples: Deque[float] = deque(maxlen=window)
+        self._run_samples: Deque[float] = deque(maxlen=window)
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self.timeouts = 0
+        self.in_flight = 0
+        self.max_wait_seconds = 0.0
+
+    def on_submit(self) -> None:
+        with self._lock:
+            self.submitted += 1
+            self.in_flight += 1
+
+    def on_reject(self) -> None:
+        with self._lock:
+            self.rejected += 1
+
+    def on_timeout(self) -> None:
+        with self._lock:
+            self.timeouts += 1
+
+    def on_done(self, wait_seconds: Optional[float], run_seconds: Optional[float], failed: bool = False) -> None:
+        """Record finished work (wait/run are None when the timing is unknown, e.g. crashes)"""
+        with self._lock:
+            self.in_flight -= 1
+            if failed:
+                self.failed += 1
+            else:
+                self.completed += 1
+            if wait_seconds is not None:
+                wait_seconds = max(wait_seconds, 0.0)
+                self._wait_samples.append(wait_seconds)
+                self.max_wait_seconds = max(self.max_wait_seconds, wait_seconds)
+            if run_seconds is not None:
+                self._run_samples.append(max(run_seconds, 0.0))
+
+    def on_cancel(self) -> None:
+        """Queued work was cancelled before it started"""
+        with self._lock:
+            self.in_flight -= 1
+
+    @staticmethod
+    def _percentile(samples: list, fraction: float) -> float:
+        if not samples:
+            return 0.0
+        ordered = sorted(samples)
+        return round(ordered[min(int(len(ordered) * fraction), len(ordered) - 1)], 4)
+
+    def snapshot(self) -> Dict[str, float]:
+        with self._lock:
+            waits = list(self._wait_samples)
+            runs = list(self._run_samples)
+            return {
+                "submitted": self.submitted,
+                "completed": self.completed,
+                "failed": self.failed,
+                "rejected": self.rejected,
+                "timeouts": self.timeouts,
+                "in_flight": self.in_flight,
+                "queue_wait_p50_seconds": self._percentile(waits, 0.50),
+                "queue_wait_p95_seconds": self._percentile(waits, 0.95),
+                "queue_wait_max_seconds": round(self.max_wait_seconds, 4),
+                "run_p50_seconds": self._percentile(runs, 0.50),
+                "run_p95_seconds": self._percentile(runs, 0.95),
+            }
@@ -0,0 +1,36 @@
+"""
+Tests for GET /api/v1/database-stats
+Unauthenticated snapshot of table and storage statistics
+"""
+import pytest
+
+from src.core.config import Config
+from src.services.database_stats_service import database_stats_collector
+
+
+@pytest.fixture(autouse=True)
+def fresh_collector(tmp_path, monkeypatch):
+    """No snapshot left over from other tests; coldpreviews in a temp directory"""
+    monkeypatch.setattr(Config, "DATA_DIRECTORY", str(tmp_path))
+    monkeypatch.setattr(Config, "COLDPREVIEW_STORAGE_BACKEND", "files")
+    monkeypatch.setattr(database_stats_collector, "_snapshot", None)
+
+
+class TestDatabaseStatsApi:
+
+    def test_returns_snapshot_without_auth(self, client, test_user):
+        response = client.get("/api/v1/database-stats")
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["tables"]["users"]["record_count"] == 1
+        assert data["coldstorage"]["total_files"] == 0
+        assert data["generated_at"]
+        assert data["age_seconds"] >= 0
+
+    def test_serves_cached_snapshot(self, client):
+        first = client.get("/api/v1/database-stats").json()
+        second = client.get("/api/v1/database-stats").json()
+
+        assert second["generated_at"] == first["generated_at"]
+        assert second["age_seconds"] >= first["age_seconds"]
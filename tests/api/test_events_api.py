@@ -7,6 +7,8 @@ from fastapi.testclient import TestClient
 from sqlalchemy.orm import Session
 
 from src.models import User, Photo, Event, Author
+from src.schemas.event import EventClusteringRequest
+from src.services.event_service import EventService
 from src.utils.security import create_access_token
 
 
@@ -374,8 +376,9 @@ class TestEventsAPI:
         
         response = client.get(f"/api/v1/events/{event.id}/photos", headers=auth_headers)
         assert response.status_code == 200
-        photos = response.json()
+        photos = response.json()["photos"]
         assert len(photos) == 2
+        assert "hotpreview" not in photos[0] and "exif_dict" not in photos[0]
     
     def test_get_event_photos_recursive(self, client: TestClient, test_user: User, auth_headers: dict, test_db_session: Session):
         """Test getting photos in event including descendants"""
@@ -399,14 +402,58 @@ class TestEventsAPI:
             f"/api/v1/events/{parent.id}/photos",
             headers=auth_headers
         )
-        assert len(response1.json()) == 1
+        assert len(response1.json()["photos"]) == 1
         
         # Get photos with recursion (parent + child)
         response2 = client.get(
             f"/api/v1/events/{parent.id}/photos?include_descendants=true",
             headers=auth_headers
         )
-        assert len(response2.json()) == 2
+        assert len(response2.json()["photos"]) == 2
+    
+    def test_get_event_photos_paginated(self, client: TestClient, test_user: User, auth_headers: dict, test_db_session: Session):
+        """Test cursor pagination by taken_at across descendants, undated photos last"""
+        parent = Event(user_id=test_user.id, name="Parent", sort_order=0)
+        test_db_session.add(parent)
+        test_db_session.commit()
+        child = Event(user_id=test_user.id, name="Child", parent_event_id=parent.id, sort_order=0)
+        test_db_session.add(child)
+        test_db_session.commit()
+        
+        taken = [datetime(2025, 7, 3), None, datetime(2025, 7, 1), datetime(2025, 7, 3), datetime(2025, 7, 2)]
+        test_db_session.add_all([
+            Photo(hothash=f"page{i}", hotpreview=b"x", user_id=test_user.id, taken_at=taken_at,
+                  input_channel_id=1, event_id=child.id if i % 2 else parent.id)
+            for i, taken_at in enumerate(taken)
+        ])
+        test_db_session.commit()
+        
+        def all_pages(order):
+            hothashes, cursor = [], None
+            while True:
+                params = {"include_descendants": "true", "limit": 2, "order": order}
+                if cursor:
+                    params["cursor"] = cursor
+                response = client.get(f"/api/v1/events/{parent.id}/photos", params=params, headers=auth_headers)
+                assert response.status_code == 200
+                page = response.json()
+                assert len(page["photos"]) <= 2
+                hothashes += [photo["hothash"] for photo in page["photos"]]
+                cursor = page["next_cursor"]
+                if cursor is None:
+                    return hothashes
+        
+        assert all_pages("asc") == ["page2", "page4", "page0", "page3", "page1"]
+        assert all_pages("desc") == ["page3", "page0", "page4", "page2", "page1"]
+    
+    def test_get_event_photos_invalid_cursor(self, client: TestClient, test_user: User, auth_headers: dict, test_db_session: Session):
+        """Test that a malformed cursor is rejected"""
+        event = Event(user_id=test_user.id, name="Test Event", sort_order=0)
+        test_db_session.add(event)
+        test_db_session.commit()
+        
+        response = client.get(f"/api/v1/events/{event.id}/photos?cursor=not-a-cursor", headers=auth_headers)
+        assert response.status_code == 422
     
     def test_event_photo_count_in_list(self, client: TestClient, test_user: User, auth_headers: dict, test_db_session: Session):
         """Test that list endpoint includes photo counts"""
@@ -426,3 +473,169 @@ class TestEventsAPI:
         events = response.json()
         assert len(events) == 1
         assert events[0]["photo_count"] == 2
+        assert events[0]["total_photo_count"] == 2
+    
+    def test_event_total_photo_counts(self, client: TestClient, test_user: User, auth_headers: dict, test_db_session: Session):
+        """Test that list and tree roll photo counts up to ancestors"""
+        trip = Event(user_id=test_user.id, name="Trip", sort_order=0)
+        test_db_session.add(trip)
+        test_db_session.commit()
+        day = Event(user_id=test_user.id, name="Day 1", parent_event_id=trip.id, sort_order=0)
+        test_db_session.add(day)
+        test_db_session.commit()
+        place = Event(user_id=test_user.id, name="Beach", parent_event_id=day.id, sort_order=0)
+        test_db_session.add(place)
+        test_db_session.commit()
+        
+        test_db_session.add_all([
+            Photo(hothash=f"roll{i}", hotpreview=b"x", user_id=test_user.id,
+                  taken_at=datetime.now(timezone.utc), input_channel_id=1, event_id=event_id)
+            for i, event_id in enumerate([trip.id, place.id, place.id, place.id])
+        ])
+        test_db_session.commit()
+        
+        response = client.get("/api/v1/events/", headers=auth_headers)
+        assert [(e["photo_count"], e["total_photo_count"]) for e in response.json()] == [(1, 4)]
+        
+        response = client.get(f"/api/v1/events/?parent_id={day.id}", headers=auth_headers)
+        assert [(e["photo_count"], e["total_photo_count"]) for e in response.json()] == [(3, 3)]
+        
+        response = client.get("/api/v1/events/tree", headers=auth_headers)
+        root = response.json()["events"][0]
+        assert (root["photo_count"], root["total_photo_count"]) == (1, 4)
+        day_node = root["children"][0]
+        assert (day_node["photo_count"], day_node["total_photo_count"]) == (0, 3)
+        assert day_node["children"][0]["total_photo_count"] == 3
+    
+    def test_propose_and_apply_clustered_events(self, client: TestClient, test_user: User, auth_headers: dict, test_db_session: Session):
+        """Test proposing a trip > day hierarchy and applying it"""
+        manual = Event(user_id=test_user.id, name="Manual", sort_order=0)
+        test_db_session.add(manual)
+        test_db_session.commit()
+        
+        starts = [datetime(2024, 6, 1, 10), datetime(2024, 6, 2, 10), datetime(2024, 8, 1, 10)]
+        photos = [
+            Photo(hothash=f"cl{day}_{i}", hotpreview=b"x", user_id=test_user.id,
+                  taken_at=start.replace(minute=i * 5), gps_latitude=41.9, gps_longitude=12.5, input_channel_id=1)
+            for day, start in enumerate(starts) for i in range(6)
+        ]
+        photos[0].event_id = manual.id
+        test_db_session.add_all(photos)
+        test_db_session.commit()
+        
+        params = {"min_trip_photos": 5}
+        response = client.post("/api/v1/events/cluster/propose", json=params, headers=auth_headers)
+        assert response.status_code == 200
+        proposal = response.json()
+        assert (proposal["total_photos"], proposal["clustered_photos"]) == (17, 17)
+        june, august = proposal["events"]
+        assert (june["name"], june["photo_count"]) == ("Trip 2024-06-01 – 2024-06-02", 11)
+        assert [(day["level"], day["photo_count"]) for day in june["children"]] == [("day", 5), ("day", 6)]
+        assert (august["photo_count"], august["children"]) == (6, [])
+        
+        response = client.post("/api/v1/events/cluster/apply", json=params, headers=auth_headers)
+        assert response.status_code == 200
+        assert response.json() == {"events_created": 4, "photos_assigned": 17}
+        
+        tree = client.get("/api/v1/events/tree", headers=auth_headers).json()
+        totals = {node["name"]: node["total_photo_count"] for node in tree["events"]}
+        assert totals == {"Manual": 1, "Trip 2024-06-01 – 2024-06-02": 11, "Trip 2024-08-01": 6}
+        
+        # Everything is assigned now: nothing left to propose
+        response = client.post("/api/v1/events/cluster/propose", json=params, headers=auth_headers)
+        assert response.json()["events"] == []
+    
+    def test_apply_clustered_events_rolls_back_on_error(self, test_user: User, test_db_session: Session, monkeypatch):
+        """Test that a failed apply leaves no events behind"""
+        test_db_session.add_all([
+            Photo(hothash=f"rb{i}", hotpreview=b"x", user_id=test_user.id,
+                  taken_at=datetime(2024, 6, 1, 10, i * 5), input_channel_id=1)
+            for i in range(6)
+        ])
+        test_db_session.commit()
+        
+        def fail(*args, **kwargs):
+            raise RuntimeError("database went away")
+        
+        monkeypatch.setattr("src.services.event_service.PhotoRepository.bulk_set_event", fail)
+        with pytest.raises(RuntimeError):
+            EventService(test_db_session).apply_event_proposal(test_user.id, EventClusteringRequest(min_trip_photos=5))
+        
+        assert test_db_session.query(Event).filter(Event.user_id == test_user.id).count() == 0
+    
+    def test_assign_photos_by_range(self, client: TestClient, test_user: User, auth_headers: dict, test_db_session: Session):
+        """Test date-range assignment: dry run, nesting, fill-empty vs overwrite, GPS radius"""
+        trip = Event(user_id=test_user.id, name="Rome", sort_order=0,
+                     start_date=datetime(2025, 7, 1), end_date=datetime(2025, 7, 10),
+                     gps_latitude=41.9028, gps_longitude=12.4964)
+        other = Event(user_id=test_user.id, name="Other", sort_order=0)
+        test_db_session.add_all([trip, other])
+        test_db_session.commit()
+        day = Event(user_id=test_user.id, name="Day 2", parent_event_id=trip.id, sort_order=0,
+                    start_date=datetime(2025, 7, 2), end_date=datetime(2025, 7, 2, 23, 59))
+        test_db_session.add(day)
+        test_db_session.commit()
+        
+        spots = [
+            (datetime(2025, 7, 1, 12), 41.90, 12.49),   # trip
+            (datetime(2025, 7, 2, 12), 41.89, 12.49),   # day
+            (datetime(2025, 7, 3, 12), 45.46, 9.19),    # trip, but Milan (480 km away)
+            (datetime(2025, 7, 4, 12), None, None),     # trip, no GPS
+            (datetime(2025, 7, 20, 12), 41.90, 12.49),  # outside all ranges
+        ]
+        photos = [
+            Photo(hothash=f"rng{i}", hotpreview=b"x", user_id=test_user.id, taken_at=taken_at,
+                  gps_latitude=lat, gps_longitude=lon, input_channel_id=1)
+            for i, (taken_at, lat, lon) in enumerate(spots)
+        ]
+        photos[3].event_id = other.id
+        test_db_session.add_all(photos)
+        test_db_session.commit()
+        
+        def assign(url, **options):
+            response = client.post(url, json=options, headers=auth_headers)
+            assert response.status_code == 200
+            body = response.json()
+            return body["photos_assigned"], {e["name"]: e["photo_count"] for e in body["events"]}
+        
+        assert assign("/api/v1/events/assign-by-range", dry_run=True) == (3, {"Rome": 2, "Day 2": 1})
+        assert assign(f"/api/v1/events/{trip.id}/assign-by-range", dry_run=True, radius_km=5) == (2, {"Rome": 2})
+        
+        assert assign("/api/v1/events/assign-by-range") == (3, {"Rome": 2, "Day 2": 1})
+        assert assign("/api/v1/events/assign-by-range", overwrite=True) == (1, {"Rome": 1, "Day 2": 0})
+        
+        for photo in photos:
+            test_db_session.refresh(photo)
+        assert [photo.event_id for photo in photos] == [trip.id, day.id, trip.id, trip.id, None]
+        
+        response = client.post(f"/api/v1/events/{other.id}/assign-by-range", json={}, headers=auth_headers)
+        assert response.status_code == 422
+    
+    def test_assign_by_range_midnight_end_covers_last_day(self, client: TestClient, test_user: User, auth_headers: dict, test_db_session: Session):
+        """Test that a date-only (midnight) end_date includes the whole last day, other ends are inclusive"""
+        weekend = Event(user_id=test_user.id, name="Weekend", sort_order=0,
+                        start_date=datetime(2025, 9, 6), end_date=datetime(2025, 9, 7))
+        evening = Event(user_id=test_user.id, name="Evening", sort_order=0,
+                        start_date=datetime(2025, 9, 10, 18), end_date=datetime(2025, 9, 10, 22))
+        test_db_session.add_all([weekend, evening])
+        test_db_session.commit()
+        
+        taken = [
+            datetime(2025, 9, 7, 21, 30),  # last day of the weekend
+            datetime(2025, 9, 8, 0, 0),    # day after
+            datetime(2025, 9, 10, 22, 0),  # exactly at the evening's end
+            datetime(2025, 9, 10, 22, 1),
+        ]
+        photos = [
+            Photo(hothash=f"mid{i}", hotpreview=b"x", user_id=test_user.id, taken_at=taken_at, input_channel_id=1)
+            for i, taken_at in enumerate(taken)
+        ]
+        test_db_session.add_all(photos)
+        test_db_session.commit()
+        
+        response = client.post("/api/v1/events/assign-by-range", json={}, headers=auth_headers)
+        
+        assert response.json()["photos_assigned"] == 2
+        for photo in photos:
+            test_db_session.refresh(photo)
+        assert [photo.event_id for photo in photos] == [weekend.id, None, evening.id, None]
@@ -0,0 +1,105 @@
+"""
+Tests for POST /api/v1/photos/bulk-delete and DELETE /api/v1/photos/{hothash}
+Soft delete with background purge
+"""
+import pytest
+from tests.fixtures.real_photo_create_schemas import (
+    load_photo_create_schema,
+    BASIC,
+    LANDSCAPE,
+    FUJI
+)
+
+from src.services.hothash_filter_service import hothash_filters
+from src.services.photo_purge_service import PhotoPurgeService
+
+
+@pytest.fixture
+def schemas(client, auth_headers, input_channel):
+    """Three photos owned by the test user"""
+    schemas = [
+        load_photo_create_schema(name, input_channel_id=input_channel.id)
+        for name in (BASIC, LANDSCAPE, FUJI)
+    ]
+    response = client.post(
+        "/api/v1/photos/create-batch",
+        json={"items": [{"photo_create_schema": schema, "tags": []} for schema in schemas]},
+        headers=auth_headers
+    )
+    assert response.json()["created"] == 3
+    return schemas
+
+
+def listed_hothashes(client, headers):
+    return {photo["hothash"] for photo in client.get("/api/v1/photos/", headers=headers).json()["data"]}
+
+
+class TestPhotosBulkDelete:
+    """Bulk delete"""
+
+    def test_bulk_delete_hides_photos_immediately(self, client, auth_headers, schemas):
+        hothashes = [schema["hothash"] for schema in schemas]
+
+        response = client.post(
+            "/api/v1/photos/bulk-delete",
+            json={"hothashes": hothashes[:2] + ["missing"]},
+            headers=auth_headers
+        )
+
+        assert response.status_code == 202
+        assert response.json() == {"matched": 2, "deleted": 2, "not_found": ["missing"]}
+        assert listed_hothashes(client, auth_headers) == {hothashes[2]}
+        assert client.get(f"/api/v1/photos/{hothashes[0]}", headers=auth_headers).status_code == 404
+        exists = client.post("/api/v1/photos/exists", json={"hothashes": hothashes}, headers=auth_headers)
+        assert exists.json()["existing"] == [hothashes[2]]
+
+    def test_bulk_delete_counts_every_photo_towards_filter_rebuild(self, client, auth_headers, schemas, monkeypatch):
+        discarded = []
+        monkeypatch.setattr(hothash_filters, "discard", lambda user_id, count=1: discarded.append(count))
+
+        client.post("/api/v1/photos/bulk-delete", json={"search": {}}, headers=auth_headers)
+
+        assert discarded == [3]
+
+    def test_bulk_delete_by_search(self, client, auth_headers, schemas):
+        response = client.post("/api/v1/photos/bulk-delete", json={"search": {}}, headers=auth_headers)
+
+        assert response.json()["deleted"] == 3
+        assert listed_hothashes(client, auth_headers) == set()
+
+    def test_bulk_delete_only_own_photos(self, client, auth_headers, second_user_headers, schemas):
+        response = client.post("/api/v1/photos/bulk-delete", json={"search": {}}, headers=second_user_headers)
+
+        assert response.json()["deleted"] == 0
+        assert len(listed_hothashes(client, auth_headers)) == 3
+
+    def test_single_delete_is_soft(self, client, auth_headers, schemas):
+        hothash = schemas[0]["hothash"]
+
+        assert client.delete(f"/api/v1/photos/{hothash}", headers=auth_headers).status_code == 200
+        assert client.delete(f"/api/v1/photos/{hothash}", headers=auth_headers).status_code == 404
+
+    def test_deleted_photo_can_be_created_again_before_purge(self, client, auth_headers, schemas):
+        schema = schemas[0]
+        client.post("/api/v1/photos/bulk-delete", json={"hothashes": [schema["hothash"]]}, headers=auth_headers)
+
+        response = client.post(
+            "/api/v1/photos/create", json={"photo_create_schema": schema, "tags": []}, headers=auth_headers
+        )
+
+        assert response.status_code == 201
+        assert response.json()["is_duplicate"] is False
+
+    def test_purge_after_bulk_delete(self, client, auth_headers, test_db_session, schemas):
+        client.post("/api/v1/photos/bulk-delete", json={"search": {}}, headers=auth_headers)
+
+        assert PhotoPurgeService(test_db_session).purge_pending() == 3
+        assert PhotoPurgeService(test_db_session).purge_pending() == 0
+
+    def test_bulk_delete_requires_selection(self, client, auth_headers):
+        response = client.post("/api/v1/photos/bulk-delete", json={}, headers=auth_headers)
+        assert response.status_code == 422
+
+    def test_bulk_delete_requires_auth(self, client):
+        response = client.post("/api/v1/photos/bulk-delete", json={"hothashes": ["a"]})
+        assert response.status_code in (401, 403)
@@ -0,0 +1,171 @@
+"""
+Tests for PATCH /api/v1/photos/bulk
+Set-based metadata updates on a selection of photos
+"""
+import pytest
+from datetime import datetime
+
+from src.models import Photo, Event
+
+
+@pytest.fixture
+def photos(test_db_session, test_user):
+    """Five photos owned by the test user, rated 0-4"""
+    photos = [
+        Photo(
+            hothash=f"bulk{i}",
+            hotpreview=b"preview",
+            user_id=test_user.id,
+            taken_at=datetime(2024, 6, i + 1),
+            rating=i
+        )
+        for i in range(5)
+    ]
+    test_db_session.add_all(photos)
+    test_db_session.commit()
+    return photos
+
+
+def reload(test_db_session, photos):
+    test_db_session.expire_all()
+    return {photo.hothash: photo for photo in test_db_session.query(Photo).filter(
+        Photo.id.in_([photo.id for photo in photos])
+    )}
+
+
+class TestPhotosBulkUpdate:
+    """Bulk metadata patch"""
+
+    def test_bulk_update_by_hothashes(self, client, auth_headers, test_db_session, photos):
+        response = client.patch(
+            "/api/v1/photos/bulk",
+            json={
+                "hothashes": ["bulk0", "bulk1", "bulk2", "missing"],
+                "patch": {"rating": 5, "visibility": "public", "category": "trip"}
+            },
+            headers=auth_headers
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["matched"] == 3
+        assert data["updated"] == 3
+        assert data["fields"] == ["category", "rating", "visibility"]
+        assert data["not_found"] == ["missing"]
+
+        by_hash = reload(test_db_session, photos)
+        assert [by_hash[f"bulk{i}"].rating for i in range(5)] == [5, 5, 5, 3, 4]
+        assert by_hash["bulk0"].visibility == "public"
+        assert by_hash["bulk3"].visibility == "private"
+        assert by_hash["bulk2"].category == "trip"
+
+    def test_bulk_update_by_search(self, client, auth_headers, test_db_session, photos):
+        response = client.patch(
+            "/api/v1/photos/bulk",
+            json={"search": {"rating_min": 3}, "patch": {"category": "best"}},
+            headers=auth_headers
+        )
+
+        assert response.json()["matched"] == 2
+        by_hash = reload(test_db_session, photos)
+        assert [by_hash[f"bulk{i}"].category for i in range(5)] == [None, None, None, "best", "best"]
+
+    def test_bulk_update_in_chunks(self, client, auth_headers, test_db_session, photos, monkeypatch):
+        monkeypatch.setattr("src.repositories.photo_repository.BULK_UPDATE_CHUNK_SIZE", 2)
+
+        response = client.patch(
+            "/api/v1/photos/bulk",
+            json={"search": {}, "patch": {"rating": 1}},
+            headers=auth_headers
+        )
+
+        assert response.json()["updated"] == 5
+        assert {photo.rating for photo in reload(test_db_session, photos).values()} == {1}
+
+    def test_bulk_update_sets_and_clears_event(self, client, auth_headers, test_db_session, test_user, photos):
+        event = Event(user_id=test_user.id, name="Summer", sort_order=0)
+        test_db_session.add(event)
+        test_db_session.commit()
+        hothashes = [photo.hothash for photo in photos]
+
+        response = client.patch(
+            "/api/v1/photos/bulk",
+            json={"hothashes": hothashes, "patch": {"event_id": event.id}},
+            headers=auth_headers
+        )
+        assert response.status_code == 200
+        assert {photo.event_id for photo in reload(test_db_session, photos).values()} == {event.id}
+
+        response = client.patch(
+            "/api/v1/photos/bulk",
+            json={"hothashes": hothashes, "patch": {"event_id": None}},
+            headers=auth_headers
+        )
+        assert response.status_code == 200
+        assert {photo.event_id for photo in reload(test_db_session, photos).values()} == {None}
+
+    def test_bulk_update_rejects_foreign_event_and_unknown_author(
+        self, client, auth_headers, test_db_session, second_user, photos
+    ):
+        foreign_event = Event(user_id=second_user.id, name="Not mine", sort_order=0)
+        test_db_session.add(foreign_event)
+        test_db_session.commit()
+
+        response = client.patch(
+            "/api/v1/photos/bulk",
+            json={"hothashes": ["bulk0"], "patch": {"event_id": foreign_event.id}},
+            headers=auth_headers
+        )
+        assert response.status_code == 404
+
+        response = client.patch(
+            "/api/v1/photos/bulk",
+            json={"hothashes": ["bulk0"], "patch": {"author_id": 999999}},
+            headers=auth_headers
+        )
+        assert response.status_code == 404
+        assert reload(test_db_session, photos)["bulk0"].author_id is None
+
+    def test_bulk_update_only_own_photos(self, client, second_user_headers, test_db_session, photos):
+        response = client.patch(
+            "/api/v1/photos/bulk",
+            json={"search": {}, "patch": {"rating": 5}},
+            headers=second_user_headers
+        )
+
+        assert response.json()["matched"] == 0
+        assert [photo.rating for photo in sorted(reload(test_db_session, photos).values(), key=lambda p: p.id)] == [0, 1, 2, 3, 4]
+
+    @pytest.mark.parametrize("body", [
+        {"patch": {"rating": 1}},
+        {"hothashes": ["bulk0"], "search": {}, "patch": {"rating": 1}},
+        {"hothashes": ["bulk0"], "patch": {}},
+        {"hothashes": ["bulk0"], "patch": {"rating": None}},
+        {"hothashes": ["bulk0"], "patch": {"rating": 9}},
+        {"hothashes": ["bulk0"], "patch": {"hothash": "x"}},
+    ])
+    def test_bulk_update_validates_body(self, client, auth_headers, photos, body):
+        response = client.patch("/api/v1/photos/bulk", json=body, headers=auth_headers)
+        assert response.status_code == 422
+
+    def test_bulk_update_requires_auth(self, client):
+        response = client.patch("/api/v1/photos/bulk", json={"hothashes": ["a"], "patch": {"rating": 1}})
+        assert response.status_code in (401, 403)
+
+    def test_bulk_update_by_tag_search(self, client, auth_headers, test_db_session, photos):
+        tagged = client.post(
+            "/api/v1/tags/bulk-apply",
+            json={"hothashes": ["bulk1", "bulk3"], "tags": ["keeper"]},
+            headers=auth_headers
+        )
+        tag_id = tagged.json()["tags"][0]["id"]
+
+        response = client.patch(
+            "/api/v1/photos/bulk",
+            json={"search": {"tag_ids": [tag_id]}, "patch": {"visibility": "authenticated"}},
+            headers=auth_headers
+        )
+
+        assert response.json()["matched"] == 2
+        by_hash = reload(test_db_session, photos)
+        assert [by_hash[f"bulk{i}"].visibility for i in (1, 2, 3)] == ["authenticated", "private", "authenticated"]
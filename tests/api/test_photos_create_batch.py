@@ -0,0 +1,170 @@
+"""
+Tests for POST /api/v1/photos/create-batch
+Batch photo creation with bulk duplicate check and per-item results
+"""
+import pytest
+from sqlalchemy.exc import OperationalError
+
+from src.core.config import Config
+from src.models import Photo
+from src.repositories.photo_repository import PhotoRepository
+from src.utils.coldpreview_repository import ColdpreviewRepository
+from tests.fixtures.real_photo_create_schemas import (
+    load_photo_create_schema,
+    BASIC,
+    LANDSCAPE,
+    FUJI_WITH_COLDPREVIEW
+)
+
+
+@pytest.fixture(autouse=True)
+def data_directory(tmp_path, monkeypatch):
+    """Coldpreviews of each test in their own directory"""
+    monkeypatch.setattr(Config, "DATA_DIRECTORY", str(tmp_path))
+    monkeypatch.setattr(Config, "COLDPREVIEW_STORAGE_BACKEND", "files")
+    return tmp_path
+
+
+def batch_body(*schemas):
+    return {"items": [{"photo_create_schema": schema, "tags": []} for schema in schemas]}
+
+
+class TestPhotosCreateBatch:
+    """Batch creation endpoint"""
+
+    def test_create_batch_creates_all_items(self, client, auth_headers, input_channel):
+        schemas = [
+            load_photo_create_schema(name, input_channel_id=input_channel.id)
+            for name in (BASIC, LANDSCAPE, FUJI_WITH_COLDPREVIEW)
+        ]
+
+        response = client.post("/api/v1/photos/create-batch", json=batch_body(*schemas), headers=auth_headers)
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["total"] == 3
+        assert data["created"] == 3
+        assert [result["hothash"] for result in data["results"]] == [schema["hothash"] for schema in schemas]
+        assert all(result["status"] == "created" and result["photo_id"] for result in data["results"])
+
+        # Created photos are visible through the normal API
+        photo = client.get(f"/api/v1/photos/{schemas[2]['hothash']}", headers=auth_headers)
+        assert photo.status_code == 200
+
+    def test_create_batch_reports_duplicates(self, client, auth_headers, input_channel):
+        basic = load_photo_create_schema(BASIC, input_channel_id=input_channel.id)
+        landscape = load_photo_create_schema(LANDSCAPE, input_channel_id=input_channel.id)
+
+        first = client.post("/api/v1/photos/create", json={"photo_create_schema": basic, "tags": []}, headers=auth_headers)
+        assert first.status_code == 201
+
+        response = client.post(
+            "/api/v1/photos/create-batch",
+            json=batch_body(basic, landscape, landscape),
+            headers=auth_headers
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        statuses = [result["status"] for result in data["results"]]
+        assert statuses == ["duplicate", "created", "error"]
+        assert data["results"][0]["photo_id"] == first.json()["id"]
+        assert data["created"] == 1
+        assert data["duplicates"] == 1
+        assert data["errors"] == 1
+
+    def test_create_batch_reports_concurrently_created_photo_as_duplicate(
+        self, client, auth_headers, input_channel, monkeypatch
+    ):
+        basic = load_photo_create_schema(BASIC, input_channel_id=input_channel.id)
+        landscape = load_photo_create_schema(LANDSCAPE, input_channel_id=input_channel.id)
+        first = client.post("/api/v1/photos/create", json={"photo_create_schema": basic, "tags": []}, headers=auth_headers)
+
+        # Simulate a request that created BASIC after this batch's duplicate check
+        lookup = PhotoRepository.get_owners_by_hashes
+        calls = []
+
+        def stale_lookup(self, hothashes):
+            calls.append(hothashes)
+            return {} if len(calls) == 1 else lookup(self, hothashes)
+
+        monkeypatch.setattr(PhotoRepository, "get_owners_by_hashes", stale_lookup)
+        response = client.post("/api/v1/photos/create-batch", json=batch_body(basic, landscape), headers=auth_headers)
+
+        assert response.status_code == 200
+        results = response.json()["results"]
+        assert [result["status"] for result in results] == ["duplicate", "created"]
+        assert results[0]["photo_id"] == first.json()["id"]
+
+    def test_create_batch_database_error_removes_coldpreviews(self, client, auth_headers, input_channel, monkeypatch):
+        schema = load_photo_create_schema(FUJI_WITH_COLDPREVIEW, input_channel_id=input_channel.id)
+
+        def fail(*args, **kwargs):
+            raise OperationalError("INSERT", {}, Exception("connection lost"))
+
+        monkeypatch.setattr("src.services.photo_service.refresh_buckets_for_photos", fail)
+        response = client.post("/api/v1/photos/create-batch", json=batch_body(schema), headers=auth_headers)
+
+        assert response.status_code == 500
+        assert ColdpreviewRepository().load_coldpreview_by_hash(schema["hothash"]) is None
+        monkeypatch.undo()
+        assert client.get(f"/api/v1/photos/{schema['hothash']}", headers=auth_headers).status_code == 404
+
+    def test_create_batch_database_error_keeps_coldpreview_of_concurrent_photo(
+        self, client, auth_headers, input_channel, test_db_session, second_user, monkeypatch
+    ):
+        fuji = load_photo_create_schema(FUJI_WITH_COLDPREVIEW, input_channel_id=input_channel.id)
+        basic = load_photo_create_schema(BASIC, input_channel_id=input_channel.id)
+
+        # Another request commits FUJI after this batch's duplicate check and before its insert;
+        # both store the coldpreview under the same hothash
+        lookup = PhotoRepository.get_owners_by_hashes
+        calls = []
+
+        def racing_lookup(self, hothashes):
+            calls.append(hothashes)
+            if len(calls) > 1:
+                return lookup(self, hothashes)
+            test_db_session.add(Photo(hothash=fuji["hothash"], hotpreview=b"x", user_id=second_user.id,
+                                      coldpreview_path=f"{fuji['hothash']}.jpg"))
+            test_db_session.commit()
+            return {}
+
+        def fail(*args, **kwargs):
+            raise OperationalError("INSERT", {}, Exception("connection lost"))
+
+        monkeypatch.setattr(PhotoRepository, "get_owners_by_hashes", racing_lookup)
+        monkeypatch.setattr("src.services.photo_service.refresh_buckets_for_photos", fail)
+        response = client.post("/api/v1/photos/create-batch", json=batch_body(fuji, basic), headers=auth_headers)
+
+        assert response.status_code == 500
+        assert ColdpreviewRepository().load_coldpreview_by_hash(fuji["hothash"]) is not None
+
+    def test_create_batch_recreates_deleted_photo_with_coldpreview(self, client, auth_headers, input_channel):
+        schema = load_photo_create_schema(FUJI_WITH_COLDPREVIEW, input_channel_id=input_channel.id)
+        client.post("/api/v1/photos/create-batch", json=batch_body(schema), headers=auth_headers)
+        assert client.delete(f"/api/v1/photos/{schema['hothash']}", headers=auth_headers).status_code == 200
+
+        response = client.post("/api/v1/photos/create-batch", json=batch_body(schema), headers=auth_headers)
+
+        assert response.json()["created"] == 1
+        coldpreview = client.get(f"/api/v1/photos/{schema['hothash']}/coldpreview", headers=auth_headers)
+        assert coldpreview.status_code == 200
+
+    def test_create_batch_invalid_channel_falls_back_to_quick_channel(self, client, auth_headers, input_channel):
+        # input_channel fixture is the user's protected (Quick) channel
+        schema = load_photo_create_schema(BASIC, input_channel_id=999999)
+
+        response = client.post("/api/v1/photos/create-batch", json=batch_body(schema), headers=auth_headers)
+
+        assert response.status_code == 200
+        assert response.json()["created"] == 1
+
+    def test_create_batch_requires_items(self, client, auth_headers):
+        response = client.post("/api/v1/photos/create-batch", json={"items": []}, headers=auth_headers)
+        assert response.status_code == 422
+
+    def test_create_batch_requires_auth(self, client):
+        schema = load_photo_create_schema(BASIC)
+        response = client.post("/api/v1/photos/create-batch", json=batch_body(schema))
+        assert response.status_code in (401, 403)
@@ -0,0 +1,82 @@
+"""
+Tests for POST /api/v1/photos/create-multipart
+Photo creation from metadata JSON plus raw binary preview parts
+"""
+import base64
+import json
+from tests.fixtures.real_photo_create_schemas import (
+    load_photo_create_schema,
+    BASIC,
+    FUJI_WITH_COLDPREVIEW
+)
+
+
+def multipart_parts(schema):
+    """Split a PhotoCreateSchema into (metadata form data, binary file parts)"""
+    schema = dict(schema)
+    files = {"hotpreview": ("hot.jpg", base64.b64decode(schema.pop("hotpreview_base64")), "image/jpeg")}
+    coldpreview_base64 = schema.pop("coldpreview_base64", None)
+    if coldpreview_base64:
+        files["coldpreview"] = ("cold.jpg", base64.b64decode(coldpreview_base64), "image/jpeg")
+    data = {"metadata": json.dumps({"photo_create_schema": schema, "tags": []})}
+    return data, files
+
+
+class TestPhotosCreateMultipart:
+    """Multipart creation endpoint"""
+
+    def test_create_multipart_with_coldpreview(self, client, auth_headers, input_channel):
+        schema = load_photo_create_schema(FUJI_WITH_COLDPREVIEW, input_channel_id=input_channel.id)
+        data, files = multipart_parts(schema)
+        assert "coldpreview" in files
+
+        response = client.post("/api/v1/photos/create-multipart", data=data, files=files, headers=auth_headers)
+
+        assert response.status_code == 201
+        body = response.json()
+        assert body["hothash"] == schema["hothash"]
+        assert body["is_duplicate"] is False
+
+        coldpreview = client.get(f"/api/v1/photos/{schema['hothash']}/coldpreview", headers=auth_headers)
+        assert coldpreview.status_code == 200
+
+    def test_create_multipart_duplicate_returns_existing(self, client, auth_headers, input_channel):
+        schema = load_photo_create_schema(BASIC, input_channel_id=input_channel.id)
+        data, files = multipart_parts(schema)
+
+        first = client.post("/api/v1/photos/create-multipart", data=data, files=files, headers=auth_headers)
+        assert first.status_code == 201
+
+        data, files = multipart_parts(schema)
+        second = client.post("/api/v1/photos/create-multipart", data=data, files=files, headers=auth_headers)
+
+        assert second.status_code == 201
+        assert second.json()["id"] == first.json()["id"]
+        assert second.json()["is_duplicate"] is True
+
+    def test_create_multipart_invalid_coldpreview(self, client, auth_headers, input_channel):
+        schema = load_photo_create_schema(BASIC, input_channel_id=input_channel.id)
+        data, files = multipart_parts(schema)
+        files["coldpreview"] = ("cold.jpg", b"not an image", "image/jpeg")
+
+        response = client.post("/api/v1/photos/create-multipart", data=data, files=files, headers=auth_headers)
+
+        assert response.status_code == 400
+
+    def test_create_multipart_invalid_metadata(self, client, auth_headers, input_channel):
+        schema = load_photo_create_schema(BASIC, input_channel_id=input_channel.id)
+        _, files = multipart_parts(schema)
+
+        response = client.post(
+            "/api/v1/photos/create-multipart",
+            data={"metadata": "{not json"},
+            files=files,
+            headers=auth_headers
+        )
+
+        assert response.status_code == 400
+
+    def test_create_multipart_requires_auth(self, client):
+        data, files = multipart_parts(load_photo_create_schema(BASIC))
+        response = client.post("/api/v1/photos/create-multipart", data=data, files=files)
+        assert response.status_code in (401, 403)
@@ -0,0 +1,78 @@
+"""
+Tests for streaming NDJSON import (POST /api/v1/photos/import)
+Per-line results, progress records and resume from the last committed line
+"""
+import json
+import pytest
+from tests.fixtures.real_photo_create_schemas import (
+    load_photo_create_schema,
+    BASIC,
+    LANDSCAPE,
+    TINY
+)
+
+
+def ndjson(*objects) -> bytes:
+    return "".join(json.dumps(obj) + "\n" for obj in objects).encode()
+
+
+def parse(response):
+    return [json.loads(line) for line in response.text.splitlines()]
+
+
+class TestPhotosImport:
+    """Streaming import endpoint"""
+
+    def test_import_streams_results_and_progress(self, client, auth_headers, input_channel):
+        schemas = [load_photo_create_schema(name, input_channel_id=input_channel.id) for name in (BASIC, LANDSCAPE, TINY)]
+
+        response = client.post(
+            "/api/v1/photos/import?batch_size=2",
+            content=ndjson(*schemas),
+            headers={**auth_headers, "Content-Type": "application/x-ndjson"}
+        )
+
+        assert response.status_code == 200
+        records = parse(response)
+        results = [record for record in records if "line" in record]
+        assert [result["line"] for result in results] == [1, 2, 3]
+        assert all(result["status"] == "created" for result in results)
+
+        # One progress record per committed batch, then done
+        assert [record["progress"]["committed_line"] for record in records if "progress" in record and "done" not in record] == [2, 3]
+        assert records[-1]["done"] is True
+        assert records[-1]["progress"]["created"] == 3
+
+    def test_import_reports_bad_lines_and_continues(self, client, auth_headers, input_channel):
+        basic = load_photo_create_schema(BASIC, input_channel_id=input_channel.id)
+        body = b"not json\n\n" + ndjson({"hothash": "abc"}, basic)
+
+        response = client.post("/api/v1/photos/import", content=body, headers=auth_headers)
+
+        results = [record for record in parse(response) if "line" in record]
+        assert [(result["line"], result["status"]) for result in results] == [(1, "error"), (3, "error"), (4, "created")]
+
+    def test_import_resumes_from_checkpoint(self, client, auth_headers, input_channel):
+        schemas = [load_photo_create_schema(name, input_channel_id=input_channel.id) for name in (BASIC, LANDSCAPE, TINY)]
+
+        # First attempt only got two lines through
+        first = client.post("/api/v1/photos/import?import_id=card-1", content=ndjson(*schemas[:2]), headers=auth_headers)
+        assert parse(first)[-1]["done"] is True
+
+        progress = client.get("/api/v1/photos/import/card-1", headers=auth_headers)
+        assert progress.status_code == 200
+        assert progress.json()["committed_line"] == 2
+
+        # Resending the whole file skips committed lines
+        second = client.post("/api/v1/photos/import?import_id=card-1", content=ndjson(*schemas), headers=auth_headers)
+        records = parse(second)
+        assert [record["line"] for record in records if "line" in record] == [3]
+        assert records[-1]["progress"]["skipped"] == 2
+
+        progress = client.get("/api/v1/photos/import/card-1", headers=auth_headers).json()
+        assert progress["committed_line"] == 3
+        assert progress["created"] == 3
+
+    def test_import_progress_not_found(self, client, auth_headers):
+        response = client.get("/api/v1/photos/import/unknown", headers=auth_headers)
+        assert response.status_code == 404
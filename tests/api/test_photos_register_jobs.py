@@ -0,0 +1,62 @@
+"""
+Tests for register-image job mode
+POST /api/v1/photos/register-image?mode=job, GET /api/v1/photos/jobs[/{id}]
+"""
+from io import BytesIO
+
+
+def queue_upload(client, headers, **params):
+    files = {"file": ("test.jpg", BytesIO(b"fake jpeg image data"), "image/jpeg")}
+    return client.post(
+        "/api/v1/photos/register-image",
+        params={"mode": "job", **params},
+        files=files,
+        headers=headers
+    )
+
+
+class TestRegisterImageJobs:
+
+    def test_job_mode_returns_202_with_pending_job(self, client, auth_headers, input_channel):
+        response = queue_upload(client, auth_headers, rating=3)
+
+        assert response.status_code == 202
+        job = response.json()
+        assert job["status"] == "pending"
+        assert job["input_channel_id"] == input_channel.id
+        assert job["filename"] == "test.jpg"
+        assert response.headers["location"] == f"/api/v1/photos/jobs/{job['id']}"
+
+    def test_get_job(self, client, auth_headers, input_channel):
+        job_id = queue_upload(client, auth_headers).json()["id"]
+
+        response = client.get(f"/api/v1/photos/jobs/{job_id}", headers=auth_headers)
+
+        assert response.status_code == 200
+        assert response.json()["id"] == job_id
+
+    def test_list_jobs_for_input_channel(self, client, auth_headers, input_channel):
+        queue_upload(client, auth_headers)
+        queue_upload(client, auth_headers)
+
+        response = client.get(
+            "/api/v1/photos/jobs",
+            params={"input_channel_id": input_channel.id},
+            headers=auth_headers
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["meta"]["total"] == 2
+        assert all(job["status"] == "pending" for job in data["data"])
+
+    def test_job_of_other_user_is_not_found(self, client, auth_headers, input_channel,
+                                            second_user_headers, second_user_input_channel):
+        job_id = queue_upload(client, auth_headers).json()["id"]
+
+        response = client.get(f"/api/v1/photos/jobs/{job_id}", headers=second_user_headers)
+
+        assert response.status_code == 404
+
+    def test_jobs_require_auth(self, client):
+        assert client.get("/api/v1/photos/jobs").status_code in (401, 403)
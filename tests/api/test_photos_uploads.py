@@ -0,0 +1,185 @@
+"""
+Tests for resumable chunked uploads
+POST /api/v1/photos/uploads, PUT/GET/DELETE /uploads/{id}, POST /uploads/{id}/finalize
+"""
+import hashlib
+import json
+import os
+from pathlib import Path
+from unittest.mock import AsyncMock, patch
+
+import httpx
+import pytest
+
+from imalink_schemas import PhotoCreateSchema
+from src.core.config import Config
+
+FIXTURE = Path(__file__).parent.parent / "fixtures" / "photo_create_schemas" / "tiny.json"
+FILE_DATA = bytes(range(256)) * 40  # 10240 bytes
+
+
+@pytest.fixture(autouse=True)
+def spool_directory(tmp_path, monkeypatch):
+    monkeypatch.setattr(Config, "REGISTER_JOB_SPOOL_DIRECTORY", str(tmp_path))
+    return tmp_path
+
+
+@pytest.fixture
+def core_client():
+    """Mocked imalink-core client recording the uploaded bytes"""
+    received = {}
+
+    async def process_image(image_file, **kwargs):
+        received["bytes"] = image_file.read()
+        return PhotoCreateSchema(**json.loads(FIXTURE.read_text()))
+
+    with patch("src.api.v1.photos.get_imalink_core_client") as get_core_client:
+        get_core_client.return_value.process_image = AsyncMock(side_effect=process_image)
+        get_core_client.return_value.received = received
+        yield get_core_client.return_value
+
+
+def start_upload(client, headers, data=FILE_DATA, **fields):
+    body = {"filename": "IMG_0001.NEF", "size": len(data), "content_type": "image/x-nikon-nef", **fields}
+    response = client.post("/api/v1/photos/uploads", json=body, headers=headers)
+    assert response.status_code == 201
+    return response.json()
+
+
+def put_chunk(client, headers, upload_id, offset, chunk, **extra_headers):
+    return client.put(
+        f"/api/v1/photos/uploads/{upload_id}",
+        params={"offset": offset},
+        content=chunk,
+        headers={**headers, "Content-Type": "application/octet-stream", **extra_headers}
+    )
+
+
+def upload_all(client, headers, upload_id, data=FILE_DATA, chunk_size=4096):
+    for offset in range(0, len(data), chunk_size):
+        response = put_chunk(client, headers, upload_id, offset, data[offset:offset + chunk_size])
+        assert response.status_code == 200
+    return response.json()
+
+
+class TestChunkedUploads:
+
+    def test_chunked_upload_and_finalize(self, client, auth_headers, input_channel, core_client):
+        upload = start_upload(client, auth_headers, sha256=hashlib.sha256(FILE_DATA).hexdigest())
+        assert upload["offset"] == 0
+
+        state = upload_all(client, auth_headers, upload["id"])
+        assert state["offset"] == len(FILE_DATA)
+        assert state["complete"] is True
+
+        response = client.post(
+            f"/api/v1/photos/uploads/{upload['id']}/finalize",
+            params={"rating": 4},
+            headers=auth_headers
+        )
+
+        assert response.status_code == 201
+        assert response.json()["hothash"] == json.loads(FIXTURE.read_text())["hothash"]
+        assert core_client.received["bytes"] == FILE_DATA
+        assert core_client.process_image.call_args.kwargs["filename"] == "IMG_0001.NEF"
+        # Session and spool file are gone
+        assert client.get(f"/api/v1/photos/uploads/{upload['id']}", headers=auth_headers).status_code == 404
+
+    def test_resume_after_interrupted_chunk(self, client, auth_headers, input_channel):
+        upload = start_upload(client, auth_headers)
+        assert put_chunk(client, auth_headers, upload["id"], 0, FILE_DATA[:4096]).status_code == 200
+
+        # Corrupted resend: rejected, offset unchanged
+        bad = put_chunk(client, auth_headers, upload["id"], 4096, FILE_DATA[4096:8192],
+                        **{"X-Chunk-SHA256": hashlib.sha256(b"other").hexdigest()})
+        assert bad.status_code == 400
+        state = client.get(f"/api/v1/photos/uploads/{upload['id']}", headers=auth_headers).json()
+        assert state["offset"] == 4096
+
+        good = put_chunk(client, auth_headers, upload["id"], 4096, FILE_DATA[4096:8192],
+                         **{"X-Chunk-SHA256": hashlib.sha256(FILE_DATA[4096:8192]).hexdigest()})
+        assert good.status_code == 200
+        assert good.json()["offset"] == 8192
+
+    def test_wrong_offset_conflicts(self, client, auth_headers, input_channel):
+        upload = start_upload(client, auth_headers)
+
+        response = put_chunk(client, auth_headers, upload["id"], 100, FILE_DATA[100:200])
+
+        assert response.status_code == 409
+
+    def test_chunk_past_announced_size_is_rejected(self, client, auth_headers, input_channel):
+        upload = start_upload(client, auth_headers, data=b"x" * 10)
+
+        response = put_chunk(client, auth_headers, upload["id"], 0, b"x" * 11)
+
+        assert response.status_code == 413
+
+    def test_finalize_incomplete_upload(self, client, auth_headers, input_channel):
+        upload = start_upload(client, auth_headers)
+        put_chunk(client, auth_headers, upload["id"], 0, FILE_DATA[:4096])
+
+        response = client.post(f"/api/v1/photos/uploads/{upload['id']}/finalize", headers=auth_headers)
+
+        assert response.status_code == 400
+        assert "incomplete" in response.json()["detail"]
+
+    def test_finalize_checksum_mismatch(self, client, auth_headers, input_channel):
+        upload = start_upload(client, auth_headers, sha256=hashlib.sha256(b"other").hexdigest())
+        upload_all(client, auth_headers, upload["id"])
+
+        response = client.post(f"/api/v1/photos/uploads/{upload['id']}/finalize", headers=auth_headers)
+
+        assert response.status_code == 400
+        assert "checksum" in response.json()["detail"]
+
+    def test_finalize_keeps_session_when_core_unavailable(self, client, auth_headers, input_channel, core_client):
+        upload = start_upload(client, auth_headers)
+        upload_all(client, auth_headers, upload["id"])
+        process_image = core_client.process_image.side_effect
+        core_client.process_image.side_effect = httpx.ConnectError("Connection refused")
+
+        failed = client.post(f"/api/v1/photos/uploads/{upload['id']}/finalize", headers=auth_headers)
+        assert failed.status_code == 503
+
+        core_client.process_image.side_effect = process_image
+        retried = client.post(f"/api/v1/photos/uploads/{upload['id']}/finalize", headers=auth_headers)
+        assert retried.status_code == 201
+        assert core_client.received["bytes"] == FILE_DATA
+
+    def test_finalize_as_job(self, client, auth_headers, input_channel):
+        upload = start_upload(client, auth_headers)
+        upload_all(client, auth_headers, upload["id"])
+
+        response = client.post(
+            f"/api/v1/photos/uploads/{upload['id']}/finalize",
+            params={"mode": "job"},
+            headers=auth_headers
+        )
+
+        assert response.status_code == 202
+        job = response.json()
+        assert job["status"] == "pending"
+        assert job["filename"] == "IMG_0001.NEF"
+        assert client.get(f"/api/v1/photos/uploads/{upload['id']}", headers=auth_headers).status_code == 404
+
+    def test_abort_upload(self, client, auth_headers, input_channel, spool_directory):
+        upload = start_upload(client, auth_headers)
+        put_chunk(client, auth_headers, upload["id"], 0, FILE_DATA[:4096])
+
+        response = client.delete(f"/api/v1/photos/uploads/{upload['id']}", headers=auth_headers)
+
+        assert response.status_code == 204
+        assert os.listdir(spool_directory) == []
+
+    def test_upload_of_other_user_is_not_found(self, client, auth_headers, input_channel, second_user_headers):
+        upload = start_upload(client, auth_headers)
+
+        response = put_chunk(client, second_user_headers, upload["id"], 0, FILE_DATA[:4096])
+
+        assert response.status_code == 404
+
+    def test_too_large_file_is_rejected(self, client, auth_headers, input_channel):
+        body = {"filename": "huge.NEF", "size": Config.UPLOAD_MAX_FILE_BYTES + 1}
+        response = client.post("/api/v1/photos/uploads", json=body, headers=auth_headers)
+        assert response.status_code == 413
@@ -6,7 +6,7 @@ imalink-core for processing, then stores the resulting PhotoCreateSchema.
 """
 import json
 from pathlib import Path
-from unittest.mock import patch, MagicMock, MagicMock
+from unittest.mock import patch, AsyncMock, MagicMock
 import pytest
 from io import BytesIO
 
@@ -32,10 +32,17 @@ class TestRegisterImageEndpoint:
                                     mock_photo_create_response, fake_image_bytes):
         """Test successful web upload - mocks imalink-core response"""
         
-        # Mock the ImalinkCoreClient class
-        with patch('src.utils.imalink_core_client.ImalinkCoreClient') as MockClient:
-            mock_instance = MockClient.return_value
-            mock_process = MagicMock(return_value=PhotoCreateSchema(**mock_photo_create_response))
+        # Mock the shared async imalink-core client
+        with patch('src.api.v1.photos.get_imalink_core_client') as get_core_client:
+            mock_instance = get_core_client.return_value
+            uploaded = {}
+
+            async def process_image(image_file, **kwargs):
+                # Upload is passed as a file object (streamed), not read into memory
+                uploaded["bytes"] = image_file.read()
+                return PhotoCreateSchema(**mock_photo_create_response)
+
+            mock_process = AsyncMock(side_effect=process_image)
             mock_instance.process_image = mock_process
             # Prepare upload
             files = {"file": ("test.jpg", BytesIO(fake_image_bytes), "image/jpeg")}
@@ -67,7 +74,7 @@ class TestRegisterImageEndpoint:
             # Verify imalink-core was called correctly
             mock_process.assert_called_once()
             call_args = mock_process.call_args
-            assert call_args.kwargs["image_bytes"] == fake_image_bytes
+            assert uploaded["bytes"] == fake_image_bytes
             assert call_args.kwargs["filename"] == "test.jpg"
     
     def test_register_image_without_import_session(self, authenticated_client, auth_headers, 
@@ -75,9 +82,9 @@ class TestRegisterImageEndpoint:
                                                    fake_image_bytes):
         """Test that photo uses protected ImportSession when not specified"""
         
-        with patch('src.utils.imalink_core_client.ImalinkCoreClient') as MockClient:
-            mock_instance = MockClient.return_value
-            mock_process = MagicMock(return_value=PhotoCreateSchema(**mock_photo_create_response))
+        with patch('src.api.v1.photos.get_imalink_core_client') as get_core_client:
+            mock_instance = get_core_client.return_value
+            mock_process = AsyncMock(return_value=PhotoCreateSchema(**mock_photo_create_response))
             mock_instance.process_image = mock_process
             
             files = {"file": ("test2.jpg", BytesIO(fake_image_bytes), "image/jpeg")}
@@ -99,9 +106,9 @@ class TestRegisterImageEndpoint:
                                                   fake_image_bytes):
         """Test requesting coldpreview with specific size"""
         
-        with patch('src.utils.imalink_core_client.ImalinkCoreClient') as MockClient:
-            mock_instance = MockClient.return_value
-            mock_process = MagicMock(return_value=PhotoCreateSchema(**mock_photo_create_response))
+        with patch('src.api.v1.photos.get_imalink_core_client') as get_core_client:
+            mock_instance = get_core_client.return_value
+            mock_process = AsyncMock(return_value=PhotoCreateSchema(**mock_photo_create_response))
             mock_instance.process_image = mock_process
             
             files = {"file": ("test3.jpg", BytesIO(fake_image_bytes), "image/jpeg")}
@@ -126,9 +133,9 @@ class TestRegisterImageEndpoint:
                                       fake_image_bytes):
         """Test uploading duplicate image - should return existing photo"""
         
-        with patch('src.utils.imalink_core_client.ImalinkCoreClient') as MockClient:
-            mock_instance = MockClient.return_value
-            mock_process = MagicMock(return_value=PhotoCreateSchema(**mock_photo_create_response))
+        with patch('src.api.v1.photos.get_imalink_core_client') as get_core_client:
+            mock_instance = get_core_client.return_value
+            mock_process = AsyncMock(return_value=PhotoCreateSchema(**mock_photo_create_response))
             mock_instance.process_image = mock_process
             
             files1 = {"file": ("original.jpg", BytesIO(fake_image_bytes), "image/jpeg")}
@@ -159,11 +166,11 @@ class TestRegisterImageEndpoint:
                                                       fake_image_bytes):
         """Test when imalink-core service is unavailable"""
         
-        with patch('src.utils.imalink_core_client.ImalinkCoreClient') as MockClient:
-            mock_instance = MockClient.return_value
+        with patch('src.api.v1.photos.get_imalink_core_client') as get_core_client:
+            mock_instance = get_core_client.return_value
             # Simulate network error
             import httpx
-            mock_instance.process_image = MagicMock(side_effect=httpx.RequestError("Connection refused"))
+            mock_instance.process_image = AsyncMock(side_effect=httpx.RequestError("Connection refused"))
             
             files = {"file": ("test.jpg", BytesIO(fake_image_bytes), "image/jpeg")}
             
@@ -181,15 +188,15 @@ class TestRegisterImageEndpoint:
                                                fake_image_bytes):
         """Test when imalink-core returns an error"""
         
-        with patch('src.utils.imalink_core_client.ImalinkCoreClient') as MockClient:
-            mock_instance = MockClient.return_value
+        with patch('src.api.v1.photos.get_imalink_core_client') as get_core_client:
+            mock_instance = get_core_client.return_value
             # Simulate HTTP error from imalink-core
             import httpx
             mock_response = MagicMock()
             mock_response.status_code = 400
             mock_response.text = "Invalid image format"
             mock_response.json.return_value = {"detail": "Invalid image format"}
-            mock_instance.process_image = MagicMock(
+            mock_instance.process_image = AsyncMock(
                 side_effect=httpx.HTTPStatusError(
                     "Bad Request", 
                     request=MagicMock(), 
@@ -0,0 +1,151 @@
+"""
+Tests for POST /api/v1/tags/bulk-apply and /api/v1/tags/bulk-remove
+Set-based tagging across many photos
+"""
+import pytest
+from tests.fixtures.real_photo_create_schemas import (
+    load_photo_create_schema,
+    BASIC,
+    LANDSCAPE,
+    FUJI
+)
+
+
+@pytest.fixture
+def hothashes(client, auth_headers, input_channel):
+    """Three photos owned by the test user"""
+    schemas = [
+        load_photo_create_schema(name, input_channel_id=input_channel.id)
+        for name in (BASIC, LANDSCAPE, FUJI)
+    ]
+    response = client.post(
+        "/api/v1/photos/create-batch",
+        json={"items": [{"photo_create_schema": schema, "tags": []} for schema in schemas]},
+        headers=auth_headers
+    )
+    assert response.json()["created"] == 3
+    return [schema["hothash"] for schema in schemas]
+
+
+def tag_counts(client, headers):
+    response = client.get("/api/v1/tags", headers=headers)
+    return {tag["name"]: tag["photo_count"] for tag in response.json()["tags"]}
+
+
+class TestBulkApplyTags:
+    """Bulk tag application"""
+
+    def test_bulk_apply_tags_all_photos(self, client, auth_headers, hothashes):
+        response = client.post(
+            "/api/v1/tags/bulk-apply",
+            json={"hothashes": hothashes, "tags": ["Norway", "summer 2024"]},
+            headers=auth_headers
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["photos_matched"] == 3
+        assert data["tags_created"] == 2
+        assert data["added"] == 6
+        assert data["skipped"] == 0
+        assert [tag["name"] for tag in data["tags"]] == ["norway", "summer 2024"]
+        assert tag_counts(client, auth_headers) == {"norway": 3, "summer 2024": 3}
+
+    def test_bulk_apply_skips_existing_associations(self, client, auth_headers, hothashes):
+        client.post(f"/api/v1/photos/{hothashes[0]}/tags", json={"tags": ["norway"]}, headers=auth_headers)
+
+        response = client.post(
+            "/api/v1/tags/bulk-apply",
+            json={"hothashes": hothashes, "tags": ["norway", "beach"]},
+            headers=auth_headers
+        )
+
+        data = response.json()
+        assert data["tags_created"] == 1
+        assert data["added"] == 5
+        assert data["skipped"] == 1
+        assert tag_counts(client, auth_headers) == {"norway": 3, "beach": 3}
+
+    def test_bulk_apply_in_small_batches(self, client, auth_headers, hothashes, monkeypatch):
+        monkeypatch.setattr("src.repositories.tag_repository.BULK_INSERT_BATCH_SIZE", 2)
+
+        response = client.post(
+            "/api/v1/tags/bulk-apply",
+            json={"hothashes": hothashes, "tags": ["a", "b", "c"]},
+            headers=auth_headers
+        )
+
+        assert response.json()["added"] == 9
+        assert tag_counts(client, auth_headers) == {"a": 3, "b": 3, "c": 3}
+
+    def test_bulk_apply_reports_foreign_and_unknown_hothashes(
+        self, client, auth_headers, hothashes, second_user_headers
+    ):
+        response = client.post(
+            "/api/v1/tags/bulk-apply",
+            json={"hothashes": hothashes[:1] + ["0" * 40], "tags": ["mine"]},
+            headers=auth_headers
+        )
+        assert response.json()["photos_matched"] == 1
+        assert response.json()["not_found"] == ["0" * 40]
+
+        # Another user cannot tag these photos
+        response = client.post(
+            "/api/v1/tags/bulk-apply",
+            json={"hothashes": hothashes, "tags": ["theirs"]},
+            headers=second_user_headers
+        )
+        assert response.json()["photos_matched"] == 0
+        assert response.json()["added"] == 0
+        assert sorted(response.json()["not_found"]) == sorted(hothashes)
+
+    def test_bulk_apply_validates_body(self, client, auth_headers, hothashes):
+        response = client.post(
+            "/api/v1/tags/bulk-apply",
+            json={"hothashes": [], "tags": ["norway"]},
+            headers=auth_headers
+        )
+        assert response.status_code == 422
+
+        response = client.post(
+            "/api/v1/tags/bulk-apply",
+            json={"hothashes": hothashes, "tags": ["bad/tag"]},
+            headers=auth_headers
+        )
+        assert response.status_code == 422
+
+    def test_bulk_apply_requires_auth(self, client):
+        response = client.post("/api/v1/tags/bulk-apply", json={"hothashes": ["a"], "tags": ["b"]})
+        assert response.status_code in (401, 403)
+
+
+class TestBulkRemoveTags:
+    """Bulk tag removal"""
+
+    def test_bulk_remove_tags(self, client, auth_headers, hothashes):
+        client.post(
+            "/api/v1/tags/bulk-apply",
+            json={"hothashes": hothashes, "tags": ["norway", "beach"]},
+            headers=auth_headers
+        )
+
+        response = client.post(
+            "/api/v1/tags/bulk-remove",
+            json={"hothashes": hothashes[:2], "tags": ["beach", "unknown"]},
+            headers=auth_headers
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["photos_matched"] == 2
+        assert data["removed"] == 2
+        assert [tag["name"] for tag in data["tags"]] == ["beach"]
+        assert data["unknown_tags"] == ["unknown"]
+        assert tag_counts(client, auth_headers) == {"norway": 3, "beach": 1}
+
+    def test_bulk_remove_is_idempotent(self, client, auth_headers, hothashes):
+        body = {"hothashes": hothashes, "tags": ["norway"]}
+        client.post("/api/v1/tags/bulk-apply", json=body, headers=auth_headers)
+
+        assert client.post("/api/v1/tags/bulk-remove", json=body, headers=auth_headers).json()["removed"] == 3
+        assert client.post("/api/v1/tags/bulk-remove", json=body, headers=auth_headers).json()["removed"] == 0
@@ -691,6 +691,52 @@ class TestTimelinePreviewSelection:
         assert preview_url == "/api/v1/photos/test_hash_123/hotpreview"
 
 
+class TestTimelineMultiplePreviews:
+    """Test previews=N mosaic selection."""
+    
+    @pytest.fixture
+    def photos(self, test_db_session: Session, test_user: User):
+        ratings = {"m0": 0, "m1": 5, "m2": 2, "m3": 4, "m4": 0}
+        photos = [
+            Photo(
+                hothash=hothash,
+                hotpreview=b"fake_preview_data",
+                user_id=test_user.id,
+                taken_at=datetime(2024, 6, 10 + i, 12, 0, 0),
+                rating=rating
+            )
+            for i, (hothash, rating) in enumerate(ratings.items())
+        ]
+        photos.append(Photo(
+            hothash="july", hotpreview=b"fake_preview_data", user_id=test_user.id,
+            taken_at=datetime(2024, 7, 1, 12, 0, 0)
+        ))
+        test_db_session.add_all(photos)
+        test_db_session.commit()
+        return photos
+    
+    def test_top_n_previews_per_bucket(self, client: TestClient, auth_headers: dict, photos):
+        response = client.get("/api/v1/timeline/?granularity=month&year=2024&previews=4", headers=auth_headers)
+        
+        assert response.status_code == 200
+        july, june = response.json()["data"]
+        assert june["count"] == 5
+        assert [p["hothash"] for p in june["previews"]] == ["m1", "m3", "m2", "m0"]
+        assert june["previews"][0]["url"] == "/api/v1/photos/m1/hotpreview"
+        assert june["preview_hothash"] == "m1"
+        assert [p["hothash"] for p in july["previews"]] == ["july"]
+    
+    def test_single_preview_by_default(self, client: TestClient, auth_headers: dict, photos):
+        response = client.get("/api/v1/timeline/?granularity=month&year=2024", headers=auth_headers)
+        
+        june = response.json()["data"][1]
+        assert [p["hothash"] for p in june["previews"]] == ["m1"]
+    
+    def test_previews_limit(self, client: TestClient, auth_headers: dict):
+        response = client.get("/api/v1/timeline/?previews=10", headers=auth_headers)
+        assert response.status_code == 422
+
+
 class TestTimelineEdgeCases:
     """Test edge cases and boundary conditions."""
     
@@ -1008,3 +1054,160 @@ class TestTimelineVisibilityIntegration:
         
         jan_bucket = next(b for b in data["data"] if b["month"] == 1)
         assert jan_bucket["count"] == 1  # Only public photo
+
+
+class TestTimelineHistogram:
+    """Test dense histogram endpoint."""
+    
+    @pytest.fixture
+    def photos(self, test_db_session: Session, test_user: User, second_user: User):
+        photos = [
+            Photo(hothash="hist_0", hotpreview=b"x", user_id=test_user.id, taken_at=datetime(2024, 2, 27, 9)),
+            Photo(hothash="hist_1", hotpreview=b"x", user_id=test_user.id, taken_at=datetime(2024, 2, 27, 18)),
+            Photo(hothash="hist_2", hotpreview=b"x", user_id=test_user.id, taken_at=datetime(2024, 3, 2, 12)),
+            Photo(hothash="hist_3", hotpreview=b"x", user_id=second_user.id, taken_at=datetime(2024, 3, 3, 12),
+                  visibility="public"),
+            Photo(hothash="hist_4", hotpreview=b"x", user_id=second_user.id, taken_at=datetime(2024, 3, 4, 12)),
+        ]
+        test_db_session.add_all(photos)
+        test_db_session.commit()
+        return photos
+    
+    def test_day_histogram(self, client: TestClient, auth_headers: dict, photos):
+        response = client.get("/api/v1/timeline/histogram", headers=auth_headers)
+        
+        assert response.status_code == 200
+        data = response.json()
+        assert data["granularity"] == "day"
+        assert data["start"] == "2024-02-27T00:00:00"
+        assert data["bins"] == 6
+        assert data["total_photos"] == 4
+        # Feb 27: 2, Feb 28/29 and Mar 1: 0, Mar 2 and 3: 1
+        assert data["runs"] == [2, 1, 0, 3, 1, 2]
+    
+    def test_anonymous_histogram(self, client: TestClient, photos):
+        data = client.get("/api/v1/timeline/histogram?granularity=month").json()
+        
+        assert data["start"] == "2024-03-01T00:00:00"
+        assert data["runs"] == [1, 1]
+    
+    def test_empty_histogram(self, client: TestClient, auth_headers: dict):
+        data = client.get("/api/v1/timeline/histogram", headers=auth_headers).json()
+        
+        assert data["start"] is None
+        assert data["bins"] == 0
+        assert data["runs"] == []
+    
+    def test_binary_histogram(self, client: TestClient, auth_headers: dict, photos):
+        from src.utils.histogram import unpack_varints
+        
+        response = client.get(
+            "/api/v1/timeline/histogram?granularity=hour",
+            headers={**auth_headers, "Accept": "application/octet-stream"}
+        )
+        
+        assert response.headers["content-type"] == "application/octet-stream"
+        assert response.headers["X-Histogram-Start"] == "2024-02-27T09:00:00"
+        assert response.headers["X-Total-Photos"] == "4"
+        runs = unpack_varints(response.content)
+        assert sum(runs[1::2]) == int(response.headers["X-Histogram-Bins"])
+        assert runs[:4] == [1, 1, 0, 8]
+    
+    def test_photo_scan_matches_rollup(self, test_db_session: Session, test_user: User, photos):
+        from src.repositories.timeline_repository import TimelineRepository
+        from src.repositories.timeline_bucket_repository import TimelineBucketRepository
+        from src.services.timeline_service import TimelineService
+        
+        repo = TimelineRepository(test_db_session)
+        scan = TimelineService(repo)
+        rollup = TimelineService(repo, TimelineBucketRepository(test_db_session))
+        
+        for granularity in ("year", "month", "day", "hour"):
+            for user_id in (test_user.id, None):
+                assert scan.get_histogram(granularity, user_id) == rollup.get_histogram(granularity, user_id)
+    
+    def test_invalid_granularity(self, client: TestClient):
+        response = client.get("/api/v1/timeline/histogram?granularity=week")
+        assert response.status_code == 422
+
+
+class TestTimelineSearch:
+    """Test timeline filtered by photo search criteria."""
+    
+    @pytest.fixture
+    def photos(self, test_db_session: Session, test_user: User, second_user: User):
+        from src.models.tag import Tag
+        
+        hiking = Tag(user_id=test_user.id, name="hiking")
+        photos = [
+            Photo(hothash="s_hike_5", hotpreview=b"x", user_id=test_user.id,
+                  taken_at=datetime(2024, 6, 1, 10), rating=5),
+            Photo(hothash="s_hike_3", hotpreview=b"x", user_id=test_user.id,
+                  taken_at=datetime(2024, 6, 2, 10), rating=3),
+            Photo(hothash="s_hike_5b", hotpreview=b"x", user_id=test_user.id,
+                  taken_at=datetime(2023, 8, 1, 10), rating=5),
+            Photo(hothash="s_plain_5", hotpreview=b"x", user_id=test_user.id,
+                  taken_at=datetime(2024, 7, 1, 10), rating=5),
+            Photo(hothash="s_deleted", hotpreview=b"x", user_id=test_user.id,
+                  taken_at=datetime(2024, 6, 3, 10), rating=5, deleted_at=datetime(2024, 9, 1)),
+            Photo(hothash="s_other", hotpreview=b"x", user_id=second_user.id,
+                  taken_at=datetime(2024, 6, 4, 10), rating=5),
+        ]
+        for photo in photos[:3] + photos[4:5]:
+            photo.tags.append(hiking)
+        test_db_session.add_all(photos)
+        test_db_session.commit()
+        return {"hiking": hiking.id}
+    
+    def test_search_timeline_by_tag_and_rating(self, client: TestClient, auth_headers: dict, photos):
+        response = client.post(
+            "/api/v1/timeline/search",
+            json={"granularity": "year", "search": {"tag_ids": [photos["hiking"]], "rating_min": 5}},
+            headers=auth_headers
+        )
+        
+        assert response.status_code == 200
+        data = response.json()
+        assert [(b["year"], b["count"], b["preview_hothash"]) for b in data["data"]] == [
+            (2024, 1, "s_hike_5"),
+            (2023, 1, "s_hike_5b"),
+        ]
+        assert data["meta"]["total_photos"] == 2
+    
+    def test_search_timeline_drill_down(self, client: TestClient, auth_headers: dict, photos):
+        response = client.post(
+            "/api/v1/timeline/search",
+            json={
+                "granularity": "day", "year": 2024, "month": 6, "previews": 3,
+                "search": {"tag_ids": [photos["hiking"]]}
+            },
+            headers=auth_headers
+        )
+        
+        data = response.json()
+        assert [(b["day"], b["count"]) for b in data["data"]] == [(2, 1), (1, 1)]
+        assert data["meta"]["total_photos"] == 3
+    
+    def test_empty_search_matches_plain_timeline(self, client: TestClient, auth_headers: dict, photos):
+        searched = client.post("/api/v1/timeline/search", json={"granularity": "month", "year": 2024},
+                               headers=auth_headers).json()
+        plain = client.get("/api/v1/timeline/?granularity=month&year=2024", headers=auth_headers).json()
+        
+        assert searched == plain
+    
+    def test_anonymous_search_sees_only_public(self, client: TestClient, photos):
+        response = client.post("/api/v1/timeline/search", json={"search": {"rating_min": 5}})
+        
+        assert response.status_code == 200
+        assert response.json()["data"] == []
+    
+    def test_search_validation(self, client: TestClient, auth_headers: dict):
+        response = client.post(
+            "/api/v1/timeline/search",
+            json={"granularity": "month", "search": {"unknown": 1}},
+            headers=auth_headers
+        )
+        assert response.status_code == 422
+        
+        response = client.post("/api/v1/timeline/search", json={"granularity": "month"}, headers=auth_headers)
+        assert response.status_code == 400
@@ -0,0 +1,129 @@
+"""
+Tests for the event_closure hierarchy index
+Maintenance on create, move and delete; rebuild and closure-based reads
+"""
+import pytest
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / 'src'))
+
+from sqlalchemy import select
+
+from src.models import Event, EventClosure, Photo
+from src.repositories.event_repository import EventRepository, rebuild_event_closure
+
+
+def closure(test_db_session):
+    rows = test_db_session.execute(select(EventClosure)).scalars().all()
+    return {(row.ancestor_id, row.descendant_id): row.depth for row in rows}
+
+
+def expected_closure(test_db_session):
+    """Closure derived by walking parent_event_id"""
+    parents = dict(test_db_session.execute(select(Event.id, Event.parent_event_id)).all())
+    pairs = {}
+    for event_id in parents:
+        ancestor, depth = event_id, 0
+        while ancestor is not None:
+            pairs[(ancestor, event_id)] = depth
+            ancestor, depth = parents[ancestor], depth + 1
+    return pairs
+
+
+@pytest.fixture
+def tree(test_db_session, test_user):
+    """trip > day > (beach, museum), plus a separate root"""
+    repo = EventRepository(test_db_session)
+    trip = repo.create(test_user.id, name="Trip")
+    day = repo.create(test_user.id, name="Day 1", parent_event_id=trip.id)
+    beach = repo.create(test_user.id, name="Beach", parent_event_id=day.id)
+    museum = repo.create(test_user.id, name="Museum", parent_event_id=day.id)
+    other = repo.create(test_user.id, name="Other")
+    return {"trip": trip, "day": day, "beach": beach, "museum": museum, "other": other}
+
+
+class TestEventClosureMaintenance:
+
+    def test_create_adds_ancestor_rows(self, test_db_session, tree):
+        rows = closure(test_db_session)
+        assert rows == expected_closure(test_db_session)
+        assert rows[(tree["trip"].id, tree["beach"].id)] == 2
+        assert len(rows) == 5 + 3 + 2
+
+    def test_session_added_hierarchy(self, test_db_session, test_user):
+        parent = Event(user_id=test_user.id, name="Parent")
+        child = Event(user_id=test_user.id, name="Child", parent=parent)
+        test_db_session.add_all([child, parent])
+        test_db_session.commit()
+
+        assert closure(test_db_session)[(parent.id, child.id)] == 1
+
+    def test_move_rehangs_subtree(self, test_db_session, test_user, tree):
+        EventRepository(test_db_session).move_event(tree["day"].id, tree["other"].id, test_user.id)
+
+        rows = closure(test_db_session)
+        assert rows == expected_closure(test_db_session)
+        assert (tree["trip"].id, tree["beach"].id) not in rows
+        assert rows[(tree["other"].id, tree["museum"].id)] == 2
+
+    def test_move_to_root(self, test_db_session, test_user, tree):
+        EventRepository(test_db_session).move_event(tree["day"].id, None, test_user.id)
+
+        assert closure(test_db_session) == expected_closure(test_db_session)
+        assert tree["beach"].depth == 1
+
+    def test_move_into_descendant_rejected(self, test_db_session, test_user, tree):
+        with pytest.raises(ValueError, match="cycle"):
+            EventRepository(test_db_session).move_event(tree["trip"].id, tree["beach"].id, test_user.id)
+
+    def test_delete_orphans_children(self, test_db_session, test_user, tree):
+        EventRepository(test_db_session).delete(tree["day"].id, test_user.id)
+
+        rows = closure(test_db_session)
+        assert rows == expected_closure(test_db_session)
+        assert (tree["trip"].id, tree["beach"].id) not in rows
+
+    def test_rebuild_matches_incremental(self, test_db_session, test_user, tree):
+        EventRepository(test_db_session).move_event(tree["beach"].id, tree["trip"].id, test_user.id)
+        incremental = closure(test_db_session)
+
+        written = rebuild_event_closure(test_db_session.connection(), test_user.id)
+        test_db_session.commit()
+
+        assert written == len(incremental)
+        assert closure(test_db_session) == incremental
+
+
+class TestEventClosureReads:
+
+    def test_breadcrumbs(self, test_db_session, test_user, tree):
+        repo = EventRepository(test_db_session)
+
+        assert [event.name for event in repo.get_ancestors(tree["beach"].id, test_user.id)] == ["Trip", "Day 1"]
+        assert tree["beach"].path == ["Trip", "Day 1", "Beach"]
+        assert tree["beach"].depth == 2
+        assert tree["trip"].is_ancestor_of(tree["museum"])
+        assert not tree["beach"].is_ancestor_of(tree["museum"])
+
+    def test_descendants_and_photo_counts(self, test_db_session, test_user, tree):
+        test_db_session.add_all([
+            Photo(hothash=f"ec{i}", hotpreview=b"x", user_id=test_user.id, event_id=tree[name].id)
+            for i, name in enumerate(["trip", "beach", "museum", "other"])
+        ])
+        test_db_session.commit()
+        repo = EventRepository(test_db_session)
+
+        assert sorted(repo.get_descendant_ids(tree["day"].id, test_user.id)) == sorted(
+            [tree["day"].id, tree["beach"].id, tree["museum"].id]
+        )
+        assert repo.get_photo_count(tree["trip"].id, include_descendants=True) == 3
+        page = repo.get_photo_page(tree["day"].id, test_user.id, include_descendants=True)
+        assert sorted(row.hothash for row in page) == ["ec1", "ec2"]
+
+    def test_tree_from_closure(self, test_db_session, test_user, tree):
+        roots = EventRepository(test_db_session).get_event_tree(test_user.id)
+
+        assert [root.name for root in roots] == ["Other", "Trip"]
+        assert [child.name for child in roots[1].children[0].children] == ["Beach", "Museum"]
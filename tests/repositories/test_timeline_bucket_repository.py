@@ -0,0 +1,187 @@
+"""
+Tests for the timeline_buckets rollup
+Incremental maintenance on photo changes, rebuild and rollup reads
+"""
+import pytest
+import sys
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / 'src'))
+
+from sqlalchemy import insert, select
+from sqlalchemy.orm import Session
+
+from src.models import Photo, TimelineBucket, User
+from src.repositories.photo_repository import PhotoRepository
+from src.repositories.timeline_repository import TimelineRepository
+from src.repositories.timeline_bucket_repository import TimelineBucketRepository, refresh_timeline_buckets
+
+
+def buckets(test_db_session):
+    rows = test_db_session.execute(select(TimelineBucket)).scalars().all()
+    return {
+        (b.user_id, b.visibility, b.year, b.month, b.day, b.hour): (b.count, b.preview_hothash)
+        for b in rows
+    }
+
+
+@pytest.fixture
+def photos(test_db_session, test_user):
+    """Three photos in one hour and one the next day"""
+    photos = [
+        Photo(hothash="tb0", hotpreview=b"x", user_id=test_user.id, taken_at=datetime(2024, 6, 15, 12, 10), rating=0),
+        Photo(hothash="tb1", hotpreview=b"x", user_id=test_user.id, taken_at=datetime(2024, 6, 15, 12, 20), rating=2),
+        Photo(hothash="tb2", hotpreview=b"x", user_id=test_user.id, taken_at=datetime(2024, 6, 15, 12, 30), rating=1),
+        Photo(hothash="tb3", hotpreview=b"x", user_id=test_user.id, taken_at=datetime(2024, 6, 16, 8, 0), rating=0),
+        Photo(hothash="tb4", hotpreview=b"x", user_id=test_user.id, taken_at=None),
+    ]
+    test_db_session.add_all(photos)
+    test_db_session.commit()
+    return photos
+
+
+class TestTimelineBucketMaintenance:
+
+    def test_insert_creates_buckets(self, test_db_session, test_user, photos):
+        assert buckets(test_db_session) == {
+            (test_user.id, "private", 2024, 6, 15, 12): (3, "tb1"),
+            (test_user.id, "private", 2024, 6, 16, 8): (1, "tb3"),
+        }
+
+    def test_rating_change_updates_preview(self, test_db_session, test_user, photos):
+        photos[2].rating = 5
+        test_db_session.commit()
+
+        assert buckets(test_db_session)[(test_user.id, "private", 2024, 6, 15, 12)] == (3, "tb2")
+
+    def test_visibility_change_moves_photo(self, test_db_session, test_user, photos):
+        photos[1].visibility = "public"
+        test_db_session.commit()
+
+        assert buckets(test_db_session) == {
+            (test_user.id, "private", 2024, 6, 15, 12): (2, "tb2"),
+            (test_user.id, "public", 2024, 6, 15, 12): (1, "tb1"),
+            (test_user.id, "private", 2024, 6, 16, 8): (1, "tb3"),
+        }
+
+    def test_taken_at_edit_moves_photo(self, test_db_session, test_user, photos):
+        test_db_session.expire_all()
+        photos[3].taken_at = datetime(2024, 6, 15, 12, 45)
+        photos[4].taken_at = datetime(2023, 1, 1, 0, 0)
+        test_db_session.commit()
+
+        assert buckets(test_db_session) == {
+            (test_user.id, "private", 2024, 6, 15, 12): (4, "tb1"),
+            (test_user.id, "private", 2023, 1, 1, 0): (1, "tb4"),
+        }
+
+    def test_deletes_update_buckets(self, test_db_session, test_user, photos):
+        PhotoRepository(test_db_session).delete("tb1", test_user.id)
+        test_db_session.delete(photos[3])
+        test_db_session.commit()
+
+        assert buckets(test_db_session) == {
+            (test_user.id, "private", 2024, 6, 15, 12): (2, "tb2"),
+        }
+
+    def test_bulk_update_refreshes_buckets(self, test_db_session, test_user, photos):
+        PhotoRepository(test_db_session).bulk_update(
+            [photo.id for photo in photos], test_user.id, {"visibility": "authenticated"}
+        )
+        test_db_session.commit()
+
+        assert {key[1] for key in buckets(test_db_session)} == {"authenticated"}
+        assert sum(count for count, _ in buckets(test_db_session).values()) == 4
+
+    def test_rebuild_matches_incremental(self, test_db_session, test_user, photos):
+        photos[0].rating = 4
+        photos[3].visibility = "public"
+        test_db_session.commit()
+        incremental = buckets(test_db_session)
+
+        written = TimelineBucketRepository(test_db_session).rebuild()
+
+        assert written == len(incremental)
+        assert buckets(test_db_session) == incremental
+
+    def test_refresh_overwrites_row_written_concurrently(self, test_db_session, test_user, photos):
+        """A bucket row committed by another transaction after our recompute is updated, not duplicated"""
+        key = (test_user.id, "private", 2024, 6, 15, 12)
+        connection = test_db_session.connection()
+        connection.execute(
+            TimelineBucket.__table__.delete().where(TimelineBucket.user_id == test_user.id)
+        )
+        connection.execute(insert(TimelineBucket).values(
+            user_id=test_user.id, visibility="private", year=2024, month=6, day=15, hour=12, count=99,
+            first_taken_at=datetime(2024, 6, 15, 12), last_taken_at=datetime(2024, 6, 15, 12),
+            preview_hothash="stale", preview_rating=0, preview_taken_at=datetime(2024, 6, 15, 12)
+        ))
+
+        refresh_timeline_buckets(connection, [key, (test_user.id, "private", 2024, 1, 1, 0)])
+        test_db_session.commit()
+
+        assert buckets(test_db_session) == {key: (3, "tb1")}
+
+    def test_two_sessions_add_to_same_hour(self, postgres_engine):
+        """Concurrent transactions adding photos to one hour both end up counted"""
+        with Session(postgres_engine) as session:
+            user = User(username="race", email="race@example.com", password_hash="x", display_name="Race")
+            session.add(user)
+            session.commit()
+            user_id = user.id
+
+        first = Session(postgres_engine)
+        first.add(Photo(hothash="race0", hotpreview=b"x", user_id=user_id, taken_at=datetime(2024, 6, 15, 12, 5)))
+        first.flush()  # refreshes the bucket and holds the owner's lock
+
+        errors = []
+
+        def second_writer():
+            try:
+                with Session(postgres_engine) as second:
+                    second.add(Photo(
+                        hothash="race1", hotpreview=b"x", user_id=user_id, taken_at=datetime(2024, 6, 15, 12, 50)
+                    ))
+                    second.commit()
+            except Exception as e:  # pragma: no cover - reported below
+                errors.append(e)
+
+        thread = threading.Thread(target=second_writer)
+        thread.start()
+        time.sleep(0.5)
+        first.commit()
+        first.close()
+        thread.join(timeout=10)
+
+        assert errors == []
+        with Session(postgres_engine) as session:
+            assert buckets(session) == {(user_id, "private", 2024, 6, 15, 12): (2, "race0")}
+
+
+class TestTimelineBucketReads:
+
+    @pytest.mark.parametrize("granularity,params", [
+        ("year", {}),
+        ("month", {"year": 2024}),
+        ("day", {"year": 2024, "month": 6}),
+        ("hour", {"year": 2024, "month": 6, "day": 15}),
+    ])
+    def test_matches_photo_scan(self, test_db_session, test_user, second_user, photos, granularity, params):
+        test_db_session.add_all([
+            Photo(hothash="other0", hotpreview=b"x", user_id=second_user.id,
+                  taken_at=datetime(2024, 6, 15, 12, 5), rating=5, visibility="public"),
+            Photo(hothash="other1", hotpreview=b"x", user_id=second_user.id,
+                  taken_at=datetime(2024, 6, 15, 13, 0), visibility="private"),
+        ])
+        test_db_session.commit()
+        scan = TimelineRepository(test_db_session)
+        rollup = TimelineBucketRepository(test_db_session)
+
+        for user_id in (test_user.id, None):
+            expected = getattr(scan, f"get_{granularity}_aggregation")(user_id=user_id, **params)
+            assert rollup.get_aggregation(granularity, user_id=user_id, **params) == expected
+            assert rollup.count_total_photos(user_id) == scan.count_total_photos(user_id)
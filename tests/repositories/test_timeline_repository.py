@@ -0,0 +1,130 @@
+"""
+Tests for TimelineRepository query plans
+Drill-down aggregations must range-scan the (user_id, taken_at) and
+(visibility, taken_at) indexes instead of scanning all photos.
+
+The PostgreSQL tests run when TEST_POSTGRES_URL points at a scratch database.
+"""
+import pytest
+import sys
+from datetime import datetime
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / 'src'))
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from src.models import Photo, User
+from src.repositories.timeline_repository import TimelineRepository
+from src.schemas.photo_schemas import PhotoSearchRequest
+
+DRILL_DOWNS = [
+    ("month", (2024,)),
+    ("day", (2024, 6)),
+    ("hour", (2024, 6, 15)),
+]
+
+
+def query_plan(engine, run, explain):
+    """Capture the last statement run() executes and return its plan lines"""
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        statements.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", capture)
+    try:
+        run()
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+
+    statement, parameters = statements[-1]
+    with engine.connect() as conn:
+        if engine.dialect.name == "postgresql":
+            # Tiny test tables: make the planner show whether an index is usable at all
+            conn.exec_driver_sql("SET enable_seqscan = off")
+        return [str(row[-1]) for row in conn.exec_driver_sql(explain + statement, parameters)]
+
+
+def add_photos(engine):
+    with Session(engine) as session:
+        user = User(username="planner", email="planner@example.com", password_hash="x", display_name="Planner")
+        session.add(user)
+        session.flush()
+        session.add_all([
+            Photo(hothash=f"plan{i}", hotpreview=b"x", user_id=user.id, taken_at=datetime(2024, 6, 15, i))
+            for i in range(3)
+        ])
+        session.commit()
+        return user.id
+
+
+class TestTimelineRepository:
+
+    def test_drill_down_results(self, sqlite_engine):
+        user_id = add_photos(sqlite_engine)
+        with Session(sqlite_engine) as session:
+            repo = TimelineRepository(session)
+
+            days = repo.get_day_aggregation(2024, 6, user_id=user_id)
+            assert [(d["day"], d["count"]) for d in days] == [(15, 3)]
+            assert repo.get_day_aggregation(2024, 7, user_id=user_id) == []
+            assert repo.get_hour_aggregation(2024, 2, 30, user_id=user_id) == []
+            assert [h["hour"] for h in repo.get_hour_aggregation(2024, 6, 15, user_id=user_id)] == [2, 1, 0]
+
+    def test_month_range_wraps_december(self):
+        repo = TimelineRepository(None)
+        assert repo._time_range(2024, 12) == (datetime(2024, 12, 1), datetime(2025, 1, 1))
+        assert repo._time_range(2024, 2, 29) == (datetime(2024, 2, 29), datetime(2024, 3, 1))
+
+
+@pytest.mark.parametrize("granularity,args", DRILL_DOWNS)
+class TestTimelineQueryPlans:
+
+    def test_sqlite_own_photos_range_scan(self, sqlite_engine, granularity, args):
+        with Session(sqlite_engine) as session:
+            method = getattr(TimelineRepository(session), f"get_{granularity}_aggregation")
+            plan = query_plan(sqlite_engine, lambda: method(*args, user_id=1), "EXPLAIN QUERY PLAN ")
+
+        assert any(
+            "USING INDEX ix_photos_user_id_taken_at (user_id=? AND taken_at>? AND taken_at<?)" in line
+            for line in plan
+        )
+        assert not any(line.startswith("SCAN photos") for line in plan)
+
+    def test_sqlite_public_range_scan(self, sqlite_engine, granularity, args):
+        with Session(sqlite_engine) as session:
+            method = getattr(TimelineRepository(session), f"get_{granularity}_aggregation")
+            plan = query_plan(sqlite_engine, lambda: method(*args, user_id=None), "EXPLAIN QUERY PLAN ")
+
+        assert any(
+            "USING INDEX ix_photos_visibility_taken_at (visibility=? AND taken_at>? AND taken_at<?)" in line
+            for line in plan
+        )
+        assert not any(line.startswith("SCAN photos") for line in plan)
+
+    def test_sqlite_search_range_scan(self, sqlite_engine, granularity, args):
+        search = PhotoSearchRequest(rating_min=4, has_gps=True)
+        with Session(sqlite_engine) as session:
+            method = getattr(TimelineRepository(session), f"get_{granularity}_aggregation")
+            plan = query_plan(
+                sqlite_engine, lambda: method(*args, user_id=1, search_params=search), "EXPLAIN QUERY PLAN "
+            )
+
+        assert any("USING INDEX ix_photos_user_id_taken_at" in line and "taken_at>?" in line for line in plan)
+        assert not any(line.startswith("SCAN photos") for line in plan)
+
+    def test_postgres_range_scan(self, postgres_engine, granularity, args):
+        add_photos(postgres_engine)
+        with Session(postgres_engine) as session:
+            method = getattr(TimelineRepository(session), f"get_{granularity}_aggregation")
+            own = "\n".join(query_plan(postgres_engine, lambda: method(*args, user_id=1), "EXPLAIN "))
+            public = "\n".join(query_plan(postgres_engine, lambda: method(*args, user_id=None), "EXPLAIN "))
+
+        assert "ix_photos_user_id_taken_at" in own
+        assert "ix_photos_visibility_taken_at" in public
+        for plan in (own, public):
+            assert "Seq Scan on photos" not in plan
+            assert "taken_at >=" in plan and "taken_at <" in plan
@@ -0,0 +1,112 @@
+"""
+Tests for ColdpreviewConsistencyService
+Orphan/dangling detection, fixing and checkpoint resume
+"""
+import hashlib
+import os
+import pytest
+import time
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / 'src'))
+
+from src.models import Photo
+from src.utils.coldpreview_repository import ColdpreviewRepository
+from src.services.coldpreview_consistency_service import ColdpreviewConsistencyService
+
+
+def make_hash(n: int) -> str:
+    return hashlib.sha256(f"consistency-{n}".encode()).hexdigest()
+
+
+@pytest.fixture
+def repository(tmp_path):
+    return ColdpreviewRepository(str(tmp_path), backend="files")
+
+
+@pytest.fixture
+def scenario(test_db_session, test_user, repository):
+    """linked photo, orphan file, unlinked photo and dangling photo"""
+    linked, orphan, unlinked, dangling = (make_hash(i) for i in range(4))
+    for hothash in (linked, orphan, unlinked):
+        repository.storage.write(hothash, b"coldpreview")
+
+    test_db_session.add_all([
+        Photo(user_id=test_user.id, hothash=linked, hotpreview=b"x",
+              coldpreview_path=str(repository.get_file_path(linked).relative_to(repository.base_path))),
+        Photo(user_id=test_user.id, hothash=unlinked, hotpreview=b"x"),
+        Photo(user_id=test_user.id, hothash=dangling, hotpreview=b"x",
+              coldpreview_path=f"{dangling[:2]}/{dangling[2:4]}/{dangling}.jpg"),
+    ])
+    test_db_session.commit()
+    return {"linked": linked, "orphan": orphan, "unlinked": unlinked, "dangling": dangling}
+
+
+class TestColdpreviewConsistencyService:
+
+    def test_report_only(self, test_db_session, repository, scenario):
+        report = ColdpreviewConsistencyService(test_db_session, repository).scan(workers=4)
+
+        assert report["complete"] is True
+        assert report["totals"]["files_scanned"] == 3
+        assert report["samples"]["orphans"] == [scenario["orphan"]]
+        assert report["samples"]["unlinked"] == [scenario["unlinked"]]
+        assert report["samples"]["dangling"] == [scenario["dangling"]]
+        # Nothing modified
+        assert repository.storage.read_by_hash(scenario["orphan"]) is not None
+
+    def test_delete_and_fix(self, test_db_session, repository, scenario):
+        service = ColdpreviewConsistencyService(test_db_session, repository)
+        report = service.scan(delete_orphans=True, fix=True, min_age_seconds=0)
+
+        assert report["totals"]["orphans_deleted"] == 1
+        assert report["totals"]["unlinked_fixed"] == 1
+        assert report["totals"]["dangling_fixed"] == 1
+        assert repository.storage.read_by_hash(scenario["orphan"]) is None
+
+        rescan = service.scan()
+        assert rescan["totals"]["orphans"] == 0
+        assert rescan["totals"]["unlinked"] == 0
+        assert rescan["totals"]["dangling"] == 0
+
+    def test_orphan_grace_period(self, test_db_session, repository, scenario):
+        report = ColdpreviewConsistencyService(test_db_session, repository).scan(delete_orphans=True)
+
+        assert report["totals"]["orphans"] == 1
+        assert report["totals"]["orphans_deleted"] == 0
+
+    def test_segment_orphan_grace_period(self, test_db_session, test_user, tmp_path):
+        repository = ColdpreviewRepository(str(tmp_path), backend="segments")
+        orphan = make_hash(0)
+        repository.storage.write(orphan, b"coldpreview")
+        service = ColdpreviewConsistencyService(test_db_session, repository)
+
+        # Just written to the active segment: a photo row may still be on its way
+        report = service.scan(delete_orphans=True)
+        assert report["totals"]["orphans"] == 1
+        assert report["totals"]["orphans_deleted"] == 0
+        assert repository.storage.read_by_hash(orphan) is not None
+
+        segment = repository.storage._segment_path(repository.storage._unpack(
+            repository.storage._index[bytes.fromhex(orphan)])[0])
+        idle_since = time.time() - 7200
+        os.utime(segment, (idle_since, idle_since))
+
+        report = service.scan(delete_orphans=True)
+        assert report["totals"]["orphans_deleted"] == 1
+        assert repository.storage.read_by_hash(orphan) is None
+
+    def test_resume_from_checkpoint(self, test_db_session, repository, scenario):
+        service = ColdpreviewConsistencyService(test_db_session, repository)
+
+        first = service.scan(max_shards=100)
+        assert first["complete"] is False
+        assert first["shards_completed"] == 100
+        assert service.checkpoint_path.exists()
+
+        second = service.scan()
+        assert second["complete"] is True
+        assert second["totals"]["files_scanned"] == 3
+        assert not service.checkpoint_path.exists()
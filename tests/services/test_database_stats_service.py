@@ -0,0 +1,95 @@
+"""
+Tests for DatabaseStatsCollector (GET /database-stats backing snapshot)
+Refresh loop, snapshot age and periodic coldpreview storage recount
+"""
+import hashlib
+import pytest
+import sys
+import threading
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / 'src'))
+
+from src.core.config import Config
+from src.services.database_stats_service import DatabaseStatsCollector
+from src.utils.coldpreview_repository import ColdpreviewRepository
+
+
+@pytest.fixture(autouse=True)
+def data_directory(tmp_path, monkeypatch):
+    monkeypatch.setattr(Config, "DATA_DIRECTORY", str(tmp_path))
+    monkeypatch.setattr(Config, "COLDPREVIEW_STORAGE_BACKEND", "files")
+    return tmp_path
+
+
+@pytest.fixture
+def collector(test_db_engine):
+    collector = DatabaseStatsCollector()
+    yield collector
+    collector.stop()
+
+
+class TestDatabaseStatsCollector:
+
+    def test_refresh_replaces_snapshot(self, collector, test_db_session, test_user):
+        first = collector.refresh()
+        second = collector.refresh()
+
+        assert first.tables["users"].record_count == 1
+        assert second.generated_at >= first.generated_at
+        assert collector.get_snapshot().generated_at == second.generated_at
+
+    def test_snapshot_age(self, collector):
+        snapshot = collector.refresh()
+        assert snapshot.age_seconds == 0.0
+
+        collector._snapshot = snapshot.model_copy(update={"generated_at": datetime.utcnow() - timedelta(seconds=90)})
+
+        aged = collector.get_snapshot()
+        assert 90.0 <= aged.age_seconds < 100.0
+        assert collector._snapshot.age_seconds == 0.0  # Stored snapshot is not modified
+
+    def test_get_snapshot_collects_when_missing(self, collector):
+        snapshot = collector.get_snapshot()
+
+        assert snapshot.tables
+        assert snapshot.age_seconds < 5
+
+    def test_refresh_loop_survives_errors(self, collector, monkeypatch):
+        calls = []
+        done = threading.Event()
+
+        def refresh():
+            calls.append(datetime.utcnow())
+            if len(calls) == 1:
+                raise RuntimeError("database unavailable")
+            if len(calls) == 3:
+                done.set()
+
+        monkeypatch.setattr(collector, "refresh", refresh)
+        collector.start(0.01)
+
+        assert done.wait(5)
+        collector.stop()
+        assert collector._thread is None
+        stopped_at = len(calls)
+        time.sleep(0.05)
+        assert len(calls) == stopped_at
+
+    def test_storage_recounted_every_n_refreshes(self, collector, monkeypatch, data_directory):
+        monkeypatch.setattr(Config, "DATABASE_STATS_STORAGE_RECOUNT_EVERY", 3)
+        repository = ColdpreviewRepository()
+        repository.storage.write(hashlib.sha256(b"1").hexdigest(), b"x" * 10)
+        assert collector.refresh().coldstorage.total_files == 1
+
+        # Written behind the storage's back: counters drift until the recount
+        hothash = hashlib.sha256(b"2").hexdigest()
+        path = repository.storage.get_file_path(hothash)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(b"x" * 10)
+
+        assert collector.refresh().coldstorage.total_files == 1
+        assert collector.refresh().coldstorage.total_files == 2
@@ -0,0 +1,91 @@
+"""
+Tests for HothashFilterRegistry (POST /photos/exists backing store)
+Lazy build, catch-up on photos created elsewhere, deletes and user scoping
+"""
+import hashlib
+import pytest
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / 'src'))
+
+from src.models import Photo
+from src.services.hothash_filter_service import HothashFilterRegistry
+
+
+def make_hash(n: int) -> str:
+    return hashlib.sha256(f"exists-{n}".encode()).hexdigest()
+
+
+def add_photos(session, user_id, numbers):
+    session.add_all([Photo(user_id=user_id, hothash=make_hash(n), hotpreview=b"x") for n in numbers])
+    session.commit()
+
+
+@pytest.fixture
+def registry():
+    return HothashFilterRegistry(max_users=10, error_rate=0.01, sync_overlap_seconds=300)
+
+
+class TestHothashFilterRegistry:
+
+    def test_finds_existing_in_input_order(self, test_db_session, test_user, registry):
+        add_photos(test_db_session, test_user.id, range(10))
+
+        query = [make_hash(n) for n in (7, 100, 3, 3, 101)]
+        assert registry.find_existing(test_db_session, test_user.id, query) == [make_hash(7), make_hash(3)]
+
+    def test_picks_up_photos_created_after_build(self, test_db_session, test_user, registry):
+        add_photos(test_db_session, test_user.id, range(5))
+        assert registry.find_existing(test_db_session, test_user.id, [make_hash(50)]) == []
+
+        # Inserted without calling registry.add (e.g. by another worker process)
+        add_photos(test_db_session, test_user.id, [50])
+        assert registry.find_existing(test_db_session, test_user.id, [make_hash(50)]) == [make_hash(50)]
+
+    def test_picks_up_photos_committed_out_of_id_order(self, test_db_session, test_user, registry):
+        add_photos(test_db_session, test_user.id, range(5))
+        registry.find_existing(test_db_session, test_user.id, [make_hash(0)])
+
+        # Id 20 was assigned first but its transaction commits after id 30 was synced
+        test_db_session.add(Photo(id=30, user_id=test_user.id, hothash=make_hash(30), hotpreview=b"x"))
+        test_db_session.commit()
+        assert registry.find_existing(test_db_session, test_user.id, [make_hash(30)]) == [make_hash(30)]
+
+        test_db_session.add(Photo(id=20, user_id=test_user.id, hothash=make_hash(20), hotpreview=b"x"))
+        test_db_session.commit()
+        assert registry.find_existing(test_db_session, test_user.id, [make_hash(20)]) == [make_hash(20)]
+
+    def test_sync_watermark_trails_by_overlap(self, test_db_session, test_user, registry, monkeypatch):
+        clock = [1000.0]
+        monkeypatch.setattr("src.services.hothash_filter_service.time.monotonic", lambda: clock[0])
+        add_photos(test_db_session, test_user.id, range(5))
+        registry.find_existing(test_db_session, test_user.id, [make_hash(0)])
+        user_filter = registry._filters[test_user.id]
+        assert user_filter.sync_from_id == 0
+
+        clock[0] += 299
+        registry.find_existing(test_db_session, test_user.id, [make_hash(0)])
+        assert user_filter.sync_from_id == 0
+
+        clock[0] += 1
+        registry.find_existing(test_db_session, test_user.id, [make_hash(0)])
+        assert user_filter.sync_from_id == user_filter.last_photo_id
+        assert user_filter.bloom.count == 5  # Re-scanned rows are not counted again
+
+    def test_deleted_photos_are_not_reported(self, test_db_session, test_user, registry):
+        add_photos(test_db_session, test_user.id, range(5))
+        registry.find_existing(test_db_session, test_user.id, [make_hash(0)])
+
+        test_db_session.query(Photo).filter(Photo.hothash == make_hash(0)).delete()
+        test_db_session.commit()
+        registry.discard(test_user.id)
+
+        assert registry.find_existing(test_db_session, test_user.id, [make_hash(0), make_hash(1)]) == [make_hash(1)]
+
+    def test_scoped_to_user(self, test_db_session, test_user, second_user, registry):
+        add_photos(test_db_session, second_user.id, [1])
+
+        assert registry.find_existing(test_db_session, test_user.id, [make_hash(1)]) == []
+        assert registry.find_existing(test_db_session, second_user.id, [make_hash(1)]) == [make_hash(1)]
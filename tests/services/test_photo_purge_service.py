@@ -0,0 +1,159 @@
+"""
+Tests for PhotoPurgeService
+Deferred removal of soft-deleted photos, their files and references
+"""
+import hashlib
+import pytest
+import sys
+from datetime import datetime
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / 'src'))
+
+from sqlalchemy import select
+
+from src.models import Photo, ImageFile, Tag, PhotoTag, PhotoCollection, PhotoTextDocument
+from src.utils.coldpreview_repository import ColdpreviewRepository
+from src.services.photo_purge_service import PhotoPurgeService, keep_coldpreviews, scrub_phototext_content
+
+
+def make_hash(n: int) -> str:
+    return hashlib.sha256(f"purge-{n}".encode()).hexdigest()
+
+
+@pytest.fixture
+def repository(tmp_path):
+    return ColdpreviewRepository(str(tmp_path), backend="files")
+
+
+@pytest.fixture
+def photos(test_db_session, test_user, repository):
+    """Four photos with coldpreview, image file and tag"""
+    tag = Tag(user_id=test_user.id, name="trip")
+    test_db_session.add(tag)
+    photos = []
+    for n in range(4):
+        hothash = make_hash(n)
+        path = repository.storage.write(hothash, b"coldpreview")
+        photo = Photo(user_id=test_user.id, hothash=hothash, hotpreview=b"x", coldpreview_path=path)
+        photo.image_files.append(ImageFile(filename=f"IMG_{n}.jpg", file_size=1))
+        photo.tags.append(tag)
+        photos.append(photo)
+    test_db_session.add_all(photos)
+    test_db_session.commit()
+    return photos
+
+
+def soft_delete(test_db_session, photos):
+    for photo in photos:
+        photo.deleted_at = datetime.utcnow()
+    test_db_session.commit()
+
+
+def all_rows(test_db_session, column):
+    return test_db_session.execute(select(column).execution_options(include_deleted=True)).scalars().all()
+
+
+class TestPhotoPurgeService:
+
+    def test_soft_deleted_photos_are_hidden(self, test_db_session, photos):
+        soft_delete(test_db_session, photos[:2])
+
+        visible = test_db_session.query(Photo.hothash).all()
+        assert sorted(row.hothash for row in visible) == sorted(p.hothash for p in photos[2:])
+        assert len(all_rows(test_db_session, Photo.id)) == 4
+        assert len(test_db_session.query(Tag).one().photos) == 2
+
+    def test_purge_removes_rows_and_files(self, test_db_session, repository, photos):
+        hothashes = [photo.hothash for photo in photos]
+        kept_id = photos[3].id
+        soft_delete(test_db_session, photos[:3])
+
+        purged = PhotoPurgeService(test_db_session, repository).purge_pending()
+
+        assert purged == 3
+        assert all_rows(test_db_session, Photo.hothash) == [hothashes[3]]
+        assert all_rows(test_db_session, ImageFile.photo_id) == [kept_id]
+        assert all_rows(test_db_session, PhotoTag.photo_id) == [kept_id]
+        assert [repository.storage.read_by_hash(h) for h in hothashes] == [None, None, None, b"coldpreview"]
+
+    def test_purge_in_batches(self, test_db_session, repository, photos):
+        soft_delete(test_db_session, photos)
+        service = PhotoPurgeService(test_db_session, repository)
+
+        assert service.purge_batch(batch_size=3) == 3
+        assert service.purge_batch(batch_size=3) == 1
+        assert service.purge_batch(batch_size=3) == 0
+
+    def test_purge_scrubs_collections_and_phototexts(self, test_db_session, test_user, repository, photos):
+        deleted, kept = photos[0].hothash, photos[1].hothash
+        collection = PhotoCollection(user_id=test_user.id, name="Best", hothashes=[deleted, kept])
+        document = PhotoTextDocument(
+            user_id=test_user.id,
+            title="Trip",
+            document_type="general",
+            cover_image_hash=deleted,
+            cover_image_alt="Cover",
+            content={
+                "coverImage": {"hash": deleted, "alt": "Cover"},
+                "blocks": [
+                    {"type": "paragraph", "content": []},
+                    {"type": "image", "images": [{"hash": deleted}, {"hash": kept}]},
+                    {"type": "image", "images": [{"hash": deleted}]},
+                ]
+            }
+        )
+        test_db_session.add_all([collection, document])
+        test_db_session.commit()
+        soft_delete(test_db_session, photos[:1])
+
+        PhotoPurgeService(test_db_session, repository).purge_pending()
+
+        test_db_session.expire_all()
+        assert collection.hothashes == [kept]
+        assert document.cover_image_hash is None
+        assert document.cover_image_alt is None
+        assert document.content["coverImage"] is None
+        assert document.content["blocks"] == [
+            {"type": "paragraph", "content": []},
+            {"type": "image", "images": [{"hash": kept}]},
+        ]
+
+    def test_purge_hashes_only_touches_deleted_photos(self, test_db_session, repository, photos):
+        soft_delete(test_db_session, photos[:1])
+        service = PhotoPurgeService(test_db_session, repository)
+
+        assert service.purge_hashes([photos[0].hothash, photos[1].hothash]) == 1
+        assert len(all_rows(test_db_session, Photo.id)) == 3
+
+    def test_purge_hashes_without_commit_deletes_files_after_caller_commits(
+        self, test_db_session, repository, photos
+    ):
+        soft_delete(test_db_session, photos[:2])
+        hothashes = [photos[0].hothash, photos[1].hothash]
+
+        assert PhotoPurgeService(test_db_session, repository).purge_hashes(hothashes, commit=False) == 2
+        keep_coldpreviews(test_db_session, hothashes[1:])
+        assert repository.storage.read_by_hash(hothashes[0]) == b"coldpreview"
+
+        test_db_session.commit()
+
+        assert len(all_rows(test_db_session, Photo.id)) == 2
+        assert repository.storage.read_by_hash(hothashes[0]) is None
+        assert repository.storage.read_by_hash(hothashes[1]) == b"coldpreview"
+
+    def test_purge_hashes_without_commit_rolls_back_with_caller(self, test_db_session, repository, photos):
+        soft_delete(test_db_session, photos[:1])
+        service = PhotoPurgeService(test_db_session, repository)
+
+        assert service.purge_hashes([photos[0].hothash], commit=False) == 1
+        test_db_session.rollback()
+        test_db_session.commit()  # A later commit must not delete the file
+
+        assert len(all_rows(test_db_session, Photo.id)) == 4
+        assert repository.storage.read_by_hash(photos[0].hothash) == b"coldpreview"
+
+    def test_scrub_phototext_content_unchanged(self):
+        content = {"blocks": [{"type": "image", "images": [{"hash": "a"}]}]}
+        assert scrub_phototext_content(content, {"b"}) is None
@@ -0,0 +1,191 @@
+"""
+Tests for register-image jobs (PhotoRegisterJobService + RegisterJobWorkers)
+Spooling, claiming, stale recovery and processing against a mocked imalink-core
+"""
+import asyncio
+import io
+import json
+import os
+import pytest
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import httpx
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / 'src'))
+
+from imalink_schemas import PhotoCreateSchema
+from src.core.config import Config
+from src.models import Photo, PhotoRegisterJob
+from src.services import photo_register_job_service
+from src.services.photo_register_job_service import PhotoRegisterJobService, RegisterJobWorkers
+
+FIXTURE = Path(__file__).parent.parent / "fixtures" / "photo_create_schemas" / "tiny.json"
+
+
+@pytest.fixture(autouse=True)
+def spool_directory(tmp_path, monkeypatch):
+    monkeypatch.setattr(Config, "REGISTER_JOB_SPOOL_DIRECTORY", str(tmp_path))
+    monkeypatch.setattr(photo_register_job_service, "RETRY_DELAY_SECONDS", 0)
+    return tmp_path
+
+
+@pytest.fixture
+def job_service(test_db_session):
+    return PhotoRegisterJobService(test_db_session)
+
+
+def queue_job(job_service, user_id, data=b"fake jpeg image data", **kwargs):
+    return job_service.create_job(
+        user_id=user_id, upload=io.BytesIO(data), filename="upload.jpg", content_type="image/jpeg", **kwargs
+    )
+
+
+def process(job_service, job, core_client):
+    """Claim and process one job with a mocked imalink-core client"""
+    claimed = job_service.claim_next_job()
+    assert claimed.id == job.id
+    with patch.object(photo_register_job_service, "get_imalink_core_client", return_value=core_client):
+        asyncio.run(RegisterJobWorkers(workers=1).process(claimed))
+    job_service.db.expire_all()
+    return job_service.db.get(PhotoRegisterJob, job.id)
+
+
+def core_returning_fixture():
+    client = MagicMock()
+    client.process_image = AsyncMock(return_value=PhotoCreateSchema(**json.loads(FIXTURE.read_text())))
+    return client
+
+
+class TestPhotoRegisterJobService:
+
+    def test_create_job_spools_upload_and_uses_quick_channel(self, job_service, test_user, input_channel):
+        job = queue_job(job_service, test_user.id, rating=3)
+
+        assert job.status == "pending"
+        assert job.input_channel_id == input_channel.id
+        assert Path(job.spool_path).read_bytes() == b"fake jpeg image data"
+
+    def test_claim_is_exclusive_and_in_order(self, job_service, test_user, input_channel):
+        first = queue_job(job_service, test_user.id)
+        second = queue_job(job_service, test_user.id)
+
+        assert job_service.claim_next_job().id == first.id
+        assert job_service.claim_next_job().id == second.id
+        assert job_service.claim_next_job() is None
+
+        claimed = job_service.get_job(first.id, test_user.id)
+        assert claimed.status == "processing"
+        assert claimed.attempts == 1
+
+    def test_stale_processing_job_is_returned_to_pending(self, job_service, test_user, input_channel):
+        job = queue_job(job_service, test_user.id)
+        job_service.claim_next_job()
+        assert job_service.recover_stale_jobs() == 0
+
+        job.started_at = datetime.utcnow() - timedelta(hours=1)
+        job_service.db.commit()
+
+        assert job_service.recover_stale_jobs() == 1
+        assert job_service.claim_next_job().id == job.id
+
+    def test_list_jobs_by_input_channel(self, job_service, test_user, second_user, input_channel):
+        queue_job(job_service, test_user.id)
+        queue_job(job_service, test_user.id)
+
+        jobs, total = job_service.list_jobs(test_user.id, input_channel_id=input_channel.id)
+        assert total == 2
+        assert jobs[0].id > jobs[1].id  # Newest first
+        assert job_service.list_jobs(second_user.id)[1] == 0
+
+
+class TestRegisterJobWorkers:
+
+    def test_process_creates_photo(self, job_service, test_user, input_channel):
+        job = queue_job(job_service, test_user.id, rating=4)
+        core_client = core_returning_fixture()
+
+        done = process(job_service, job, core_client)
+
+        assert done.status == "done"
+        assert done.is_duplicate is False
+        photo = job_service.db.get(Photo, done.photo_id)
+        assert photo.user_id == test_user.id
+        assert photo.rating == 4
+        assert photo.input_channel_id == input_channel.id
+        assert not os.path.exists(job.spool_path)
+        assert core_client.process_image.call_args.kwargs["filename"] == "upload.jpg"
+
+    def test_duplicate_upload_points_to_existing_photo(self, job_service, test_user, input_channel):
+        first = process(job_service, queue_job(job_service, test_user.id), core_returning_fixture())
+        second = process(job_service, queue_job(job_service, test_user.id), core_returning_fixture())
+
+        assert second.status == "done"
+        assert second.is_duplicate is True
+        assert second.photo_id == first.photo_id
+
+    def test_rejected_image_fails_without_retry(self, job_service, test_user, input_channel):
+        job = queue_job(job_service, test_user.id)
+        response = httpx.Response(400, json={"detail": "Invalid image format"}, request=httpx.Request("POST", "http://core"))
+        core_client = MagicMock()
+        core_client.process_image = AsyncMock(
+            side_effect=httpx.HTTPStatusError("Bad Request", request=response.request, response=response)
+        )
+
+        failed = process(job_service, job, core_client)
+
+        assert failed.status == "failed"
+        assert "Invalid image format" in failed.error
+        assert not os.path.exists(job.spool_path)
+
+    def test_unavailable_core_is_retried_then_fails(self, job_service, test_user, input_channel):
+        job = queue_job(job_service, test_user.id)
+        core_client = MagicMock()
+        core_client.process_image = AsyncMock(side_effect=httpx.ConnectError("Connection refused"))
+
+        for attempt in range(1, Config.REGISTER_JOB_MAX_ATTEMPTS):
+            retried = process(job_service, job, core_client)
+            assert retried.status == "pending"
+            assert retried.attempts == attempt
+            assert os.path.exists(job.spool_path)
+
+        failed = process(job_service, job, core_client)
+        assert failed.status == "failed"
+        assert "unavailable" in failed.error
+        assert not os.path.exists(job.spool_path)
+
+    def test_worker_survives_failed_stale_recovery(self, monkeypatch):
+        monkeypatch.setattr(photo_register_job_service, "POLL_INTERVAL_SECONDS", 0.01)
+        workers = RegisterJobWorkers(workers=1)
+        job = MagicMock(spec=PhotoRegisterJob)
+        calls = []
+
+        def with_service(method, *args):
+            calls.append(method)
+            if method == "recover_stale_jobs":
+                if calls.count(method) == 1:
+                    raise RuntimeError("database unavailable")
+                return 0
+            return job if calls.count("recover_stale_jobs") >= 2 else None
+
+        async def run():
+            processed = asyncio.Event()
+
+            async def process(claimed):
+                assert claimed is job
+                processed.set()
+
+            monkeypatch.setattr(workers, "_with_service", with_service)
+            monkeypatch.setattr(workers, "process", process)
+            workers._wake = asyncio.Event()
+            task = asyncio.create_task(workers._run())
+            await asyncio.wait_for(processed.wait(), timeout=5)
+            assert not task.done()
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+        asyncio.run(run())
+        assert calls.count("recover_stale_jobs") >= 2
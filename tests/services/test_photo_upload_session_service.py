@@ -0,0 +1,68 @@
+"""
+Tests for PhotoUploadSessionService
+Chunk files, conditional offset commits and concurrent requests for one offset
+"""
+import pytest
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / 'src'))
+
+from src.core.config import Config
+from src.core.exceptions import ConflictError
+from src.services.photo_upload_session_service import PhotoUploadSessionService
+
+
+@pytest.fixture(autouse=True)
+def spool_directory(tmp_path, monkeypatch):
+    monkeypatch.setattr(Config, "REGISTER_JOB_SPOOL_DIRECTORY", str(tmp_path))
+    return tmp_path
+
+
+@pytest.fixture
+def service(test_db_session):
+    return PhotoUploadSessionService(test_db_session)
+
+
+def write_chunk(service, upload, offset, data):
+    chunk_file = service.open_chunk(upload, offset)
+    chunk_file.write(data)
+    chunk_file.close()
+    return chunk_file.name
+
+
+class TestPhotoUploadSessionService:
+
+    def test_chunks_are_appended_on_commit(self, service, test_user):
+        upload = service.create_session(test_user.id, "IMG_0001.NEF", 8)
+
+        service.commit_chunk(upload, 0, write_chunk(service, upload, 0, b"abcd"), 4)
+        service.commit_chunk(upload, 4, write_chunk(service, upload, 4, b"efgh"), 4)
+
+        assert upload.received_bytes == 8
+        assert Path(upload.spool_path).read_bytes() == b"abcdefgh"
+
+    def test_concurrent_chunks_at_same_offset(self, service, test_user, spool_directory):
+        upload = service.create_session(test_user.id, "IMG_0001.NEF", 8)
+
+        # Both requests pass the offset check and receive their body before either commits
+        first = write_chunk(service, upload, 0, b"abcd")
+        second = write_chunk(service, upload, 0, b"wxyz")
+        assert Path(upload.spool_path).read_bytes() == b""
+
+        service.commit_chunk(upload, 0, first, 4)
+        with pytest.raises(ConflictError):
+            service.commit_chunk(upload, 0, second, 4)
+
+        assert upload.received_bytes == 4
+        assert Path(upload.spool_path).read_bytes() == b"abcd"
+        assert not list(spool_directory.glob("*.chunk"))
+
+    def test_discard_chunk(self, service, test_user, spool_directory):
+        upload = service.create_session(test_user.id, "IMG_0001.NEF", 8)
+
+        service.discard_chunk(service.open_chunk(upload, 0))
+
+        assert not list(spool_directory.glob("*.chunk"))
+        assert upload.received_bytes == 0
@@ -0,0 +1,37 @@
+"""
+Tests for the hothash Bloom filter
+"""
+import hashlib
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / 'src'))
+
+from src.utils.bloom_filter import BloomFilter
+
+
+def make_hash(n: int) -> str:
+    return hashlib.sha256(str(n).encode()).hexdigest()
+
+
+def test_added_items_are_always_found():
+    bloom = BloomFilter(capacity=5000, error_rate=0.01)
+    bloom.update(make_hash(i) for i in range(5000))
+
+    assert bloom.count == 5000
+    assert all(make_hash(i) in bloom for i in range(5000))
+
+
+def test_false_positive_rate_near_target():
+    bloom = BloomFilter(capacity=10000, error_rate=0.01)
+    bloom.update(make_hash(i) for i in range(10000))
+
+    false_positives = sum(make_hash(-i) in bloom for i in range(1, 10001))
+    assert false_positives < 10000 * 0.02
+
+
+def test_non_hex_keys_supported():
+    bloom = BloomFilter(capacity=10)
+    bloom.add("not-a-hex-hash")
+    assert "not-a-hex-hash" in bloom
@@ -0,0 +1,252 @@
+"""
+Tests for coldpreview storage backends
+Covers sharded file layout and packed segment files (index, tombstones, compaction)
+"""
+import hashlib
+import io
+import pytest
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / 'src'))
+
+from src.utils.coldpreview_storage import ShardedFileStorage, SegmentFileStorage
+
+
+def make_hash(n: int) -> str:
+    return hashlib.sha256(str(n).encode()).hexdigest()
+
+
+@pytest.fixture(params=["files", "segments"])
+def storage(request, tmp_path):
+    """Each test runs against both backends"""
+    if request.param == "files":
+        backend = ShardedFileStorage(tmp_path)
+    else:
+        backend = SegmentFileStorage(tmp_path, max_segment_bytes=4096)
+    yield backend
+    backend.close()
+
+
+class TestColdpreviewStorage:
+    """Behaviour shared by all storage backends"""
+
+    def test_write_and_read_roundtrip(self, storage):
+        hothash = make_hash(1)
+        relative_path = storage.write(hothash, b"jpeg-bytes")
+
+        assert relative_path.endswith(f"{hothash}.jpg")
+        assert storage.read(relative_path) == b"jpeg-bytes"
+        assert storage.read_by_hash(hothash) == b"jpeg-bytes"
+        assert storage.size_by_hash(hothash) == len(b"jpeg-bytes")
+
+    def test_overwrite_replaces_data(self, storage):
+        hothash = make_hash(2)
+        storage.write(hothash, b"old")
+        storage.write(hothash, b"new-data")
+
+        assert storage.read_by_hash(hothash) == b"new-data"
+        assert storage.stats()["total_files"] == 1
+
+    def test_write_stream(self, storage):
+        hothash = make_hash(4)
+        data = bytes(range(256)) * 1000  # Larger than one copy chunk
+        storage.write(make_hash(5), b"before")
+
+        relative_path = storage.write_stream(hothash, io.BytesIO(data), len(data))
+        storage.write(make_hash(6), b"after")
+
+        assert storage.read(relative_path) == data
+        assert storage.read_by_hash(make_hash(5)) == b"before"
+        assert storage.read_by_hash(make_hash(6)) == b"after"
+        assert storage.stats()["total_size_bytes"] == len(data) + len(b"before") + len(b"after")
+
+    def test_write_stream_short_stream_stores_nothing(self, storage):
+        hothash = make_hash(7)
+
+        with pytest.raises(ValueError):
+            storage.write_stream(hothash, io.BytesIO(b"short"), 100)
+
+        assert storage.read_by_hash(hothash) is None
+        storage.write(make_hash(8), b"next")
+        assert storage.read_by_hash(make_hash(8)) == b"next"
+
+    def test_write_stream_short_stream_keeps_previous_version(self, storage):
+        hothash = make_hash(9)
+        storage.write(hothash, b"previous")
+
+        with pytest.raises(ValueError):
+            storage.write_stream(hothash, io.BytesIO(b"short"), 100)
+
+        assert storage.read_by_hash(hothash) == b"previous"
+        assert storage.stats()["total_files"] == 1
+        storage.write(make_hash(10), b"next")
+        assert storage.read_by_hash(make_hash(10)) == b"next"
+
+    def test_write_stream_failing_read_keeps_previous_version(self, storage):
+        hothash = make_hash(11)
+        storage.write(hothash, b"previous")
+
+        class FailingStream(io.BytesIO):
+            def read(self, size=-1):
+                if self.tell() > 0:
+                    raise OSError("client disconnected")
+                return super().read(size)
+
+        with pytest.raises(OSError):
+            storage.write_stream(hothash, FailingStream(b"x" * 100_000), 200_000)
+
+        assert storage.read_by_hash(hothash) == b"previous"
+        storage.write(make_hash(12), b"next")
+        assert storage.read_by_hash(make_hash(12)) == b"next"
+
+    def test_delete(self, storage):
+        hothash = make_hash(3)
+        relative_path = storage.write(hothash, b"data")
+
+        assert storage.delete_by_hash(hothash) is True
+        assert storage.read_by_hash(hothash) is None
+        assert storage.exists(relative_path) is False
+        assert storage.delete_by_hash(hothash) is False
+
+    def test_stats_and_iteration(self, storage):
+        hashes = {make_hash(i) for i in range(5)}
+        for hothash in hashes:
+            storage.write(hothash, b"x" * 100)
+
+        stats = storage.stats()
+        assert stats["total_files"] == 5
+        assert stats["total_size_bytes"] == 500
+        assert set(storage.iter_hothashes()) == hashes
+
+
+class TestSegmentFileStorage:
+    """Segment-specific behaviour"""
+
+    def test_index_survives_reopen(self, tmp_path):
+        storage = SegmentFileStorage(tmp_path)
+        storage.write(make_hash(1), b"one")
+        storage.write(make_hash(2), b"two")
+        storage.delete_by_hash(make_hash(1))
+        storage.close()
+
+        reopened = SegmentFileStorage(tmp_path)
+        assert reopened.read_by_hash(make_hash(1)) is None
+        assert reopened.read_by_hash(make_hash(2)) == b"two"
+        reopened.close()
+
+    def test_rebuild_index_from_segments(self, tmp_path):
+        storage = SegmentFileStorage(tmp_path)
+        storage.write(make_hash(1), b"one")
+        storage.write(make_hash(2), b"two")
+        storage.delete_by_hash(make_hash(2))
+        storage.close()
+
+        (tmp_path / "segments" / "index.log").unlink()
+
+        rebuilt = SegmentFileStorage(tmp_path)
+        assert rebuilt.read_by_hash(make_hash(1)) == b"one"
+        assert rebuilt.read_by_hash(make_hash(2)) is None
+        rebuilt.close()
+
+    def test_rebuild_index_skips_aborted_stream(self, tmp_path):
+        storage = SegmentFileStorage(tmp_path)
+        storage.write(make_hash(1), b"one")
+        with pytest.raises(ValueError):
+            storage.write_stream(make_hash(1), io.BytesIO(b"short"), 100)
+        storage.write(make_hash(2), b"two")
+        storage.close()
+
+        (tmp_path / "segments" / "index.log").unlink()
+
+        rebuilt = SegmentFileStorage(tmp_path)
+        assert rebuilt.read_by_hash(make_hash(1)) == b"one"
+        assert rebuilt.read_by_hash(make_hash(2)) == b"two"
+        rebuilt.close()
+
+    def test_rolls_over_to_new_segment(self, tmp_path):
+        storage = SegmentFileStorage(tmp_path, max_segment_bytes=1024)
+        for i in range(10):
+            storage.write(make_hash(i), bytes([i]) * 400)
+
+        assert storage.stats()["segment_count"] > 1
+        for i in range(10):
+            assert storage.read_by_hash(make_hash(i)) == bytes([i]) * 400
+        storage.close()
+
+    def test_compaction_reclaims_dead_segments(self, tmp_path):
+        storage = SegmentFileStorage(tmp_path, max_segment_bytes=1024)
+        for i in range(10):
+            storage.write(make_hash(i), bytes([i]) * 400)
+        for i in range(0, 10, 2):
+            storage.delete_by_hash(make_hash(i))
+
+        before = storage.stats()
+        result = storage.compact(threshold=0.3)
+        after = storage.stats()
+
+        assert result["segments_compacted"] > 0
+        assert after["segment_bytes"] < before["segment_bytes"]
+        for i in range(10):
+            expected = None if i % 2 == 0 else bytes([i]) * 400
+            assert storage.read_by_hash(make_hash(i)) == expected
+        storage.close()
+
+        # Compacted index snapshot is valid after restart
+        reopened = SegmentFileStorage(tmp_path, max_segment_bytes=1024)
+        assert reopened.stats()["total_files"] == 5
+        assert reopened.read_by_hash(make_hash(1)) == bytes([1]) * 400
+        reopened.close()
+
+    def test_compaction_keeps_tombstones_over_older_data(self, tmp_path):
+        storage = SegmentFileStorage(tmp_path, max_segment_bytes=1024)
+        storage.write(make_hash(0), b"a" * 400)          # Segment 1, below the threshold
+        storage.write(make_hash(1), b"b" * 400)
+        storage.write(make_hash(2), b"c" * 400)          # Segment 2
+        storage.delete_by_hash(make_hash(0))             # Tombstone in segment 2
+        storage.write(make_hash(2), b"d" * 400)
+        storage.write(make_hash(2), b"e" * 400)          # Segment 3 (active); segment 2 is all dead
+
+        result = storage.compact(threshold=0.9)
+        assert result["segments_compacted"] == 1
+        assert storage.rebuild_index() == 2
+        assert storage.read_by_hash(make_hash(0)) is None
+        assert storage.read_by_hash(make_hash(2)) == b"e" * 400
+        storage.close()
+
+    def test_rejects_non_hex_hothash(self, tmp_path):
+        storage = SegmentFileStorage(tmp_path)
+        with pytest.raises(ValueError):
+            storage.write("not-a-hash", b"data")
+        assert storage.read_by_hash("not-a-hash") is None
+        storage.close()
+
+
+class TestShardedFileStorageCounters:
+    """File backend totals are counted once and then maintained incrementally"""
+
+    def test_counters_follow_writes_and_deletes(self, tmp_path):
+        storage = ShardedFileStorage(tmp_path)
+        storage.write(make_hash(1), b"a" * 10)
+        assert storage.stats()["total_files"] == 1  # First call walks the tree
+
+        storage.write(make_hash(2), b"b" * 20)
+        storage.write(make_hash(1), b"a" * 5)  # Overwrite adjusts size only
+        storage.delete_by_hash(make_hash(2))
+
+        stats = storage.stats()
+        assert stats["total_files"] == 1
+        assert stats["total_size_bytes"] == 5
+
+    def test_stats_do_not_walk_after_initial_count(self, tmp_path):
+        storage = ShardedFileStorage(tmp_path)
+        storage.stats()
+
+        # A file placed behind the backend's back is only seen by recount()
+        stray = tmp_path / "ff" / "ff" / f"{'f' * 64}.jpg"
+        stray.parent.mkdir(parents=True)
+        stray.write_bytes(b"stray")
+
+        assert storage.stats()["total_files"] == 0
+        assert storage.recount()["total_files"] == 1
@@ -0,0 +1,95 @@
+"""
+Tests for spatio-temporal event clustering
+"""
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+from types import SimpleNamespace
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / 'src'))
+
+import pytest
+
+from src.utils.event_clustering import bounding_box, haversine_km, cluster_points
+
+OSLO = (59.9139, 10.7522)
+ROME = (41.9028, 12.4964)
+
+
+def points(*bursts):
+    """Photos every 5 minutes: bursts of (start, count, (lat, lon) or None)"""
+    result = []
+    for start, count, position in bursts:
+        lat, lon = position or (None, None)
+        for i in range(count):
+            result.append(SimpleNamespace(
+                id=len(result), taken_at=start + timedelta(minutes=5 * i), gps_latitude=lat, gps_longitude=lon
+            ))
+    return result
+
+
+def shape(clusters):
+    return [(c.level, c.start, c.end, shape(c.children)) for c in clusters]
+
+
+def test_haversine():
+    assert haversine_km(*OSLO, *OSLO) == 0
+    assert haversine_km(*OSLO, *ROME) == pytest.approx(2009, rel=0.01)
+
+
+def test_bounding_box_encloses_radius():
+    min_lat, max_lat, min_lon, max_lon = bounding_box(*OSLO, 10)
+    assert haversine_km(*OSLO, min_lat, OSLO[1]) == pytest.approx(10, rel=1e-3)
+    assert haversine_km(*OSLO, OSLO[0], max_lon) == pytest.approx(10, rel=1e-3)
+    assert bounding_box(89.99, 0, 10)[2:] == (None, None)
+    assert bounding_box(0, 179.99, 10)[2:] == (None, None)
+
+
+def test_time_gap_splits_trips():
+    photos = points(
+        (datetime(2024, 6, 1, 10), 12, OSLO),
+        (datetime(2024, 6, 10, 10), 12, OSLO),
+    )
+    assert shape(cluster_points(photos)) == [("trip", 0, 12, []), ("trip", 12, 24, [])]
+
+
+def test_distance_jump_splits_trip_without_time_gap():
+    photos = points(
+        (datetime(2024, 6, 1, 10), 12, OSLO),
+        (datetime(2024, 6, 1, 14), 12, ROME),
+    )
+    assert [c.start for c in cluster_points(photos)] == [0, 12]
+
+
+def test_nesting_days_and_locations():
+    photos = points(
+        (datetime(2024, 6, 1, 9), 4, ROME),
+        (datetime(2024, 6, 1, 14), 4, (41.8902, 12.4922)),  # Colosseum, 1.4 km away
+        (datetime(2024, 6, 2, 9), 4, ROME),
+        (datetime(2024, 6, 2, 20), 2, None),
+    )
+    trip, = cluster_points(photos)
+
+    assert shape([trip]) == [("trip", 0, 14, [
+        ("day", 0, 8, [("location", 0, 4, []), ("location", 4, 8, [])]),
+        ("day", 8, 12, []),
+    ])]
+    # Two evening photos are too few for a day of their own: they stay in the trip
+    assert list(trip.direct_indices()) == [12, 13]
+
+
+def test_single_day_trip_holds_locations_directly():
+    photos = points(
+        (datetime(2024, 6, 1, 9), 5, OSLO),
+        (datetime(2024, 6, 1, 15), 5, OSLO),
+    )
+    assert shape(cluster_points(photos)) == [
+        ("trip", 0, 10, [("location", 0, 5, []), ("location", 5, 10, [])])
+    ]
+
+
+def test_small_bursts_are_not_trips():
+    photos = points((datetime(2024, 6, 1, 9), 3, OSLO))
+    assert cluster_points(photos) == []
+    assert cluster_points([]) == []
@@ -0,0 +1,53 @@
+"""
+Tests for histogram bin numbering, run-length and varint encoding
+"""
+import sys
+from datetime import datetime
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / 'src'))
+
+import pytest
+
+from src.utils.histogram import (
+    bin_index, bin_start, encode_runs, decode_runs, pack_varints, unpack_varints
+)
+
+
+@pytest.mark.parametrize("granularity,parts,start", [
+    ("year", (2024,), datetime(2024, 1, 1)),
+    ("month", (2024, 12), datetime(2024, 12, 1)),
+    ("day", (2024, 2, 29), datetime(2024, 2, 29)),
+    ("hour", (2024, 2, 29, 23), datetime(2024, 2, 29, 23)),
+])
+def test_bin_roundtrip(granularity, parts, start):
+    index = bin_index(granularity, *parts)
+    assert bin_start(granularity, index) == start
+    assert bin_start(granularity, index + 1) > start
+
+
+def test_adjacent_bins_across_boundaries():
+    assert bin_index("month", 2025, 1) - bin_index("month", 2024, 12) == 1
+    assert bin_index("day", 2024, 3, 1) - bin_index("day", 2024, 2, 29) == 1
+    assert bin_index("hour", 2025, 1, 1, 0) - bin_index("hour", 2024, 12, 31, 23) == 1
+
+
+def test_encode_runs():
+    first, length, runs = encode_runs([(10, 5), (17, 3), (18, 3), (19, 12)])
+
+    assert (first, length) == (10, 10)
+    assert runs == [5, 1, 0, 6, 3, 2, 12, 1]
+    assert decode_runs(runs) == [5, 0, 0, 0, 0, 0, 0, 3, 3, 12]
+
+
+def test_encode_runs_empty():
+    assert encode_runs([]) == (None, 0, [])
+
+
+def test_varints_roundtrip():
+    values = [0, 1, 127, 128, 300, 2 ** 32]
+    packed = pack_varints(values)
+
+    assert packed[:3] == b"\x00\x01\x7f"
+    assert unpack_varints(packed) == values
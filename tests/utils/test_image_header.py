@@ -0,0 +1,81 @@
+"""
+Tests for pure-Python image header probing
+Dimensions must match Pillow for JPEG, PNG and WebP (including the test fixtures)
+"""
+import base64
+import io
+import json
+import pytest
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / 'src'))
+
+from PIL import Image as PILImage, features
+
+from src.utils.image_header import ImageHeader, UnknownImageFormatError, probe_image_header
+
+FIXTURES_DIR = Path(__file__).parent.parent / "fixtures" / "photo_create_schemas"
+
+
+def encode(fmt: str, size=(123, 45), mode="RGB", **save_args) -> bytes:
+    output = io.BytesIO()
+    PILImage.new(mode, size, (10, 20, 30, 128)[:len(mode)]).save(output, format=fmt, **save_args)
+    return output.getvalue()
+
+
+def fixture_images():
+    for path in sorted(FIXTURES_DIR.glob("*.json")):
+        schema = json.loads(path.read_text())
+        for field in ("hotpreview_base64", "coldpreview_base64"):
+            if schema.get(field):
+                yield pytest.param(base64.b64decode(schema[field]), id=f"{path.stem}-{field}")
+
+
+@pytest.mark.parametrize("data", fixture_images())
+def test_fixture_images_match_pillow(data):
+    img = PILImage.open(io.BytesIO(data))
+    assert probe_image_header(data) == ImageHeader(img.format, *img.size)
+
+
+@pytest.mark.parametrize("save_args", [{}, {"progressive": True}, {"exif": b"Exif\x00\x00" + b"\x00" * 20000}])
+def test_jpeg_variants(save_args):
+    assert probe_image_header(encode("JPEG", **save_args)) == ("JPEG", 123, 45)
+
+
+def test_png():
+    assert probe_image_header(encode("PNG", mode="RGBA")) == ("PNG", 123, 45)
+
+
+@pytest.mark.skipif(not features.check("webp"), reason="Pillow built without WebP")
+@pytest.mark.parametrize("mode,save_args", [
+    ("RGB", {}),                    # VP8
+    ("RGB", {"lossless": True}),    # VP8L
+    ("RGBA", {}),                   # VP8X (alpha)
+])
+def test_webp_variants(mode, save_args):
+    assert probe_image_header(encode("WEBP", mode=mode, **save_args)) == ("WEBP", 123, 45)
+
+
+def test_header_prefix_is_enough():
+    data = encode("JPEG", size=(2000, 1500))
+    assert probe_image_header(data[:2048]) == ("JPEG", 2000, 1500)
+
+
+def test_unknown_format():
+    with pytest.raises(UnknownImageFormatError):
+        probe_image_header(b"GIF89a" + b"\x00" * 100)
+    with pytest.raises(UnknownImageFormatError):
+        probe_image_header(b"")
+
+
+@pytest.mark.parametrize("data", [
+    b"\xff\xd8\xff\xe0\x00\x10JFIF",          # JPEG truncated before SOF
+    b"\xff\xd8\xff\xda\x00\x08" + b"\x00" * 8,  # Scan data before SOF
+    b"\x89PNG\r\n\x1a\n\x00\x00\x00\x0dIHDR",  # PNG truncated IHDR
+    b"RIFF\x00\x00\x00\x00WEBPVP8 " + b"\x00" * 20,  # Bad VP8 start code
+])
+def test_malformed_headers_raise_value_error(data):
+    with pytest.raises(ValueError):
+        probe_image_header(data)
@@ -0,0 +1,104 @@
+"""
+Tests for the image worker pool
+Covers inline mode, queue-depth rejection, timeouts and queue metrics
+"""
+import io
+import threading
+import time
+import pytest
+import sys
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from unittest.mock import MagicMock
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / 'src'))
+
+from PIL import Image as PILImage
+
+from src.core.exceptions import ServiceBusyError, ProcessingTimeoutError
+from src.utils import image_ops
+from src.utils.image_worker_pool import ImageWorkerPool
+
+
+def make_jpeg(width: int = 64, height: int = 48) -> bytes:
+    output = io.BytesIO()
+    PILImage.new("RGB", (width, height), (200, 100, 50)).save(output, format="JPEG")
+    return output.getvalue()
+
+
+def test_inline_probe_and_resize():
+    pool = ImageWorkerPool(max_workers=0, max_queue=0, timeout=5)
+    data = make_jpeg(200, 100)
+
+    assert pool.run(image_ops.probe_dimensions, data, True) == (200, 100)
+    resized = pool.run(image_ops.resize_jpeg, data, None, None, 50, 85)
+    assert PILImage.open(io.BytesIO(resized)).size == (50, 25)
+
+    snapshot = pool.metrics.snapshot()
+    assert snapshot["submitted"] == 2
+    assert snapshot["completed"] == 2
+    assert snapshot["in_flight"] == 0
+
+
+def test_invalid_image_raises_value_error():
+    pool = ImageWorkerPool(max_workers=0, max_queue=0, timeout=5)
+    with pytest.raises(ValueError):
+        pool.run(image_ops.probe_dimensions, b"not an image")
+    assert pool.metrics.snapshot()["failed"] == 1
+
+
+def test_process_pool_rejects_when_full_and_times_out():
+    pool = ImageWorkerPool(max_workers=1, max_queue=0, timeout=0.5)
+    try:
+        # Warm up the worker so the timeout below measures the task, not process startup
+        pool.timeout = 30
+        assert pool.run(image_ops.probe_dimensions, make_jpeg()) == (64, 48)
+        pool.timeout = 0.5
+
+        errors = []
+
+        def slow_call():
+            try:
+                pool.run(time.sleep, 2)
+            except Exception as e:
+                errors.append(e)
+
+        worker = threading.Thread(target=slow_call)
+        worker.start()
+        time.sleep(0.1)
+
+        # One task running, no queue slots left
+        with pytest.raises(ServiceBusyError):
+            pool.run(image_ops.probe_dimensions, make_jpeg())
+
+        worker.join()
+        assert len(errors) == 1 and isinstance(errors[0], ProcessingTimeoutError)
+
+        snapshot = pool.metrics.snapshot()
+        assert snapshot["rejected"] == 1
+        assert snapshot["timeouts"] == 1
+    finally:
+        pool.shutdown()
+
+
+def test_failed_restart_after_broken_pool_releases_slot():
+    pool = ImageWorkerPool(max_workers=1, max_queue=0, timeout=5)
+    broken = MagicMock()
+    broken.submit.side_effect = BrokenProcessPool("worker died")
+    replacement = MagicMock()
+    replacement.submit.side_effect = OSError("cannot start worker process")
+    executors = iter([broken, replacement])
+
+    def get_executor():
+        if pool._executor is None:
+            pool._executor = next(executors)
+        return pool._executor
+
+    pool._get_executor = get_executor
+
+    with pytest.raises(OSError):
+        pool.run(image_ops.probe_dimensions, make_jpeg())
+
+    broken.shutdown.assert_called_once_with(wait=False)
+    assert pool.metrics.snapshot()["in_flight"] == 0
@@ -0,0 +1,198 @@
+"""
+Tests for AsyncImalinkCoreClient against a local stub imalink-core server
+
+The stub is a real HTTP/1.1 server (keep-alive) on localhost, so connection
+reuse, streamed uploads and the concurrency limit are exercised end to end.
+"""
+import asyncio
+import json
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import httpx
+import pytest
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+from src.core.exceptions import ServiceBusyError, ProcessingTimeoutError
+from src.utils.imalink_core_client import AsyncImalinkCoreClient
+
+FIXTURE = Path(__file__).parent.parent / "fixtures" / "photo_create_schemas" / "tiny.json"
+
+
+class StubCoreServer(ThreadingHTTPServer):
+    """Records requests to /v1/process and answers with a fixture PhotoCreateSchema"""
+
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), StubCoreHandler)
+        self.response_body = FIXTURE.read_bytes()
+        self.delay = 0.0
+        self.status = 200
+        self.bodies = []
+        self.client_ports = set()
+        self.active = 0
+        self.peak_active = 0
+        self.lock = threading.Lock()
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+
+class StubCoreHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # Keep-alive
+    timeout = 5
+
+    def do_POST(self):
+        server = self.server
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+        with server.lock:
+            server.bodies.append(body)
+            server.client_ports.add(self.client_address[1])
+            server.active += 1
+            server.peak_active = max(server.peak_active, server.active)
+        try:
+            time.sleep(server.delay)
+        finally:
+            with server.lock:
+                server.active -= 1
+
+        if server.status == 200:
+            payload = server.response_body
+        else:
+            payload = json.dumps({"detail": "Invalid image format"}).encode()
+        self.send_response(server.status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def core_server():
+    server = StubCoreServer()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def image_file(data=b"fake jpeg image data"):
+    f = tempfile.SpooledTemporaryFile()
+    f.write(data)
+    f.seek(0)
+    return f
+
+
+def run_calls(client, count, **kwargs):
+    """Run count concurrent process_image calls; return results/exceptions"""
+    async def run():
+        try:
+            return await asyncio.gather(
+                *(client.process_image(image_file(), f"img{i}.jpg", **kwargs) for i in range(count)),
+                return_exceptions=True
+            )
+        finally:
+            await client.aclose()
+    return asyncio.run(run())
+
+
+def test_process_image_returns_schema(core_server):
+    client = AsyncImalinkCoreClient(core_url=core_server.url)
+
+    [result] = run_calls(client, 1, coldpreview_size=1200)
+
+    assert result.hothash == json.loads(FIXTURE.read_text())["hothash"]
+    body = core_server.bodies[0]
+    assert b'filename="img0.jpg"' in body
+    assert b"fake jpeg image data" in body
+    assert b'name="coldpreview_size"' in body and b"1200" in body
+
+
+def test_connections_are_reused(core_server):
+    client = AsyncImalinkCoreClient(core_url=core_server.url)
+
+    async def sequential():
+        try:
+            for i in range(5):
+                await client.process_image(image_file(), f"img{i}.jpg")
+        finally:
+            await client.aclose()
+    asyncio.run(sequential())
+
+    assert len(core_server.bodies) == 5
+    assert len(core_server.client_ports) == 1
+
+
+def test_large_upload_is_streamed_from_file(core_server):
+    client = AsyncImalinkCoreClient(core_url=core_server.url)
+    data = bytes(range(256)) * (5 * 4096)  # 5 MB
+
+    async def upload():
+        try:
+            with tempfile.TemporaryFile() as f:
+                f.write(data)
+                return await client.process_image(f, "big.jpg")
+        finally:
+            await client.aclose()
+    asyncio.run(upload())
+
+    assert data in core_server.bodies[0]
+
+
+def test_concurrency_is_limited(core_server):
+    core_server.delay = 0.2
+    client = AsyncImalinkCoreClient(core_url=core_server.url, max_concurrency=2)
+
+    results = run_calls(client, 6)
+
+    assert not any(isinstance(result, Exception) for result in results)
+    assert core_server.peak_active == 2
+    stats = client.stats()
+    assert stats["completed"] == 6
+    assert stats["in_flight"] == 0
+    assert stats["queue_wait_max_seconds"] >= 0.2
+
+
+def test_queue_timeout_rejects_with_service_busy(core_server):
+    core_server.delay = 0.5
+    client = AsyncImalinkCoreClient(core_url=core_server.url, max_concurrency=1, queue_timeout=0.1)
+
+    results = run_calls(client, 2)
+
+    assert sum(isinstance(result, ServiceBusyError) for result in results) == 1
+    assert client.stats()["rejected"] == 1
+    assert client.stats()["in_flight"] == 0
+
+
+def test_slow_processing_times_out(core_server):
+    core_server.delay = 1.0
+    client = AsyncImalinkCoreClient(core_url=core_server.url, timeout=0.2)
+
+    [result] = run_calls(client, 1)
+
+    assert isinstance(result, ProcessingTimeoutError)
+    assert result.status_code == 504
+    assert client.stats()["timeouts"] == 1
+
+
+def test_core_error_is_raised(core_server):
+    core_server.status = 400
+    client = AsyncImalinkCoreClient(core_url=core_server.url)
+
+    [result] = run_calls(client, 1)
+
+    assert isinstance(result, httpx.HTTPStatusError)
+    assert result.response.status_code == 400
+    assert client.stats()["failed"] == 1
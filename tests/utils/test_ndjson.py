@@ -0,0 +1,63 @@
+"""
+Tests for incremental NDJSON line splitting
+"""
+import asyncio
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / 'src'))
+
+from src.utils.ndjson import LineTooLong, iter_ndjson_lines
+
+
+def split(chunks, max_line_bytes=100):
+    async def stream():
+        for chunk in chunks:
+            yield chunk
+
+    async def collect():
+        return [line async for line in iter_ndjson_lines(stream(), max_line_bytes)]
+
+    return asyncio.run(collect())
+
+
+def test_lines_split_across_chunks():
+    assert split([b'{"a"', b': 1}\n{"b": 2}\n', b'{"c"', b': 3}']) == [b'{"a": 1}', b'{"b": 2}', b'{"c": 3}']
+
+
+def test_blank_lines_and_crlf_keep_line_numbers():
+    assert split([b"one\r\n\r\nthree\n"]) == [b"one", b"", b"three"]
+
+
+def test_trailing_newline_does_not_add_line():
+    assert split([b"one\n", b"two\n"]) == [b"one", b"two"]
+
+
+def test_oversized_line_is_discarded():
+    lines = split([b"ok\n", b"x" * 60, b"x" * 60, b"\nafter\n"], max_line_bytes=100)
+
+    assert lines[0] == b"ok"
+    assert isinstance(lines[1], LineTooLong) and lines[1].size == 120
+    assert lines[2] == b"after"
+
+
+def test_request_streaming_response_reads_body_while_streaming():
+    from starlette.applications import Starlette
+    from starlette.requests import Request
+    from starlette.routing import Route
+    from starlette.testclient import TestClient
+
+    from src.utils.ndjson import RequestStreamingResponse
+
+    async def echo(request: Request):
+        async def results():
+            async for line in iter_ndjson_lines(request.stream(), 1024):
+                yield line.upper() + b"\n"
+        return RequestStreamingResponse(results(), media_type="application/x-ndjson")
+
+    client = TestClient(Starlette(routes=[Route("/echo", echo, methods=["POST"])]))
+    response = client.post("/echo", content=b'{"a": 1}\n{"b": 2}\n')
+
+    assert response.status_code == 200
+    assert response.text.splitlines() == ['{"A": 1}', '{"B": 2}']